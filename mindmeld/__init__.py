@@ -19,14 +19,22 @@ try:
 except ImportError:
     pass  # no worries
 
-from ._util import blueprint, configure_logs
+from ._lazy import lazy_exports
 from ._version import current
-from .app import Application
-from .components import (
-    Conversation,
-    DialogueResponder,
-    NaturalLanguageProcessor,
-    QuestionAnswerer,
+
+# The exported names are imported from their modules when they are first used, so importing
+# mindmeld does not load the models and their dependencies
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    {
+        "blueprint": "._util",
+        "configure_logs": "._util",
+        "Application": ".app",
+        "Conversation": ".components",
+        "DialogueResponder": ".components",
+        "NaturalLanguageProcessor": ".components",
+        "QuestionAnswerer": ".components",
+    },
 )
 
 __all__ = [
@@ -0,0 +1,85 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2015 Cisco Systems, Inc. and others.  All rights reserved.
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#     http://www.apache.org/licenses/LICENSE-2.0
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""This module contains helpers for deferring imports of modules with heavy dependencies until
+they are used, so that importing MindMeld and starting a server stays fast."""
+import importlib
+import sys
+import types
+
+
+class LazyModule(types.ModuleType):
+    """A placeholder for a module which is imported when one of its attributes is first
+    accessed.
+
+    Attributes such as exception classes are resolved when they are used, for example when an
+    ``except`` clause is evaluated, so a module can refer to them without importing their
+    package.
+    """
+
+    def __getattr__(self, name):
+        module = importlib.import_module(self.__name__)
+        self.__dict__.update(module.__dict__)
+        return getattr(module, name)
+
+
+def lazy_import(name):
+    """Gets a module which is imported when it is first used.
+
+    Args:
+        name (str): The absolute name of the module
+
+    Returns:
+        (module): The module if it was already imported, otherwise a placeholder for it
+    """
+    try:
+        return sys.modules[name]
+    except KeyError:
+        return LazyModule(name)
+
+
+def lazy_exports(package, exports):
+    """Creates the module ``__getattr__`` and ``__dir__`` functions of a package which exports
+    names from its submodules without importing them up front.
+
+    Args:
+        package (str): The name of the package
+        exports (dict): A mapping of each exported name to the relative name of the module
+            defining it
+
+    Returns:
+        (tuple): The ``__getattr__`` and ``__dir__`` functions of the package
+    """
+    module = sys.modules[package]
+    if sys.version_info < (3, 7):
+        # module __getattr__ is only supported from Python 3.7 (PEP 562), so the names are
+        # imported up front instead
+        for name, submodule in exports.items():
+            setattr(module, name, getattr(importlib.import_module(submodule, package), name))
+
+    def __getattr__(name):
+        try:
+            submodule = exports[name]
+        except KeyError:
+            raise AttributeError(
+                "module {!r} has no attribute {!r}".format(package, name)
+            ) from None
+        value = getattr(importlib.import_module(submodule, package), name)
+        # cache the value so it is only looked up once
+        setattr(module, name, value)
+        return value
+
+    def __dir__():
+        return sorted(set(module.__dict__) | set(exports))
+
+    return __getattr__, __dir__
@@ -19,6 +19,7 @@ import os
 import sys
 
 from .app_manager import ApplicationManager
+from .asgi import AsyncMindMeldServer
 from .cli import app_cli
 from .components._config import get_custom_action_config
 from .components.custom_action import (
@@ -45,6 +46,8 @@ class Application:
                 inherits from the DialogueResponder.
             preprocessor (Preprocessor): The application preprocessor, if any.
             async_mode (bool): ``True`` if the application is async, ``False`` otherwise.
+            history_store (HistoryStore): The store of the histories of conversations which \
+                are referred to by id, if not the default in-memory store.
         """
 
     def __init__(
@@ -54,6 +57,7 @@ class Application:
         responder_class=None,
         preprocessor=None,
         async_mode=False,
+        history_store=None,
     ):
         self.import_name = import_name
         filename = getattr(sys.modules[import_name], "__file__", None)
@@ -63,12 +67,14 @@ class Application:
 
         self.app_manager = None
         self._server = None
+        self._asgi_server = None
         self._dialogue_rules = []
         self._middleware = []
         self.request_class = request_class or Request
         self.responder_class = responder_class or DialogueResponder
         self.preprocessor = preprocessor
         self.async_mode = async_mode
+        self.history_store = history_store
         self.custom_action_config = get_custom_action_config(self.app_path)
 
     @property
@@ -92,6 +98,7 @@ class Application:
             request_class=self.request_class,
             preprocessor=self.preprocessor,
             async_mode=self.async_mode,
+            history_store=self.history_store,
         )
         self._server = MindMeldServer(self.app_manager)
 
@@ -104,8 +111,31 @@ class Application:
             self.add_middleware(middleware)
         self._middleware = None
 
-    def run(self, **kwargs):
-        """Runs the application on a local development server."""
+    @property
+    def asgi_app(self):
+        """
+        An ASGI application serving the MindMeld API, which can be run by any ASGI server, for \
+            example ``uvicorn my_app:app.asgi_app``. The application's models are loaded when \
+            the ASGI server starts up.
+        """
+        if self._asgi_server is None:
+            self.lazy_init()
+            self._asgi_server = AsyncMindMeldServer(self.app_manager)
+        return self._asgi_server
+
+    def run(self, asgi=False, **kwargs):
+        """Runs the application on a local development server.
+
+        Args:
+            asgi (bool, optional): Whether to serve the application with the asynchronous ASGI \
+                server instead of the Flask development server.
+        """
+        if asgi:
+            self.asgi_app.run(
+                host=kwargs.get("host", "0.0.0.0"), port=kwargs.get("port", 7150)
+            )
+            return
+
         defaults = {"port": 7150, "host": "0.0.0.0", "threaded": True}
         for key, value in defaults.items():
             if key not in kwargs:
@@ -174,6 +204,7 @@ class Application:
         async_mode=False,
         merge=True,
         config=None,
+        parallel=False,
         **kwargs
     ):
         """Adds a custom action sequence handler for the dialogue manager.
@@ -188,6 +219,8 @@ class Application:
             merge (bool): Whether we should merge the Responder with fields from the
                 response, otherwise we will overwrite the fields (frame, directives) accordingly.
             config (dict): The custom action config, if different from the application's.
+            parallel (bool): Whether the actions are independent and can be invoked in \
+                parallel. Their responses are merged in order.
         """
         if not (action or actions):
             raise CustomActionException(
@@ -201,7 +234,9 @@ class Application:
             )
 
         actions = [action] if action else actions
-        action_seq = CustomActionSequence(actions, config, merge=merge)
+        action_seq = CustomActionSequence(
+            actions, config, merge=merge, parallel=parallel
+        )
         state_name = kwargs.pop("name", "custom_actions_{}".format(actions))
         async_mode = async_mode or self.async_mode
         if async_mode:
@@ -14,16 +14,27 @@
 """
 This module contains the application manager
 """
+import asyncio
 import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from multiprocessing import cpu_count
 
 from .components import DialogueManager, NaturalLanguageProcessor, QuestionAnswerer
 from .components._config import get_max_history_len
 from .components.dialogue import DialogueResponder
 from .components.request import FrozenParams, Params, Request
+from .exceptions import BadMindMeldRequestError
+from .history import NEW_CONVERSATION_ID, HistoryStore
 from .resource_loader import ResourceLoader
 
 logger = logging.getLogger(__name__)
 
+# The number of threads which run natural language processing for async applications, so that it
+# does not block the event loop
+DEFAULT_NLP_WORKERS = int(os.environ.get("MM_NLP_WORKERS", min(32, cpu_count())))
+
 
 def freeze_params(params):
     """
@@ -57,6 +68,8 @@ class ApplicationManager:
 
         Attributes:
             async_mode (bool): Whether the application is asynchronous or synchronous.
+            nlp_workers (int): The number of threads which run natural language processing for \
+                asynchronous applications.
             nlp (NaturalLanguageProcessor): The natural language processor.
             question_answerer (QuestionAnswerer): The question answerer.
             request_class (Request): Any class that inherits \
@@ -64,6 +77,8 @@ class ApplicationManager:
             responder_class (DialogueResponder): Any class \
                 that inherits from the DialogueResponder
             dialogue_manager (DialogueManager): The application's dialogue manager.
+            history_store (HistoryStore): The store of the histories of conversations which \
+                are referred to by id.
     """
 
     MAX_HISTORY_LEN = 100
@@ -79,8 +94,12 @@ class ApplicationManager:
         responder_class=None,
         preprocessor=None,
         async_mode=False,
+        nlp_workers=None,
+        history_store=None,
     ):
         self.async_mode = async_mode
+        self.nlp_workers = nlp_workers or DEFAULT_NLP_WORKERS
+        self._nlp_executor = None
 
         self._app_path = app_path
         # If NLP or QA were passed in, use the resource loader from there
@@ -109,6 +128,7 @@ class ApplicationManager:
         self.max_history_len = (
             get_max_history_len(self._app_path) or self.MAX_HISTORY_LEN
         )
+        self.history_store = history_store or HistoryStore()
 
     @property
     def ready(self):
@@ -129,8 +149,34 @@ class ApplicationManager:
         if self.nlp.ready:
             # if we are ready, don't load again
             return
-        # TODO: make an async nlp
-        self.nlp.load()
+        await self.run_in_nlp_executor(self.nlp.load)
+
+    @property
+    def nlp_executor(self):
+        """The executor which runs natural language processing for async applications
+        (ThreadPoolExecutor)."""
+        if self._nlp_executor is None:
+            self._nlp_executor = ThreadPoolExecutor(
+                max_workers=self.nlp_workers, thread_name_prefix="mindmeld-nlp"
+            )
+        return self._nlp_executor
+
+    async def run_in_nlp_executor(self, func, *args, **kwargs):
+        """Runs a function in the natural language processing executor, without blocking the
+        event loop.
+
+        Args:
+            func (callable): The function to run
+            args: The positional arguments of the function
+            kwargs: The keyword arguments of the function
+
+        Returns:
+            The result of the function
+        """
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(
+            self.nlp_executor, partial(func, *args, **kwargs)
+        )
 
     def _pre_dm(self, processed_query, context, params, frame, history):
         # We pass in the previous turn's responder's params to the current request
@@ -154,7 +200,14 @@ class ApplicationManager:
         return request, response
 
     def parse(
-        self, text, params=None, context=None, frame=None, history=None, verbose=False
+        self,
+        text,
+        params=None,
+        context=None,
+        frame=None,
+        history=None,
+        verbose=False,
+        conversation_id=None,
     ):
         """
         Args:
@@ -170,8 +223,12 @@ class ApplicationManager:
             frame (dict, optional): A dictionary specifying the frame of the conversation
             context (dict, optional): A dictionary of app-specific data
             history (list, optional): A list of previous and current responder objects \
-                                      through interactions with MindMeld
+                                      through interactions with MindMeld. If a conversation id \
+                                      is given, the turns newer than the stored history.
             verbose (bool, optional): Flag to return confidence scores for domains and intents
+            conversation_id (str, optional): The id of a conversation whose history is kept by \
+                the history store, so that clients do not need to send it. ``'new'`` starts a \
+                conversation with an id created by the store, which is returned in the response.
 
         Returns:
             TODO: Convert to dict
@@ -192,12 +249,14 @@ class ApplicationManager:
                 frame=frame,
                 history=history,
                 verbose=verbose,
+                conversation_id=conversation_id,
             )
 
         params = freeze_params(params)
         history = history or []
         frame = frame or {}
         context = context or {}
+        conversation_id = self._get_conversation_id(conversation_id)
 
         allowed_intents, nlp_params, dm_params = self._pre_nlp(params, verbose)
         processed_query = self.nlp.process(
@@ -206,7 +265,7 @@ class ApplicationManager:
         request, response = self._pre_dm(
             processed_query=processed_query,
             context=context,
-            history=history,
+            history=self._get_history(history, conversation_id),
             frame=frame,
             params=params,
         )
@@ -214,11 +273,20 @@ class ApplicationManager:
         dm_responder = self.dialogue_manager.apply_handler(
             request, response, **dm_params
         )
-        modified_dm_responder = self._post_dm(request, dm_responder)
+        modified_dm_responder = self._post_dm(
+            request, dm_responder, history, conversation_id
+        )
         return modified_dm_responder
 
     async def _parse_async(
-        self, text, params=None, context=None, frame=None, history=None, verbose=False
+        self,
+        text,
+        params=None,
+        context=None,
+        frame=None,
+        history=None,
+        verbose=False,
+        conversation_id=None,
     ):
         """
         Args:
@@ -233,8 +301,12 @@ class ApplicationManager:
             params.timestamp (long, optional): A unix time stamp for the request (in seconds).
             context (dict, optional): A dictionary of app-specific data
             history (list, optional): A list of previous and current responder objects
-                                      through interactions with MindMeld
+                                      through interactions with MindMeld. If a conversation id
+                                      is given, the turns newer than the stored history.
             verbose (bool, optional): Flag to return confidence scores for domains and intents
+            conversation_id (str, optional): The id of a conversation whose history is kept by
+                the history store, so that clients do not need to send it. ``'new'`` starts a
+                conversation with an id created by the store, which is returned in the response.
 
         Returns:
             @TODO: Convert to dict
@@ -251,16 +323,19 @@ class ApplicationManager:
         context = context or {}
         history = history or []
         frame = frame or {}
+        conversation_id = self._get_conversation_id(conversation_id)
 
         allowed_intents, nlp_params, dm_params = self._pre_nlp(params, verbose)
-        # TODO: make an async nlp
-        processed_query = self.nlp.process(
-            query_text=text, allowed_intents=allowed_intents, **nlp_params
+        processed_query = await self.run_in_nlp_executor(
+            self.nlp.process,
+            query_text=text,
+            allowed_intents=allowed_intents,
+            **nlp_params
         )
         request, response = self._pre_dm(
             processed_query=processed_query,
             context=context,
-            history=history,
+            history=self._get_history(history, conversation_id),
             frame=frame,
             params=params,
         )
@@ -268,9 +343,28 @@ class ApplicationManager:
         dm_responder = await self.dialogue_manager.apply_handler(
             request, response, **dm_params
         )
-        modified_dm_responder = self._post_dm(request, dm_responder)
+        modified_dm_responder = self._post_dm(
+            request, dm_responder, history, conversation_id
+        )
         return modified_dm_responder
 
+    def _get_conversation_id(self, conversation_id):
+        if conversation_id is None:
+            return None
+        if conversation_id == NEW_CONVERSATION_ID:
+            return self.history_store.create()
+        # ids are only accepted once the store has created them, so that clients can not read or
+        # continue the conversations of other clients by choosing their ids
+        if conversation_id not in self.history_store:
+            raise BadMindMeldRequestError("Unknown conversation id", status_code=404)
+        return conversation_id
+
+    def _get_history(self, history, conversation_id):
+        if conversation_id is None:
+            return history
+        # the client only sends the turns which are newer than the stored history, if any
+        return tuple(history) + self.history_store.get(conversation_id)
+
     def _pre_nlp(self, params, verbose=False):
         # validate params
         allowed_intents = params.validate_param("allowed_intents")
@@ -282,14 +376,24 @@ class ApplicationManager:
             params.validate_dm_params(self.dialogue_manager.handler_map),
         )
 
-    def _post_dm(self, request, dm_response):
+    def _post_dm(self, request, dm_response, history_delta=(), conversation_id=None):
         # Append this item to the history, but don't recursively store history
         prev_request = DialogueResponder.to_json(dm_response)
         prev_request.pop("history")
+        prev_request["request"].pop("history", None)
 
-        # limit length of history
-        new_history = (prev_request,) + request.history
-        dm_response.history = new_history[: self.max_history_len]
+        if conversation_id is None:
+            # limit length of history
+            new_history = (prev_request,) + request.history.to_json()
+            dm_response.history = new_history[: self.max_history_len]
+        else:
+            # only the new turns are written to the history store
+            dm_response.history = self.history_store.append(
+                conversation_id,
+                (prev_request,) + tuple(history_delta),
+                self.max_history_len,
+            )
+            dm_response.conversation_id = conversation_id
 
         # validate outgoing params
         dm_response.params.validate_param("allowed_intents")
@@ -0,0 +1,310 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2015 Cisco Systems, Inc. and others.  All rights reserved.
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#     http://www.apache.org/licenses/LICENSE-2.0
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+    This module contains the ASGI application which serves the MindMeld API asynchronously.
+"""
+import asyncio
+import json
+import logging
+import os
+import time
+
+from ._version import current as __version__
+from .components.custom_action import default_client_pool
+from .exceptions import BadMindMeldRequestError, MindMeldImportError
+from .server import (
+    PARSE_REQUEST_KEYS,
+    encode_json,
+    get_app_version,
+    get_response_body,
+)
+
+logger = logging.getLogger(__name__)
+
+# The number of requests which are processed at the same time
+DEFAULT_MAX_CONCURRENCY = int(os.environ.get("MM_MAX_CONCURRENT_REQUESTS", 64))
+
+# The number of requests which may wait to be processed before new ones are rejected
+DEFAULT_MAX_QUEUE = int(os.environ.get("MM_MAX_QUEUED_REQUESTS", 256))
+
+MAX_CONTENT_LENGTH = 1024 * 1024 * 16
+
+CORS_HEADERS = [
+    (b"access-control-allow-origin", b"*"),
+]
+
+
+class AsyncMindMeldServer:
+    """This class is an ASGI application which serves the MindMeld API with the same JSON
+    contract as the MindMeldServer. Dialogue handlers of asynchronous applications are awaited on
+    the event loop while natural language processing runs in the application manager's bounded
+    executor, and synchronous applications are processed entirely in that executor.
+
+    At most ``max_concurrency`` requests are processed at a time, and at most ``max_queue`` more
+    wait for their turn. Requests beyond that are rejected with a 503 status, so that an
+    overloaded server sheds load instead of accumulating latency.
+    """
+
+    def __init__(self, app_manager, max_concurrency=None, max_queue=None):
+        """Initializes the server.
+
+        Args:
+            app_manager (ApplicationManager): The application manager
+            max_concurrency (int, optional): The number of requests which are processed at the \
+                same time
+            max_queue (int, optional): The number of requests which may wait to be processed
+        """
+        self._app_manager = app_manager
+        self._request_logger = logger.getChild("requests")
+        self.max_concurrency = max_concurrency or DEFAULT_MAX_CONCURRENCY
+        self.max_queue = DEFAULT_MAX_QUEUE if max_queue is None else max_queue
+        self._semaphore = None
+        self._num_waiting = 0
+
+        # Set the version for logging purposes
+        self._package_version = __version__
+        self._app_version = get_app_version()
+
+        self._routes = {
+            "/parse": ("POST", self._parse),
+            "/_status": ("GET", self._status_check),
+        }
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+        elif scope["type"] == "http":
+            await self._handle_http(scope, receive, send)
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                try:
+                    await self.load()
+                except Exception as exc:  # pylint: disable=broad-except
+                    logger.exception("Failed to load the application")
+                    await send({"type": "lifespan.startup.failed", "message": str(exc)})
+                    return
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await default_client_pool.close_async()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    async def load(self):
+        """Loads the application's models without blocking the event loop."""
+        if self._app_manager.async_mode:
+            await self._app_manager.load()
+        else:
+            await self._app_manager.run_in_nlp_executor(self._app_manager.load)
+
+    async def _handle_http(self, scope, receive, send):
+        start_time = time.time()
+        method = scope["method"]
+        path = scope["path"]
+        request_json = None
+
+        if method == "OPTIONS":
+            await self._send_preflight(scope, send)
+            return
+
+        try:
+            route = self._routes.get(path)
+            if route is None:
+                raise BadMindMeldRequestError("Not found", status_code=404)
+            route_method, handler = route
+            if method != route_method:
+                raise BadMindMeldRequestError(
+                    "Method not allowed", status_code=405
+                )
+
+            body = await self._read_body(scope, receive)
+            if method == "POST":
+                request_json = self._parse_json(scope, body)
+            if path == "/parse":
+                data = await self._throttle(handler, request_json)
+            else:
+                # status checks are not throttled so that they stay responsive under load
+                data = await handler(request_json)
+            status = 200
+        except BadMindMeldRequestError as error:
+            status, data = error.status_code, error.to_dict()
+            logger.error(json.dumps(data))
+        except Exception as exc:  # pylint: disable=broad-except
+            logger.exception("Failed to process request")
+            status, data = 500, {"error": str(exc)}
+
+        response_time = time.time() - start_time
+        data["response_time"] = response_time
+        data["version"] = "2.0"
+        await self._send_json(send, status, data)
+        if status == 200 and path == "/parse":
+            self._log_request(scope, request_json, data, response_time)
+
+    async def _throttle(self, handler, request_json):
+        """Runs a request handler once fewer than ``max_concurrency`` handlers are running.
+
+        Raises:
+            BadMindMeldRequestError: when ``max_queue`` requests are already waiting
+        """
+        if self._semaphore is None:
+            # The semaphore is created lazily so it belongs to the server's event loop
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        if self._semaphore.locked():
+            if self._num_waiting >= self.max_queue:
+                raise BadMindMeldRequestError(
+                    "The server is overloaded, please retry later", status_code=503
+                )
+        self._num_waiting += 1
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self._num_waiting -= 1
+        try:
+            return await handler(request_json)
+        finally:
+            self._semaphore.release()
+
+    async def _parse(self, request_json):
+        """The main endpoint for the MindMeld API"""
+        safe_request = {}
+        for key in PARSE_REQUEST_KEYS:
+            if key in request_json:
+                safe_request[key] = request_json[key]
+
+        app_manager = self._app_manager
+        if app_manager.async_mode:
+            response = await app_manager.parse(**safe_request)
+        else:
+            response = await app_manager.run_in_nlp_executor(
+                app_manager.parse, **safe_request
+            )
+        return get_response_body(response, request_json)
+
+    async def _status_check(self, request_json):
+        del request_json
+        body = {"status": "OK", "package_version": self._package_version}
+        if self._app_version:
+            body["app_version"] = self._app_version
+        return body
+
+    @staticmethod
+    async def _read_body(scope, receive):
+        for name, value in scope.get("headers", ()):
+            if name == b"content-length" and int(value) > MAX_CONTENT_LENGTH:
+                raise BadMindMeldRequestError(
+                    "Request body is too large", status_code=413
+                )
+
+        chunks = []
+        size = 0
+        more_body = True
+        while more_body:
+            message = await receive()
+            chunk = message.get("body", b"")
+            size += len(chunk)
+            if size > MAX_CONTENT_LENGTH:
+                raise BadMindMeldRequestError(
+                    "Request body is too large", status_code=413
+                )
+            chunks.append(chunk)
+            more_body = message.get("more_body", False)
+        return b"".join(chunks)
+
+    @staticmethod
+    def _parse_json(scope, body):
+        content_type = dict(scope.get("headers", ())).get(b"content-type", b"")
+        if content_type.split(b";")[0].strip() != b"application/json":
+            msg = "Invalid Content-Type: Only 'application/json' is supported."
+            raise BadMindMeldRequestError(msg, status_code=415)
+        try:
+            request_json = json.loads(body.decode("utf8"))
+        except ValueError as exc:
+            raise BadMindMeldRequestError("Malformed request body: {0!s}".format(exc))
+        if not isinstance(request_json, dict):
+            raise BadMindMeldRequestError(
+                "Malformed request body: expected a JSON object"
+            )
+        return request_json
+
+    @staticmethod
+    async def _send_json(send, status, data):
+        body = encode_json(data)
+        headers = [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode("ascii")),
+        ] + CORS_HEADERS
+        await send(
+            {"type": "http.response.start", "status": status, "headers": headers}
+        )
+        await send({"type": "http.response.body", "body": body})
+
+    @staticmethod
+    async def _send_preflight(scope, send):
+        request_headers = dict(scope.get("headers", ()))
+        headers = CORS_HEADERS + [
+            (b"access-control-allow-methods", b"GET, POST, OPTIONS"),
+            (
+                b"access-control-allow-headers",
+                request_headers.get(b"access-control-request-headers", b"*"),
+            ),
+            (b"content-length", b"0"),
+        ]
+        await send({"type": "http.response.start", "status": 200, "headers": headers})
+        await send({"type": "http.response.body", "body": b""})
+
+    def _log_request(self, scope, request_json, response_data, response_time):
+        if not self._request_logger.isEnabledFor(logging.INFO):
+            return
+        headers = dict(scope.get("headers", ()))
+        if b"x-forwarded-for" in headers:
+            ip_address = headers[b"x-forwarded-for"].decode("latin-1")
+        else:
+            ip_address = (scope.get("client") or (None,))[0]
+
+        log_request_data = {
+            "response": response_data,
+            "request": request_json,
+            "response_time": response_time,
+            "ip": ip_address,
+            "path": scope["path"],
+            "source": {"type": "app", "package_version": self._package_version},
+        }
+        if os.environ.get("MM_NODE_NAME"):
+            log_request_data["source"]["node_name"] = os.environ.get("MM_NODE_NAME")
+        if self._app_version:
+            log_request_data["source"]["app_version"] = self._app_version
+
+        self._request_logger.info(encode_json(log_request_data).decode("utf8"))
+
+    def run(self, host="0.0.0.0", port=7150, **kwargs):
+        """Starts the server with uvicorn.
+
+        Args:
+            host (str): The host to listen on
+            port (int): The port to listen on
+            kwargs: Additional arguments to ``uvicorn.run``
+
+        Raises:
+            MindMeldImportError: when uvicorn is not installed
+        """
+        try:
+            import uvicorn  # pylint: disable=import-outside-toplevel
+        except ImportError as exc:
+            raise MindMeldImportError(
+                "uvicorn is required to run the ASGI server. "
+                "Install it with 'pip install mindmeld[asgi]'."
+            ) from exc
+        uvicorn.run(self, host=host, port=port, **kwargs)
@@ -18,9 +18,9 @@ import os
 import importlib
 from enum import Enum
 from tqdm import tqdm
-import spacy
 
 
+from ._lazy import lazy_import
 from .resource_loader import ResourceLoader
 from .components._config import get_auto_annotator_config
 from .system_entity_recognizer import DucklingRecognizer
@@ -35,6 +35,9 @@ from .path import get_entity_types
 
 logger = logging.getLogger(__name__)
 
+# spacy is imported when a spacy annotator loads its model
+spacy = lazy_import("spacy")
+
 EN_CORE_WEB_SM = "en_core_web_sm"
 EN_CORE_WEB_MD = "en_core_web_md"
 EN_CORE_WEB_LG = "en_core_web_lg"
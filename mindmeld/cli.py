@@ -43,8 +43,9 @@ from .converter import DialogflowConverter, RasaConverter
 from .exceptions import KnowledgeBaseConnectionError, KnowledgeBaseError, MindMeldError
 from .path import (
     MODEL_CACHE_PATH,
+    LEGACY_QUERY_CACHE_PATH,
+    LEGACY_QUERY_CACHE_TMP_PATH,
     QUERY_CACHE_PATH,
-    QUERY_CACHE_TMP_PATH,
     get_generated_data_folder,
     get_dvc_local_remote_path,
 )
@@ -286,7 +287,12 @@ def dvc(ctx, init, save, checkout, help_, destroy):
     is_flag=True,
     help="starts the service with the reloader enabled",
 )
-def run_server(ctx, port, no_debug, reloader):
+@click.option(
+    "--asgi",
+    is_flag=True,
+    help="starts the asynchronous ASGI service, which requires uvicorn",
+)
+def run_server(ctx, port, no_debug, reloader, asgi):
     """Starts the MindMeld service."""
     app = ctx.obj.get("app")
     if app is None:
@@ -297,6 +303,10 @@ def run_server(ctx, port, no_debug, reloader):
     # make sure num parser is running
     ctx.invoke(num_parser, start=True)
 
+    if asgi:
+        app.run(asgi=True, port=port, host="0.0.0.0")
+        return
+
     app.run(
         port=port,
         debug=not no_debug,
@@ -374,7 +384,14 @@ async def _converse_async(app, context):
     default=False,
     help="only build models with changed training data or configuration",
 )
-def build(ctx, incremental):
+@click.option(
+    "-w",
+    "--workers",
+    type=int,
+    default=None,
+    help="number of worker processes used to build the models in parallel",
+)
+def build(ctx, incremental, workers):
     """Builds the app with default config."""
     try:
         app = ctx.obj.get("app")
@@ -388,7 +405,7 @@ def build(ctx, incremental):
 
         app.lazy_init()
         nlp = app.app_manager.nlp
-        nlp.build(incremental=incremental)
+        nlp.build(incremental=incremental, num_workers=workers)
         nlp.dump()
     except MindMeldError as ex:
         logger.error(ex.message)
@@ -536,13 +553,16 @@ def clean(ctx, query_cache, model_cache, days):
     if query_cache:
         try:
             main_cache_location = QUERY_CACHE_PATH.format(app_path=app.app_path)
-            tmp_cache_location = QUERY_CACHE_TMP_PATH.format(app_path=app.app_path)
-
-            if os.path.exists(main_cache_location):
-                os.remove(main_cache_location)
+            cache_locations = [
+                main_cache_location,
+                main_cache_location + "-journal",
+                LEGACY_QUERY_CACHE_PATH.format(app_path=app.app_path),
+                LEGACY_QUERY_CACHE_TMP_PATH.format(app_path=app.app_path),
+            ]
 
-            if os.path.exists(tmp_cache_location):
-                os.remove(tmp_cache_location)
+            for cache_location in cache_locations:
+                if os.path.exists(cache_location):
+                    os.remove(cache_location)
 
             logger.info("Query cache deleted")
         except FileNotFoundError:
@@ -619,12 +639,23 @@ def shared_cli():
     default=None,
     help="Needed to access app config to generating embeddings.",
 )
-def load_index(ctx, es_host, app_namespace, index_name, data_file, app_path):
+@click.option(
+    "--batch-size",
+    type=int,
+    default=None,
+    help="The maximum number of fields encoded in a single call to the embedder.",
+)
+def load_index(ctx, es_host, app_namespace, index_name, data_file, app_path, batch_size):
     """Loads data into a question answerer index."""
 
     try:
         QuestionAnswerer.load_kb(
-            app_namespace, index_name, data_file, es_host, app_path=app_path,
+            app_namespace,
+            index_name,
+            data_file,
+            es_host,
+            app_path=app_path,
+            batch_size=batch_size,
         )
     except (KnowledgeBaseConnectionError, KnowledgeBaseError) as ex:
         logger.error(ex.message)
@@ -12,17 +12,25 @@
 # limitations under the License.
 
 """This module contains the components of the MindMeld platform"""
-from .dialogue import Conversation, DialogueManager, DialogueResponder
-from .entity_resolver import EntityResolver
-from .nlp import NaturalLanguageProcessor
-from .preprocessor import Preprocessor
-from .question_answerer import QuestionAnswerer
-from .request import Request
-from .custom_action import (
-    CustomAction,
-    CustomActionSequence,
-    invoke_custom_action,
-    invoke_custom_action_async,
+from .._lazy import lazy_exports
+
+# The components are imported from their modules when they are first used
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    {
+        "Conversation": ".dialogue",
+        "DialogueManager": ".dialogue",
+        "DialogueResponder": ".dialogue",
+        "EntityResolver": ".entity_resolver",
+        "NaturalLanguageProcessor": ".nlp",
+        "Preprocessor": ".preprocessor",
+        "QuestionAnswerer": ".question_answerer",
+        "Request": ".request",
+        "CustomAction": ".custom_action",
+        "CustomActionSequence": ".custom_action",
+        "invoke_custom_action": ".custom_action",
+        "invoke_custom_action_async": ".custom_action",
+    },
 )
 
 __all__ = [
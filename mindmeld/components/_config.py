@@ -608,6 +608,24 @@ def get_system_entity_url_config(app_path):
     )
 
 
+def get_system_entity_cache_config(app_path):
+    """
+    Get the system entity response cache settings from the application's config. The cache is
+    configured with the ``cache`` key of the system entity recognizer config, e.g.
+    ``{'max_size': 10000, 'ttl': 3600, 'time_bucket': 60}``.
+
+    Returns:
+        (dict): The cache settings, or None if the cache is not configured
+    """
+    if not app_path:
+        raise NlpConfigError("Application path is not valid")
+
+    config = get_nlp_config(app_path).get("system_entity_recognizer")
+    if not isinstance(config, dict):
+        return None
+    return config.get("cache") or None
+
+
 def get_classifier_config(
     clf_type, app_path=None, domain=None, intent=None, entity=None
 ):
@@ -1057,7 +1075,8 @@ def get_tokenizer_config(app_path=None, exclude_from_norm=None):
         tokenizer_config = getattr(
             _get_config_module(app_path), "TOKENIZER_CONFIG", DEFAULT_TOKENIZER_CONFIG
         )
-        return tokenizer_config
+        # settings missing from the app's configuration fall back to the defaults
+        return {**DEFAULT_TOKENIZER_CONFIG, **tokenizer_config}
     except (OSError, IOError, AttributeError):
         logger.info("No app configuration file found.")
         return DEFAULT_TOKENIZER_CONFIG
@@ -15,22 +15,18 @@
 import logging
 import os
 
-from elasticsearch import ConnectionError as EsConnectionError
-from elasticsearch import (
-    Elasticsearch,
-    ElasticsearchException,
-    ImproperlyConfigured,
-    TransportError,
-)
-from elasticsearch.helpers import streaming_bulk
-
 from tqdm import tqdm
 
+from .._lazy import lazy_import
 from ..exceptions import KnowledgeBaseConnectionError, KnowledgeBaseError
 from ._config import DEFAULT_ES_INDEX_TEMPLATE, DEFAULT_ES_INDEX_TEMPLATE_NAME
 
 logger = logging.getLogger(__name__)
 
+# elasticsearch is imported when it is first used
+elasticsearch = lazy_import("elasticsearch")
+es_helpers = lazy_import("elasticsearch.helpers")
+
 INDEX_TYPE_SYNONYM = "syn"
 INDEX_TYPE_KB = "kb"
 DOC_TYPE = "document"
@@ -54,11 +50,11 @@ def create_es_client(es_host=None, es_user=None, es_pass=None):
 
     try:
         http_auth = (es_user, es_pass) if es_user and es_pass else None
-        es_client = Elasticsearch(es_host, http_auth=http_auth)
+        es_client = elasticsearch.Elasticsearch(es_host, http_auth=http_auth)
         return es_client
-    except ElasticsearchException:
+    except elasticsearch.ElasticsearchException:
         raise KnowledgeBaseError
-    except ImproperlyConfigured:
+    except elasticsearch.ImproperlyConfigured:
         raise KnowledgeBaseError
 
 
@@ -96,12 +92,12 @@ def does_index_exist(
         # Confirm ES connection with a shorter timeout
         es_client.cluster.health(request_timeout=connect_timeout)
         return es_client.indices.exists(index=scoped_index_name)
-    except EsConnectionError as e:
+    except elasticsearch.ConnectionError as e:
         logger.debug(
             "Unable to connect to Elasticsearch: %s details: %s", e.error, e.info
         )
         raise KnowledgeBaseConnectionError(es_host=es_client.transport.hosts)
-    except TransportError as e:
+    except elasticsearch.TransportError as e:
         logger.error(
             "Unexpected error occurred when sending requests to Elasticsearch: %s "
             "Status code: %s details: %s",
@@ -110,7 +106,7 @@ def does_index_exist(
             e.info,
         )
         raise KnowledgeBaseError
-    except ElasticsearchException:
+    except elasticsearch.ElasticsearchException:
         raise KnowledgeBaseError
 
 
@@ -137,12 +133,12 @@ def get_field_names(
         else:
             all_field_info = res[scoped_index_name]["mappings"][DOC_TYPE]["properties"]
         return all_field_info.keys()
-    except EsConnectionError as e:
+    except elasticsearch.ConnectionError as e:
         logger.debug(
             "Unable to connect to Elasticsearch: %s details: %s", e.error, e.info
         )
         raise KnowledgeBaseConnectionError(es_host=es_client.transport.hosts)
-    except TransportError as e:
+    except elasticsearch.TransportError as e:
         logger.error(
             "Unexpected error occurred when sending requests to Elasticsearch: %s "
             "Status code: %s details: %s",
@@ -151,7 +147,7 @@ def get_field_names(
             e.info,
         )
         raise KnowledgeBaseError
-    except ElasticsearchException:
+    except elasticsearch.ElasticsearchException:
         raise KnowledgeBaseError
 
 
@@ -186,12 +182,12 @@ def create_index(
             es_client.indices.create(scoped_index_name, body=mapping)
         else:
             logger.error("Index %r already exists.", index_name)
-    except EsConnectionError as e:
+    except elasticsearch.ConnectionError as e:
         logger.debug(
             "Unable to connect to Elasticsearch: %s details: %s", e.error, e.info
         )
         raise KnowledgeBaseConnectionError(es_host=es_client.transport.hosts)
-    except TransportError as e:
+    except elasticsearch.TransportError as e:
         logger.error(
             "Unexpected error occurred when sending requests to Elasticsearch: %s "
             "Status code: %s details: %s",
@@ -204,7 +200,7 @@ def create_index(
             "Elasticsearch: {} Status code: {} details: "
             "{}".format(e.error, e.status_code, e.info)
         )
-    except ElasticsearchException:
+    except elasticsearch.ElasticsearchException:
         raise KnowledgeBaseError
 
 
@@ -236,12 +232,12 @@ def delete_index(
                     index_name, app_namespace
                 )
             )
-    except EsConnectionError as e:
+    except elasticsearch.ConnectionError as e:
         logger.debug(
             "Unable to connect to Elasticsearch: %s details: %s", e.error, e.info
         )
         raise KnowledgeBaseConnectionError(es_host=es_client.transport.hosts)
-    except TransportError as e:
+    except elasticsearch.TransportError as e:
         logger.error(
             "Unexpected error occurred when sending requests to Elasticsearch: %s "
             "Status code: %s details: %s",
@@ -250,7 +246,7 @@ def delete_index(
             e.info,
         )
         raise KnowledgeBaseError
-    except ElasticsearchException:
+    except elasticsearch.ElasticsearchException:
         raise KnowledgeBaseError
 
 
@@ -276,7 +272,7 @@ def version_compatible_streaming_bulk(
 ):
 
     if is_es_version_7(es_client):
-        return streaming_bulk(
+        return es_helpers.streaming_bulk(
             es_client,
             docs,
             index=index,
@@ -284,7 +280,7 @@ def version_compatible_streaming_bulk(
             raise_on_error=raise_on_error,
         )
     else:
-        return streaming_bulk(
+        return es_helpers.streaming_bulk(
             es_client,
             docs,
             index=index,
@@ -304,6 +300,7 @@ def load_index(
     es_host=None,
     es_client=None,
     connect_timeout=2,
+    on_loaded=None,
 ):
     """Loads documents from data into the specified index. If an index with the specified name
     doesn't exist, a new index with that name will be created.
@@ -320,6 +317,8 @@ def load_index(
         es_client (Elasticsearch): The Elasticsearch client
         connect_timeout (int, optional): The amount of time for a connection to the
             Elasticsearch host
+        on_loaded (function, optional): A function which is called after each document is sent
+            to the index, in the order of the documents
     """
     scoped_index_name = get_scoped_index_name(app_namespace, index_name)
     es_client = es_client or create_es_client(es_host)
@@ -362,18 +361,20 @@ def load_index(
             else:
                 count += 1
             pbar.update(1)
+            if on_loaded:
+                on_loaded()
 
         # close the progress bar and flush all output
         pbar.close()
         # Refresh to make sure all data stored is available for search.
         es_client.indices.refresh(index=scoped_index_name)
         logger.info("Loaded %s document%s", count, "" if count == 1 else "s")
-    except EsConnectionError as e:
+    except elasticsearch.ConnectionError as e:
         logger.debug(
             "Unable to connect to Elasticsearch: %s details: %s", e.error, e.info
         )
         raise KnowledgeBaseConnectionError(es_host=es_client.transport.hosts)
-    except TransportError as e:
+    except elasticsearch.TransportError as e:
         logger.error(
             "Unexpected error occurred when sending requests to Elasticsearch: %s "
             "Status code: %s details: %s",
@@ -382,5 +383,5 @@ def load_index(
             e.info,
         )
         raise KnowledgeBaseError
-    except ElasticsearchException:
+    except elasticsearch.ElasticsearchException:
         raise KnowledgeBaseError
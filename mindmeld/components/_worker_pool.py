@@ -0,0 +1,366 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2015 Cisco Systems, Inc. and others.  All rights reserved.
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#     http://www.apache.org/licenses/LICENSE-2.0
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+This module contains the worker pools used to process lists of items in parallel in the natural
+language processor.
+"""
+import logging
+import os
+import threading
+import weakref
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import cpu_count
+
+logger = logging.getLogger(__name__)
+
+PROCESS_MODE = "process"
+THREAD_MODE = "thread"
+
+DEFAULT_TIMEOUT = 0.5
+DEFAULT_HEALTH_CHECK_TIMEOUT = 5.0
+
+# The process pools by id, which forked workers use to look up the version of their models
+_process_pools = weakref.WeakValueDictionary()
+
+
+class StaleWorkerError(Exception):
+    """An exception raised in a worker process which does not have the current version of the
+    models."""
+
+
+class WorkerPool:
+    """A pool of workers which processes lists of items in parallel, and tells the caller to fall
+    back to processing them in series when the pool can not process them in time.
+
+    In process mode, the workers are forked from the current process, so they are preloaded with
+    the models that are in memory when the pool is started. The pool keeps a model version which
+    is handed off to it whenever the models are built or loaded. Workers forked with an older
+    version are retired instead of running tasks against stale models. In thread mode, the
+    workers share the models of the current process, which suits I/O bound stages.
+
+    The workers are health checked in the background when they are started and after they fail
+    to process a list in time, and lists are processed in series until the check passes.
+
+    Attributes:
+        mode (str): The type of workers, either ``'process'`` or ``'thread'``
+        num_workers (int): The number of workers. The pool is disabled when it is ``0``
+        timeout (float): The number of seconds to wait for the results of a list of items
+        health_check_timeout (float): The number of seconds to wait for the workers to respond
+            to a health check, which includes starting them
+    """
+
+    def __init__(
+        self,
+        mode=PROCESS_MODE,
+        num_workers=0,
+        timeout=DEFAULT_TIMEOUT,
+        health_check_timeout=DEFAULT_HEALTH_CHECK_TIMEOUT,
+    ):
+        if mode not in (PROCESS_MODE, THREAD_MODE):
+            raise ValueError("Invalid worker pool mode {!r}".format(mode))
+        self.mode = mode
+        self.num_workers = num_workers
+        self.timeout = timeout
+        self.health_check_timeout = health_check_timeout
+        self._version = 0
+        self._executor = None
+        self._pid = None
+        self._needs_health_check = False
+        self._health_check_thread = None
+        self._lock = threading.RLock()
+        self._metrics = Counter()
+        if mode == PROCESS_MODE:
+            _process_pools[id(self)] = self
+
+    @property
+    def enabled(self):
+        """Whether the pool has any workers (bool)."""
+        return self.num_workers > 0
+
+    @property
+    def version(self):
+        """The version of the models the workers must have (int)."""
+        return self._version
+
+    @property
+    def metrics(self):
+        """The counts of the pool events, such as the lists which fell back to being processed in
+        series and the reasons why (dict)."""
+        with self._lock:
+            return dict(self._metrics)
+
+    def start(self, wait=False):
+        """Starts new workers, replacing the current ones. The workers are health checked, which
+        forks and warms up process workers, and lists of items are processed in series until
+        the check passes.
+
+        Args:
+            wait (bool, optional): Whether to wait for the health check rather than running it
+                in the background
+        """
+        with self._lock:
+            self._shutdown_executor()
+            if not self.enabled:
+                return
+            if self.mode == PROCESS_MODE:
+                self._executor = ProcessPoolExecutor(max_workers=self.num_workers)
+            else:
+                self._executor = ThreadPoolExecutor(max_workers=self.num_workers)
+            self._pid = os.getpid()
+            self._metrics["starts"] += 1
+            self._needs_health_check = True
+            if not wait:
+                self._check_health_in_background()
+        if wait:
+            self.check_health()
+
+    def handoff(self, preload=False):
+        """Hands off a new version of the models to the pool, after they have been built or
+        loaded. The process workers forked with the previous models are retired.
+
+        Args:
+            preload (bool, optional): Whether to start workers with the new models right away,
+                rather than when the next list of items is processed
+        """
+        with self._lock:
+            self._version += 1
+            self._metrics["handoffs"] += 1
+            if self.mode == PROCESS_MODE:
+                self._shutdown_executor()
+        if preload and self.enabled:
+            self.start(wait=True)
+
+    def check_health(self, timeout=None):
+        """Checks that the workers respond and have the current version of the models.
+
+        Args:
+            timeout (float, optional): The number of seconds to wait for the workers. Defaults
+                to the pool's ``health_check_timeout``
+
+        Returns:
+            bool: Whether the workers are healthy
+        """
+        with self._lock:
+            executor = self._executor
+            self._metrics["health_checks"] += 1
+        healthy = False
+        if executor is not None:
+            try:
+                futures = [
+                    self._submit(executor, os.getpid) for _ in range(self.num_workers)
+                ]
+                _, not_done = wait(futures, timeout=timeout or self.health_check_timeout)
+                healthy = not not_done and all(
+                    future.exception() is None for future in futures
+                )
+            except (BrokenProcessPool, RuntimeError):
+                pass
+        with self._lock:
+            # the workers may have been replaced while they were checked
+            if self._executor is executor:
+                self._needs_health_check = not healthy
+            if not healthy:
+                self._metrics["failed_health_checks"] += 1
+        return healthy
+
+    def map(self, func, items, *args, **kwargs):
+        """Calls a function on each item of a list with the workers.
+
+        Args:
+            func (callable): The function, called as ``func(item, *args, **kwargs)``. In process
+                mode, it must be picklable.
+            items (list): The items to process
+
+        Returns:
+            (tuple): The result for each item, or ``None`` if the items should be processed in \
+                series instead
+        """
+        items = list(items)
+        if not self.enabled or len(items) < 2:
+            return None
+
+        executor = self._get_executor()
+        if executor is None:
+            self._fall_back("unhealthy")
+            return None
+
+        futures = []
+        try:
+            for item in items:
+                futures.append(self._submit(executor, func, item, *args, **kwargs))
+        except (BrokenProcessPool, RuntimeError):
+            self._retire(executor)
+            self._fall_back("broken")
+            return None
+
+        _, not_done = wait(futures, timeout=self.timeout)
+        if not_done and self.mode == THREAD_MODE:
+            self._fall_back("timeout")
+            return self._finish_in_series(futures, func, items, *args, **kwargs)
+        if not_done:
+            for future in not_done:
+                future.cancel()
+            # The workers may only be busy, so rather than restarting them, they are checked
+            # before the next list of items is processed
+            with self._lock:
+                self._needs_health_check = True
+            self._fall_back("timeout")
+            return None
+
+        try:
+            results = tuple(future.result() for future in futures)
+        except StaleWorkerError:
+            self._retire(executor)
+            self._fall_back("stale")
+            return None
+        except BrokenProcessPool:
+            self._retire(executor)
+            self._fall_back("broken")
+            return None
+        except Exception:  # pylint: disable=broad-except
+            logger.debug("Worker failed to process an item", exc_info=True)
+            self._fall_back("error")
+            return None
+
+        with self._lock:
+            self._metrics["parallel"] += 1
+        return results
+
+    def shutdown(self):
+        """Shuts down the workers. They are started again when the next list of items is
+        processed."""
+        with self._lock:
+            self._shutdown_executor()
+
+    def _submit(self, executor, func, *args, **kwargs):
+        if self.mode == PROCESS_MODE:
+            return executor.submit(_run_task, id(self), self._version, func, *args, **kwargs)
+        return executor.submit(func, *args, **kwargs)
+
+    def _finish_in_series(self, futures, func, items, *args, **kwargs):
+        """Finishes a list of items which the thread workers did not process in time. Running
+        threads can not be stopped, and processing their items again would race with them on
+        shared objects, so their results are awaited and only the items which have not been
+        started are processed in the calling thread.
+
+        Returns:
+            (tuple): The result for each item, or ``None`` if the items should be processed in \
+                series instead
+        """
+        started = [not future.cancel() for future in futures]
+        try:
+            return tuple(
+                future.result() if is_started else func(item, *args, **kwargs)
+                for item, future, is_started in zip(items, futures, started)
+            )
+        except Exception:  # pylint: disable=broad-except
+            logger.debug("Worker failed to process an item", exc_info=True)
+            # the items are only processed again once no thread is working on them
+            wait(futures)
+            self._fall_back("error")
+            return None
+
+    def _get_executor(self):
+        with self._lock:
+            if self._executor is not None and self._pid != os.getpid():
+                # This is a copy of the pool in a forked process. Process workers are not nested,
+                # but thread workers have to be started again as threads do not survive forks.
+                if self.mode == PROCESS_MODE:
+                    return None
+                self._executor = None
+            if self._executor is None:
+                self.start()
+            elif self._needs_health_check:
+                self._check_health_in_background()
+            return self._executor if not self._needs_health_check else None
+
+    def _check_health_in_background(self):
+        """Health checks the workers in a background thread, unless a check is already running,
+        so that lists of items are processed in series rather than waiting for the workers."""
+        with self._lock:
+            if self._health_check_thread is not None and self._health_check_thread.is_alive():
+                return
+            self._health_check_thread = threading.Thread(
+                target=self._recover, name="mindmeld-worker-pool-health-check", daemon=True
+            )
+            self._health_check_thread.start()
+
+    def _recover(self):
+        """Health checks the workers, and restarts them if they do not respond."""
+        with self._lock:
+            executor = self._executor
+        if executor is None or self.check_health():
+            return
+        with self._lock:
+            if self._executor is not executor:
+                return
+            logger.warning("Restarting the %s worker pool as it is not responding", self.mode)
+            self._metrics["restarts"] += 1
+        self.start(wait=True)
+
+    def _retire(self, executor):
+        with self._lock:
+            if self._executor is executor:
+                self._shutdown_executor()
+                self._metrics["restarts"] += 1
+
+    def _fall_back(self, reason):
+        with self._lock:
+            self._metrics["fallbacks"] += 1
+            self._metrics["fallbacks_" + reason] += 1
+        logger.debug("Processing items in series after a %s %s fallback", self.mode, reason)
+
+    def _shutdown_executor(self):
+        if self._executor is not None and self._pid == os.getpid():
+            self._executor.shutdown(wait=False)
+        self._executor = None
+        self._pid = None
+        self._needs_health_check = False
+
+
+def _run_task(pool_id, version, func, *args, **kwargs):
+    """Runs a task in a process worker, if the worker has the version of the models the task was
+    submitted for."""
+    pool = _process_pools.get(pool_id)
+    if pool is None or pool.version != version:
+        raise StaleWorkerError("The worker does not have version {} of the models".format(version))
+    return func(*args, **kwargs)
+
+
+WORKER_POOLS = {
+    PROCESS_MODE: WorkerPool(
+        PROCESS_MODE,
+        num_workers=int(os.environ.get("MM_SUBPROCESS_COUNT", cpu_count() + 1)),
+        timeout=float(os.environ.get("MM_SUBPROCESS_TIMEOUT", DEFAULT_TIMEOUT)),
+    ),
+    THREAD_MODE: WorkerPool(
+        THREAD_MODE,
+        num_workers=int(os.environ.get("MM_THREAD_COUNT", 0)),
+        timeout=float(os.environ.get("MM_THREAD_TIMEOUT", DEFAULT_TIMEOUT)),
+    ),
+}
+
+
+def get_worker_pool(mode=PROCESS_MODE):
+    """Gets the shared worker pool of the given mode.
+
+    Args:
+        mode (str, optional): Either ``'process'`` or ``'thread'``
+
+    Returns:
+        WorkerPool: The worker pool
+    """
+    return WORKER_POOLS[mode]
@@ -304,6 +304,49 @@ class Classifier(ABC):
         class_proba_tuples = list(predict_proba_result[0][1].items())
         return sorted(class_proba_tuples, key=lambda x: x[1], reverse=True)
 
+    def predict_batch(self, queries, dynamic_resource=None):
+        """Predicts class labels for a batch of queries with a single call to the trained
+        classification model
+
+        Args:
+            queries (list of Query): The input queries
+            dynamic_resource (dict, optional): A dynamic resource to aid NLP inference
+
+        Returns:
+            list: The predicted class label of each query
+        """
+        if not self._model:
+            logger.error("You must fit or load the model before running predict")
+            return [None for _ in queries]
+        if not queries:
+            return []
+        return list(self._model.predict(list(queries), dynamic_resource=dynamic_resource))
+
+    def predict_proba_batch(self, queries, dynamic_resource=None):
+        """Runs prediction on a batch of queries with a single call to the trained classification
+        model and generates multiple hypotheses with their associated probabilities for each query
+
+        Args:
+            queries (list of Query): The input queries
+            dynamic_resource (dict, optional):  A dynamic resource to aid NLP inference
+
+        Returns:
+            list: A list of tuples of the form (str, float) grouping predicted class labels and \
+                their probabilities for each query
+        """
+        if not self._model:
+            logger.error("You must fit or load the model before running predict_proba")
+            return [[] for _ in queries]
+        if not queries:
+            return []
+        predict_proba_result = self._model.predict_proba(
+            list(queries), dynamic_resource=dynamic_resource
+        )
+        return [
+            sorted(class_proba.items(), key=lambda x: x[1], reverse=True)
+            for _, class_proba in predict_proba_result
+        ]
+
     def evaluate(self, queries=None, label_set=None):
         """Evaluates the trained classification model on the given test data
 
@@ -561,9 +604,31 @@ class Classifier(ABC):
         """
 
         # Hash queries
-        queries_hash = self._get_queries_and_labels_hash(
-            queries=queries, label_set=label_set
-        )
+        if queries:
+            queries_hash = self._get_queries_and_labels_hash(
+                queries=queries, label_set=label_set
+            )
+        else:
+            # The labeled queries are only loaded and hashed when their files have changed
+            domain = getattr(self, "domain", None)
+            intent = getattr(self, "intent", None)
+            files_hash = self._resource_loader.get_labeled_queries_fingerprint(
+                domain=domain, intent=intent, label_set=label_set
+            )
+            key = self._resource_loader.hash_list(
+                [
+                    self.CLF_TYPE,
+                    domain or "",
+                    intent or "",
+                    getattr(self, "entity_type", None) or "",
+                    label_set or "",
+                    files_hash,
+                ]
+            )
+            queries_hash = self._resource_loader.hash_cached(
+                key,
+                lambda: self._get_queries_and_labels_hash(label_set=label_set),
+            )
 
         # Hash config
         config_hash = self._resource_loader.hash_string(model_config.to_json())
@@ -1,8 +1,15 @@
+import asyncio
 import logging
-
+import os
 import ssl
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
 import aiohttp
 import requests
+from requests.adapters import HTTPAdapter
 
 from .dialogue import DialogueResponder
 from .request import Params
@@ -13,11 +20,258 @@ logger = logging.getLogger(__name__)
 
 RESPONSE_FIELDS = ["frame", "directives", "params", "slots"]
 
+# The number of connections which are kept open to each custom action server
+DEFAULT_POOL_SIZE = int(os.environ.get("MM_CUSTOM_ACTION_POOL_SIZE", 10))
+
+# The errors raised when a custom action server can not be reached
+CONNECTION_ERRORS = (
+    ConnectionError,
+    requests.exceptions.RequestException,
+    aiohttp.ClientError,
+    asyncio.TimeoutError,
+)
+
 
 class CustomActionException(Exception):
     pass
 
 
+def get_ssl_context(cert=None, public_key=None, private_key=None):
+    """Gets the SSL context for a custom action configuration. Contexts are cached, so the
+    certificates are only loaded once, until one of the files is modified.
+
+    Args:
+        cert (str, optional): The path of the CA certificate of the custom action server
+        public_key (str, optional): The path of the client certificate
+        private_key (str, optional): The path of the client private key
+
+    Returns:
+        (ssl.SSLContext): The SSL context, or None to use the default one
+    """
+    if not (cert or (public_key and private_key)):
+        return None
+    paths = (cert, public_key, private_key)
+    return _create_ssl_context(paths, tuple(_get_mtime(path) for path in paths))
+
+
+@lru_cache(maxsize=32)
+def _create_ssl_context(paths, mtimes):
+    del mtimes  # only used to create the context again when the files change
+    cert, public_key, private_key = paths
+    ssl_context = ssl.create_default_context(cafile=cert)
+    if public_key and private_key:
+        ssl_context.load_cert_chain(public_key, private_key)
+    return ssl_context
+
+
+def _get_mtime(path):
+    try:
+        return os.stat(path).st_mtime_ns if path else None
+    except OSError:
+        return None
+
+
+class CustomActionClientPool:
+    """The persistent HTTP clients which are shared by custom actions, so that connections to
+    custom action servers are kept alive between invocations instead of being opened for every
+    call. Synchronous requests use a requests session for each thread and asynchronous requests
+    an aiohttp session for each event loop, and at most ``pool_size`` connections are kept open
+    to each server. Actions configured with ``"http2": True`` use httpx clients instead.
+    """
+
+    def __init__(self, pool_size=None):
+        """Initializes the pool.
+
+        Args:
+            pool_size (int, optional): The number of connections per custom action server
+        """
+        self.pool_size = pool_size or DEFAULT_POOL_SIZE
+        self._local = threading.local()
+        self._async_clients = weakref.WeakKeyDictionary()
+        self._executor = None
+        self._lock = threading.Lock()
+
+    @property
+    def executor(self):
+        """The executor which runs synchronous custom actions in parallel
+        (ThreadPoolExecutor)."""
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.pool_size,
+                    thread_name_prefix="mindmeld-custom-action",
+                )
+        return self._executor
+
+    def post(
+        self, url, json_data, cert=None, public_key=None, private_key=None, http2=False
+    ):
+        """Posts a request to a custom action server.
+
+        Args:
+            url (str): The URL of the custom action
+            json_data (dict): The body of the request
+            cert (str, optional): The path of the CA certificate of the custom action server, \
+                only used for HTTP/2
+            public_key (str, optional): The path of the client certificate
+            private_key (str, optional): The path of the client private key
+            http2 (bool, optional): Whether to use HTTP/2
+
+        Returns:
+            (tuple): The status code and the JSON body of the response
+        """
+        if http2:
+            ssl_context = get_ssl_context(cert, public_key, private_key)
+            key = ("httpx", cert, public_key, private_key, ssl_context)
+            client = self._get_client(key)
+            if client is None:
+                httpx = _import_httpx()
+                for stale_client in _pop_stale_clients(getattr(self._local, "clients", {}), key):
+                    stale_client.close()
+                client = self._set_client(
+                    key,
+                    httpx.Client(
+                        http2=True,
+                        verify=ssl_context or True,
+                        limits=self._get_httpx_limits(httpx),
+                    ),
+                )
+            try:
+                result = client.post(url, json=json_data)
+            except _get_httpx_transport_error() as exc:
+                raise ConnectionError(str(exc)) from exc
+        else:
+            session = self._get_client(("requests",))
+            if session is None:
+                session = self._set_client(("requests",), self._create_session())
+            if public_key and private_key:
+                result = session.post(
+                    url=url, json=json_data, cert=(public_key, private_key)
+                )
+            elif public_key:
+                result = session.post(url=url, json=json_data, cert=public_key)
+            else:
+                result = session.post(url=url, json=json_data)
+        if result.status_code == 200:
+            return 200, result.json()
+        return result.status_code, {}
+
+    async def post_async(
+        self, url, json_data, cert=None, public_key=None, private_key=None, http2=False
+    ):
+        """Posts a request to a custom action server asynchronously.
+
+        Args:
+            url (str): The URL of the custom action
+            json_data (dict): The body of the request
+            cert (str, optional): The path of the CA certificate of the custom action server
+            public_key (str, optional): The path of the client certificate
+            private_key (str, optional): The path of the client private key
+            http2 (bool, optional): Whether to use HTTP/2
+
+        Returns:
+            (tuple): The status code and the JSON body of the response
+        """
+        ssl_context = get_ssl_context(cert, public_key, private_key)
+        clients = self._async_clients.setdefault(asyncio.get_event_loop(), {})
+        if http2:
+            key = ("httpx", cert, public_key, private_key, ssl_context)
+            client = clients.get(key)
+            if client is None:
+                httpx = _import_httpx()
+                for stale_client in _pop_stale_clients(clients, key):
+                    await stale_client.aclose()
+                client = clients[key] = httpx.AsyncClient(
+                    http2=True,
+                    verify=ssl_context or True,
+                    limits=self._get_httpx_limits(httpx),
+                )
+            try:
+                result = await client.post(url, json=json_data)
+            except _get_httpx_transport_error() as exc:
+                raise ConnectionError(str(exc)) from exc
+            if result.status_code == 200:
+                return 200, result.json()
+            return result.status_code, {}
+
+        session = clients.get(("aiohttp",))
+        if session is None:
+            session = clients[("aiohttp",)] = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit_per_host=self.pool_size)
+            )
+        async with session.post(url, json=json_data, ssl=ssl_context) as response:
+            if response.status == 200:
+                return 200, await response.json()
+            return response.status, {}
+
+    def close(self):
+        """Closes the synchronous clients of the current thread."""
+        clients = getattr(self._local, "clients", {})
+        self._local.clients = {}
+        for client in clients.values():
+            client.close()
+
+    async def close_async(self):
+        """Closes the asynchronous clients of the current event loop."""
+        clients = self._async_clients.pop(asyncio.get_event_loop(), {})
+        for key, client in clients.items():
+            if key[0] == "aiohttp":
+                await client.close()
+            else:
+                await client.aclose()
+
+    def _get_client(self, key):
+        return getattr(self._local, "clients", {}).get(key)
+
+    def _set_client(self, key, client):
+        if not hasattr(self._local, "clients"):
+            self._local.clients = {}
+        self._local.clients[key] = client
+        return client
+
+    def _create_session(self):
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_maxsize=self.pool_size)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+
+    def _get_httpx_limits(self, httpx):
+        return httpx.Limits(
+            max_connections=None, max_keepalive_connections=self.pool_size
+        )
+
+
+def _pop_stale_clients(clients, key):
+    """Removes the HTTP/2 clients of a custom action configuration which were created with the
+    SSL context of certificate files that have since been modified."""
+    stale_keys = [
+        other for other in clients if other[:-1] == key[:-1] and other[-1] is not key[-1]
+    ]
+    return [clients.pop(other) for other in stale_keys]
+
+
+def _get_httpx_transport_error():
+    """Returns the base class of the httpx errors raised when a custom action server can not be
+    reached."""
+    return _import_httpx().TransportError
+
+
+def _import_httpx():
+    try:
+        import httpx  # pylint: disable=import-outside-toplevel
+    except ImportError:
+        raise CustomActionException(
+            "httpx is required to invoke custom actions over HTTP/2. "
+            "Install it with 'pip install httpx[http2]'."
+        )
+    return httpx
+
+
+default_client_pool = CustomActionClientPool()
+"""The client pool which is used by custom actions by default."""
+
+
 class CustomAction:
     """
     This class allows the client to send Request and Responder to another server and return the
@@ -31,7 +285,9 @@ class CustomAction:
         self._cert = self._config.get("cert")
         self._public_key = self._config.get("public_key")
         self._private_key = self._config.get("private_key")
+        self.http2 = self._config.get("http2", False)
         self.merge = merge
+        self.client_pool = default_client_pool
 
     def get_json_payload(self, request, responder):
         request_json = request.to_dict()
@@ -55,24 +311,14 @@ class CustomAction:
         Returns:
             (bool)
         """
-        if not self.url:
-            raise CustomActionException(
-                "No URL is given for custom action {}.".format(self._name)
-            )
-
+        self._check_url()
         json_data = self.get_json_payload(request, responder)
 
-        try:
-            if async_mode:
-                # returning the coroutine to be awaited elsewhere
-                return self._process_async(json_data, responder)
-            else:
-                return self._process(json_data, responder)
-        except ConnectionError:
-            logger.error(
-                "Connection error trying to reach custom action server %s.", self.url
-            )
-            return False
+        if async_mode:
+            # returning the coroutine to be awaited elsewhere
+            return self._process_async(json_data, responder)
+        else:
+            return self._process(json_data, responder)
 
     async def invoke_async(self, request, responder):
         """Asynchronously invoke the custom action with Request and Responder and return True if
@@ -88,14 +334,33 @@ class CustomAction:
         """
         return await self.invoke(request, responder, async_mode=True)
 
+    def _check_url(self):
+        if not self.url:
+            raise CustomActionException(
+                "No URL is given for custom action {}.".format(self._name)
+            )
+
     def _process(self, json_data, responder):
-        status_code, result_json = self.post(json_data)
+        try:
+            status_code, result_json = self.post(json_data)
+        except CONNECTION_ERRORS:
+            self._log_connection_error()
+            return False
         return self._process_post_response(status_code, result_json, responder)
 
     async def _process_async(self, json_data, responder):
-        status_code, result_json = await self.post_async(json_data)
+        try:
+            status_code, result_json = await self.post_async(json_data)
+        except CONNECTION_ERRORS:
+            self._log_connection_error()
+            return False
         return self._process_post_response(status_code, result_json, responder)
 
+    def _log_connection_error(self):
+        logger.error(
+            "Connection error trying to reach custom action server %s.", self.url
+        )
+
     def _process_post_response(self, status_code, result_json, responder):
         if status_code == 200:
             for field in RESPONSE_FIELDS:
@@ -132,35 +397,24 @@ class CustomAction:
             return False
 
     def post(self, json_data):
-        if self._public_key and self._private_key:
-            result = requests.post(
-                url=self.url, json=json_data, cert=(self._public_key, self._private_key)
-            )
-        elif self._public_key:
-            result = requests.post(url=self.url, json=json_data, cert=self._public_key)
-        else:
-            result = requests.post(url=self.url, json=json_data)
-        if result.status_code == 200:
-            return 200, result.json()
-        else:
-            return result.status_code, {}
+        return self.client_pool.post(
+            self.url,
+            json_data,
+            cert=self._cert,
+            public_key=self._public_key,
+            private_key=self._private_key,
+            http2=self.http2,
+        )
 
     async def post_async(self, json_data):
-        ssl_context = None
-        if self._cert:
-            ssl_context = ssl.create_default_context(cafile=self._cert)
-
-        if self._public_key and self._private_key:
-            ssl_context.load_cert_chain(self._public_key, self._private_key)
-
-        async with aiohttp.ClientSession() as session:
-            async with session.post(
-                self.url, json=json_data, ssl=ssl_context
-            ) as response:
-                if response.status == 200:
-                    return 200, await response.json()
-                else:
-                    return response.status, {}
+        return await self.client_pool.post_async(
+            self.url,
+            json_data,
+            cert=self._cert,
+            public_key=self._public_key,
+            private_key=self._private_key,
+            http2=self.http2,
+        )
 
     def __repr__(self):
         return self._name
@@ -171,13 +425,22 @@ class CustomAction:
 
 class CustomActionSequence:
     """
-    This class implements a sequence of custom actions
+    This class implements a sequence of custom actions. The actions of a parallel sequence are
+    independent: they are all sent the request and responder as they were before the sequence,
+    and their responses are merged into the responder in the order of the sequence.
     """
 
-    def __init__(self, actions, config, merge=True):
+    def __init__(self, actions, config, merge=True, parallel=False):
+        if parallel and not merge:
+            raise CustomActionException(
+                "Custom actions can only be invoked in parallel if their responses are merged."
+            )
         self.actions = [CustomAction(action, config, merge=merge) for action in actions]
+        self.parallel = parallel and len(self.actions) > 1
 
     def invoke(self, request, responder):
+        if self.parallel:
+            return self._invoke_parallel(request, responder)
         for action in self.actions:
             result = action.invoke(request, responder)
             if not result:
@@ -186,6 +449,8 @@ class CustomActionSequence:
         return True
 
     async def invoke_async(self, request, responder):
+        if self.parallel:
+            return await self._invoke_parallel_async(request, responder)
         for action in self.actions:
             result = await action.invoke_async(request, responder)
             if not result:
@@ -193,6 +458,56 @@ class CustomActionSequence:
                 return False
         return True
 
+    def _get_json_payloads(self, request, responder):
+        for action in self.actions:
+            action._check_url()  # pylint: disable=protected-access
+        return [action.get_json_payload(request, responder) for action in self.actions]
+
+    def _invoke_parallel(self, request, responder):
+        json_payloads = self._get_json_payloads(request, responder)
+        executor = default_client_pool.executor
+        futures = [
+            executor.submit(action.post, json_data)
+            for action, json_data in zip(self.actions, json_payloads)
+        ]
+        results = []
+        for future in futures:
+            try:
+                results.append(future.result())
+            except CONNECTION_ERRORS as exc:
+                results.append(exc)
+        return self._merge_results(results, responder)
+
+    async def _invoke_parallel_async(self, request, responder):
+        json_payloads = self._get_json_payloads(request, responder)
+        results = await asyncio.gather(
+            *(
+                action.post_async(json_data)
+                for action, json_data in zip(self.actions, json_payloads)
+            ),
+            return_exceptions=True,
+        )
+        for result in results:
+            if isinstance(result, BaseException) and not isinstance(result, CONNECTION_ERRORS):
+                raise result
+        return self._merge_results(results, responder)
+
+    def _merge_results(self, results, responder):
+        """Merges the responses of the actions in the order of the sequence, up to the first
+        action which failed or whose server could not be reached, as a sequential invocation
+        stops there."""
+        # pylint: disable=protected-access
+        for action, result in zip(self.actions, results):
+            if isinstance(result, BaseException):
+                action._log_connection_error()
+                logger.warning("Failed to invoke action %s.", action)
+                return False
+            status_code, result_json = result
+            if not action._process_post_response(status_code, result_json, responder):
+                logger.warning("Failed to invoke action %s.", action)
+                return False
+        return True
+
     def __repr__(self):
         return str(self.actions)
 
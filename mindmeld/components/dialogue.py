@@ -22,7 +22,7 @@ from functools import cmp_to_key, partial
 import immutables
 
 from .. import path
-from .request import FrozenParams, Params, Request
+from .request import FrozenParams, History, Params, Request
 from ..core import Entity
 from ..models import entity_features, query_features
 from ..models.helpers import DEFAULT_SYS_ENTITIES
@@ -71,6 +71,18 @@ class DialogueStateException(Exception):
         self.target_dialogue_state = target_dialogue_state
 
 
+def get_entity_types(request):
+    """Gets the types of the entities of a request.
+
+    Args:
+        request (Request): A request object.
+
+    Returns:
+        (frozenset): The entity types.
+    """
+    return frozenset(entity["type"] for entity in request.entities)
+
+
 class DialogueStateRule:
     """A rule that determines a dialogue state. Each rule represents a pattern that must match in
     order to invoke a particular dialogue state.
@@ -195,13 +207,7 @@ class DialogueStateRule:
 
         # check expected entity types are present
         if self.entity_types is not None:
-            # TODO cache entity types
-            entity_types = set()
-            for entity in request.entities:
-                entity_types.add(entity["type"])
-
-            if len(self.entity_types & entity_types) < len(self.entity_types):
-                return False
+            return self.entity_types <= get_entity_types(request)
 
         return True
 
@@ -265,6 +271,76 @@ class DialogueStateRule:
         return (this.complexity > that.complexity) - (this.complexity < that.complexity)
 
 
+class DialogueRuleIndex:
+    """An index of dialogue state rules which finds the dialogue state of a request without
+    applying every rule. Rules are grouped by their domain and intent, and a request can only
+    match the rules of its own domain and intent, of its domain or intent alone, or of neither.
+    The first matching rule of each of these groups is found by checking that its entity types are
+    a subset of the request's, and the earliest of them in the ordered list of rules is chosen, so
+    the result is the same as applying each rule in order.
+
+    Attributes:
+        num_rules (int): The number of rules which were indexed.
+    """
+
+    def __init__(self, rules):
+        """Initializes the index.
+
+        Args:
+            rules (list of DialogueStateRule): The rules, ordered from the most complex
+        """
+        self.num_rules = len(rules)
+        self._rules = {}
+        self._states = set()
+        for position, rule in enumerate(rules):
+            self._states.add(rule.dialogue_state)
+            if rule.targeted_only:
+                continue
+            self._rules.setdefault((rule.domain, rule.intent), []).append(
+                (position, rule.entity_types, rule.dialogue_state)
+            )
+
+    def get_state(self, request):
+        """Gets the dialogue state of the first rule which matches a request.
+
+        Args:
+            request (Request): A request object.
+
+        Returns:
+            (str): The dialogue state, or None if no rule matches.
+        """
+        entity_types = None
+        match = None
+        for key in (
+            (request.domain, request.intent),
+            (request.domain, None),
+            (None, request.intent),
+            (None, None),
+        ):
+            for position, rule_entity_types, dialogue_state in self._rules.get(key, ()):
+                if match is not None and position > match[0]:
+                    break
+                if rule_entity_types:
+                    if entity_types is None:
+                        entity_types = get_entity_types(request)
+                    if not rule_entity_types <= entity_types:
+                        continue
+                match = (position, dialogue_state)
+                break
+        return None if match is None else match[1]
+
+    def get_target_state(self, target_dialogue_state):
+        """Gets a targeted dialogue state if any rule has it.
+
+        Args:
+            target_dialogue_state (str): The target dialogue state.
+
+        Returns:
+            (str): The dialogue state, or None if no rule has it.
+        """
+        return target_dialogue_state if target_dialogue_state in self._states else None
+
+
 class DialogueManager:
     logger = mod_logger.getChild("DialogueManager")
 
@@ -276,6 +352,8 @@ class DialogueManager:
         self.rules = []
         self.responder_class = responder_class or DialogueResponder
         self.default_rule = None
+        self._rule_index = None
+        self._handler_chains = {}
 
     def handle(self, **kwargs):
         """A decorator that is used to register dialogue state rules."""
@@ -318,6 +396,7 @@ class DialogueManager:
             raise TypeError(msg.format(middleware.__name__))
 
         self.middlewares.append(middleware)
+        self._handler_chains = {}
 
     def add_dialogue_rule(self, name, handler, **kwargs):
         """Adds a dialogue state rule for the dialogue manager.
@@ -340,6 +419,7 @@ class DialogueManager:
         rule = DialogueStateRule(name, **kwargs)
         self.rules.append(rule)
         self.rules.sort(key=cmp_to_key(DialogueStateRule.compare), reverse=True)
+        self._rule_index = None
         if handler is not None:
             old_handler = self.handler_map.get(name)
             if old_handler is not None and old_handler != handler:
@@ -509,16 +589,11 @@ class DialogueManager:
         )
 
     def _get_dialogue_state(self, request, target_dialogue_state=None):
-        dialogue_state = None
-        for rule in self.rules:
-            if target_dialogue_state:
-                if target_dialogue_state == rule.dialogue_state:
-                    dialogue_state = rule.dialogue_state
-                    break
-            else:
-                if rule.apply(request):
-                    dialogue_state = rule.dialogue_state
-                    break
+        rule_index = self._get_rule_index()
+        if target_dialogue_state:
+            dialogue_state = rule_index.get_target_state(target_dialogue_state)
+        else:
+            dialogue_state = rule_index.get_state(request)
         if dialogue_state is None:
             msg = "Failed to find dialogue state for {domain}.{intent}".format(
                 domain=request.domain, intent=request.intent
@@ -527,6 +602,12 @@ class DialogueManager:
 
         return dialogue_state
 
+    def _get_rule_index(self):
+        # The rules list is public, so the index is also rebuilt if it was modified directly
+        if self._rule_index is None or self._rule_index.num_rules != len(self.rules):
+            self._rule_index = DialogueRuleIndex(self.rules)
+        return self._rule_index
+
     def _get_dialogue_handler(self, dialogue_state):
         handler = (
             self.handler_map[dialogue_state]
@@ -534,10 +615,16 @@ class DialogueManager:
             else self._default_handler
         )
 
-        for m in reversed(self.middlewares):
-            handler = partial(m, handler=handler)
+        # The middleware is composed once per handler. The handler is part of the key since
+        # handlers can be replaced in the handler map.
+        chain = self._handler_chains.get(dialogue_state)
+        if chain is None or chain[0] is not handler:
+            composed_handler = handler
+            for m in reversed(self.middlewares):
+                composed_handler = partial(m, handler=composed_handler)
+            chain = self._handler_chains[dialogue_state] = (handler, composed_handler)
 
-        return handler
+        return chain[1]
 
     def _create_responder(self):
         return self.responder_class(slots={})
@@ -687,23 +774,6 @@ class DialogueFlow(DialogueManager):
 
         return {"dialogue_state": dialogue_state, "directives": responder.directives}
 
-    def _get_dialogue_handler(self, dialogue_state):
-        handler = (
-            self.handler_map[dialogue_state]
-            if dialogue_state
-            else self._default_handler
-        )
-
-        try:
-            middlewares = self.middlewares
-        except AttributeError:
-            middlewares = getattr(self, "middleware", tuple())
-
-        for m in reversed(middlewares):
-            handler = partial(m, handler=handler)
-
-        return handler
-
 
 class AutoEntityFilling:
     """A class to implement Automatic Entity (Slot) Filling
@@ -1227,6 +1297,8 @@ class DialogueResponder:
         for attribute, value in vars(instance).items():
             if isinstance(value, (Params, Request, FrozenParams)):
                 serialized_obj[attribute] = DialogueResponder.to_json(value)
+            elif isinstance(value, History):
+                serialized_obj[attribute] = value.to_json()
             elif isinstance(value, tuple) and all(
                 isinstance(item, immutables.Map) for item in value
             ):
@@ -231,6 +231,24 @@ class EntityRecognizer(Classifier):
         )
         return tuple(sorted(prediction, key=lambda e: e.span.start))
 
+    def predict_batch(self, queries, dynamic_resource=None):
+        """Predicts entities for a batch of queries with a single call to the trained recognition
+        model.
+
+        Args:
+            queries (list of Query): The input queries.
+            dynamic_resource (dict, optional): A dynamic resource to aid NLP inference.
+
+        Returns:
+            (list of tuple): The predicted entities of each query.
+        """
+        return [
+            tuple(sorted(prediction or (), key=lambda e: e.span.start))
+            for prediction in super().predict_batch(
+                queries, dynamic_resource=dynamic_resource
+            )
+        ]
+
     def predict_proba(
         self, query, time_zone=None, timestamp=None, dynamic_resource=None
     ):
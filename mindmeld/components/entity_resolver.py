@@ -19,9 +19,7 @@ import hashlib
 import logging
 import os
 
-from elasticsearch.exceptions import ConnectionError as EsConnectionError
-from elasticsearch.exceptions import ElasticsearchException, TransportError
-
+from .._lazy import lazy_import
 from ..core import Entity
 from ..exceptions import EntityResolverConnectionError, EntityResolverError
 from ._config import (
@@ -45,6 +43,9 @@ from ._elasticsearch_helpers import (
 
 logger = logging.getLogger(__name__)
 
+# elasticsearch is imported when it is first used
+elasticsearch = lazy_import("elasticsearch")
+
 
 class EntityResolver:
     """An entity resolver is used to resolve entities in a given query to their canonical values
@@ -483,12 +484,12 @@ class EntityResolver:
         try:
             index = get_scoped_index_name(self._app_namespace, self._es_index_name)
             response = self._es_client.search(index=index, body=text_relevance_query)
-        except EsConnectionError as ex:
+        except elasticsearch.ConnectionError as ex:
             logger.error(
                 "Unable to connect to Elasticsearch: %s details: %s", ex.error, ex.info
             )
             raise EntityResolverConnectionError(es_host=self._es_client.transport.hosts)
-        except TransportError as ex:
+        except elasticsearch.TransportError as ex:
             logger.error(
                 "Unexpected error occurred when sending requests to Elasticsearch: %s "
                 "Status code: %s details: %s",
@@ -501,7 +502,7 @@ class EntityResolver:
                 "Elasticsearch: {} Status code: {} details: "
                 "{}".format(ex.error, ex.status_code, ex.info)
             )
-        except ElasticsearchException:
+        except elasticsearch.ElasticsearchException:
             raise EntityResolverError
         else:
             hits = response["hits"]["hits"]
@@ -575,12 +576,12 @@ class EntityResolver:
             else:
                 self.fit()
 
-        except EsConnectionError as e:
+        except elasticsearch.ConnectionError as e:
             logger.error(
                 "Unable to connect to Elasticsearch: %s details: %s", e.error, e.info
             )
             raise EntityResolverConnectionError(es_host=self._es_client.transport.hosts)
-        except TransportError as e:
+        except elasticsearch.TransportError as e:
             logger.error(
                 "Unexpected error occurred when sending requests to Elasticsearch: %s "
                 "Status code: %s details: %s",
@@ -589,5 +590,5 @@ class EntityResolver:
                 e.info,
             )
             raise EntityResolverError
-        except ElasticsearchException:
+        except elasticsearch.ElasticsearchException:
             raise EntityResolverError
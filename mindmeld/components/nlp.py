@@ -17,13 +17,17 @@ This module contains the natural language processor.
 import datetime
 import logging
 import os
+import pickle
 import sys
+import tempfile
 import time
 import warnings
 from abc import ABC, abstractmethod
-from concurrent.futures import ProcessPoolExecutor, wait
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import get_context
 from copy import deepcopy
-from multiprocessing import cpu_count
+from functools import partial
 from tqdm import tqdm
 
 from .. import path
@@ -43,6 +47,7 @@ from ._config import (
     get_nlp_config,
     get_language_config,
 )
+from ._worker_pool import PROCESS_MODE, THREAD_MODE, StaleWorkerError, get_worker_pool
 from .domain_classifier import DomainClassifier
 from .entity_recognizer import EntityRecognizer
 from .entity_resolver import EntityResolver, EntityResolverConnectionError
@@ -53,21 +58,54 @@ from .role_classifier import RoleClassifier
 # ignore sklearn DeprecationWarning, https://github.com/scikit-learn/scikit-learn/issues/10449
 warnings.filterwarnings(action="ignore", category=DeprecationWarning)
 
-SUBPROCESS_WAIT_TIME = 0.5
-default_num_workers = 0
-if sys.version_info > (3, 0):
-    default_num_workers = cpu_count() + 1
-
 logger = logging.getLogger(__name__)
-num_workers = int(os.environ.get("MM_SUBPROCESS_COUNT", default_num_workers))
-executor = ProcessPoolExecutor(max_workers=num_workers) if num_workers > 0 else None
 
+# The number of worker processes used to fit the models of the processor hierarchy. Models are
+# fit serially in the calling process when this is 0.
+DEFAULT_BUILD_WORKERS = int(os.environ.get("MM_BUILD_WORKERS", 0))
+
+
+def _group_indices(labels):
+    """Groups the indices of a list by their label.
+
+    Args:
+        labels (list): The label of each item
+
+    Returns:
+        (dict): The indices of the items with each label, in the order the labels first appear
+    """
+    groups = {}
+    for idx, label in enumerate(labels):
+        groups.setdefault(label, []).append(idx)
+    return groups
 
-def restart_subprocesses():
-    """Restarts the process pool executor"""
-    global executor  # pylint: disable=global-statement
-    executor.shutdown(wait=False)
-    executor = ProcessPoolExecutor(max_workers=num_workers)
+
+def _fit_processor(instance_id, label_set, folder):
+    """
+    A module function used to fit the models of a processor within a build worker process. The
+    worker is forked from the process that owns the processor, so the processor, its resource
+    loader and the loaded queries and gazetteers are inherited from it rather than copied.
+
+    Args:
+        instance_id (number): id(inst) of the Processor instance to fit
+        label_set (str): The label set from which to train the classifiers
+        folder (str): The folder to dump the fitted models to
+
+    Returns:
+        (tuple): The paths of the dumped models, keyed by the name of their classifier, and the \
+            file fingerprints computed by the worker
+    """
+    processor = Processor.instance_map[instance_id]
+    processor._fit(label_set=label_set)  # pylint: disable=protected-access
+
+    classifiers = processor._get_classifiers()  # pylint: disable=protected-access
+    model_paths = {}
+    for name, classifier in classifiers.items():
+        if classifier.ready:
+            model_path = os.path.join(folder, name + ".pkl")
+            classifier.dump(model_path)
+            model_paths[name] = model_path
+    return model_paths, processor.resource_loader.fingerprints.get_updates()
 
 
 def subproc_call_instance_function(instance_id, func_name, *args, **kwargs):
@@ -80,14 +118,19 @@ def subproc_call_instance_function(instance_id, func_name, *args, **kwargs):
 
     Returns:
         The result of the called function
+
+    Raises:
+        StaleWorkerError: If the child process was forked before the instance or function existed
     """
     try:
-        instance = Processor.instance_map[instance_id]
-        return getattr(instance, func_name)(*args, **kwargs)
-    except Exception:  # pylint: disable=broad-except
-        # This subprocess does not have the requested instance.  Shut down and
-        # it will be recreated by the parent process with updated instances.
-        sys.exit(1)
+        func = getattr(Processor.instance_map[instance_id], func_name)
+    except (KeyError, AttributeError):
+        raise StaleWorkerError(
+            "The worker does not have the function {!r} of processor {}".format(
+                func_name, instance_id
+            )
+        )
+    return func(*args, **kwargs)
 
 
 class Processor(ABC):
@@ -105,6 +148,9 @@ class Processor(ABC):
     instance_map = {}
     """The map of identity to instance."""
 
+    _build_creates_children = False
+    """Whether the children of the processor are created when it is built."""
+
     def __init__(self, app_path, resource_loader=None, config=None):
         """Initializes a processor
 
@@ -127,14 +173,26 @@ class Processor(ABC):
         self.config = get_nlp_config(app_path, config)
         Processor.instance_map[id(self)] = self
 
-    def build(self, incremental=False, label_set=None):
+    def build(self, incremental=False, label_set=None, num_workers=None):
         """Builds all the natural language processing models for this processor and its children.
 
         Args:
             incremental (bool, optional): When ``True``, only build models whose training data or
                 configuration has changed since the last build. Defaults to ``False``.
             label_set (string, optional): The label set from which to train all classifiers.
+            num_workers (int, optional): The number of worker processes used to fit the models of
+                the hierarchy. Defaults to the ``MM_BUILD_WORKERS`` environment variable, or 0
+                (the models are fit serially) if it is not set.
         """
+        if num_workers is None:
+            num_workers = DEFAULT_BUILD_WORKERS
+
+        if num_workers > 0:
+            self._build_parallel(
+                incremental=incremental, label_set=label_set, num_workers=num_workers
+            )
+            return
+
         self._build(incremental=incremental, label_set=label_set)
         # Dumping the model when incremental builds are turned on
         # allows for other models with identical data and configs
@@ -145,13 +203,154 @@ class Processor(ABC):
         for child in self._children.values():
             # We pass the incremental_timestamp to children processors
             child.incremental_timestamp = self.incremental_timestamp
-            child.build(incremental=incremental, label_set=label_set)
+            child.build(incremental=incremental, label_set=label_set, num_workers=0)
             if incremental:
                 child.dump()
 
         self.resource_loader.query_cache.dump()
+        self.resource_loader.fingerprints.dump()
         self.ready = True
         self.dirty = True
+        self._handoff_models()
+
+    def _build_parallel(self, incremental, label_set, num_workers):
+        """Builds the models of this processor and its children with a pool of worker processes.
+
+        The hierarchy is fit in waves. Each wave fits the models of every processor which has not
+        been fit yet in a single process pool, and the next wave fits the processors which were
+        created by the previous one (e.g. the entity processors of an intent). The workers dump
+        their models to a temporary folder, and the models and their hashes are loaded back into
+        this process.
+
+        Args:
+            incremental (bool): When ``True``, only build models whose training data or
+                configuration has changed since the last build.
+            label_set (string): The label set from which to train all classifiers.
+            num_workers (int): The number of worker processes to use
+        """
+        self._start_build(incremental=incremental)
+
+        # Load the training data and fingerprint its files before the workers are forked, so
+        # that they share them
+        self.resource_loader.get_labeled_queries(label_set=label_set)
+        self.resource_loader.get_labeled_queries_fingerprint(label_set=label_set)
+        self.resource_loader.get_gazetteers()
+        self.resource_loader.get_gazetteers_hash()
+
+        fit_ids = set()
+        processors = list(self._get_unfit_processors(fit_ids))
+        while processors:
+            for processor in processors:
+                processor.incremental_timestamp = self.incremental_timestamp
+            self._fit_processors(processors, label_set, num_workers)
+
+            for processor in processors:
+                fit_ids.add(id(processor))
+                processor._finish_build()
+                if incremental:
+                    processor._dump()
+                processor.ready = True
+                processor.dirty = True
+            processors = list(self._get_unfit_processors(fit_ids))
+
+        self.resource_loader.query_cache.dump()
+        self.resource_loader.fingerprints.dump()
+        self._handoff_models()
+
+    def _get_unfit_processors(self, fit_ids):
+        """Yields this processor and its descendants which have not been fit during a parallel
+        build. The children of a processor which creates them when it is built are skipped until
+        it has been fit.
+
+        Args:
+            fit_ids (set): The ids of the processors which have been fit
+
+        Yields:
+            Processor: The processors which can be fit
+        """
+        if id(self) not in fit_ids:
+            yield self
+            if self._build_creates_children:
+                return
+        for child in self._children.values():
+            yield from child._get_unfit_processors(fit_ids)
+
+    @staticmethod
+    def _fit_processors(processors, label_set, num_workers):
+        """Fits the models of the given processors in a pool of forked worker processes, and loads
+        the fitted models back into the processors. Processors without classifiers are fit in this
+        process. If the process pool can not be started or breaks, the models are fit serially
+        instead, but errors raised while fitting a model in a worker are raised as they are.
+
+        Args:
+            processors (list[Processor]): The processors to fit
+            label_set (string): The label set from which to train all classifiers.
+            num_workers (int): The number of worker processes to use
+        """
+        pool_processors = []
+        for processor in processors:
+            if processor._get_classifiers():
+                pool_processors.append(processor)
+            else:
+                processor._fit(label_set=label_set)
+        processors = pool_processors
+        if not processors:
+            return
+
+        with tempfile.TemporaryDirectory(prefix="mindmeld-build-") as folder:
+            results = None
+            pool = None
+            try:
+                # the executor only takes a context from Python 3.7, before which it always
+                # uses the default context, fork
+                pool_kwargs = {}
+                if sys.version_info >= (3, 7):
+                    pool_kwargs["mp_context"] = get_context("fork")
+                pool = ProcessPoolExecutor(
+                    max_workers=min(num_workers, len(processors)), **pool_kwargs
+                )
+                futures = [
+                    pool.submit(
+                        _fit_processor,
+                        id(processor),
+                        label_set,
+                        os.path.join(folder, str(idx)),
+                    )
+                    for idx, processor in enumerate(processors)
+                ]
+            except (OSError, ValueError, RuntimeError):
+                # fork is not available on this platform or the workers could not be started
+                logger.warning(
+                    "Could not build models in parallel, building them serially instead.",
+                    exc_info=True,
+                )
+                futures = None
+            try:
+                if futures is not None:
+                    results = [future.result() for future in futures]
+            except (BrokenProcessPool, pickle.PicklingError):
+                # other errors were raised by a processor in a worker and would be raised again
+                # by a serial build
+                logger.warning(
+                    "Could not build models in parallel, building them serially instead.",
+                    exc_info=True,
+                )
+            finally:
+                if pool is not None:
+                    pool.shutdown(wait=futures is not None)
+
+            if results is None:
+                for processor in processors:
+                    processor._fit(label_set=label_set)
+                return
+
+            for processor, (model_paths, fingerprints) in zip(processors, results):
+                processor.resource_loader.fingerprints.update(fingerprints)
+                classifiers = processor._get_classifiers()
+                for name, model_path in model_paths.items():
+                    classifiers[name].load(model_path)
+                    # the model has not been saved to the app's model folder
+                    classifiers[name].dirty = True
 
     @property
     def incremental_timestamp(self):
@@ -162,9 +361,33 @@ class Processor(ABC):
     def incremental_timestamp(self, ts):
         self._incremental_timestamp = ts
 
-    @abstractmethod
     def _build(self, incremental=False, label_set=None):
-        raise NotImplementedError
+        self._start_build(incremental=incremental)
+        self._fit(label_set=label_set)
+        self._finish_build()
+
+    def _start_build(self, incremental=False):
+        """Prepares this processor to be built before any of its models are fit."""
+        del incremental
+
+    def _fit(self, label_set=None):
+        """Fits the models of this processor. This may run in a build worker process, so any
+        other changes to the processor should be made in _finish_build().
+
+        Processors which only implement _build() are built by it instead. They have no
+        classifiers, so they are built in the calling process during a parallel build.
+        """
+        if type(self)._build is Processor._build:
+            raise NotImplementedError
+        self._build(label_set=label_set)
+
+    def _finish_build(self):
+        """Completes the build of this processor after its models are fit."""
+
+    def _get_classifiers(self):
+        """Returns the classifiers of this processor (dict), keyed by name. Their models are
+        fit in a build worker process and loaded back during a parallel build."""
+        return {}
 
     def dump(self):
         """Saves all the natural language processing models for this processor and its children to
@@ -175,6 +398,7 @@ class Processor(ABC):
             child.dump()
 
         self.resource_loader.query_cache.dump()
+        self.resource_loader.fingerprints.dump()
         self.dirty = False
 
     @abstractmethod
@@ -195,6 +419,7 @@ class Processor(ABC):
 
         self.ready = True
         self.dirty = False
+        self._handoff_models()
 
     @abstractmethod
     def _load(self, incremental_timestamp=None):
@@ -301,43 +526,34 @@ class Processor(ABC):
         """
         raise NotImplementedError
 
-    def _process_list(self, items, func, *args, **kwargs):
-        """Processes a list of items in parallel if possible using the executor.
+    def _process_list(self, items, func, *args, worker_mode=PROCESS_MODE, **kwargs):
+        """Processes a list of items in parallel if possible using a worker pool, or in series
+        if the pool is disabled or can not process them in time.
+
         Args:
             items (list): Items to process.
             func (str): Function name to call for processing.
+            worker_mode (str, optional): The worker pool to use, either ``'process'`` for CPU \
+                bound functions or ``'thread'`` for I/O bound functions.
 
         Returns:
             (tuple): Results of the processing.
         """
-        if executor:
-            try:
-                results = list(items)
-                future_to_idx_map = {}
-                for idx, item in enumerate(items):
-                    future = executor.submit(
-                        subproc_call_instance_function,
-                        id(self),
-                        func,
-                        item,
-                        *args,
-                        **kwargs
-                    )
-                    future_to_idx_map[future] = idx
-                tasks = wait(future_to_idx_map, timeout=SUBPROCESS_WAIT_TIME)
-                if tasks.not_done:
-                    raise Exception()
-                for future in tasks.done:
-                    item = future.result()
-                    item_idx = future_to_idx_map[future]
-                    results[item_idx] = item
-                return tuple(results)
-            except (Exception, SystemExit):  # pylint: disable=broad-except
-                # process pool is broken, restart it and process current request in series
-                restart_subprocesses()
+        if worker_mode == PROCESS_MODE:
+            pool_func = partial(subproc_call_instance_function, id(self), func)
+        else:
+            pool_func = getattr(self, func)
+        results = get_worker_pool(worker_mode).map(pool_func, items, *args, **kwargs)
+        if results is not None:
+            return results
         # process the list in series
         return tuple([getattr(self, func)(itm, *args, **kwargs) for itm in items])
 
+    def _handoff_models(self):
+        """Hands off the models which were built or loaded to the process worker pool, so that
+        workers with the previous models are not used."""
+        get_worker_pool(PROCESS_MODE).handoff()
+
     def _validate_locale(self, locale=None):
         """This function makes sure the locale is consistent with the app's language code"""
         locale = locale or self.locale
@@ -374,13 +590,15 @@ class Processor(ABC):
         if not query_text:
             query_text = ""
         if isinstance(query_text, (list, tuple)):
-            return self._process_list(
-                query_text,
-                "create_query",
-                locale=locale,
-                language=language,
-                time_zone=time_zone,
-                timestamp=timestamp,
+            # the system entity candidates of all the texts are requested as a single batch
+            return tuple(
+                self.resource_loader.query_factory.create_queries(
+                    [text or "" for text in query_text],
+                    locale=locale,
+                    language=language,
+                    time_zone=time_zone,
+                    timestamp=timestamp,
+                )
             )
         return self.resource_loader.query_factory.create_query(
             query_text,
@@ -445,6 +663,16 @@ class NaturalLanguageProcessor(Processor):
                         intent
                     ].nbest_transcripts_enabled = True
 
+    def _handoff_models(self):
+        # The n-best transcripts are processed by the process workers, so they are started with
+        # the new models right away when n-best processing is enabled.
+        nbest_enabled = any(
+            intent.nbest_transcripts_enabled
+            for domain in self.domains.values()
+            for intent in domain.intents.values()
+        )
+        get_worker_pool(PROCESS_MODE).handoff(preload=nbest_enabled)
+
     def _load_custom_features(self):
         # Load __init__.py so nlp object recognizes custom features in python console
         try:
@@ -457,7 +685,7 @@ class NaturalLanguageProcessor(Processor):
         """The domains supported by this application."""
         return self._children
 
-    def _build(self, incremental=False, label_set=None):
+    def _start_build(self, incremental=False):
 
         # reset display for the progress bar. This is important for repeated use of the
         # progress bar
@@ -471,6 +699,7 @@ class NaturalLanguageProcessor(Processor):
             )
             self.incremental_timestamp = current_ts
 
+    def _fit(self, label_set=None):
         if len(self.domains) == 1:
             return
 
@@ -478,6 +707,9 @@ class NaturalLanguageProcessor(Processor):
             label_set=label_set, incremental_timestamp=self.incremental_timestamp
         )
 
+    def _get_classifiers(self):
+        return {"domain_classifier": self.domain_classifier}
+
     def _dump(self):
         if len(self.domains) == 1:
             return
@@ -517,48 +749,56 @@ class NaturalLanguageProcessor(Processor):
     def _process_domain(
         self, query, allowed_nlp_classes=None, dynamic_resource=None, verbose=False
     ):
-        domain_proba = None
+        return self._process_domains(
+            [query], allowed_nlp_classes, dynamic_resource, verbose
+        )[0]
 
+    def _process_domains(
+        self, queries, allowed_nlp_classes=None, dynamic_resource=None, verbose=False
+    ):
+        """Predicts the domain of each query, with a single call to the domain classifier for all
+        the queries.
+
+        Returns:
+            (list of tuple): The domain and the domain probabilities, which are only returned in \
+                verbose mode, of each query
+        """
         if len(self.domains) > 1:
             if not allowed_nlp_classes:
-                if verbose:
-                    # predict_proba() returns sorted list of tuples
-                    # ie, [(<class1>, <confidence>), (<class2>, <confidence>),...]
-                    domain_proba = self.domain_classifier.predict_proba(
-                        query, dynamic_resource=dynamic_resource
+                if not verbose:
+                    domains = self.domain_classifier.predict_batch(
+                        queries, dynamic_resource=dynamic_resource
                     )
-                    # Since domain_proba is sorted by class with highest confidence,
-                    # get that as the predicted class
-                    return domain_proba[0][0], domain_proba
-                else:
-                    domain = self.domain_classifier.predict(
-                        query, dynamic_resource=dynamic_resource
+                    return [(domain, None) for domain in domains]
+                # predict_proba() returns sorted list of tuples
+                # ie, [(<class1>, <confidence>), (<class2>, <confidence>),...]
+                # Since domain_proba is sorted by class with highest confidence,
+                # get that as the predicted class
+                return [
+                    (domain_proba[0][0], domain_proba)
+                    for domain_proba in self.domain_classifier.predict_proba_batch(
+                        queries, dynamic_resource=dynamic_resource
                     )
-                    return domain, None
-            else:
-                if len(allowed_nlp_classes) == 1:
-                    domain = list(allowed_nlp_classes.keys())[0]
-                    if verbose:
-                        domain_proba = [(domain, 1.0)]
-                    return domain, domain_proba
-                else:
-                    sorted_domains = self.domain_classifier.predict_proba(
-                        query, dynamic_resource=dynamic_resource
-                    )
-                    if verbose:
-                        domain_proba = sorted_domains
+                ]
+            if len(allowed_nlp_classes) > 1:
+                results = []
+                for sorted_domains in self.domain_classifier.predict_proba_batch(
+                    queries, dynamic_resource=dynamic_resource
+                ):
+                    domain_proba = sorted_domains if verbose else None
                     for ordered_domain, _ in sorted_domains:
                         if ordered_domain in allowed_nlp_classes.keys():
-                            return ordered_domain, domain_proba
-
-                    raise AllowedNlpClassesKeyError(
-                        "Could not find user inputted domain in NLP hierarchy"
-                    )
+                            results.append((ordered_domain, domain_proba))
+                            break
+                    else:
+                        raise AllowedNlpClassesKeyError(
+                            "Could not find user inputted domain in NLP hierarchy"
+                        )
+                return results
+            domain = list(allowed_nlp_classes.keys())[0]
         else:
             domain = list(self.domains.keys())[0]
-            if verbose:
-                domain_proba = [(domain, 1.0)]
-            return domain, domain_proba
+        return [(domain, [(domain, 1.0)] if verbose else None) for _ in queries]
 
     def process_query(
         self, query, allowed_nlp_classes=None, dynamic_resource=None, verbose=False
@@ -602,6 +842,10 @@ class NaturalLanguageProcessor(Processor):
         processed_query = self.domains[domain].process_query(
             query, allowed_intents, dynamic_resource=dynamic_resource, verbose=verbose
         )
+        return self._set_domain(processed_query, domain, domain_proba)
+
+    @staticmethod
+    def _set_domain(processed_query, domain, domain_proba):
         processed_query.domain = domain
         if domain_proba:
             domain_scores = dict(domain_proba)
@@ -610,6 +854,54 @@ class NaturalLanguageProcessor(Processor):
             processed_query.confidence = scores
         return processed_query
 
+    def process_query_batch(
+        self, queries, allowed_nlp_classes=None, dynamic_resource=None, verbose=False
+    ):
+        """Processes a batch of queries using the full hierarchy of natural language processing \
+        models trained for this application. The queries are grouped by their predicted domain, \
+        and then by their predicted intent, so that each classifier and entity recognizer \
+        processes a group of queries at once.
+
+        Args:
+            queries (list of Query): The user input queries.
+            allowed_nlp_classes (dict, optional): A dictionary of the NLP hierarchy that is \
+                selected for NLP analysis. An example: ``{'smart_home': {'close_door': {}}}`` \
+                where smart_home is the domain and close_door is the intent.
+            dynamic_resource (dict, optional): A dynamic resource to aid NLP inference.
+            verbose (bool, optional): If True, returns class probabilities along with class \
+                prediction.
+
+        Returns:
+            (list of ProcessedQuery): The processed query of each input query, which is the \
+                same as the result of ``process_query``.
+        """
+        self._check_ready()
+        queries = list(queries)
+        domains_probas = self._process_domains(
+            queries,
+            allowed_nlp_classes=allowed_nlp_classes,
+            dynamic_resource=dynamic_resource,
+            verbose=verbose,
+        )
+
+        processed_queries = [None] * len(queries)
+        domain_groups = _group_indices([domain for domain, _ in domains_probas])
+        for domain, indices in domain_groups.items():
+            allowed_intents = (
+                allowed_nlp_classes.get(domain) if allowed_nlp_classes else None
+            )
+            domain_processed_queries = self.domains[domain].process_query_batch(
+                [queries[idx] for idx in indices],
+                allowed_intents,
+                dynamic_resource=dynamic_resource,
+                verbose=verbose,
+            )
+            for idx, processed_query in zip(indices, domain_processed_queries):
+                processed_queries[idx] = self._set_domain(
+                    processed_query, domain, domains_probas[idx][1]
+                )
+        return processed_queries
+
     def _update_nlp_hierarchy(self, nlp_components, domain, intent, entity=None, role=None):
         # We assume that the intent is a correct child of the domain
         if domain not in nlp_components:
@@ -778,6 +1070,63 @@ class NaturalLanguageProcessor(Processor):
             verbose=verbose,
         )
 
+    def process_batch(
+        self,
+        query_texts,
+        allowed_nlp_classes=None,
+        allowed_intents=None,
+        locale=None,
+        time_zone=None,
+        timestamp=None,
+        dynamic_resource=None,
+        verbose=False,
+    ):
+        """Processes a batch of queries using the full hierarchy of natural language processing \
+        models trained for this application. This gives the same results as calling ``process`` \
+        for each query, but the queries are grouped by domain and intent so that each model \
+        processes a group of queries at once, which is much faster for large batches.
+
+        Args:
+            query_texts (list of str): The raw user text inputs.
+            allowed_nlp_classes (dict, optional): A dictionary of the NLP hierarchy that is \
+                selected for NLP analysis. An example: ``{'smart_home': {'close_door': {}}}`` \
+                where smart_home is the domain and close_door is the intent.
+            allowed_intents (list, optional): A list of allowed intents to use for \
+                the NLP processing.
+            locale (str, optional): The locale representing the ISO 639-1 language code and
+                ISO3166 alpha 2 country code separated by an underscore character.
+            time_zone (str, optional): The name of an IANA time zone, such as \
+                'America/Los_Angeles', or 'Asia/Kolkata' \
+                See the [tz database](https://www.iana.org/time-zones) for more information.
+            timestamp (long, optional): A unix time stamp for the requests (in seconds).
+            dynamic_resource (dict, optional): A dynamic resource to aid NLP inference.
+            verbose (bool, optional): If True, returns class probabilities along with class \
+                prediction.
+
+        Returns:
+            (list of dict): The processed query of each input text.
+        """
+        if allowed_intents is not None and allowed_nlp_classes is not None:
+            raise TypeError(
+                "'allowed_intents' and 'allowed_nlp_classes' cannot be used together"
+            )
+        if allowed_intents:
+            allowed_nlp_classes = self.extract_allowed_nlp_components_list(allowed_intents)
+        if not query_texts:
+            return []
+
+        queries = self.create_query(
+            list(query_texts),
+            language=self.language,
+            locale=self._validate_locale(locale),
+            time_zone=time_zone,
+            timestamp=timestamp,
+        )
+        processed_queries = self.process_query_batch(
+            queries, allowed_nlp_classes, dynamic_resource, verbose
+        )
+        return [processed_query.to_dict() for processed_query in processed_queries]
+
 
 class DomainProcessor(Processor):
     """The domain processor houses the hierarchy of domain-specific natural language processing
@@ -819,7 +1168,7 @@ class DomainProcessor(Processor):
                 app_path, domain, intent, self.resource_loader, progress_bar
             )
 
-    def _build(self, incremental=False, label_set=None):
+    def _fit(self, label_set=None):
         if len(self.intents) == 1:
             return
         # train intent model
@@ -827,10 +1176,14 @@ class DomainProcessor(Processor):
             label_set=label_set, incremental_timestamp=self.incremental_timestamp
         )
 
+    def _finish_build(self):
         if len(self._children) > 1 and self.progress_bar is not None:
             self.progress_bar.update(1)
             self.progress_bar.refresh()
 
+    def _get_classifiers(self):
+        return {"intent_classifier": self.intent_classifier}
+
     def _dump(self):
         if len(self.intents) == 1:
             return
@@ -959,54 +1312,114 @@ class DomainProcessor(Processor):
         else:
             top_query = query
 
-        intent_proba = None
+        intent, intent_proba = self._process_intents(
+            [top_query],
+            allowed_nlp_classes=allowed_nlp_classes,
+            dynamic_resource=dynamic_resource,
+            verbose=verbose,
+        )[0]
+
+        processed_query = self.intents[intent].process_query(
+            query,
+            allowed_nlp_classes=self._get_allowed_entities(allowed_nlp_classes, intent),
+            dynamic_resource=dynamic_resource,
+            verbose=verbose,
+        )
+        return self._set_intent(processed_query, intent, intent_proba)
+
+    def process_query_batch(
+        self, queries, allowed_nlp_classes=None, dynamic_resource=None, verbose=False
+    ):
+        """Processes a batch of queries using the hierarchy of natural language processing \
+        models trained for this domain. The queries are grouped by their predicted intent, so \
+        that each entity recognizer processes a group of queries at once.
+
+        Args:
+            queries (list of Query): The user input queries.
+            allowed_nlp_classes (dict, optional): A dictionary of the intent section of the \
+                NLP hierarchy that is selected for NLP analysis.
+            dynamic_resource (dict, optional): A dynamic resource to aid NLP inference.
+            verbose (bool, optional): If True, returns class probabilities along with class \
+                prediction.
+
+        Returns:
+            (list of ProcessedQuery): The processed query of each input query.
+        """
+        self._check_ready()
+        intents_probas = self._process_intents(
+            queries,
+            allowed_nlp_classes=allowed_nlp_classes,
+            dynamic_resource=dynamic_resource,
+            verbose=verbose,
+        )
+
+        processed_queries = [None] * len(queries)
+        intent_groups = _group_indices([intent for intent, _ in intents_probas])
+        for intent, indices in intent_groups.items():
+            intent_processed_queries = self.intents[intent].process_query_batch(
+                [queries[idx] for idx in indices],
+                allowed_nlp_classes=self._get_allowed_entities(allowed_nlp_classes, intent),
+                dynamic_resource=dynamic_resource,
+                verbose=verbose,
+            )
+            for idx, processed_query in zip(indices, intent_processed_queries):
+                processed_queries[idx] = self._set_intent(
+                    processed_query, intent, intents_probas[idx][1]
+                )
+        return processed_queries
+
+    def _process_intents(
+        self, queries, allowed_nlp_classes=None, dynamic_resource=None, verbose=False
+    ):
+        """Predicts the intent of each query, with a single call to the intent classifier for all
+        the queries.
+
+        Returns:
+            (list of tuple): The intent and the intent probabilities, which are only returned in \
+                verbose mode, of each query
+        """
         if len(self.intents) > 1:
             # Check if the user has specified allowed intents
             if not allowed_nlp_classes:
-                if verbose:
-                    intent_proba = self.intent_classifier.predict_proba(
-                        top_query, dynamic_resource=dynamic_resource
+                if not verbose:
+                    intents = self.intent_classifier.predict_batch(
+                        queries, dynamic_resource=dynamic_resource
                     )
-                    intent = intent_proba[0][0]
-                else:
-                    intent = self.intent_classifier.predict(
-                        top_query, dynamic_resource=dynamic_resource
+                    return [(intent, None) for intent in intents]
+                return [
+                    (intent_proba[0][0], intent_proba)
+                    for intent_proba in self.intent_classifier.predict_proba_batch(
+                        queries, dynamic_resource=dynamic_resource
                     )
-            else:
-                if len(allowed_nlp_classes) == 1:
-                    intent = list(allowed_nlp_classes.keys())[0]
-                    if verbose:
-                        intent_proba = [(intent, 1.0)]
-                else:
-                    sorted_intents = self.intent_classifier.predict_proba(
-                        top_query, dynamic_resource=dynamic_resource
-                    )
-                    intent = None
-                    if verbose:
-                        intent_proba = sorted_intents
+                ]
+            if len(allowed_nlp_classes) > 1:
+                results = []
+                for sorted_intents in self.intent_classifier.predict_proba_batch(
+                    queries, dynamic_resource=dynamic_resource
+                ):
+                    intent_proba = sorted_intents if verbose else None
                     for ordered_intent, _ in sorted_intents:
                         if ordered_intent in allowed_nlp_classes.keys():
-                            intent = ordered_intent
+                            results.append((ordered_intent, intent_proba))
                             break
-
-                    if not intent:
+                    else:
                         raise AllowedNlpClassesKeyError(
                             "Could not find user inputted intent in NLP hierarchy"
                         )
+                return results
+            intent = list(allowed_nlp_classes.keys())[0]
         else:
             intent = list(self.intents.keys())[0]
-            if verbose:
-                intent_proba = [(intent, 1.0)]
+        return [(intent, [(intent, 1.0)] if verbose else None) for _ in queries]
 
+    @staticmethod
+    def _get_allowed_entities(allowed_nlp_classes, intent):
         if allowed_nlp_classes and intent in allowed_nlp_classes:
-            allowed_nlp_classes = allowed_nlp_classes[intent]
-        else:
-            allowed_nlp_classes = None
+            return allowed_nlp_classes[intent]
+        return None
 
-        processed_query = self.intents[intent].process_query(
-            query, allowed_nlp_classes=allowed_nlp_classes,
-            dynamic_resource=dynamic_resource, verbose=verbose
-        )
+    @staticmethod
+    def _set_intent(processed_query, intent, intent_proba):
         processed_query.intent = intent
         if intent_proba:
             intent_scores = dict(intent_proba)
@@ -1042,6 +1455,8 @@ class IntentProcessor(Processor):
         entity_recognizer (EntityRecognizer): The entity recognizer for this intent.
     """
 
+    _build_creates_children = True
+
     def __init__(
         self, app_path, domain, intent, resource_loader=None, progress_bar=None
     ):
@@ -1085,14 +1500,15 @@ class IntentProcessor(Processor):
     def nbest_transcripts_enabled(self, value):
         self._nbest_transcripts_enabled = value
 
-    def _build(self, incremental=False, label_set=None):
-        """Builds the models for this intent"""
+    def _fit(self, label_set=None):
+        """Fits the models for this intent"""
 
         # train entity recognizer
         self.entity_recognizer.fit(
             label_set=label_set, incremental_timestamp=self.incremental_timestamp
         )
 
+    def _finish_build(self):
         if isinstance(self.progress_bar, tqdm):
             self.progress_bar.update(1)
             self.progress_bar.refresh()
@@ -1110,6 +1526,9 @@ class IntentProcessor(Processor):
             )
             self._children[entity_type] = processor
 
+    def _get_classifiers(self):
+        return {"entity_recognizer": self.entity_recognizer}
+
     def _dump(self):
         model_path, incremental_model_path = path.get_entity_model_paths(
             self._app_path, self.domain, self.name, timestamp=self.incremental_timestamp
@@ -1332,7 +1751,8 @@ class IntentProcessor(Processor):
         processed_entities_conf = self._process_list(
             list(range(len(processed_entities))),
             "_classify_and_resolve_entities",
-            *[query, processed_entities, aligned_entities, allowed_nlp_classes, verbose]
+            *[query, processed_entities, aligned_entities, allowed_nlp_classes, verbose],
+            worker_mode=THREAD_MODE
         )
         if processed_entities_conf:
             processed_entities, role_confidence = [
@@ -1352,6 +1772,10 @@ class IntentProcessor(Processor):
         entities = self._recognize_entities(
             query, dynamic_resource=dynamic_resource, verbose=verbose
         )
+        return self._split_entity_confidence(entities, verbose)
+
+    @staticmethod
+    def _split_entity_confidence(entities, verbose=False):
         pred_entities = entities[0]
         entity_confidence = []
         if verbose and len(pred_entities) > 0:
@@ -1388,7 +1812,68 @@ class IntentProcessor(Processor):
         entity_confidence, entities = self._get_pred_entities(
             query, dynamic_resource=dynamic_resource, verbose=verbose
         )
+        return self._build_processed_query(
+            query,
+            entity_confidence,
+            entities,
+            allowed_nlp_classes=allowed_nlp_classes,
+            verbose=verbose,
+            using_nbest_transcripts=using_nbest_transcripts,
+        )
+
+    def process_query_batch(
+        self, queries, allowed_nlp_classes=None, dynamic_resource=None, verbose=False
+    ):
+        """Processes a batch of queries using the hierarchy of natural language processing \
+        models trained for this intent. The entities of all the queries are recognized with a \
+        single call to the entity recognizer.
+
+        Args:
+            queries (list of Query): The user input queries.
+            dynamic_resource (dict, optional): A dynamic resource to aid NLP inference.
+            verbose (bool, optional): If ``True``, returns class as well as predict probabilities.
+
+        Returns:
+            (list of ProcessedQuery): The processed query of each input query.
+        """
+        self._check_ready()
+
+        if verbose:
+            # the entity probabilities are computed one query at a time
+            queries_entities = [
+                self.entity_recognizer.predict_proba(query, dynamic_resource=dynamic_resource)
+                for query in queries
+            ]
+        else:
+            queries_entities = self.entity_recognizer.predict_batch(
+                queries, dynamic_resource=dynamic_resource
+            )
+
+        processed_queries = []
+        for query, query_entities in zip(queries, queries_entities):
+            entity_confidence, entities = self._split_entity_confidence(
+                [query_entities], verbose
+            )
+            processed_queries.append(
+                self._build_processed_query(
+                    (query,),
+                    entity_confidence,
+                    entities,
+                    allowed_nlp_classes=allowed_nlp_classes,
+                    verbose=verbose,
+                )
+            )
+        return processed_queries
 
+    def _build_processed_query(
+        self,
+        query,
+        entity_confidence,
+        entities,
+        allowed_nlp_classes=None,
+        verbose=False,
+        using_nbest_transcripts=False,
+    ):
         aligned_entities = self._align_entities(entities)
         processed_entities, role_confidence = self._process_entities(
             query, entities, aligned_entities, allowed_nlp_classes, verbose
@@ -1462,16 +1947,21 @@ class EntityProcessor(Processor):
         if isinstance(self.progress_bar, tqdm):
             self.progress_bar.total += 1
 
-    def _build(self, incremental=False, label_set=None):
-        """Builds the models for this entity type"""
+    def _fit(self, label_set=None):
+        """Fits the models for this entity type"""
         self.role_classifier.fit(
             label_set=label_set, incremental_timestamp=self.incremental_timestamp
         )
+
+    def _finish_build(self):
         self.entity_resolver.fit()
         if isinstance(self.progress_bar, tqdm):
             self.progress_bar.update(1)
             self.progress_bar.refresh()
 
+    def _get_classifiers(self):
+        return {"role_classifier": self.role_classifier}
+
     def _dump(self):
         model_path, incremental_model_path = path.get_role_model_paths(
             self._app_path,
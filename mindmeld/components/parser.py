@@ -14,7 +14,9 @@
 """
 This module contains the language parser component of the MindMeld natural language processor
 """
+import json
 import logging
+import threading
 import time
 from collections import OrderedDict, defaultdict, namedtuple
 
@@ -38,6 +40,13 @@ START_SYMBOLS = frozenset({START_SYMBOL, HEAD_SYMBOL})
 
 MAX_PARSE_TIME = 2.0
 
+# The maximum number of sentential forms whose parses are cached for each grammar
+PARSE_CACHE_SIZE = 10000
+
+# The compiled grammars, keyed by the parser config and entity types they were generated from
+_compiled_grammars = {}
+_compiled_grammars_lock = threading.Lock()
+
 
 class Parser:
     """
@@ -89,16 +98,9 @@ class Parser:
             configured_entities.update(entity_config.keys())
 
         self._configured_entities = configured_entities
-        rules = generate_grammar(self.config, entity_types)
-        self._grammar = FeatureGrammar.fromstring(rules)
-        self._parser = FeatureChartParser(self._grammar)
-        if allow_relaxed:
-            relaxed_rules = generate_grammar(self.config, entity_types, relaxed=True)
-            self._relaxed_grammar = FeatureGrammar.fromstring(relaxed_rules)
-            self._relaxed_parser = FeatureChartParser(self._relaxed_grammar)
-        else:
-            self._relaxed_grammar = None
-            self._relaxed_parser = None
+        self._compiled_grammar = get_compiled_grammar(
+            self.config, entity_types, allow_relaxed
+        )
 
     def parse_entities(
         self,
@@ -162,27 +164,14 @@ class Parser:
             tokens.append(entity_id)
 
         logger.debug("Parsing sentential form: %r", " ".join(tokens))
-        start_time = time.time()
-        parses = []
-        for parse in self._parser.parse(tokens):
-            parses.append(parse)
-            if timeout is not None and (time.time() - start_time) > timeout:
-                raise ParserTimeout("Parsing took too long")
-
-        if not parses and self._relaxed_parser:
-            for parse in self._relaxed_parser.parse(tokens):
-                parses.append(parse)
-                if timeout is not None and (time.time() - start_time) > MAX_PARSE_TIME:
-                    raise ParserTimeout("Parsing took too long")
+        parses = self._compiled_grammar.parse(tokens, timeout)
 
         if not parses:
             if all_candidates:
                 return []
             return entities
 
-        ranked_parses = self._rank_parses(
-            query, entity_dict, parses, timeout, start_time
-        )
+        ranked_parses = self._rank_parses(query, entity_dict, parses)
         if all_candidates:
             return ranked_parses
 
@@ -190,36 +179,24 @@ class Parser:
         entities = self._get_flat_entities(ranked_parses[0], entities, entity_dict)
         return tuple(sorted(entities, key=lambda e: e.span.start))
 
-    def _rank_parses(self, query, entity_dict, parses, timeout, start_time=None):
-        start_time = start_time or time.time()
-        resolved = OrderedDict()
-
-        for parse in parses:
-            if timeout is not None and time.time() - start_time > timeout:
-                raise ParserTimeout("Parsing took too long")
-            resolved[self._resolve_parse(parse)] = None
-        filtered = (p for p in resolved.keys())
-
-        # Prefer parses with fewer groups
-        parses = list(sorted(filtered, key=len))
-        filtered = (p for p in parses if len(p) <= len(parses[0]))
-
+    def _rank_parses(self, query, entity_dict, parses):
         # Prefer parses with minimal distance from dependents to heads
-        parses = list(
-            sorted(filtered, key=lambda p: self._parse_distance(p, query, entity_dict))
-        )
-        min_parse_dist = self._parse_distance(parses[0], query, entity_dict)
+        query_tokens = query.text.split(" ")
+        distances = [
+            self._parse_distance(parse, query_tokens, entity_dict) for parse in parses
+        ]
+        min_parse_dist = min(distances)
         filtered = (
-            p
-            for p in parses
-            if self._parse_distance(p, query, entity_dict) <= min_parse_dist
+            parse
+            for parse, distance in zip(parses, distances)
+            if distance <= min_parse_dist
         )
 
         # TODO: apply precedence
 
         return list(filtered)
 
-    def _parse_distance(self, parse, query, entity_dict):
+    def _parse_distance(self, parse, query_tokens, entity_dict):
         total_link_distance = 0
         stack = list(parse)
         while stack:
@@ -239,7 +216,7 @@ class Parser:
                         child.token_span.end, head.token_span.start
                     )
                 link_distance = 0
-                for token in intra_entity_span.slice(query.text.split(" ")):
+                for token in intra_entity_span.slice(query_tokens):
                     if token in self.config[node.type][dep.type]["linking_words"]:
                         link_distance -= 0.5
                     else:
@@ -299,6 +276,119 @@ class Parser:
         return group
 
 
+class _CompiledGrammar:
+    """The chart parsers for a parser config, which are shared by all the parsers with the same
+    config and entity types.
+
+    The candidate parses of a sentential form only depend on the grammar, so the candidate parses
+    of recently parsed sentential forms are cached. The parses are resolved into entity groups and
+    only the ones with the fewest groups are kept. Ranking the candidates by the distances between
+    heads and dependents depends on the query, so it is done by the parser.
+    """
+
+    def __init__(self, config, entity_types, allow_relaxed=True):
+        rules = generate_grammar(config, entity_types)
+        self.grammar = FeatureGrammar.fromstring(rules)
+        self.parser = FeatureChartParser(self.grammar)
+        if allow_relaxed:
+            relaxed_rules = generate_grammar(config, entity_types, relaxed=True)
+            self.relaxed_grammar = FeatureGrammar.fromstring(relaxed_rules)
+            self.relaxed_parser = FeatureChartParser(self.relaxed_grammar)
+        else:
+            self.relaxed_grammar = None
+            self.relaxed_parser = None
+        self._parses = OrderedDict()
+        self._lock = threading.Lock()
+
+    def parse(self, tokens, timeout=MAX_PARSE_TIME):
+        """Gets the candidate parses of a sentential form.
+
+        Args:
+            tokens (list[str]): The sentential form, e.g. ``['product0', 'store0']``
+            timeout (float, optional): The amount of time to wait for the parsing to complete.
+
+        Returns:
+            (tuple[frozenset]): The candidate parses, each of which is a set of entity groups.
+        """
+        key = tuple(tokens)
+        with self._lock:
+            try:
+                parses = self._parses.pop(key)
+                self._parses[key] = parses
+                return parses
+            except KeyError:
+                pass
+
+        parses = self._parse(tokens, timeout)
+        with self._lock:
+            self._parses[key] = parses
+            while len(self._parses) > PARSE_CACHE_SIZE:
+                self._parses.popitem(last=False)
+        return parses
+
+    def _parse(self, tokens, timeout):
+        start_time = time.time()
+        parses = []
+        for parse in self.parser.parse(tokens):
+            parses.append(parse)
+            if timeout is not None and (time.time() - start_time) > timeout:
+                raise ParserTimeout("Parsing took too long")
+
+        if not parses and self.relaxed_parser:
+            for parse in self.relaxed_parser.parse(tokens):
+                parses.append(parse)
+                if timeout is not None and (time.time() - start_time) > MAX_PARSE_TIME:
+                    raise ParserTimeout("Parsing took too long")
+
+        resolved = OrderedDict()
+        for parse in parses:
+            if timeout is not None and time.time() - start_time > timeout:
+                raise ParserTimeout("Parsing took too long")
+            resolved[Parser._resolve_parse(parse)] = None  # pylint: disable=protected-access
+        if not resolved:
+            return ()
+
+        # Prefer parses with fewer groups
+        min_groups = min(len(parse) for parse in resolved)
+        return tuple(parse for parse in resolved if len(parse) <= min_groups)
+
+    def __getstate__(self):
+        """Returns the state of the grammar without the parse cache and its lock."""
+        state = self.__dict__.copy()
+        state["_parses"] = OrderedDict()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__ = state
+        self._lock = threading.Lock()
+
+
+def get_compiled_grammar(config, entity_types, allow_relaxed=True):
+    """Gets the compiled grammar for a parser config, compiling it the first time it is requested.
+
+    Args:
+        config (dict): The parser configuration
+        entity_types (iterable): The entity types of the app
+        allow_relaxed (bool, optional): Whether a relaxed grammar is compiled as well
+
+    Returns:
+        (_CompiledGrammar): The compiled grammar
+    """
+    key = (
+        json.dumps(config, sort_keys=True, default=str),
+        tuple(sorted(entity_types)),
+        allow_relaxed,
+    )
+    with _compiled_grammars_lock:
+        try:
+            return _compiled_grammars[key]
+        except KeyError:
+            compiled_grammar = _CompiledGrammar(config, entity_types, allow_relaxed)
+            _compiled_grammars[key] = compiled_grammar
+            return compiled_grammar
+
+
 class _EntityNode(namedtuple("EntityNode", ("type", "id", "dependents"))):
     """A private tree data structure used to parse queries
 
@@ -15,14 +15,18 @@
 This module contains the question answerer component of MindMeld.
 """
 import copy
+import itertools
 import json
 import logging
+import os
+import queue
 import re
+import threading
 from abc import ABC, abstractmethod
+from collections import deque
 
-from elasticsearch import ConnectionError as EsConnectionError
-from elasticsearch import ElasticsearchException, TransportError
-
+from .. import path
+from .._lazy import lazy_import
 from ..exceptions import (
     KnowledgeBaseConnectionError,
     KnowledgeBaseError,
@@ -50,11 +54,21 @@ from ..models import create_embedder_model
 
 logger = logging.getLogger(__name__)
 
+# elasticsearch is imported when it is first used
+elasticsearch = lazy_import("elasticsearch")
+
 
 DEFAULT_QUERY_TYPE = "keyword"
 ALL_QUERY_TYPES = ["keyword", "text", "embedder", "embedder_keyword", "embedder_text"]
 EMBEDDING_FIELD_STRING = "_embedding"
 
+# The default maximum number of fields encoded in a single call to the embedder
+DEFAULT_EMBEDDING_BATCH_SIZE = 256
+# The number of lines of a jsonl data file read at a time
+DOCUMENT_CHUNK_SIZE = 1000
+# The number of loaded documents between load checkpoints
+CHECKPOINT_INTERVAL = 500
+
 
 class QuestionAnswerer:
     """The question answerer is primarily an information retrieval system that provides all the
@@ -241,7 +255,7 @@ class QuestionAnswerer:
                     self._es_field_info[index][field_name] = FieldInfo(
                         field_name, field_type
                     )
-            except EsConnectionError as e:
+            except elasticsearch.ConnectionError as e:
                 logger.error(
                     "Unable to connect to Elasticsearch: %s details: %s",
                     e.error,
@@ -250,7 +264,7 @@ class QuestionAnswerer:
                 raise KnowledgeBaseConnectionError(
                     es_host=self._es_client.transport.hosts
                 )
-            except TransportError as e:
+            except elasticsearch.TransportError as e:
                 logger.error(
                     "Unexpected error occurred when sending requests to Elasticsearch: %s "
                     "Status code: %s details: %s",
@@ -259,7 +273,7 @@ class QuestionAnswerer:
                     e.info,
                 )
                 raise KnowledgeBaseError
-            except ElasticsearchException:
+            except elasticsearch.ElasticsearchException:
                 raise KnowledgeBaseError
 
     def config(self, config):
@@ -285,10 +299,16 @@ class QuestionAnswerer:
         clean=False,
         app_path=None,
         config=None,
+        batch_size=None,
+        checkpoint_path=None,
     ):
         """Loads documents from disk into the specified index in the knowledge
         base. If an index with the specified name doesn't exist, a new index
-        with that name will be created in the knowledge base.
+        with that name will be created.
+
+        Documents are read, embedded and sent to the index in a stream, so encoding documents
+        overlaps with indexing them. The progress of the load is checkpointed, and a load which
+        was interrupted resumes from the last checkpoint, unless ``clean`` is set.
 
         Args:
             app_namespace (str): The namespace of the app. Used to prevent
@@ -306,6 +326,12 @@ class QuestionAnswerer:
                 and reindex it
             app_path (str): The path to the directory containing the app's data
             config (dict): The QA config if passed directly rather than loaded from the app config
+            batch_size (int, optional): The maximum number of fields encoded in a single call to
+                the embedder. Defaults to the ``embedding_batch_size`` model setting of the QA
+                config, or 256.
+            checkpoint_path (str, optional): The path of the file which records the progress of
+                the load. Defaults to a file in the app's generated data folder if ``app_path``
+                is given, otherwise the progress is not recorded.
         """
         embedder_model = None
         embedding_fields = []
@@ -322,77 +348,27 @@ class QuestionAnswerer:
                     "question_answering", app_path=app_path
                 )
             embedder_model = create_embedder_model(app_path, qa_config)
-            embedding_fields = (
-                qa_config.get("model_settings", {})
-                .get("embedding_fields", {})
-                .get(index_name, [])
+            model_settings = qa_config.get("model_settings", {})
+            embedding_fields = model_settings.get("embedding_fields", {}).get(
+                index_name, []
             )
+            batch_size = batch_size or model_settings.get("embedding_batch_size")
+        batch_size = batch_size or DEFAULT_EMBEDDING_BATCH_SIZE
 
-        def _doc_data(data_file):
-            with open(data_file) as data_fp:
-                line = data_fp.readline()
-                data_fp.seek(0)
-                if line.strip() == "[":
-                    docs = json.load(data_fp)
-                    count = len(docs)
-                else:
-                    count = 0
-                    for line in data_fp:
-                        count += 1
-                return count
-
-        def _doc_generator(data_file, embedder_model=None, embedding_fields=None):
-            def match_regex(string, pattern_list):
-                for pattern in pattern_list:
-                    if re.match(pattern, string):
-                        return True
-
-            def transform(doc, embedder_model, embedding_fields):
-                if embedder_model:
-                    embed_fields = [
-                        (key, str(val))
-                        for key, val in doc.items()
-                        if match_regex(key, embedding_fields)
-                    ]
-                    embed_keys = list(zip(*embed_fields))[0]
-                    embed_vals = embedder_model.get_encodings(
-                        list(zip(*embed_fields))[1]
-                    )
-                    embedded_doc = {
-                        key + EMBEDDING_FIELD_STRING: emb.tolist()
-                        for key, emb in zip(embed_keys, embed_vals)
-                    }
-                    doc.update(embedded_doc)
-                if not doc.get("id"):
-                    return doc
-                base = {"_id": doc["id"]}
-                base.update(doc)
-                return base
-
-            with open(data_file) as data_fp:
-                line = data_fp.readline()
-                data_fp.seek(0)
-                if line.strip() == "[":
-                    logging.debug("Loading data from a json file.")
-                    docs = json.load(data_fp)
-                    for doc in docs:
-                        yield transform(doc, embedder_model, embedding_fields)
-                else:
-                    logging.debug("Loading data from a jsonl file.")
-                    for line in data_fp:
-                        doc = json.loads(line)
-                        yield transform(doc, embedder_model, embedding_fields)
-
-        docs_count = _doc_data(data_file)
         if embedder_model and len(embedding_fields) == 0:
             logger.warning(
                 "No embedding fields specified in the app config, "
                 "continuing without generating embeddings..."
             )
             embedder_model = None
-        docs = _doc_generator(data_file, embedder_model, embedding_fields)
 
+        if not checkpoint_path and app_path:
+            checkpoint_path = path.get_kb_load_checkpoint_path(app_path, index_name)
+        checkpoint = _LoadCheckpoint(checkpoint_path, data_file)
+
+        es_client = es_client or create_es_client(es_host)
         if clean:
+            checkpoint.clear()
             try:
                 delete_index(app_namespace, index_name, es_host, es_client)
             except ValueError:
@@ -401,6 +377,24 @@ class QuestionAnswerer:
                     index_name,
                     app_namespace,
                 )
+        elif checkpoint.load() and not does_index_exist(
+            app_namespace, index_name, es_host, es_client, connect_timeout
+        ):
+            # the index the documents were loaded into is gone
+            checkpoint.clear()
+        if checkpoint.documents:
+            logger.info(
+                "Resuming the load of index %r after %d documents",
+                index_name,
+                checkpoint.documents,
+            )
+
+        docs_count, docs = _read_documents(data_file, checkpoint)
+        if embedder_model:
+            docs = _embed_documents(docs, embedder_model, embedding_fields, batch_size)
+        # Documents are read and encoded in a background thread while the previous ones
+        # are sent to the index
+        docs = _prefetch(map(_get_index_action, docs), max_items=2 * batch_size)
 
         def _generate_mapping_data(embedder_model, embedding_fields):
             # generates a dictionary with any metadata needed to create the mapping"
@@ -423,7 +417,6 @@ class QuestionAnswerer:
 
             return mapping_data
 
-        es_client = es_client or create_es_client(es_host)
         if is_es_version_7(es_client):
             mapping_data = _generate_mapping_data(embedder_model, embedding_fields)
             qa_mapping = create_index_mapping(DEFAULT_ES_QA_MAPPING, mapping_data)
@@ -435,21 +428,255 @@ class QuestionAnswerer:
                 raise ElasticsearchVersionError
             qa_mapping = resolve_es_config_for_version(DEFAULT_ES_QA_MAPPING, es_client)
 
-        load_index(
-            app_namespace,
-            index_name,
-            docs,
-            docs_count,
-            qa_mapping,
-            DOC_TYPE,
-            es_host,
-            es_client,
-            connect_timeout=connect_timeout,
-        )
+        try:
+            load_index(
+                app_namespace,
+                index_name,
+                docs,
+                docs_count,
+                qa_mapping,
+                DOC_TYPE,
+                es_host,
+                es_client,
+                connect_timeout=connect_timeout,
+                on_loaded=checkpoint.loaded,
+            )
+        except BaseException:
+            # record the documents which were loaded, so that the load can be resumed
+            checkpoint.save()
+            raise
+        finally:
+            docs.close()
+            # Saves the embedder model cache to disk
+            if embedder_model:
+                embedder_model.dump()
+        checkpoint.clear()
 
-        # Saves the embedder model cache to disk
-        if embedder_model:
-            embedder_model.dump()
+
+class _LoadCheckpoint:
+    """Records the progress of loading the documents of a data file into a knowledge base index, so
+    that a load which was interrupted can be resumed.
+
+    The checkpoint holds the number of documents which were sent to the index, and for jsonl files,
+    the offset of the line after the last one. It is only resumed from when the data file has not
+    changed since it was written.
+    """
+
+    def __init__(self, checkpoint_path, data_file):
+        self.path = checkpoint_path
+        self.data_file = os.path.abspath(data_file)
+        stat = os.stat(self.data_file)
+        self._data_file_id = [self.data_file, stat.st_size, stat.st_mtime_ns]
+        self.documents = 0
+        self.offset = 0
+        # The positions of the documents which have been read but not loaded yet
+        self._pending = deque()
+
+    def load(self):
+        """Reads the checkpoint from disk.
+
+        Returns:
+            bool: Whether there is a checkpoint to resume from
+        """
+        if not self.path:
+            return False
+        try:
+            with open(self.path, "r") as checkpoint_file:
+                data = json.load(checkpoint_file)
+        except (OSError, IOError, ValueError):
+            return False
+        if data.get("data_file") != self._data_file_id:
+            return False
+        self.documents = data["documents"]
+        self.offset = data["offset"]
+        return self.documents > 0
+
+    def read(self, offset):
+        """Records that a document was read.
+
+        Args:
+            offset (int): The offset of the data following the document
+        """
+        self._pending.append(offset)
+
+    def loaded(self):
+        """Records that the earliest document which was read has been loaded."""
+        self.offset = self._pending.popleft()
+        self.documents += 1
+        if self.documents % CHECKPOINT_INTERVAL == 0:
+            self.save()
+
+    def save(self):
+        """Writes the checkpoint to disk."""
+        if not self.path:
+            return
+        folder = os.path.dirname(self.path)
+        if folder and not os.path.isdir(folder):
+            os.makedirs(folder)
+        data = {
+            "data_file": self._data_file_id,
+            "documents": self.documents,
+            "offset": self.offset,
+        }
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w") as checkpoint_file:
+            json.dump(data, checkpoint_file)
+        os.replace(tmp_path, self.path)
+
+    def clear(self):
+        """Removes the checkpoint."""
+        self.documents = 0
+        self.offset = 0
+        if self.path and os.path.exists(self.path):
+            os.remove(self.path)
+
+
+def _read_documents(data_file, checkpoint):
+    """Reads the documents of a json or jsonl data file, starting after the documents recorded in
+    the checkpoint. jsonl files are read in chunks of lines rather than all at once.
+
+    Args:
+        data_file (str): The path of the data file
+        checkpoint (_LoadCheckpoint): The checkpoint of the load
+
+    Returns:
+        tuple: The number of documents to read, or None if it is not known without reading the \
+            whole file, and an iterator over the documents
+    """
+    with open(data_file, "rb") as data_fp:
+        is_json = data_fp.readline().strip() == b"["
+
+    if is_json:
+        logger.debug("Loading data from a json file.")
+        with open(data_file) as data_fp:
+            docs = json.load(data_fp)[checkpoint.documents :]
+
+        def _generate_json_documents():
+            for idx, doc in enumerate(docs, checkpoint.documents + 1):
+                checkpoint.read(idx)
+                yield doc
+
+        return len(docs), _generate_json_documents()
+
+    def _generate_jsonl_documents():
+        logger.debug("Loading data from a jsonl file.")
+        with open(data_file, "rb") as data_fp:
+            data_fp.seek(checkpoint.offset)
+            offset = checkpoint.offset
+            while True:
+                lines = list(itertools.islice(data_fp, DOCUMENT_CHUNK_SIZE))
+                if not lines:
+                    return
+                for line in lines:
+                    offset += len(line)
+                    if not line.strip():
+                        continue
+                    checkpoint.read(offset)
+                    yield json.loads(line)
+
+    return None, _generate_jsonl_documents()
+
+
+def _embed_documents(docs, embedder_model, embedding_fields, batch_size):
+    """Adds the embeddings of the fields of documents. The fields of several documents are encoded
+    in each call to the embedder.
+
+    Args:
+        docs (iterable): The documents
+        embedder_model (Embedder): The embedder
+        embedding_fields (list): Patterns matching the names of the fields to embed
+        batch_size (int): The maximum number of fields encoded in a single call to the embedder
+
+    Yields:
+        dict: The documents, with the embeddings of their fields
+    """
+    patterns = [re.compile(pattern) for pattern in embedding_fields]
+
+    def _flush(batch, texts):
+        encodings = embedder_model.get_encodings(texts) if texts else []
+        encoded = iter(encodings)
+        for doc, keys in batch:
+            doc.update(
+                {key + EMBEDDING_FIELD_STRING: next(encoded).tolist() for key in keys}
+            )
+        return batch
+
+    batch = []
+    texts = []
+    for doc in docs:
+        keys = [
+            key for key in doc if any(pattern.match(key) for pattern in patterns)
+        ]
+        batch.append((doc, keys))
+        texts.extend(str(doc[key]) for key in keys)
+        if len(texts) >= batch_size:
+            for embedded_doc, _ in _flush(batch, texts):
+                yield embedded_doc
+            batch = []
+            texts = []
+    for embedded_doc, _ in _flush(batch, texts):
+        yield embedded_doc
+
+
+def _get_index_action(doc):
+    """Gets the action which indexes a document, using its id as the document id"""
+    if not doc.get("id"):
+        return doc
+    base = {"_id": doc["id"]}
+    base.update(doc)
+    return base
+
+
+def _prefetch(iterable, max_items):
+    """Iterates over an iterable in a background thread, so that producing its items overlaps with
+    consuming them.
+
+    Args:
+        iterable (iterable): The iterable
+        max_items (int): The maximum number of items produced ahead of the consumer
+
+    Returns:
+        generator: A generator of the items of the iterable
+    """
+    items = queue.Queue(maxsize=max_items)
+    stopped = threading.Event()
+
+    def _put(item):
+        while not stopped.is_set():
+            try:
+                items.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def _produce():
+        try:
+            for item in iterable:
+                if not _put((True, item)):
+                    return
+        except Exception as exc:  # pylint: disable=broad-except
+            _put((False, exc))
+            return
+        _put((False, None))
+
+    def _consume():
+        producer = threading.Thread(target=_produce, daemon=True)
+        producer.start()
+        try:
+            while True:
+                is_item, value = items.get()
+                if is_item:
+                    yield value
+                elif value is None:
+                    return
+                else:
+                    raise value
+        finally:
+            stopped.set()
+            producer.join()
+
+    return _consume()
 
 
 class FieldInfo:
@@ -842,12 +1069,12 @@ class Search:
                 item['_score'] = hit['_score']
                 results.append(item)
             return results
-        except EsConnectionError as e:
+        except elasticsearch.ConnectionError as e:
             logger.error(
                 "Unable to connect to Elasticsearch: %s details: %s", e.error, e.info
             )
             raise KnowledgeBaseConnectionError(es_host=self.client.transport.hosts)
-        except TransportError as e:
+        except elasticsearch.TransportError as e:
             logger.error(
                 "Unexpected error occurred when sending requests to Elasticsearch: %s "
                 "Status code: %s details: %s",
@@ -856,7 +1083,7 @@ class Search:
                 e.info,
             )
             raise KnowledgeBaseError
-        except ElasticsearchException:
+        except elasticsearch.ElasticsearchException:
             raise KnowledgeBaseError
 
     class Clause(ABC):
@@ -11,6 +11,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 import logging
+from collections.abc import Sequence
 
 import attr
 import immutables
@@ -302,6 +303,64 @@ def tuple_elems_to_immutable_map(value):
     return tuple([immutables.Map(i) for i in value])
 
 
+class History(Sequence):
+    """The read-only history of a conversation, ordered from the most recent turn. The turns are
+    kept as they were received and each is converted into an immutables.Map when it is first
+    read, so a long history which a dialogue handler does not read is never converted.
+    """
+
+    __slots__ = ("_turns", "_maps")
+
+    def __init__(self, turns=()):
+        self._turns = tuple(turns)
+        self._maps = [None] * len(self._turns)
+
+    def __len__(self):
+        return len(self._turns)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return tuple(self[i] for i in range(*index.indices(len(self._turns))))
+        turn = self._maps[index]
+        if turn is None:
+            turn = self._maps[index] = immutables.Map(self._turns[index])
+        return turn
+
+    def __eq__(self, other):
+        if isinstance(other, (History, tuple, list)):
+            return self.to_json() == History(other).to_json()
+        return NotImplemented
+
+    def __hash__(self):
+        return hash(tuple(self))
+
+    def __add__(self, other):
+        return tuple(self) + tuple(other)
+
+    def __radd__(self, other):
+        return tuple(other) + tuple(self)
+
+    def __repr__(self):
+        return "History({!r})".format(self._turns)
+
+    def to_json(self):
+        """Gets the turns of the history without converting them.
+
+        Returns:
+            tuple of dict: The turns of the history
+        """
+        return tuple(
+            turn if isinstance(turn, dict) else dict(turn) for turn in self._turns
+        )
+
+
+def to_history(value):
+    """Custom attrs converter. Converts a list of turns into a lazily converted History."""
+    if isinstance(value, History):
+        return value
+    return History(value)
+
+
 @attr.s(frozen=True, kw_only=True)  # pylint: disable=too-many-instance-attributes
 class Request:
     """
@@ -313,8 +372,9 @@ class Request:
         domains (str): Domain of the current query.
         intent (str): Intent of the current query.
         entities (list): A list of entities in the current query.
-        history (list): List of previous and current responder objects (de-serialized) up to the
-            current conversation.
+        history (History): List of previous and current responder objects (de-serialized) up to
+            the current conversation. Each turn is converted into an Immutables Map when it is
+            first read.
         text (str): The query text.
         frame (): Immutables Map of stored data across multiple dialogue turns.
         params (Params): An object that modifies how MindMeld process the current turn.
@@ -334,9 +394,7 @@ class Request:
     entities = attr.ib(
         default=attr.Factory(tuple), converter=tuple_elems_to_immutable_map
     )
-    history = attr.ib(
-        default=attr.Factory(tuple), converter=tuple_elems_to_immutable_map
-    )
+    history = attr.ib(default=attr.Factory(History), converter=to_history)
     text = attr.ib(default=None)
     frame = attr.ib(default=immutables.Map(), converter=immutables.Map)
     params = attr.ib(default=FrozenParams())
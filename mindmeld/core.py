@@ -13,6 +13,8 @@
 
 """This module contains a collection of the core data structures used in MindMeld."""
 import logging
+import sys
+from array import array
 
 TEXT_FORM_RAW = 0
 TEXT_FORM_PROCESSED = 1
@@ -45,6 +47,52 @@ def _sort_by_lowest_time_grain(system_entities):
     )
 
 
+def _slot_values(obj):
+    """Gets the values of all the slots of an object, for comparing objects with __slots__"""
+    return tuple(
+        getattr(obj, name)
+        for cls in type(obj).__mro__
+        for name in cls.__dict__.get("__slots__", ())
+    )
+
+
+def _intern_strings(strings):
+    return tuple(sys.intern(string) for string in strings)
+
+
+def _compact_char_maps(char_maps):
+    """Stores each character index map whose keys are the contiguous indexes 0..n-1 as an int
+    array instead of a dict. Maps which are shared between text form pairs stay shared."""
+    compacted = {}
+    by_id = {}
+    for key, mapping in char_maps.items():
+        if id(mapping) not in by_id:
+            by_id[id(mapping)] = _compact_char_map(mapping)
+        compacted[key] = by_id[id(mapping)]
+    return compacted
+
+
+def _compact_char_map(mapping):
+    if not mapping:
+        return mapping
+    try:
+        return array("i", [mapping[index] for index in range(len(mapping))])
+    except KeyError:
+        return mapping
+
+
+def _map_char_index(mapping, index):
+    # An empty or None mapping means a 1-1 mapping
+    if not mapping:
+        return index
+    if index < 0:
+        raise ValueError("Invalid index {}".format(index))
+    try:
+        return mapping[index]
+    except (KeyError, IndexError):
+        raise ValueError("Invalid index {}".format(index))
+
+
 class Bunch(dict):
     """Dictionary-like object that exposes its keys as attributes.
 
@@ -168,7 +216,17 @@ class Query:
         stemmed_tokens (list): A sequence of stemmed tokens for the query text
     """
 
-    # TODO: look into using __slots__
+    __slots__ = [
+        "_normalized_tokens",
+        "_texts",
+        "_char_maps",
+        "system_entity_candidates",
+        "_locale",
+        "_language",
+        "_time_zone",
+        "_timestamp",
+        "stemmed_tokens",
+    ]
 
     def __init__(
         self,
@@ -192,16 +250,18 @@ class Query:
             char_maps (dict): Mappings between character indices in raw,
                 processed and normalized text
         """
-        self._normalized_tokens = normalized_tokens
-        norm_text = " ".join([t["entity"] for t in self._normalized_tokens])
+        # Only the token strings are kept, and they are interned since the same tokens recur
+        # across queries
+        self._normalized_tokens = _intern_strings(t["entity"] for t in normalized_tokens)
+        norm_text = " ".join(self._normalized_tokens)
         self._texts = (raw_text, processed_text, norm_text)
-        self._char_maps = char_maps
+        self._char_maps = _compact_char_maps(char_maps)
         self.system_entity_candidates = ()
         self._locale = locale
         self._language = language
         self._time_zone = time_zone
         self._timestamp = timestamp
-        self.stemmed_tokens = stemmed_tokens or tuple()
+        self.stemmed_tokens = _intern_strings(stemmed_tokens or ())
 
     @property
     def text(self):
@@ -226,7 +286,7 @@ class Query:
     @property
     def normalized_tokens(self):
         """The tokens of the normalized input text"""
-        return tuple((token["entity"] for token in self._normalized_tokens))
+        return self._normalized_tokens
 
     @property
     def language(self):
@@ -328,11 +388,7 @@ class Query:
         except KeyError:
             # mapping doesn't exist -> use identity
             return index
-        # None for mapping means 1-1 mapping
-        try:
-            return mapping[index] if mapping else index
-        except KeyError:
-            raise ValueError("Invalid index {}".format(index))
+        return _map_char_index(mapping, index)
 
     def _unprocess_index(self, index, form_in):
         if form_in == TEXT_FORM_RAW:
@@ -343,15 +399,11 @@ class Query:
         except KeyError:
             # mapping doesn't exist -> use identity
             return index
-        # None for mapping means 1-1 mapping
-        try:
-            return mapping[index] if mapping else index
-        except KeyError:
-            raise ValueError("Invalid index {}".format(index))
+        return _map_char_index(mapping, index)
 
     def __eq__(self, other):
         if isinstance(other, self.__class__):
-            return self.__dict__ == other.__dict__
+            return _slot_values(self) == _slot_values(other)
         return NotImplemented
 
     def __ne__(self, other):
@@ -380,7 +432,17 @@ class ProcessedQuery:
         confidence (dict): A dictionary of the class probas for the domain and intent classifier
     """
 
-    # TODO: look into using __slots__
+    __slots__ = [
+        "query",
+        "domain",
+        "intent",
+        "entities",
+        "is_gold",
+        "nbest_transcripts_queries",
+        "nbest_transcripts_entities",
+        "nbest_aligned_entities",
+        "confidence",
+    ]
 
     def __init__(
         self,
@@ -435,7 +497,7 @@ class ProcessedQuery:
 
     def __eq__(self, other):
         if isinstance(other, self.__class__):
-            return self.__dict__ == other.__dict__
+            return _slot_values(self) == _slot_values(other)
         return NotImplemented
 
     def __ne__(self, other):
@@ -471,6 +533,8 @@ class NestedEntity:
         children (tuple of NestedEntity): A tuple of children nested entities
     """
 
+    __slots__ = ["_texts", "_spans", "_token_spans", "entity", "parent", "children"]
+
     def __init__(self, texts, spans, token_spans, entity, children=None):
         self._texts = texts
         self._spans = spans
@@ -623,7 +687,7 @@ class NestedEntity:
 
     def __eq__(self, other):
         if isinstance(other, self.__class__):
-            return self.__dict__ == other.__dict__
+            return _slot_values(self) == _slot_values(other)
         return NotImplemented
 
     def __ne__(self, other):
@@ -674,6 +738,22 @@ class QueryEntity(NestedEntity):
             entity. This index is based on the normalized text of the query passed in.
     """
 
+    __slots__ = []
+
+
+class _SystemEntityCheck:
+    """A descriptor for Entity.is_system_entity, which is a static method when accessed on the
+    class and the flag of the entity when accessed on an instance."""
+
+    def __init__(self, func):
+        self.func = func
+        self.__doc__ = func.__doc__
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self.func
+        return instance._is_system_entity  # pylint: disable=protected-access
+
 
 class Entity:
     """An Entity is any important piece of text that provides more information about the user
@@ -691,7 +771,15 @@ class Entity:
         is_system_entity (bool): True if the entity is a system entity
     """
 
-    # TODO: look into using __slots__
+    __slots__ = [
+        "text",
+        "type",
+        "role",
+        "value",
+        "display_text",
+        "confidence",
+        "_is_system_entity",
+    ]
 
     def __init__(
         self,
@@ -703,15 +791,15 @@ class Entity:
         confidence=None,
     ):
         self.text = text
-        self.type = entity_type
+        self.type = sys.intern(entity_type)
         self.role = role
         self.value = value
         self.display_text = display_text
         self.confidence = confidence
-        self.is_system_entity = self.__class__.is_system_entity(entity_type)
+        self._is_system_entity = self.__class__.is_system_entity(entity_type)
 
-    @staticmethod
-    def is_system_entity(entity_type):  # pylint: disable=method-hidden
+    @_SystemEntityCheck
+    def is_system_entity(entity_type):
         """Checks whether the provided entity type is a MindMeld-recognized system entity.
 
         Args:
@@ -734,7 +822,7 @@ class Entity:
 
     def __eq__(self, other):
         if isinstance(other, self.__class__):
-            return self.__dict__ == other.__dict__
+            return _slot_values(self) == _slot_values(other)
         return NotImplemented
 
     def __ne__(self, other):
@@ -0,0 +1,216 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2015 Cisco Systems, Inc. and others.  All rights reserved.
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#     http://www.apache.org/licenses/LICENSE-2.0
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+This module contains the file fingerprint manifest used to detect changes to an app's files.
+"""
+import json
+import logging
+import os
+import threading
+import time
+
+from ._version import get_mm_version
+from .path import FINGERPRINTS_PATH, GEN_FOLDER
+
+logger = logging.getLogger(__name__)
+
+# Files modified within this many seconds of being fingerprinted may be modified again without
+# their modification time changing, so their fingerprints are not kept
+MIN_FINGERPRINT_AGE = 2.0
+# The maximum number of derived hashes kept in the manifest
+MAX_DERIVED_HASHES = 100000
+
+
+class FingerprintManifest:
+    """
+    A persistent manifest of the fingerprints of an app's files, which is used to avoid hashing
+    files which have not changed.
+
+    The fingerprint of a file is its modification time, size and content digest. The digest is
+    only recomputed when the modification time or size of the file changes. The manifest also
+    keeps hashes derived from the contents of files (e.g. the hash of the queries a classifier
+    is trained on), keyed by a hash of the digests of those files, so that they are only
+    recomputed when one of the files changes. The manifest is emptied when it was written by a
+    different MindMeld version.
+    """
+
+    def __init__(self, app_path, hasher):
+        """Initializes a fingerprint manifest
+
+        Args:
+            app_path (str): The path to the directory containing the app's data
+            hasher (Hasher): The hasher used to compute file digests
+        """
+        self.app_path = app_path
+        self.is_dirty = False
+        self._hasher = hasher
+        self._lock = threading.RLock()
+        self._files = None
+        self._hashes = None
+        # Entries which have been added since the manifest was loaded or dumped
+        self._updates = {"files": {}, "hashes": {}}
+        self.gen_folder = GEN_FOLDER.format(app_path=self.app_path)
+        self.manifest_location = FINGERPRINTS_PATH.format(app_path=self.app_path)
+
+    def get_file_digest(self, file_path):
+        """Gets the digest of the contents of a file. The digest of a missing file is the digest of
+        an empty file.
+
+        Args:
+            file_path (str): The path of the file
+
+        Returns:
+            str: A hex digest of the file
+        """
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return self._hasher.hash_file(file_path)
+
+        with self._lock:
+            self._load()
+            fingerprint = self._files.get(file_path)
+            if (
+                fingerprint
+                and fingerprint["mtime"] == stat.st_mtime_ns
+                and fingerprint["size"] == stat.st_size
+            ):
+                return fingerprint["digest"]
+
+        digest = self._hasher.hash_file(file_path)
+        if time.time() - stat.st_mtime >= MIN_FINGERPRINT_AGE:
+            fingerprint = {
+                "mtime": stat.st_mtime_ns,
+                "size": stat.st_size,
+                "digest": digest,
+            }
+            with self._lock:
+                self._files[file_path] = fingerprint
+                self._updates["files"][file_path] = fingerprint
+                self.is_dirty = True
+        return digest
+
+    def get_hash(self, key, hash_func):
+        """Gets a hash derived from the contents of files.
+
+        Args:
+            key (str): A hash of the digests of the files the hash is derived from, and anything
+                else it depends on
+            hash_func (function): A function which computes the hash when it is not in the manifest
+
+        Returns:
+            str: The hash
+        """
+        with self._lock:
+            self._load()
+            try:
+                # move the hash to the end, so that the least recently used ones are dropped first
+                value = self._hashes.pop(key)
+                self._hashes[key] = value
+                return value
+            except KeyError:
+                pass
+
+        value = hash_func()
+        with self._lock:
+            self._hashes[key] = value
+            self._updates["hashes"][key] = value
+            while len(self._hashes) > MAX_DERIVED_HASHES:
+                del self._hashes[next(iter(self._hashes))]
+            self.is_dirty = True
+        return value
+
+    def get_updates(self):
+        """Returns the entries which have been added to the manifest since it was last loaded or
+        dumped (dict)."""
+        with self._lock:
+            return {
+                "files": dict(self._updates["files"]),
+                "hashes": dict(self._updates["hashes"]),
+            }
+
+    def update(self, updates):
+        """Adds entries to the manifest, e.g. the ones added by a worker process.
+
+        Args:
+            updates (dict): Entries returned by get_updates()
+        """
+        with self._lock:
+            self._load()
+            for file_path, fingerprint in updates["files"].items():
+                self._files[file_path] = fingerprint
+                self._updates["files"][file_path] = fingerprint
+            for key, value in updates["hashes"].items():
+                self._hashes[key] = value
+                self._updates["hashes"][key] = value
+            if updates["files"] or updates["hashes"]:
+                self.is_dirty = True
+
+    def dump(self):
+        """Writes the manifest to disk."""
+        with self._lock:
+            if not self.is_dirty:
+                return
+
+            # make generated directory if necessary
+            if not os.path.isdir(self.gen_folder):
+                os.makedirs(self.gen_folder)
+
+            data = {
+                "mm_version": get_mm_version(),
+                "files": self._files,
+                "hashes": list(self._hashes.items()),
+            }
+            tmp_location = "{}.{}.tmp".format(self.manifest_location, os.getpid())
+            try:
+                # The manifest is written to a temporary file and moved into place, so that it is
+                # not corrupted when the user cancels the training operation midway during the
+                # write.
+                with open(tmp_location, "w") as manifest_file:
+                    json.dump(data, manifest_file)
+                os.replace(tmp_location, self.manifest_location)
+            except (OSError, IOError):
+                logger.warning("Couldn't dump the file fingerprints to disk.")
+                return
+            self._updates = {"files": {}, "hashes": {}}
+            self.is_dirty = False
+
+    def __getstate__(self):
+        """Returns the state of the manifest without the lock, which can not be pickled."""
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__ = state
+        self._lock = threading.RLock()
+
+    def _load(self):
+        """Reads the manifest from disk if it has not been read yet."""
+        if self._files is not None:
+            return
+
+        self._files = {}
+        self._hashes = {}
+        try:
+            with open(self.manifest_location, "r") as manifest_file:
+                data = json.load(manifest_file)
+        except (OSError, IOError, ValueError):
+            return
+
+        if data.get("mm_version") != get_mm_version():
+            logger.info("The file fingerprints are outdated, so they will be recomputed.")
+            return
+        self._files = data.get("files", {})
+        self._hashes = dict(data.get("hashes", []))
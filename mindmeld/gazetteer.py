@@ -15,6 +15,7 @@ import codecs
 import logging
 import os
 from collections import defaultdict
+from collections.abc import Mapping, Sequence
 
 import joblib
 
@@ -240,6 +241,226 @@ class Gazetteer:
             )
 
 
+class GazetteerOverlay:
+    """A view of a serialized gazetteer with additional entities layered over it.
+
+    The entities added to the overlay are stored separately from the base gazetteer, so the base
+    gazetteer is neither copied nor modified. Looking up a missing key in the ``pop_dict`` or
+    ``index`` of the view returns the default value without inserting it.
+
+    Attributes:
+      name (str): The name of the gazetteer
+      entity_count (int): Total entities in the base gazetteer and the overlay
+      pop_dict (Mapping): The popularity of each entity
+      index (Mapping): The inverted index, which maps terms to the set of documents which
+        contain them
+      entities (Sequence): A list of all entities
+      sys_types (set): The set of nested numeric types for this entity
+      matcher (GazetteerMatcher): The span matcher of the base gazetteer and the overlay
+    """
+
+    def __init__(self, base):
+        """
+        Args:
+            base (dict): The serialized base gazetteer, as returned by ``Gazetteer.to_dict``
+        """
+        self.name = base["name"]
+        self.max_ngram = 1
+        self.entity_count = base["total_entities"]
+        self.pop_dict = _OverlayDict(base["pop_dict"], int)
+        self.index = _OverlayDict(base["index"], set)
+        self.entities = _ChainedSequence(base["entities"])
+        self.sys_types = base["sys_types"]
+        self.matcher = GazetteerMatcher(base=get_gazetteer_matcher(base))
+
+    def update_entity(self, entity, popularity):
+        """
+        Adds an entity and its popularity to the overlay. If the entity is already in the
+        gazetteer, its popularity is set to the max of the given and existing popularity.
+
+        Args:
+            entity (str): A normalized entity name.
+            popularity (float): The entity's popularity value.
+        """
+        old_value = self.pop_dict.get(entity, 0)
+        if old_value == 0:
+            self.entities.append(entity)
+            for ngram in iterate_ngrams(entity.split(), max_length=self.max_ngram):
+                self.index.copy_on_write(ngram).add(self.entity_count)
+            self.matcher.add(entity)
+            self.entity_count += 1
+        self.pop_dict[entity] = max(old_value, popularity)
+
+    def to_dict(self):
+        """
+        Returns: dict
+        """
+        return {
+            "name": self.name,
+            "total_entities": self.entity_count,
+            "pop_dict": self.pop_dict,
+            "index": self.index,
+            "entities": self.entities,
+            "sys_types": self.sys_types,
+            "matcher": self.matcher,
+        }
+
+
+class GazetteerMatcher:
+    """A token trie of the entities in a gazetteer, which finds every span of a query matching an
+    entity in a single pass over the query tokens.
+
+    Attributes:
+      max_length (int): The number of tokens in the longest entity
+    """
+
+    # key of the trie nodes which marks the end of an entity
+    _END = None
+
+    def __init__(self, entities=(), base=None):
+        """
+        Args:
+            entities (iterable of str): The normalized entity names to match
+            base (GazetteerMatcher, optional): A matcher whose spans are matched in addition to
+                the entities added to this matcher
+        """
+        self._root = {}
+        self._base = base
+        self.max_length = 0
+        for entity in entities:
+            self.add(entity)
+
+    def add(self, entity):
+        """Adds an entity to the matcher.
+
+        Args:
+            entity (str): A normalized entity name.
+        """
+        # normalized tokens are joined with single spaces to look up entities, so splitting on
+        # single spaces gives the only token sequence which can match the entity
+        tokens = entity.split(" ")
+        node = self._root
+        for token in tokens:
+            node = node.setdefault(token, {})
+        node[self._END] = True
+        self.max_length = max(self.max_length, len(tokens))
+
+    def find_spans(self, tokens):
+        """Finds the spans of the tokens which match an entity.
+
+        Args:
+            tokens (list of str): The normalized tokens of a query
+
+        Returns:
+            (list of tuple): The (start, end) token indices of the matching spans, sorted by \
+                start and end
+        """
+        spans = []
+        for start in range(len(tokens)):
+            node = self._root
+            for end in range(start, min(len(tokens), start + self.max_length)):
+                node = node.get(tokens[end])
+                if node is None:
+                    break
+                if self._END in node:
+                    spans.append((start, end + 1))
+        if self._base is not None:
+            spans = sorted(set(spans).union(self._base.find_spans(tokens)))
+        return spans
+
+
+def get_gazetteer_matcher(gaz):
+    """Gets the span matcher of a serialized gazetteer, building it if the gazetteer does not
+    have one yet.
+
+    Args:
+        gaz (dict): The serialized gazetteer, as returned by ``Gazetteer.to_dict``
+
+    Returns:
+        GazetteerMatcher: The matcher of the gazetteer's entities
+    """
+    matcher = gaz.get("matcher")
+    if matcher is None:
+        matcher = GazetteerMatcher(gaz["pop_dict"])
+        gaz["matcher"] = matcher
+    return matcher
+
+
+class _OverlayDict(Mapping):
+    """A mapping which reads from a base mapping, except for the keys set in the overlay."""
+
+    def __init__(self, base, default_factory):
+        self._base = base
+        self._overlay = {}
+        self._default_factory = default_factory
+
+    def __getitem__(self, key):
+        try:
+            return self._overlay[key]
+        except KeyError:
+            pass
+        if key in self._base:
+            return self._base[key]
+        # behave like the base defaultdict without inserting the key
+        return self._default_factory()
+
+    def __setitem__(self, key, value):
+        self._overlay[key] = value
+
+    def __contains__(self, key):
+        return key in self._overlay or key in self._base
+
+    def get(self, key, default=None):
+        return self[key] if key in self else default
+
+    def copy_on_write(self, key):
+        """Returns the overlay's own copy of the value of a key, copying the base value first if
+        necessary."""
+        if key not in self._overlay:
+            self._overlay[key] = (
+                self._base[key].copy() if key in self._base else self._default_factory()
+            )
+        return self._overlay[key]
+
+    def __iter__(self):
+        yield from self._base
+        for key in self._overlay:
+            if key not in self._base:
+                yield key
+
+    def __len__(self):
+        return len(self._base) + sum(1 for key in self._overlay if key not in self._base)
+
+
+class _ChainedSequence(Sequence):
+    """A sequence of the items of a base list followed by the items appended to the sequence."""
+
+    def __init__(self, base):
+        self._base = base
+        self._extra = []
+
+    def append(self, item):
+        self._extra.append(item)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return list(self)[index]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("sequence index out of range")
+        if index < len(self._base):
+            return self._base[index]
+        return self._extra[index - len(self._base)]
+
+    def __iter__(self):
+        yield from self._base
+        yield from self._extra
+
+    def __len__(self):
+        return len(self._base) + len(self._extra)
+
+
 def iterate_ngrams(tokens, min_length=1, max_length=1):
     """Iterates over all n-grams in a list of tokens.
 
@@ -0,0 +1,255 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (c) 2015 Cisco Systems, Inc. and others.  All rights reserved.
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#     http://www.apache.org/licenses/LICENSE-2.0
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+This module contains the server-side store of conversation histories, which lets clients refer
+to a conversation by its id instead of sending its full history with every request.
+"""
+import json
+import logging
+import os
+import secrets
+import sqlite3
+import threading
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+# The number of conversations whose history is kept in memory
+DEFAULT_HISTORY_CACHE_SIZE = int(os.environ.get("MM_HISTORY_CACHE_SIZE", 10000))
+# The conversation id with which a client asks for a new conversation
+NEW_CONVERSATION_ID = "new"
+# The number of random bytes in a conversation id
+CONVERSATION_ID_BYTES = 32
+# The number of locks which serialize the updates of the histories of conversations
+NUM_CONVERSATION_LOCKS = 64
+
+
+class HistoryBackend:
+    """The persistent storage of a HistoryStore. Only the new turns of a conversation are written
+    to a backend on each request, so a backend can store them as deltas."""
+
+    def load(self, conversation_id):
+        """Loads the history of a conversation.
+
+        Args:
+            conversation_id (str): The id of the conversation
+
+        Returns:
+            tuple of dict: The turns of the conversation, from the most recent, or None if the \
+                conversation is not stored
+        """
+        raise NotImplementedError
+
+    def append(self, conversation_id, turns, max_history_len):
+        """Adds turns to the history of a conversation.
+
+        Args:
+            conversation_id (str): The id of the conversation
+            turns (tuple of dict): The new turns, from the most recent
+            max_history_len (int): The number of turns to keep
+        """
+        raise NotImplementedError
+
+    def delete(self, conversation_id):
+        """Deletes the history of a conversation.
+
+        Args:
+            conversation_id (str): The id of the conversation
+        """
+        raise NotImplementedError
+
+
+class SQLiteHistoryBackend(HistoryBackend):
+    """A history backend which stores each turn of a conversation as a row of a SQLite
+    database."""
+
+    def __init__(self, path):
+        """Initializes the backend.
+
+        Args:
+            path (str): The path of the database file
+        """
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._connection:
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS turns ("
+                "conversation_id TEXT NOT NULL, turn INTEGER NOT NULL, data TEXT NOT NULL, "
+                "PRIMARY KEY (conversation_id, turn))"
+            )
+
+    def load(self, conversation_id):
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT data FROM turns WHERE conversation_id = ? ORDER BY turn DESC",
+                (conversation_id,),
+            ).fetchall()
+        if not rows:
+            return None
+        return tuple(json.loads(data) for data, in rows)
+
+    def append(self, conversation_id, turns, max_history_len):
+        # the turns are encoded as the server encodes responses, so values such as dates which
+        # the standard library cannot encode are stored the same way they are returned
+        from .server import encode_json  # pylint: disable=import-outside-toplevel
+
+        with self._lock, self._connection:
+            last_turn = self._connection.execute(
+                "SELECT MAX(turn) FROM turns WHERE conversation_id = ?",
+                (conversation_id,),
+            ).fetchone()[0]
+            last_turn = -1 if last_turn is None else last_turn
+            self._connection.executemany(
+                "INSERT INTO turns (conversation_id, turn, data) VALUES (?, ?, ?)",
+                [
+                    (conversation_id, last_turn + index + 1, encode_json(turn).decode("utf8"))
+                    for index, turn in enumerate(reversed(turns))
+                ],
+            )
+            self._connection.execute(
+                "DELETE FROM turns WHERE conversation_id = ? AND turn <= ?",
+                (conversation_id, last_turn + len(turns) - max_history_len),
+            )
+
+    def delete(self, conversation_id):
+        with self._lock, self._connection:
+            self._connection.execute(
+                "DELETE FROM turns WHERE conversation_id = ?", (conversation_id,)
+            )
+
+    def close(self):
+        """Closes the database connection."""
+        with self._lock:
+            self._connection.close()
+
+
+class HistoryStore:
+    """A store of conversation histories keyed by conversation id. The histories of the most
+    recently active conversations are kept in memory, and an optional backend persists them so
+    that they survive restarts and evictions from memory and can be shared by several servers.
+
+    Conversation ids are created by the store and are random, so that a conversation can only be
+    read or continued by a client it was given to. Without a backend, the history of a
+    conversation which is evicted from memory is lost.
+    """
+
+    def __init__(self, backend=None, cache_size=None):
+        """Initializes the store.
+
+        Args:
+            backend (HistoryBackend, optional): The persistent storage of the histories
+            cache_size (int, optional): The number of conversations whose history is kept in \
+                memory
+        """
+        self.backend = backend
+        self.cache_size = cache_size or DEFAULT_HISTORY_CACHE_SIZE
+        self._histories = OrderedDict()
+        self._lock = threading.Lock()
+        # a conversation's history is read, appended to and cached under the same lock, so that
+        # concurrent turns of a conversation are not lost
+        self._conversation_locks = [threading.RLock() for _ in range(NUM_CONVERSATION_LOCKS)]
+
+    def __contains__(self, conversation_id):
+        return self._load(conversation_id) is not None
+
+    def create(self):
+        """Creates a conversation with an empty history.
+
+        Returns:
+            str: The id of the conversation, which is random and hard to guess
+        """
+        conversation_id = secrets.token_urlsafe(CONVERSATION_ID_BYTES)
+        with self._lock:
+            self._cache(conversation_id, ())
+        return conversation_id
+
+    def get(self, conversation_id):
+        """Gets the history of a conversation.
+
+        Args:
+            conversation_id (str): The id of the conversation
+
+        Returns:
+            tuple of dict: The turns of the conversation, from the most recent
+        """
+        return self._load(conversation_id) or ()
+
+    def append(self, conversation_id, turns, max_history_len):
+        """Adds turns to the history of a conversation.
+
+        Args:
+            conversation_id (str): The id of the conversation
+            turns (tuple of dict): The new turns, from the most recent
+            max_history_len (int): The number of turns to keep
+
+        Returns:
+            tuple of dict: The updated turns of the conversation, from the most recent
+        """
+        turns = tuple(turns)
+        with self._get_conversation_lock(conversation_id):
+            history = (turns + self.get(conversation_id))[:max_history_len]
+            if self.backend is not None:
+                self.backend.append(conversation_id, turns, max_history_len)
+            with self._lock:
+                self._cache(conversation_id, history)
+        return history
+
+    def delete(self, conversation_id):
+        """Deletes the history of a conversation.
+
+        Args:
+            conversation_id (str): The id of the conversation
+        """
+        with self._get_conversation_lock(conversation_id):
+            with self._lock:
+                self._histories.pop(conversation_id, None)
+            if self.backend is not None:
+                self.backend.delete(conversation_id)
+
+    def _load(self, conversation_id):
+        """Loads the history of a conversation from memory, or else from the backend.
+
+        Returns:
+            tuple of dict: The turns of the conversation, or None if it is not stored
+        """
+        with self._lock:
+            history = self._histories.get(conversation_id)
+            if history is not None:
+                self._histories.move_to_end(conversation_id)
+                return history
+        if self.backend is None:
+            return None
+
+        with self._get_conversation_lock(conversation_id):
+            with self._lock:
+                # the history may have been cached while waiting for the lock
+                history = self._histories.get(conversation_id)
+            if history is None:
+                history = self.backend.load(conversation_id)
+                if history is not None:
+                    with self._lock:
+                        self._cache(conversation_id, history)
+        return history
+
+    def _get_conversation_lock(self, conversation_id):
+        return self._conversation_locks[hash(conversation_id) % NUM_CONVERSATION_LOCKS]
+
+    def _cache(self, conversation_id, history):
+        self._histories[conversation_id] = history
+        self._histories.move_to_end(conversation_id)
+        while len(self._histories) > self.cache_size:
+            self._histories.popitem(last=False)
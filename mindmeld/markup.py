@@ -113,34 +113,96 @@ def load_query_file(
     query_factory = query_factory or QueryFactory.create_query_factory(app_path)
 
     queries = []
+    # maps the query texts which are not in the query cache to their indices in queries
+    uncached = {}
     for query_text in read_query_file(file_path):
         if query_text[0] == "-":
             continue
 
-        if query_cache:
-            query = query_cache.get_value(domain, intent, query_text)
-            if not query:
-                query = load_query(
-                    query_text,
-                    query_factory=query_factory,
-                    domain=domain,
-                    intent=intent,
-                    is_gold=is_gold,
-                )
-                query_cache.set_value(domain, intent, query_text, query)
-        else:
-            query = load_query(
-                query_text,
-                query_factory=query_factory,
-                domain=domain,
-                intent=intent,
-                is_gold=is_gold,
-            )
-
+        query = query_cache.get_value(domain, intent, query_text) if query_cache else None
+        if not query:
+            uncached.setdefault(query_text, []).append(len(queries))
         queries.append(query)
+
+    if uncached:
+        query_texts = list(uncached)
+        loaded_queries = load_queries(
+            query_texts,
+            query_factory=query_factory,
+            domain=domain,
+            intent=intent,
+            is_gold=is_gold,
+        )
+        for query_text, query in zip(query_texts, loaded_queries):
+            if query_cache:
+                query_cache.set_value(domain, intent, query_text, query)
+            for idx in uncached[query_text]:
+                queries[idx] = query
     return queries
 
 
+def load_queries(
+    markups,
+    query_factory=None,
+    app_path=None,
+    domain=None,
+    intent=None,
+    is_gold=False,
+    query_options=None,
+):
+    """Creates processed query objects from a list of marked up query texts. The system entity
+    candidates of all the queries are requested as a single batch.
+
+    Args:
+        markups (list of str): The marked up query texts.
+        query_factory (QueryFactory, optional): An object which can create
+            queries.
+        app_path (str, optional): The dir path of the application
+        domain (str, optional): The name of the domain annotated for the queries.
+        intent (str, optional): The name of the intent annotated for the queries.
+        is_gold (bool, optional): True if the markups passed in are reference,
+            human-labeled examples. Defaults to False.
+        query_options (dict, optional): A dict containing options for creating
+            queries, such as `language`, `time_zone` and `timestamp`
+
+    Returns:
+        list of ProcessedQuery: the processed queries, in the same order as the markups
+    """
+    query_factory = query_factory or QueryFactory.create_query_factory(app_path)
+    query_options = query_options or {}
+
+    parsed = []
+    for markup in markups:
+        try:
+            parsed.append(_parse_tokens(_tokenize_markup(markup)))
+        except (MarkupError, IndexError) as exc:
+            msg = "Invalid markup in query {!r}: {}"
+            raise MarkupError(msg.format(markup, exc)) from exc
+
+    queries = query_factory.create_queries(
+        [raw_text for raw_text, _ in parsed], **query_options
+    )
+
+    processed_queries = []
+    for markup, query, (_, annotations) in zip(markups, queries, parsed):
+        try:
+            entities = _process_annotations(
+                query, annotations, query_factory.system_entity_recognizer
+            )
+        except (MarkupError, IndexError) as exc:
+            msg = "Invalid markup in query {!r}: {}"
+            raise MarkupError(msg.format(markup, exc)) from exc
+        except SystemEntityResolutionError as exc:
+            msg = "Unable to load query {!r}: {}"
+            raise SystemEntityMarkupError(msg.format(markup, exc)) from exc
+        processed_queries.append(
+            ProcessedQuery(
+                query, domain=domain, intent=intent, entities=entities, is_gold=is_gold
+            )
+        )
+    return processed_queries
+
+
 def mark_down_file(file_path):
     """Read all annotated queries from the input file and remove all the annotations
 
@@ -28,14 +28,6 @@ from ..tokenizer import Tokenizer
 
 logger = logging.getLogger(__name__)
 
-try:
-    from sentence_transformers import SentenceTransformer
-
-    register_bert = True
-except ImportError:
-    logger.info("Must install the extra [bert] to use the built in embbedder.")
-    register_bert = False
-
 
 class Embedder(ABC):
     """
@@ -118,6 +110,13 @@ class BertEmbedder(Embedder):
     DEFAULT_BERT = "bert-base-nli-mean-tokens"
 
     def load(self, **kwargs):
+        # sentence_transformers loads torch, so it is only imported when a bert embedder is used
+        try:
+            from sentence_transformers import SentenceTransformer
+        except ImportError:
+            raise ValueError(
+                "Must install the extra [bert] to use the built in bert embedder."
+            )
         if self.model_name == "default":
             bert_model_name = self.DEFAULT_BERT
             logger.info("No bert model specifications passed, using default.")
@@ -176,7 +175,5 @@ class GloveEmbedder(Embedder):
         self.model.save_embeddings()
 
 
-if register_bert:
-    register_embedder("bert", BertEmbedder)
-
+register_embedder("bert", BertEmbedder)
 register_embedder("glove", GloveEmbedder)
@@ -12,11 +12,14 @@
 # limitations under the License.
 
 """This module contains some helper functions for the models package"""
+import copy
 import re
+import threading
+from collections import OrderedDict
 
 from sklearn.metrics import make_scorer
 
-from ..gazetteer import Gazetteer
+from ..gazetteer import GazetteerOverlay
 from ..tokenizer import Tokenizer
 
 FEATURE_MAP = {}
@@ -44,6 +47,9 @@ WORD_NGRAM_FREQ_RSC = "w_ngram_freq"
 CHAR_NGRAM_FREQ_RSC = "c_ngram_freq"
 SENTIMENT_ANALYZER = "vader_classifier"
 OUT_OF_BOUNDS_TOKEN = "<$>"
+# The number of dynamic gazetteer overlays kept so that the models of a hierarchy can share the
+# overlays built for a request
+DYNAMIC_GAZETTEER_CACHE_SIZE = 32
 DEFAULT_SYS_ENTITIES = [
     "sys_time",
     "sys_temperature",
@@ -115,6 +121,31 @@ def get_feature_extractor(example_type, name):
     return FEATURE_MAP[example_type][name]
 
 
+def compile_feature_extractors(example_type, feature_config):
+    """Builds the ordered pipeline of feature extractors described by a feature config
+
+    Args:
+        example_type (str): The type of example
+        feature_config (dict): The config for features
+
+    Returns:
+        (tuple of function): The feature extractors in the order of the feature config
+    """
+    enable_stemming = feature_config.get(ENABLE_STEMMING, False)
+    extractors = []
+    for name, kwargs in feature_config.items():
+        if name == ENABLE_STEMMING:
+            continue
+        if callable(kwargs):
+            # a feature extractor function was passed in directly
+            extractors.append(kwargs)
+        else:
+            kwargs = copy.deepcopy(kwargs)
+            kwargs[ENABLE_STEMMING] = enable_stemming
+            extractors.append(get_feature_extractor(example_type, name)(**kwargs))
+    return tuple(extractors)
+
+
 def get_label_encoder(config):
     """Gets a label encoder given the label type from the config
 
@@ -371,11 +402,19 @@ def entity_seqs_equal(expected, predicted):
     return True
 
 
+_dynamic_gazetteer_cache = OrderedDict()
+_dynamic_gazetteer_cache_lock = threading.Lock()
+
+
 def merge_gazetteer_resource(resource, dynamic_resource, tokenizer):
     """
     Returns a new resource that is a merge between the original resource and the dynamic
     resource passed in for only the gazetteer values
 
+    The merged gazetteers are overlays which share the data of the original gazetteers, and
+    identical overlays are reused across calls, so the domain, intent and entity models
+    processing a request build the overlays only once.
+
     Args:
         resource (dict): The original resource built from the app
         dynamic_resource (dict): The dynamic resource passed in
@@ -391,30 +430,56 @@ def merge_gazetteer_resource(resource, dynamic_resource, tokenizer):
             return_obj[key] = resource[key]
             continue
 
-        # Create a dict from scratch if we match the gazetteer key
         return_obj[key] = {}
         for entity_type in resource[key]:
-            # If the entity type is in the dyn gaz, we merge the data. Else,
-            # just pass by reference the original resource data
+            # If the entity type is in the dyn gaz, we layer the dynamic entities over the
+            # original gazetteer. Else, just pass by reference the original resource data
             if entity_type in dynamic_resource[key]:
-                new_gaz = Gazetteer(entity_type)
-                # We deep copy here since shallow copying will also change the
-                # original resource's data during the '_update_entity' op.
-                new_gaz.from_dict(resource[key][entity_type])
-
-                for entity in dynamic_resource[key][entity_type]:
-                    new_gaz._update_entity(
-                        tokenizer.normalize(entity),
-                        dynamic_resource[key][entity_type][entity],
-                    )
-
-                # The new gaz created is a deep copied version of the merged gaz data
-                return_obj[key][entity_type] = new_gaz.to_dict()
+                return_obj[key][entity_type] = _get_gazetteer_overlay(
+                    resource[key][entity_type],
+                    dynamic_resource[key][entity_type],
+                    tokenizer,
+                )
             else:
                 return_obj[key][entity_type] = resource[key][entity_type]
     return return_obj
 
 
+def _get_gazetteer_overlay(gazetteer, dynamic_entities, tokenizer):
+    """Gets the serialized overlay of the dynamic entities over a gazetteer, building it if it
+    is not cached.
+
+    Args:
+        gazetteer (dict): The serialized gazetteer
+        dynamic_entities (dict): The popularity of each dynamic entity
+        tokenizer (Tokenizer): This component is used to normalize the dynamic entities
+
+    Returns:
+        dict: The serialized overlay
+    """
+    entity_items = tuple(sorted(dynamic_entities.items(), key=lambda item: item[0]))
+    # The cached value holds references to the gazetteer and tokenizer, so their ids can not be
+    # reused by other objects while the entry is cached.
+    cache_key = (id(gazetteer), id(tokenizer), entity_items)
+    with _dynamic_gazetteer_cache_lock:
+        try:
+            _dynamic_gazetteer_cache.move_to_end(cache_key)
+            return _dynamic_gazetteer_cache[cache_key][2]
+        except KeyError:
+            pass
+
+    overlay = GazetteerOverlay(gazetteer)
+    for entity, popularity in dynamic_entities.items():
+        overlay.update_entity(tokenizer.normalize(entity), popularity)
+    serialized_overlay = overlay.to_dict()
+
+    with _dynamic_gazetteer_cache_lock:
+        _dynamic_gazetteer_cache[cache_key] = (gazetteer, tokenizer, serialized_overlay)
+        while len(_dynamic_gazetteer_cache) > DYNAMIC_GAZETTEER_CACHE_SIZE:
+            _dynamic_gazetteer_cache.popitem(last=False)
+    return serialized_overlay
+
+
 def ingest_dynamic_gazetteer(resource, dynamic_resource=None, tokenizer=None):
     """Ingests dynamic gazetteers from the app and adds them to the resource
 
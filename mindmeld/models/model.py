@@ -40,6 +40,7 @@ from .helpers import (
     ENTITIES_LABEL_TYPE,
     WORD_NGRAM_FREQ_RSC,
     SENTIMENT_ANALYZER,
+    compile_feature_extractors,
     entity_seqs_equal,
     get_feature_extractor,
     get_label_encoder,
@@ -103,6 +104,7 @@ class ModelConfig:
         "param_selection",
         "train_label_set",
         "test_label_set",
+        "_feature_extractors",
     ]
 
     def __init__(
@@ -140,6 +142,7 @@ class ModelConfig:
         self.param_selection = param_selection
         self.train_label_set = train_label_set
         self.test_label_set = test_label_set
+        self._feature_extractors = None
 
     def to_dict(self):
         """Converts the model config object into a dict
@@ -148,16 +151,55 @@ class ModelConfig:
             dict: A dict version of the config
         """
         result = {}
-        for attr in self.__slots__:
+        for attr in self._config_attributes():
             result[attr] = getattr(self, attr)
         return result
 
     def __repr__(self):
         args_str = ", ".join(
-            "{}={!r}".format(key, getattr(self, key)) for key in self.__slots__
+            "{}={!r}".format(key, getattr(self, key))
+            for key in self._config_attributes()
         )
         return "{}({})".format(self.__class__.__name__, args_str)
 
+    def __getstate__(self):
+        # The compiled feature extractors are closures which can not be pickled, so they are
+        # compiled again after the config is loaded
+        return {
+            attr: getattr(self, attr)
+            for attr in self._config_attributes()
+            if hasattr(self, attr)
+        }
+
+    def __setstate__(self, state):
+        if isinstance(state, tuple):
+            # configs pickled before __getstate__ was defined store their slots separately
+            state = state[1]
+        for attr in self._config_attributes():
+            # attributes missing from older configs are left unset, see resolve_config
+            if attr in state:
+                setattr(self, attr, state[attr])
+        self._feature_extractors = None
+
+    def _config_attributes(self):
+        return [attr for attr in self.__slots__ if not attr.startswith("_")]
+
+    def get_feature_extractors(self):
+        """Gets the feature extractors for this config, compiling them the first time they are
+        requested. The compiled pipeline is reused until the features attribute is replaced.
+
+        Returns:
+            (tuple of function): The feature extractors in the order of the feature config
+        """
+        compiled = self._feature_extractors
+        if compiled is None or compiled[0] is not self.features:
+            compiled = (
+                self.features,
+                compile_feature_extractors(self.example_type, self.features),
+            )
+            self._feature_extractors = compiled
+        return compiled[1]
+
     def to_json(self):
         """Converts the model config object to JSON
 
@@ -1077,21 +1119,11 @@ class Model:
         Returns:
             (dict of str: number): A dict of feature names to their values.
         """
-        example_type = self.config.example_type
         feat_set = {}
         workspace_resource = ingest_dynamic_gazetteer(
             self._resources, dynamic_resource, tokenizer
         )
-        workspace_features = copy.deepcopy(self.config.features)
-        enable_stemming = workspace_features.pop(ENABLE_STEMMING, False)
-
-        for name, kwargs in workspace_features.items():
-            if callable(kwargs):
-                # a feature extractor function was passed in directly
-                feat_extractor = kwargs
-            else:
-                kwargs[ENABLE_STEMMING] = enable_stemming
-                feat_extractor = get_feature_extractor(example_type, name)(**kwargs)
+        for feat_extractor in self.config.get_feature_extractors():
             feat_set.update(feat_extractor(example, workspace_resource))
         return feat_set
 
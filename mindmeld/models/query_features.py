@@ -16,6 +16,7 @@ import math
 import re
 from collections import Counter, defaultdict
 
+from ..gazetteer import get_gazetteer_matcher
 from .helpers import (
     CHAR_NGRAM_FREQ_RSC,
     DEFAULT_SYS_ENTITIES,
@@ -161,12 +162,9 @@ def extract_in_gaz_span_features(**kwargs):
             tokens = query.normalized_tokens
 
             # Collect ngrams of plain normalized ngrams
-            for start in range(len(tokens)):
-                for end in range(start + 1, len(tokens) + 1):
-                    for gaz_name, gaz in gazetteers.items():
-                        ngram = " ".join(tokens[start:end])
-                        if ngram in gaz["pop_dict"]:
-                            spans.append((start, end, gaz_name, ngram))
+            for gaz_name, gaz in gazetteers.items():
+                for start, end in get_gazetteer_matcher(gaz).find_spans(tokens):
+                    spans.append((start, end, gaz_name, " ".join(tokens[start:end])))
             return spans
 
         gazetteers = resources[GAZETTEER_RSC]
@@ -922,21 +920,19 @@ def extract_in_gaz_feature(scaling=1, **kwargs):
 
         norm_text = query.normalized_text
         tokens = query.normalized_tokens
-        ngrams = []
-        for i in range(1, (len(tokens) + 1)):
-            ngrams.extend(find_ngrams(tokens, i))
-        for ngram in ngrams:
-            for gaz_name, gaz in resources[GAZETTEER_RSC].items():
-                if ngram in gaz["pop_dict"]:
-                    popularity = gaz["pop_dict"].get(ngram, 0.0)
-                    ratio = len(ngram) / len(norm_text) * scaling
-                    ratio_pop = ratio * popularity
-                    in_gaz_features[
-                        "in_gaz|type:{}|ratio_pop".format(gaz_name)
-                    ] += ratio_pop
-                    in_gaz_features["in_gaz|type:{}|ratio".format(gaz_name)] += ratio
-                    in_gaz_features["in_gaz|type:{}|pop".format(gaz_name)] += popularity
-                    in_gaz_features["in_gaz|type:{}".format(gaz_name)] = 1
+        for gaz_name, gaz in resources[GAZETTEER_RSC].items():
+            spans = get_gazetteer_matcher(gaz).find_spans(tokens)
+            # Accumulate the matching ngrams from shortest to longest
+            spans.sort(key=lambda span: (span[1] - span[0], span[0]))
+            for start, end in spans:
+                ngram = " ".join(tokens[start:end])
+                popularity = gaz["pop_dict"].get(ngram, 0.0)
+                ratio = len(ngram) / len(norm_text) * scaling
+                ratio_pop = ratio * popularity
+                in_gaz_features["in_gaz|type:{}|ratio_pop".format(gaz_name)] += ratio_pop
+                in_gaz_features["in_gaz|type:{}|ratio".format(gaz_name)] += ratio
+                in_gaz_features["in_gaz|type:{}|pop".format(gaz_name)] += popularity
+                in_gaz_features["in_gaz|type:{}".format(gaz_name)] = 1
 
         return in_gaz_features
 
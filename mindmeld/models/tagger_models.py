@@ -30,11 +30,6 @@ from .model import EntityModelEvaluation, EvaluatedExample, Model, ModelConfig
 from .taggers.crf import ConditionalRandomFields
 from .taggers.memm import MemmModel
 
-try:
-    from .taggers.lstm import LstmModel
-except ImportError:
-    LstmModel = None
-
 
 logger = logging.getLogger(__name__)
 
@@ -158,7 +153,7 @@ class TaggerModel(Model):
             self._current_params = params
         else:
             # run cross validation to select params
-            if self._clf.__class__ == LstmModel:
+            if self.config.model_settings["classifier_type"] == LSTM_TYPE:
                 raise MindMeldError("The LSTM model does not support cross-validation")
 
             _, best_params = self._fit_cv(X, y, groups)
@@ -218,7 +213,7 @@ class TaggerModel(Model):
             (list of tuples of mindmeld.core.QueryEntity): a list of predicted labels
         """
         if self._no_entities:
-            return [()]
+            return [() for _ in examples]
 
         workspace_resource = ingest_dynamic_gazetteer(
             self._resources, dynamic_resource=dynamic_resource, tokenizer=self.tokenizer
@@ -328,17 +323,21 @@ class TaggerModel(Model):
     def _get_model_constructor(self):
         """Returns the python class of the actual underlying model"""
         classifier_type = self.config.model_settings["classifier_type"]
-        try:
-            if classifier_type == LSTM_TYPE and LstmModel is None:
+        if classifier_type == LSTM_TYPE:
+            # TensorFlow is only imported when a config uses the LSTM tagger
+            try:
+                from .taggers.lstm import LstmModel
+            except ImportError:
                 msg = (
                     "{}: Classifier type {!r} dependencies not found. Install the "
                     "mindmeld[tensorflow] extra to use this classifier type."
                 )
                 raise ValueError(msg.format(self.__class__.__name__, classifier_type))
+            return LstmModel
+        try:
             return {
                 MEMM_TYPE: MemmModel,
                 CRF_TYPE: ConditionalRandomFields,
-                LSTM_TYPE: LstmModel,
             }[classifier_type]
         except KeyError:
             msg = "{}: Classifier type {!r} not recognized"
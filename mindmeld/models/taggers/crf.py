@@ -25,6 +25,9 @@ logger = logging.getLogger(__name__)
 
 ZERO = 1e-20
 
+# The maximum number of encoded feature values a FeatureBinner keeps
+MAX_CACHED_ATTRIBUTES = 1 << 20
+
 
 class ConditionalRandomFields(Tagger):
     """A Conditional Random Fields model."""
@@ -110,7 +113,11 @@ class ConditionalRandomFields(Tagger):
             list[dict]: Features.
         """
         return extract_sequence_features(
-            example, config.example_type, config.features, resources
+            example,
+            config.example_type,
+            config.features,
+            resources,
+            feature_extractors=config.get_feature_extractors(),
         )
 
     def _preprocess_data(self, X, fit=False):
@@ -125,17 +132,7 @@ class ConditionalRandomFields(Tagger):
         """
         if fit:
             self._feat_binner.fit(X)
-
-        new_X = []
-        for feat_seq in self._feat_binner.transform(X):
-            feat_list = []
-            for feature in feat_seq:
-                temp_list = []
-                for feat_type in sorted(feature.keys()):
-                    temp_list.append("{}={}".format(feat_type, str(feature[feat_type])))
-                feat_list.append(temp_list)
-            new_X.append(feat_list)
-        return new_X
+        return self._feat_binner.encode(X)
 
     def setup_model(self, config):
         self._feat_binner = FeatureBinner()
@@ -213,6 +210,16 @@ class FeatureBinner:
 
     def __init__(self):
         self.features = {}
+        self._attributes = {}
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state.pop("_attributes", None)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__ = state
+        self._attributes = {}
 
     def fit(self, X_train):
         """
@@ -221,6 +228,7 @@ class FeatureBinner:
         Args:
             X_train (list of list of dict): training data
         """
+        self._attributes = {}
         for sentence in X_train:
             for word in sentence:
                 for feat_name, feat_value in word.items():
@@ -249,6 +257,61 @@ class FeatureBinner:
             new_X_train.append(new_sentence)
         return new_X_train
 
+    def encode(self, X):
+        """
+        Convert features to CRF suite attributes. Each attribute is the "name=value" string of a
+        feature after its value is binned, and the attributes of a word are sorted by feature
+        name. This is equivalent to formatting the output of transform, but the attribute of
+        each distinct feature name and value is only computed once.
+
+        Args:
+            X (list of list of dict): features of the examples
+
+        Returns:
+            (list of list of list of str): features in CRF suite format
+        """
+        attributes = self._attributes
+        encode_feature = self._encode_feature
+        new_X = []
+        for sentence in X:
+            new_sentence = []
+            for word in sentence:
+                new_word = []
+                for feat_name in sorted(word):
+                    key = (feat_name, word[feat_name])
+                    try:
+                        attribute = attributes[key]
+                    except KeyError:
+                        attribute = encode_feature(*key)
+                        if len(attributes) >= MAX_CACHED_ATTRIBUTES:
+                            attributes.clear()
+                        attributes[key] = attribute
+                    except TypeError:
+                        # unhashable feature values are not cached
+                        attribute = encode_feature(*key)
+                    new_word.append(attribute)
+                new_sentence.append(new_word)
+            new_X.append(new_sentence)
+        return new_X
+
+    def _encode_feature(self, feat_name, feat_value):
+        """
+        Get the CRF suite attribute of a feature value.
+
+        Args:
+            feat_name (str): feature name
+            feat_value (any): feature value
+        """
+        try:
+            feat_value = float(feat_value)
+        except ValueError:
+            # Don't do bucketing of non numerical features
+            return "{}={}".format(feat_name, feat_value)
+        mapper = self.features.get(feat_name)
+        if mapper is None:
+            return "{}={}".format(feat_name, feat_value)
+        return "{}={}".format(feat_name, mapper.map_bucket(feat_value))
+
     def fit_transform(self, X_train):
         """
         Run fit and transform at once.
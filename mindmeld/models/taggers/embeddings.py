@@ -10,10 +10,15 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+import hashlib
+import json
 import logging
 import os
 import pickle
+import shutil
+import tempfile
 import zipfile
+from collections.abc import Mapping
 from urllib.request import urlretrieve
 
 import numpy as np
@@ -21,6 +26,7 @@ from tqdm import tqdm
 
 from ...exceptions import EmbeddingDownloadError
 from ...path import (
+    BINARY_EMBEDDINGS_FOLDER_PATH,
     EMBEDDINGS_FILE_PATH,
     EMBEDDINGS_FOLDER_PATH,
     PREVIOUSLY_USED_CHAR_EMBEDDINGS_FILE_PATH,
@@ -33,6 +39,15 @@ GLOVE_DOWNLOAD_LINK = "http://nlp.stanford.edu/data/glove.6B.zip"
 EMBEDDING_FILE_PATH_TEMPLATE = "glove.6B.{}d.txt"
 ALLOWED_WORD_EMBEDDING_DIMENSIONS = [50, 100, 200, 300]
 
+# The version of the binary embeddings format, which is a vocabulary file with a word on each line
+# and a file with the float32 embedding of each word in the same order
+BINARY_EMBEDDINGS_FORMAT = 1
+BINARY_EMBEDDINGS_VOCAB_FILE = "vocab.txt"
+BINARY_EMBEDDINGS_VECTORS_FILE = "vectors.f32"
+BINARY_EMBEDDINGS_METADATA_FILE = "metadata.json"
+# The number of lines parsed at once when converting embeddings to the binary format
+EMBEDDINGS_CONVERSION_CHUNK_SIZE = 10000
+
 
 class TqdmUpTo(tqdm):
     """Provides `update_to(n)` which uses `tqdm.update(delta_n)`."""
@@ -50,9 +65,39 @@ class TqdmUpTo(tqdm):
         self.update(b * bsize - self.n)  # will also set self.n = b * bsize
 
 
+class PretrainedEmbeddings(Mapping):
+    """A read-only mapping of words to their pretrained embeddings, backed by the rows of an
+    embedding matrix."""
+
+    def __init__(self, vocab, embeddings):
+        self._vocab = vocab
+        self._embeddings = embeddings
+
+    def __getitem__(self, word):
+        if isinstance(word, bytes):
+            word = word.decode("utf-8")
+        return self._embeddings[self._vocab[word]]
+
+    def __contains__(self, word):
+        if isinstance(word, bytes):
+            word = word.decode("utf-8")
+        return word in self._vocab
+
+    def __iter__(self):
+        return iter(self._vocab)
+
+    def __len__(self):
+        return len(self._vocab)
+
+
 class GloVeEmbeddingsContainer:
     """This class is responsible for the downloading, extraction and storing of
-    word embeddings based on the GloVe format."""
+    word embeddings based on the GloVe format.
+
+    The embeddings are converted once to a binary format, with a vocabulary which maps each word
+    to a row of a float32 matrix. The matrix is memory mapped, so the processes using the same
+    embeddings share its pages instead of each parsing the text file.
+    """
 
     def __init__(self, token_dimension=300, token_pretrained_embedding_filepath=None):
 
@@ -70,16 +115,17 @@ class GloVeEmbeddingsContainer:
             )
             self.token_dimension = 300
 
-        self.word_to_embedding = {}
+        self.vocab = {}
+        self.embeddings = np.zeros((0, self.token_dimension), dtype=np.float32)
         self._extract_embeddings()
 
     def get_pretrained_word_to_embeddings_dict(self):
-        """Returns the word to embedding dict.
+        """Returns the word to embedding mapping.
 
         Returns:
-            (dict): word to embedding mapping.
+            (Mapping): word to embedding mapping.
         """
-        return self.word_to_embedding
+        return PretrainedEmbeddings(self.vocab, self.embeddings)
 
     def _download_embeddings_and_return_zip_handle(self):
 
@@ -120,30 +166,153 @@ class GloVeEmbeddingsContainer:
 
             return zip_file_object
 
-    def _extract_and_map(self, glove_file):
-        for line in glove_file:
-            values = line.split()
-            word = values[0]
-            coefs = np.asarray(values[1:], dtype="float32")
-            self.word_to_embedding[word] = coefs
+    def _extract_and_map(self, glove_file, binary_path, source_path):
+        """Converts the embeddings in a GloVe text file to the binary format and maps them.
+
+        Args:
+            glove_file (file): The GloVe text file, opened in text or binary mode
+            binary_path (str): The folder to write the binary embeddings to
+            source_path (str): The path of the file the embeddings are read from
+        """
+        parent_folder = os.path.dirname(binary_path)
+        if not os.path.isdir(parent_folder):
+            os.makedirs(parent_folder)
+
+        # The embeddings are written to a temporary folder which is moved into place once it is
+        # complete, so other processes never read a partially converted file
+        temp_path = tempfile.mkdtemp(dir=parent_folder)
+        try:
+            num_words = 0
+            dimension = None
+            vocab_path = os.path.join(temp_path, BINARY_EMBEDDINGS_VOCAB_FILE)
+            vectors_path = os.path.join(temp_path, BINARY_EMBEDDINGS_VECTORS_FILE)
+            with open(vocab_path, "w", encoding="utf-8") as vocab_file, open(
+                vectors_path, "wb"
+            ) as vectors_file:
+                words, vectors = [], []
+                for line in glove_file:
+                    if isinstance(line, bytes):
+                        line = line.decode("utf-8")
+                    values = line.split()
+                    if dimension is None:
+                        # the dimension of the embeddings is the one of the first line
+                        dimension = len(values) - 1
+                    if len(values) != dimension + 1:
+                        continue
+                    words.append(values[0])
+                    vectors.append(values[1:])
+                    if len(words) == EMBEDDINGS_CONVERSION_CHUNK_SIZE:
+                        num_words += self._write_chunk(words, vectors, vocab_file, vectors_file)
+                        words, vectors = [], []
+                num_words += self._write_chunk(words, vectors, vocab_file, vectors_file)
+
+            with open(os.path.join(temp_path, BINARY_EMBEDDINGS_METADATA_FILE), "w") as fp:
+                metadata = self._get_binary_metadata(source_path)
+                metadata.update(
+                    {"num_words": num_words, "dimension": dimension or self.token_dimension}
+                )
+                json.dump(metadata, fp)
+
+            if os.path.isdir(binary_path):
+                shutil.rmtree(binary_path, ignore_errors=True)
+            try:
+                os.replace(temp_path, binary_path)
+            except OSError:
+                # another process converted the same embeddings at the same time
+                logger.debug("Using binary embeddings converted by another process")
+        finally:
+            shutil.rmtree(temp_path, ignore_errors=True)
+
+        if not self._map_binary_embeddings(binary_path, source_path):
+            raise IOError("Could not read the binary embeddings in {}".format(binary_path))
+
+    @staticmethod
+    def _write_chunk(words, vectors, vocab_file, vectors_file):
+        if not words:
+            return 0
+        for word in words:
+            vocab_file.write(word + "\n")
+        np.asarray(vectors, dtype=np.float32).tofile(vectors_file)
+        return len(words)
+
+    @staticmethod
+    def _get_binary_metadata(source_path):
+        stat = os.stat(source_path)
+        return {
+            "format": BINARY_EMBEDDINGS_FORMAT,
+            "source_size": stat.st_size,
+            "source_mtime": stat.st_mtime,
+        }
+
+    def _map_binary_embeddings(self, binary_path, source_path):
+        """Maps the binary embeddings converted from a source file, if they are up to date.
+
+        Args:
+            binary_path (str): The folder of the binary embeddings
+            source_path (str): The path of the file the embeddings were converted from
+
+        Returns:
+            bool: Whether the embeddings were mapped
+        """
+        try:
+            with open(os.path.join(binary_path, BINARY_EMBEDDINGS_METADATA_FILE)) as fp:
+                metadata = json.load(fp)
+            num_words = metadata.pop("num_words")
+            dimension = metadata.pop("dimension")
+            if metadata != self._get_binary_metadata(source_path):
+                return False
+
+            with open(
+                os.path.join(binary_path, BINARY_EMBEDDINGS_VOCAB_FILE), encoding="utf-8"
+            ) as vocab_file:
+                words = vocab_file.read().split("\n")[:num_words]
+            if num_words:
+                embeddings = np.memmap(
+                    os.path.join(binary_path, BINARY_EMBEDDINGS_VECTORS_FILE),
+                    dtype=np.float32,
+                    mode="r",
+                    shape=(num_words, dimension),
+                )
+            else:
+                embeddings = np.zeros((0, dimension), dtype=np.float32)
+        except (IOError, OSError, ValueError, KeyError):
+            return False
+
+        if len(words) != num_words:
+            return False
+        # later occurrences of a word take precedence, as in the text file
+        self.vocab = {word: row for row, word in enumerate(words)}
+        self.embeddings = embeddings
+        self.token_dimension = dimension
+        return True
+
+    def _get_binary_path(self, source_path, name):
+        digest = hashlib.sha1(os.path.abspath(source_path).encode("utf-8")).hexdigest()
+        return os.path.join(BINARY_EMBEDDINGS_FOLDER_PATH, "{}-{}".format(name, digest[:12]))
 
     def _extract_embeddings(self):
         file_location = self.token_pretrained_embedding_filepath
 
         if file_location and os.path.isfile(file_location):
+            binary_path = self._get_binary_path(file_location, os.path.basename(file_location))
+            if self._map_binary_embeddings(binary_path, file_location):
+                return
             logger.info(
                 "Extracting embeddings from provided " "file location %s.",
                 str(file_location),
             )
-            with open(file_location, "r") as embedding_file:
-                self._extract_and_map(embedding_file)
+            with open(file_location, "r", encoding="utf-8") as embedding_file:
+                self._extract_and_map(embedding_file, binary_path, file_location)
             return
 
         logger.info("Provided file location %s does not exist.", str(file_location))
 
         file_name = EMBEDDING_FILE_PATH_TEMPLATE.format(self.token_dimension)
+        binary_path = self._get_binary_path(EMBEDDINGS_FILE_PATH, file_name)
 
         if os.path.isfile(EMBEDDINGS_FILE_PATH):
+            if self._map_binary_embeddings(binary_path, EMBEDDINGS_FILE_PATH):
+                return
             logger.info(
                 "Extracting embeddings from default folder " "location %s.",
                 EMBEDDINGS_FILE_PATH,
@@ -152,7 +321,7 @@ class GloVeEmbeddingsContainer:
             try:
                 zip_file_object = zipfile.ZipFile(EMBEDDINGS_FILE_PATH, "r")
                 with zip_file_object.open(file_name) as embedding_file:
-                    self._extract_and_map(embedding_file)
+                    self._extract_and_map(embedding_file, binary_path, EMBEDDINGS_FILE_PATH)
             except zipfile.BadZipFile:
                 logger.warning(
                     "%s is corrupt. Deleting the zip file and attempting to"
@@ -178,7 +347,7 @@ class GloVeEmbeddingsContainer:
             raise EmbeddingDownloadError("Failed to download embeddings.")
 
         with zip_file_object.open(file_name) as embedding_file:
-            self._extract_and_map(embedding_file)
+            self._extract_and_map(embedding_file, binary_path, EMBEDDINGS_FILE_PATH)
         return
 
 
@@ -206,10 +375,25 @@ class WordSequenceEmbedding:
         self.token_embedding_dimension = token_embedding_dimension
         self.sequence_padding_length = sequence_padding_length
 
-        self.token_to_embedding_mapping = GloVeEmbeddingsContainer(
+        container = GloVeEmbeddingsContainer(
             token_embedding_dimension, token_pretrained_embedding_filepath
-        ).get_pretrained_word_to_embeddings_dict()
+        )
+        if container.token_dimension == self.token_embedding_dimension:
+            self._pretrained_vocab = container.vocab
+            self._pretrained_embeddings = container.embeddings
+        else:
+            logger.warning(
+                "Not using the pretrained embeddings, as their dimension %s does not match "
+                "the token embedding dimension %s",
+                container.token_dimension,
+                self.token_embedding_dimension,
+            )
+            self._pretrained_vocab = {}
+            self._pretrained_embeddings = None
 
+        # The embeddings of the words which are not pretrained
+        self.token_to_embedding_mapping = {}
+        self._dirty = False
         self._add_historic_embeddings()
 
         self.use_padding = use_padding
@@ -221,23 +405,35 @@ class WordSequenceEmbedding:
             token_sequence (list): A sequence of tokens.
 
         Returns:
-            (list): Encoded sequence of tokens.
+            (ndarray): Encoded sequence of tokens.
         """
-        default_encoding = np.zeros(self.token_embedding_dimension)
         if self.use_padding:
-            encoded_query = [default_encoding] * self.sequence_padding_length
+            token_sequence = token_sequence[: self.sequence_padding_length]
+            encoded_query = np.zeros(
+                (self.sequence_padding_length, self.token_embedding_dimension),
+                dtype=np.float32,
+            )
         else:
-            encoded_query = [default_encoding] * len(token_sequence)
+            encoded_query = np.zeros(
+                (len(token_sequence), self.token_embedding_dimension), dtype=np.float32
+            )
 
+        pretrained_indices = []
+        pretrained_rows = []
         for idx, token in enumerate(token_sequence):
-            if idx >= self.sequence_padding_length and self.use_padding:
-                break
-            encoded_query[idx] = self._encode_token(token)
+            row = self._pretrained_vocab.get(token)
+            if row is None:
+                encoded_query[idx] = self._encode_token(token)
+            else:
+                pretrained_indices.append(idx)
+                pretrained_rows.append(row)
+        if pretrained_rows:
+            encoded_query[pretrained_indices] = self._pretrained_embeddings[pretrained_rows]
 
         return encoded_query
 
     def _encode_token(self, token):
-        """Encodes a token to its corresponding embedding
+        """Encodes a token which is not pretrained to its corresponding embedding
 
         Args:
             token (str): Individual token
@@ -250,6 +446,7 @@ class WordSequenceEmbedding:
                 -1, 1, size=(self.token_embedding_dimension,)
             )
             self.token_to_embedding_mapping[token] = random_vector
+            self._dirty = True
         return self.token_to_embedding_mapping[token]
 
     def _add_historic_embeddings(self):
@@ -262,16 +459,22 @@ class WordSequenceEmbedding:
             pkl_file.close()
 
         for word in historic_word_embeddings:
+            # Older files also hold the pretrained embeddings, which are mapped already
+            if isinstance(word, bytes) or word in self._pretrained_vocab:
+                continue
             if len(historic_word_embeddings[word]) == self.token_embedding_dimension:
                 self.token_to_embedding_mapping[word] = historic_word_embeddings.get(
                     word
                 )
 
     def save_embeddings(self):
-        """Save extracted embeddings to historic pickle file."""
+        """Save the embeddings of the words which are not pretrained to historic pickle file."""
+        if not self._dirty and os.path.exists(PREVIOUSLY_USED_WORD_EMBEDDINGS_FILE_PATH):
+            return
         output = open(PREVIOUSLY_USED_WORD_EMBEDDINGS_FILE_PATH, "wb")
         pickle.dump(self.token_to_embedding_mapping, output)
         output.close()
+        self._dirty = False
 
 
 class CharacterSequenceEmbedding:
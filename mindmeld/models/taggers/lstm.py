@@ -93,6 +93,12 @@ class LstmModel(Tagger):  # pylint: disable=too-many-instance-attributes
             lstm_output_keep_prob: The dropout rate of the outputs of the LSTM cell (float)
 
             gaz_encoding_dimension: The gazetteer encoding dimension (int)
+
+            inference_batch_size: The maximum number of queries in each batch at predict
+                time (int)
+
+            inference_length_bucket_size: The range of sequence lengths of the queries which
+                are batched together at predict time (int)
         """
         self.number_of_epochs = parameters.get("number_of_epochs", 20)
         self.batch_size = parameters.get("batch_size", 20)
@@ -128,6 +134,11 @@ class LstmModel(Tagger):  # pylint: disable=too-many-instance-attributes
             "word_level_character_embedding_size", 40
         )
 
+        self.inference_batch_size = parameters.get("inference_batch_size", 256)
+        self.inference_length_bucket_size = parameters.get(
+            "inference_length_bucket_size", 4
+        )
+
     def get_params(self, deep=True):
         return self.__dict__
 
@@ -244,7 +255,7 @@ class LstmModel(Tagger):  # pylint: disable=too-many-instance-attributes
             x_sequence_embeddings_arr,
             self.gaz_features_arr,
             self.char_features_arr,
-        ) = self._get_features(examples)
+        ) = self._get_features(examples, use_buffers=not y)
 
         self.sequence_lengths = self._extract_seq_length(examples)
 
@@ -259,9 +270,11 @@ class LstmModel(Tagger):  # pylint: disable=too-many-instance-attributes
 
         self.graph = tf.Graph()
         self.saver = None
+        self._feature_buffers = {}
 
         self.example_type = config.example_type
         self.features = config.features
+        self.feature_extractors = config.get_feature_extractors()
 
         self.query_encoder = WordSequenceEmbedding(
             self.padding_length,
@@ -699,11 +712,14 @@ class LstmModel(Tagger):  # pylint: disable=too-many-instance-attributes
 
         return seq_lengths
 
-    def _get_features(self, examples):
+    def _get_features(self, examples, use_buffers=False):
         """Extracts the word and gazetteer embeddings from the input examples
 
         Args:
             examples (list of mindmeld.core.Query): a list of queries
+            use_buffers (bool, optional): Whether to write the gazetteer and character features
+                into arrays which are reused across calls instead of new arrays. The arrays are
+                overwritten by the next call, so this is only used at predict time.
 
         Returns:
             (tuple): Word embeddings and Gazetteer one-hot embeddings
@@ -711,11 +727,24 @@ class LstmModel(Tagger):  # pylint: disable=too-many-instance-attributes
         x_feats_array = []
         gaz_feats_array = []
         char_feats_array = []
-        for example in examples:
+        for index, example in enumerate(examples):
             x_feat, gaz_feat, char_feat = self._extract_features(example)
             x_feats_array.append(x_feat)
-            gaz_feats_array.append(gaz_feat)
-            char_feats_array.append(char_feat)
+            if use_buffers:
+                if index == 0:
+                    gaz_feats_array = self._get_feature_buffer(
+                        "gaz", (len(examples),) + np.shape(gaz_feat)
+                    )
+                    if self.use_char_embeddings:
+                        char_feats_array = self._get_feature_buffer(
+                            "char", (len(examples),) + np.shape(char_feat)
+                        )
+                gaz_feats_array[index] = gaz_feat
+                if self.use_char_embeddings:
+                    char_feats_array[index] = char_feat
+            else:
+                gaz_feats_array.append(gaz_feat)
+                char_feats_array.append(char_feat)
 
         # save all the embeddings used for model saving purposes
         self.query_encoder.save_embeddings()
@@ -730,6 +759,24 @@ class LstmModel(Tagger):  # pylint: disable=too-many-instance-attributes
 
         return x_feats_array, gaz_feats_array, char_feats_array
 
+    def _get_feature_buffer(self, name, shape):
+        """Gets a preallocated array for the features of a set of queries. The array is kept
+        and grown as needed, so that predicting does not allocate new feature arrays.
+
+        Args:
+            name (str): The name of the features
+            shape (tuple): The shape of the features of all the queries
+
+        Returns:
+            (ndarray): A view of the buffer with the given shape
+        """
+        buffer = self._feature_buffers.get(name)
+        if buffer is None or buffer.shape[0] < shape[0] or buffer.shape[1:] != shape[1:]:
+            capacity = max(shape[0], int(self.inference_batch_size))
+            buffer = np.zeros((capacity,) + tuple(shape[1:]), dtype=np.float32)
+            self._feature_buffers[name] = buffer
+        return buffer[: shape[0]]
+
     def _gaz_transform(self, list_of_tokens_to_transform):
         """This function is used to handle special logic around SKLearn's LabelBinarizer
         class which behaves in a non-standard way for 2 classes. In a 2 class system,
@@ -761,7 +808,11 @@ class LstmModel(Tagger):  # pylint: disable=too-many-instance-attributes
         default_gaz_one_hot = self._gaz_transform([DEFAULT_GAZ_LABEL]).tolist()[0]
         extracted_gaz_tokens = [default_gaz_one_hot] * self.padding_length
         extracted_sequence_features = extract_sequence_features(
-            example, self.example_type, self.features, self.resources
+            example,
+            self.example_type,
+            self.features,
+            self.resources,
+            feature_extractors=self.feature_extractors,
         )
 
         for index, extracted_gaz in enumerate(extracted_sequence_features):
@@ -875,14 +926,39 @@ class LstmModel(Tagger):  # pylint: disable=too-many-instance-attributes
                     )
         return self
 
-    def _predict(self, X):
-        """Predicts tags for query sequence
+    def _get_inference_batches(self, seq_len_arr):
+        """Groups the queries into buckets of similar sequence lengths, and splits each bucket
+        into batches of at most inference_batch_size queries.
 
         Args:
-            X (list of list of list of str): a list of input representations
+            seq_len_arr (ndarray): The sequence length of each query
 
         Returns:
-            (list): A list of decoded labelled predicted by the model
+            (list of ndarray): The indices of the queries in each batch
+        """
+        bucket_size = max(int(self.inference_length_bucket_size), 1)
+        batch_size = max(int(self.inference_batch_size), 1)
+        buckets = np.maximum(seq_len_arr - 1, 0) // bucket_size
+        order = np.argsort(buckets, kind="stable")
+        sorted_buckets = buckets[order]
+
+        batches = []
+        for bucket in np.unique(sorted_buckets):
+            bucket_indices = order[sorted_buckets == bucket]
+            for start in range(0, len(bucket_indices), batch_size):
+                batches.append(bucket_indices[start : start + batch_size])
+        return batches
+
+    def _run_inference(self, X):
+        """Runs the network on the input representations. The bidirectional RNN stops at the
+        longest sequence of a batch, so queries are run in batches of similar lengths. A set of
+        queries which fits in a single batch is run with one call, as before.
+
+        Args:
+            X (ndarray): The input representations of the queries
+
+        Returns:
+            (ndarray): The softmax output of each token of each query
         """
         seq_len_arr = np.array(self.sequence_lengths)
 
@@ -891,17 +967,43 @@ class LstmModel(Tagger):  # pylint: disable=too-many-instance-attributes
         self.lstm_input_keep_prob = 1.0
         self.lstm_output_keep_prob = 1.0
 
-        output = self.session.run(
-            [self.lstm_output_softmax_tf],
-            feed_dict=self.construct_feed_dictionary(
-                X, self.char_features_arr, self.gaz_features_arr, seq_len_arr
-            ),
-        )
+        output_shape = [-1, int(self.padding_length), self.output_dimension]
+        batches = self._get_inference_batches(seq_len_arr)
+        if len(batches) <= 1:
+            output = self.session.run(
+                [self.lstm_output_softmax_tf],
+                feed_dict=self.construct_feed_dictionary(
+                    X, self.char_features_arr, self.gaz_features_arr, seq_len_arr
+                ),
+            )
+            return np.reshape(output, output_shape)
 
-        output = np.reshape(
-            output, [-1, int(self.padding_length), self.output_dimension]
+        output = np.empty(
+            (len(X), int(self.padding_length), self.output_dimension), dtype=np.float32
         )
-        output = np.argmax(output, 2)
+        for indices in batches:
+            batch_output = self.session.run(
+                self.lstm_output_softmax_tf,
+                feed_dict=self.construct_feed_dictionary(
+                    X[indices],
+                    self.char_features_arr[indices] if self.use_char_embeddings else [],
+                    self.gaz_features_arr[indices],
+                    seq_len_arr[indices],
+                ),
+            )
+            output[indices] = np.reshape(batch_output, output_shape)
+        return output
+
+    def _predict(self, X):
+        """Predicts tags for query sequence
+
+        Args:
+            X (list of list of list of str): a list of input representations
+
+        Returns:
+            (list): A list of decoded labelled predicted by the model
+        """
+        output = np.argmax(self._run_inference(X), 2)
 
         decoded_queries = []
         for idx, encoded_predict in enumerate(output):
@@ -922,23 +1024,7 @@ class LstmModel(Tagger):  # pylint: disable=too-many-instance-attributes
             (list): A list of decoded labelled predicted by the model with confidence scores
         """
 
-        seq_len_arr = np.array(self.sequence_lengths)
-
-        # During predict time, we make sure no nodes are dropped out
-        self.dense_keep_probability = 1.0
-        self.lstm_input_keep_prob = 1.0
-        self.lstm_output_keep_prob = 1.0
-
-        output = self.session.run(
-            [self.lstm_output_softmax_tf],
-            feed_dict=self.construct_feed_dictionary(
-                X, self.char_features_arr, self.gaz_features_arr, seq_len_arr
-            ),
-        )
-
-        output = np.reshape(
-            output, [-1, int(self.padding_length), self.output_dimension]
-        )
+        output = self._run_inference(X)
         class_output = np.argmax(output, 2)
 
         decoded_queries = []
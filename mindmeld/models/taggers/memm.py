@@ -17,16 +17,21 @@ This module contains the Memm entity recognizer.
 import logging
 
 import numpy as np
+import scipy.sparse as sp
 from sklearn.feature_extraction import DictVectorizer
 from sklearn.feature_selection import SelectFromModel, SelectPercentile
 from sklearn.linear_model import LogisticRegression
 from sklearn.preprocessing import LabelEncoder as SKLabelEncoder
 from sklearn.preprocessing import MaxAbsScaler, StandardScaler
+from sklearn.utils.extmath import safe_sparse_dot
 
 from .taggers import START_TAG, Tagger, extract_sequence_features
 
 logger = logging.getLogger(__name__)
 
+GREEDY_DECODER = "greedy"
+VITERBI_DECODER = "viterbi"
+
 
 class MemmModel(Tagger):
     """A maximum-entropy Markov model."""
@@ -43,6 +48,7 @@ class MemmModel(Tagger):
 
     def fit(self, X, y):
         self._clf.fit(X, y)
+        self._prev_tag_scores = None
         return self
 
     def set_params(self, **parameters):
@@ -70,7 +76,11 @@ class MemmModel(Tagger):
             (list[dict]): Features.
         """
         return extract_sequence_features(
-            example, config.example_type, config.features, resources
+            example,
+            config.example_type,
+            config.features,
+            resources,
+            feature_extractors=config.get_feature_extractors(),
         )
 
     def extract_features(self, examples, config, resources, y=None, fit=True):
@@ -112,47 +122,180 @@ class MemmModel(Tagger):
 
     def extract_and_predict(self, examples, config, resources):
         return [
-            self._predict_example(example, config, resources) for example in examples
+            [tag for tag, _ in tags_probas]
+            for tags_probas in self._decode(examples, config, resources)
         ]
 
-    def _predict_example(self, example, config, resources):
-        features_by_segment = self.extract_example_features(example, config, resources)
-        if len(features_by_segment) == 0:
-            return []
+    def predict_proba(self, examples, config, resources):
+        return [
+            [list(tag_proba) for tag_proba in tags_probas]
+            for tags_probas in self._decode(
+                examples, config, resources, include_proba=True
+            )
+        ]
 
-        predicted_tags = []
-        prev_tag = START_TAG
-        for features in features_by_segment:
-            features["prev_tag"] = prev_tag
-            X, _ = self._preprocess_data([features])
-            prediction = self.predict(X)
-            predicted_tag = self.class_encoder.inverse_transform(prediction)[0]
-            predicted_tags.append(predicted_tag)
-            prev_tag = predicted_tag
+    def _decode(self, examples, config, resources, include_proba=False):
+        """Predicts the tags of a batch of examples.
 
-        return predicted_tags
+        The features which do not depend on the previous tag are vectorized once for all the
+        tokens in the batch. Since the feature scaling and selection only transform each column
+        independently, the score of a tag is the sum of the score of these features and the
+        score of the previous tag, which is precomputed for every tag.
 
-    def predict_proba(self, examples, config, resources):
-        return [
-            self._predict_proba_example(example, config, resources)
+        Args:
+            examples (list of core.Query): The examples.
+            config (ModelConfig): The ModelConfig which may contain information used for feature
+                                  extraction
+            resources (dict): Resources which may be used for this model's feature extraction
+            include_proba (bool, optional): Whether to compute the probability of each tag
+
+        Returns:
+            (list of list of tuple): The (tag, probability) pairs for each token of each \
+                example. The probabilities are None unless include_proba is set.
+        """
+        features_by_example = [
+            self.extract_example_features(example, config, resources)
             for example in examples
         ]
+        token_features = [
+            features
+            for example_features in features_by_example
+            for features in example_features
+        ]
+        if not token_features:
+            return [[] for _ in examples]
+
+        token_X, _ = self._preprocess_data(token_features)
+        prev_tag_X, prev_tag_scores = self._get_prev_tag_scores()
+        token_scores = self._get_scores(token_X)
+
+        # The index of each class in the prev_tag rows, the last row is the start tag
+        start_index = len(self._clf.classes_)
+        # models pickled before the decoder setting was added decode greedily
+        decoder = getattr(self, "_decoder", GREEDY_DECODER)
+        if decoder == VITERBI_DECODER:
+            log_probas = np.log(self._get_transition_probas(token_X, prev_tag_X))
+
+        predictions = []
+        prev_indices = []
+        offset = 0
+        for example_features in features_by_example:
+            length = len(example_features)
+            if decoder == VITERBI_DECODER and length:
+                indices = self._viterbi(log_probas[offset : offset + length], start_index)
+            else:
+                indices = self._greedy(
+                    token_scores[offset : offset + length], prev_tag_scores, start_index
+                )
+            predictions.append(indices)
+            prev_indices.extend(([start_index] + indices)[:length])
+            offset += length
+
+        flat_indices = [index for indices in predictions for index in indices]
+        tags = self.class_encoder.inverse_transform(self._clf.classes_[flat_indices])
+        if include_proba:
+            probas = self._get_probas(token_X, prev_tag_X, prev_indices)
+            probas = probas[np.arange(len(flat_indices)), flat_indices]
+        else:
+            probas = [None] * len(flat_indices)
+
+        tags_probas = iter(zip(tags, probas))
+        return [[next(tags_probas) for _ in indices] for indices in predictions]
+
+    @staticmethod
+    def _greedy(token_scores, prev_tag_scores, start_index):
+        indices = []
+        prev_index = start_index
+        for scores in token_scores:
+            prev_index = int(np.argmax(scores + prev_tag_scores[prev_index]))
+            indices.append(prev_index)
+        return indices
+
+    @staticmethod
+    def _viterbi(log_probas, start_index):
+        """Finds the most likely tag sequence.
+
+        Args:
+            log_probas (numpy.ndarray): The log probability of each tag given each previous tag \
+                for each token, with shape (tokens, previous tags, tags)
+            start_index (int): The index of the start tag in the previous tags
+
+        Returns:
+            (list of int): The indices of the tags
+        """
+        path_scores = log_probas[0, start_index]
+        backpointers = []
+        for token_log_probas in log_probas[1:]:
+            candidate_scores = path_scores[:, None] + token_log_probas[:start_index]
+            backpointers.append(np.argmax(candidate_scores, axis=0))
+            path_scores = np.max(candidate_scores, axis=0)
+
+        indices = [int(np.argmax(path_scores))]
+        for token_backpointers in reversed(backpointers):
+            indices.append(int(token_backpointers[indices[-1]]))
+        indices.reverse()
+        return indices
+
+    def _get_prev_tag_scores(self):
+        """Gets the feature vectors of the previous tags and their contribution to the score of
+        each tag. The rows are ordered like the classes of the model, followed by the start tag.
+
+        Returns:
+            (tuple): The feature matrix and the score matrix of the previous tags
+        """
+        if getattr(self, "_prev_tag_scores", None) is None:
+            prev_tags = list(
+                self.class_encoder.inverse_transform(self._clf.classes_)
+            ) + [START_TAG]
+            prev_tag_X, _ = self._preprocess_data(
+                [{"prev_tag": prev_tag} for prev_tag in prev_tags]
+            )
+            self._prev_tag_scores = (
+                prev_tag_X,
+                self._get_scores(prev_tag_X, include_intercept=False),
+            )
+        return self._prev_tag_scores
 
-    def _predict_proba_example(self, example, config, resources):
-        features_by_segment = self.extract_example_features(example, config, resources)
-        if len(features_by_segment) == 0:
-            return []
-
-        prev_tag = START_TAG
-        seq_log_probs = []
-        for features in features_by_segment:
-            features["prev_tag"] = prev_tag
-            X, _ = self._preprocess_data([features])
-            prediction = self._clf.predict_proba(X)[0]
-            predicted_tag = np.argmax(prediction)
-            prev_tag = self.class_encoder.inverse_transform(predicted_tag)
-            seq_log_probs.append([prev_tag, prediction[predicted_tag]])
-        return seq_log_probs
+    def _get_scores(self, X, include_intercept=True):
+        """Gets the score of each class, whose largest value is the predicted class."""
+        scores = safe_sparse_dot(X, self._clf.coef_.T, dense_output=True)
+        if include_intercept:
+            scores = scores + self._clf.intercept_
+        if scores.shape[1] == 1:
+            # binary models score the positive class only
+            scores = np.hstack([np.zeros_like(scores), scores])
+        return scores
+
+    def _get_probas(self, token_X, prev_tag_X, prev_indices):
+        """Gets the class probabilities of each token given its previous tag.
+
+        Args:
+            token_X (sparse matrix): The features of the tokens without the previous tag
+            prev_tag_X (sparse matrix): The features of the previous tags
+            prev_indices (list of int): The index of the previous tag of each token
+
+        Returns:
+            (numpy.ndarray): The probabilities with shape (tokens, classes)
+        """
+        return self._clf.predict_proba(token_X + prev_tag_X[prev_indices])
+
+    def _get_transition_probas(self, token_X, prev_tag_X):
+        """Gets the class probabilities of each token given each of the previous tags.
+
+        Args:
+            token_X (sparse matrix): The features of the tokens without the previous tag
+            prev_tag_X (sparse matrix): The features of the previous tags
+
+        Returns:
+            (numpy.ndarray): The probabilities with shape (tokens, previous tags, classes)
+        """
+        num_tokens = token_X.shape[0]
+        num_prev_tags = prev_tag_X.shape[0]
+        X = sp.vstack([token_X] * num_prev_tags, format="csr") + prev_tag_X[
+            np.repeat(np.arange(num_prev_tags), num_tokens)
+        ]
+        probas = self._clf.predict_proba(X)
+        return probas.reshape(num_prev_tags, num_tokens, -1).transpose(1, 0, 2)
 
     @staticmethod
     def _get_feature_selector(selector_type):
@@ -182,9 +325,17 @@ class MemmModel(Tagger):
         if config.model_settings is None:
             selector_type = None
             scale_type = None
+            decoder = GREEDY_DECODER
         else:
             selector_type = config.model_settings.get("feature_selector")
             scale_type = config.model_settings.get("feature_scaler")
+            decoder = config.model_settings.get("decoder", GREEDY_DECODER)
+        if decoder not in (GREEDY_DECODER, VITERBI_DECODER):
+            raise ValueError(
+                "{}: Decoder {!r} not recognized".format(self.__class__.__name__, decoder)
+            )
+        self._decoder = decoder
+        self._prev_tag_scores = None
         self.class_encoder = SKLabelEncoder()
         self.feat_vectorizer = DictVectorizer()
         self._feat_selector = self._get_feature_selector(selector_type)
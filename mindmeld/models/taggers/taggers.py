@@ -14,7 +14,6 @@
 """
 This module contains all code required to perform sequence tagging.
 """
-import copy
 import logging
 
 from ...core import (
@@ -26,7 +25,7 @@ from ...core import (
 )
 from ...markup import MarkupError
 from ...system_entity_recognizer import SystemEntityResolutionError
-from ..helpers import ENABLE_STEMMING, get_feature_extractor
+from ..helpers import compile_feature_extractors
 
 logger = logging.getLogger(__name__)
 
@@ -579,7 +578,9 @@ def get_boundary_counts(expected_sequence, predicted_sequence, boundary_counts):
     return boundary_counts
 
 
-def extract_sequence_features(example, example_type, feature_config, resources):
+def extract_sequence_features(
+    example, example_type, feature_config, resources, feature_extractors=None
+):
     """Extracts feature dicts for each token in an example.
 
     Args:
@@ -587,22 +588,17 @@ def extract_sequence_features(example, example_type, feature_config, resources):
         example_type (str): The type of example
         feature_config (dict): The config for features
         resources (dict): Resources of this model
+        feature_extractors (tuple of function, optional): The feature extractors compiled from \
+            the feature config. They are compiled from the feature config if not specified.
 
     Returns:
         (list of dict): features
     """
-    feat_seq = []
-    workspace_features = copy.deepcopy(feature_config)
-    enable_stemming = workspace_features.pop(ENABLE_STEMMING, False)
-
-    for name, kwargs in workspace_features.items():
-        if callable(kwargs):
-            # a feature extractor function was passed in directly
-            feat_extractor = kwargs
-        else:
-            kwargs[ENABLE_STEMMING] = enable_stemming
-            feat_extractor = get_feature_extractor(example_type, name)(**kwargs)
+    if feature_extractors is None:
+        feature_extractors = compile_feature_extractors(example_type, feature_config)
 
+    feat_seq = []
+    for feat_extractor in feature_extractors:
         update_feat_seq = feat_extractor(example, resources)
         if not feat_seq:
             feat_seq = update_feat_seq
@@ -342,12 +342,17 @@ class TextModel(Model):
 
     def _predict_proba(self, X, predictor):
         predictions = []
+        decoded_classes = None
         for row in predictor(X):
+            if decoded_classes is None:
+                # the classes are decoded once for all the rows
+                decoded_classes = [
+                    self._label_encoder.decode([raw_class])[0]
+                    for raw_class in self._class_encoder.inverse_transform(range(len(row)))
+                ]
             probabilities = {}
             top_class = None
-            for class_index, proba in enumerate(row):
-                raw_class = self._class_encoder.inverse_transform([class_index])[0]
-                decoded_class = self._label_encoder.decode([raw_class])[0]
+            for decoded_class, proba in zip(decoded_classes, row):
                 probabilities[decoded_class] = proba
                 if proba > probabilities.get(top_class, -1.0):
                     top_class = decoded_class
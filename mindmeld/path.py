@@ -32,8 +32,11 @@ APP_PATH = "{app_path}"
 # Generated folder structure for models
 GEN_FOLDER = os.path.join(APP_PATH, ".generated")
 MODEL_CACHE_PATH = os.path.join(GEN_FOLDER, "cached_models")
-QUERY_CACHE_PATH = os.path.join(GEN_FOLDER, "query_cache.pkl")
-QUERY_CACHE_TMP_PATH = os.path.join(GEN_FOLDER, "query_cache_tmp.pkl")
+QUERY_CACHE_PATH = os.path.join(GEN_FOLDER, "query_cache.db")
+FINGERPRINTS_PATH = os.path.join(GEN_FOLDER, "fingerprints.json")
+# The query cache files written by MindMeld versions which pickled the whole cache
+LEGACY_QUERY_CACHE_PATH = os.path.join(GEN_FOLDER, "query_cache.pkl")
+LEGACY_QUERY_CACHE_TMP_PATH = os.path.join(GEN_FOLDER, "query_cache_tmp.pkl")
 DOMAIN_MODEL_PATH = os.path.join(GEN_FOLDER, "domain.pkl")
 GEN_DOMAINS_FOLDER = os.path.join(GEN_FOLDER, "domains")
 GEN_TIMESTAMP_FOLDER = os.path.join(MODEL_CACHE_PATH, "{timestamp}")
@@ -55,6 +58,7 @@ GAZETTEER_PATH = os.path.join(GEN_FOLDER, "gaz-{entity}.pkl")
 GEN_INDEXES_FOLDER = os.path.join(GEN_FOLDER, "indexes")
 GEN_INDEX_FOLDER = os.path.join(GEN_INDEXES_FOLDER, "{index}")
 RANKING_MODEL_PATH = os.path.join(GEN_INDEX_FOLDER, "ranking.pkl")
+KB_LOAD_CHECKPOINT_PATH = os.path.join(GEN_INDEX_FOLDER, "load_checkpoint.json")
 GEN_EMBEDDER_MODEL_PATH = os.path.join(
     GEN_INDEXES_FOLDER, "{embedder_type}_{model_name}_cache.pkl"
 )
@@ -120,6 +124,7 @@ DUCKLING_PATH_TO_MD5_MAPPINGS = {
 
 EMBEDDINGS_FOLDER_PATH = os.path.join(MINDMELD_ROOT, "data")
 EMBEDDINGS_FILE_PATH = os.path.join(EMBEDDINGS_FOLDER_PATH, "glove.6B.zip")
+BINARY_EMBEDDINGS_FOLDER_PATH = os.path.join(EMBEDDINGS_FOLDER_PATH, "binary")
 PREVIOUSLY_USED_CHAR_EMBEDDINGS_FILE_PATH = os.path.join(
     EMBEDDINGS_FOLDER_PATH, "previously_used_char_embeddings.pkl"
 )
@@ -518,6 +523,20 @@ def get_ranking_file_path(app_path, index):
     return RANKING_FILE_PATH.format(app_path=app_path, index=index)
 
 
+@safe_path
+def get_kb_load_checkpoint_path(app_path, index):
+    """Gets the path to the file which records the progress of loading a knowledge base index.
+
+    Args:
+        app_path (str): The path to the app data.
+        index (str): A knowledge base index under the application.
+
+    Returns:
+        (str) The path of the checkpoint file
+    """
+    return KB_LOAD_CHECKPOINT_PATH.format(app_path=app_path, index=index)
+
+
 @safe_path
 def get_embedder_cache_file_path(app_path, embedder_type, model_name):
     """Gets the path to the model_cache.json file for a given embedder model.
@@ -16,42 +16,64 @@ This module contains the query cache implementation.
 """
 import logging
 import os
-import shutil
-
-from sklearn.externals import joblib
+import pickle
+import sqlite3
+import threading
 
 from ._version import get_mm_version
-from .path import GEN_FOLDER, QUERY_CACHE_PATH, QUERY_CACHE_TMP_PATH
+from .path import GEN_FOLDER, QUERY_CACHE_PATH
 
 logger = logging.getLogger(__name__)
 
+# The version of the pickled query format, which changes when the layout of the core query
+# classes does, so caches written with an older layout are cleared
+QUERY_CACHE_FORMAT = "2"
+
 
 class QueryCache:
     """
-    An object that stores ProcessedQuery objects in memory to save time on reloading.
+    An object that stores ProcessedQuery objects on disk to save time on reloading.
     ProcessedQuery objects consist of the query itself, the domain/intent classifications,
     recognized entities in the query, and more.
+
+    The queries are stored in a SQLite database keyed by (domain, intent, query_text). Queries
+    are read from disk one key at a time when they are first requested, and new queries are
+    appended to the database when the cache is dumped. The cache is emptied when it was written by
+    a different MindMeld version or in a different query format.
     """
 
     def __init__(self, app_path):
         self.app_path = app_path
         self.is_dirty = False
-        # We initialize cached_queries to None instead of {} since
-        # we want to lazy load it from disk only when necessary ie during
+        # We open the database lazily, only when necessary ie during
         # set, get and dump ops. This allows us to run the application
         # faster.
-        self._cached_queries = None
+        self._connection = None
+        self._connection_pid = None
+        self._lock = threading.RLock()
+        # Queries which have been read from or added to the cache
+        self._memory = {}
+        # Queries which have been added to the cache but not written to disk yet
+        self._pending = {}
         self.gen_folder = GEN_FOLDER.format(app_path=self.app_path)
         self.main_cache_location = QUERY_CACHE_PATH.format(app_path=self.app_path)
-        self.tmp_cache_location = QUERY_CACHE_TMP_PATH.format(app_path=self.app_path)
 
     @property
     def cached_queries(self):
-        """A dictionary containing all the cached queries"""
-        if self._cached_queries is None:
-            self.load()
-
-        return self._cached_queries
+        """A dictionary containing all the cached queries. This reads the whole cache from disk,
+        so use it sparingly!"""
+        with self._lock:
+            queries = {}
+            connection = self._get_connection()
+            if connection:
+                rows = connection.execute(
+                    "SELECT domain, intent, query_text, processed_query FROM queries"
+                )
+                for domain, intent, query_text, data in rows:
+                    key = (domain, intent, query_text)
+                    queries[key] = self._memory.get(key) or pickle.loads(data)
+            queries.update(self._pending)
+            return queries
 
     @property
     def versioned_data(self):
@@ -69,11 +91,14 @@ class QueryCache:
             processed_query (ProcessedQuery): The ProcessedQuery \
                 object corresponding to the domain, intent and query_text
         """
-        if (domain, intent, query_text) in self.cached_queries:
-            return
+        key = (domain, intent, query_text)
+        with self._lock:
+            if self.get_value(domain, intent, query_text) is not None:
+                return
 
-        self.cached_queries[(domain, intent, query_text)] = processed_query
-        self.is_dirty = True
+            self._memory[key] = processed_query
+            self._pending[key] = processed_query
+            self.is_dirty = True
 
     def get_value(self, domain, intent, query_text):
         """
@@ -84,61 +109,187 @@ class QueryCache:
             intent (str): The intent
             query_text (str): The query text
         """
-        try:
-            return self.cached_queries[(domain, intent, query_text)]
-        except KeyError:
-            return
+        key = (domain, intent, query_text)
+        with self._lock:
+            try:
+                return self._memory[key]
+            except KeyError:
+                pass
+
+            connection = self._get_connection()
+            if not connection:
+                return
+            row = connection.execute(
+                "SELECT processed_query FROM queries "
+                "WHERE domain = ? AND intent = ? AND query_text = ?",
+                key,
+            ).fetchone()
+            if row is None:
+                return
+            processed_query = pickle.loads(row[0])
+            self._memory[key] = processed_query
+            return processed_query
 
     def dump(self):
         """
-        This function dumps the query cache mapping to disk. This operation is expensive,
-        so use it sparingly!
+        This function appends the queries added since the last dump to the cache on disk.
         """
-        if not self.is_dirty:
-            return
+        with self._lock:
+            if not self.is_dirty:
+                return
 
-        # make generated directory if necessary
-        if not os.path.isdir(self.gen_folder):
-            os.makedirs(self.gen_folder)
+            # make generated directory if necessary
+            if not os.path.isdir(self.gen_folder):
+                os.makedirs(self.gen_folder)
 
-        try:
-            # We write to a new cache temp file and then rename it to prevent file corruption
-            # due to the user cancelling the training operation midway during the
-            # file write.
-            joblib.dump(self.versioned_data, self.tmp_cache_location)
-            if os.path.isfile(self.main_cache_location):
-                os.remove(self.main_cache_location)
-            shutil.move(self.tmp_cache_location, self.main_cache_location)
-            self.is_dirty = False
-        except (OSError, IOError, KeyboardInterrupt):
-            if os.path.exists(self.main_cache_location):
-                os.remove(self.main_cache_location)
+            try:
+                connection = self._get_connection(create=True)
+                # The rows are written in a single transaction so that the cache is not corrupted
+                # when the user cancels the training operation midway during the write.
+                with connection:
+                    connection.executemany(
+                        "INSERT OR REPLACE INTO queries "
+                        "(domain, intent, query_text, processed_query) VALUES (?, ?, ?, ?)",
+                        (
+                            key + (pickle.dumps(value, pickle.HIGHEST_PROTOCOL),)
+                            for key, value in self._pending.items()
+                        ),
+                    )
+                self._pending = {}
+                self.is_dirty = False
+            except (sqlite3.Error, OSError, IOError, KeyboardInterrupt):
+                self._delete()
+                logger.error(
+                    "Couldn't dump query cache to disk properly, "
+                    "so deleting query cache due to possible corruption."
+                )
 
-            if os.path.exists(self.tmp_cache_location):
-                os.remove(self.tmp_cache_location)
+    def load(self):
+        """
+        Opens the generated query cache. Queries are read from disk when they are requested.
+        """
+        with self._lock:
+            self._memory = {}
+            self._pending = {}
+            self._close()
+            self._get_connection()
+            self.is_dirty = False
 
-            logger.error(
-                "Couldn't dump query cache to disk properly, "
-                "so deleting query cache due to possible corruption."
-            )
+    def compact(self, keys=None):
+        """
+        Removes queries from the cache on disk and reclaims the space they used.
 
-    def load(self):
+        Args:
+            keys (iterable, optional): The (domain, intent, query_text) keys to keep. If not \
+                specified, all the queries are kept and only the unused space is reclaimed.
         """
-        Loads a generated query cache into memory.
+        with self._lock:
+            self.dump()
+            connection = self._get_connection()
+            if not connection:
+                return
+            if keys is not None:
+                keys = set(keys)
+                rows = connection.execute("SELECT domain, intent, query_text FROM queries")
+                stale_keys = [key for key in rows if key not in keys]
+                with connection:
+                    connection.executemany(
+                        "DELETE FROM queries "
+                        "WHERE domain = ? AND intent = ? AND query_text = ?",
+                        stale_keys,
+                    )
+                for key in stale_keys:
+                    self._memory.pop(key, None)
+            connection.execute("VACUUM")
+
+    def __getstate__(self):
+        """Returns the state of the cache without the database connection and lock, which can not
+        be pickled."""
+        state = self.__dict__.copy()
+        state["_connection"] = None
+        state["_connection_pid"] = None
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__ = state
+        self._lock = threading.RLock()
+
+    def _get_connection(self, create=False):
+        """Gets the connection to the cache database, opening it if necessary.
+
+        Args:
+            create (bool, optional): Whether to create the database if it does not exist
+
+        Returns:
+            sqlite3.Connection: The connection, or None if the database does not exist
         """
-        file_location = QUERY_CACHE_PATH.format(app_path=self.app_path)
+        if self._connection is not None and self._connection_pid == os.getpid():
+            return self._connection
+
+        # connections can not be shared with forked processes
+        self._connection = None
+        if not create and not os.path.isfile(self.main_cache_location):
+            return None
+
+        try:
+            connection = self._open_connection()
+        except sqlite3.DatabaseError:
+            logger.warning("Couldn't read the query cache, so deleting it.")
+            self._delete()
+            if not create:
+                return None
+            connection = self._open_connection()
+        self._connection = connection
+        self._connection_pid = os.getpid()
+        return connection
+
+    def _open_connection(self):
+        connection = sqlite3.connect(self.main_cache_location, check_same_thread=False)
         try:
-            versioned_data = joblib.load(file_location)
-            if "cached_queries" not in versioned_data:
-                # The old version of caching did not have versions
-                logger.warning(
-                    "The cache contains deprecated versions of queries. Please "
-                    "run this command to clear the query cache: "
-                    '"python -m <app_name> clean -q"'
+            with connection:
+                connection.execute(
+                    "CREATE TABLE IF NOT EXISTS metadata (key TEXT PRIMARY KEY, value TEXT)"
                 )
-                self._cached_queries = versioned_data
-            else:
-                self._cached_queries = versioned_data["cached_queries"]
-        except (OSError, IOError, KeyboardInterrupt):
-            self._cached_queries = {}
-        self.is_dirty = False
+                connection.execute(
+                    "CREATE TABLE IF NOT EXISTS queries (domain TEXT, intent TEXT, "
+                    "query_text TEXT, processed_query BLOB, "
+                    "PRIMARY KEY (domain, intent, query_text))"
+                )
+                metadata = dict(
+                    connection.execute(
+                        "SELECT key, value FROM metadata WHERE key IN ('mm_version', 'format')"
+                    ).fetchall()
+                )
+                mm_version = get_mm_version()
+                if (
+                    metadata.get("mm_version") != mm_version
+                    or metadata.get("format") != QUERY_CACHE_FORMAT
+                ):
+                    if metadata:
+                        logger.info(
+                            "The query cache was created by MindMeld %s in format %s, so "
+                            "clearing it.",
+                            metadata.get("mm_version"),
+                            metadata.get("format"),
+                        )
+                    connection.execute("DELETE FROM queries")
+                    connection.executemany(
+                        "INSERT OR REPLACE INTO metadata (key, value) VALUES (?, ?)",
+                        [("mm_version", mm_version), ("format", QUERY_CACHE_FORMAT)],
+                    )
+        except sqlite3.DatabaseError:
+            connection.close()
+            raise
+        return connection
+
+    def _close(self):
+        if self._connection is not None and self._connection_pid == os.getpid():
+            self._connection.close()
+        self._connection = None
+
+    def _delete(self):
+        self._close()
+        for suffix in ("", "-journal"):
+            if os.path.exists(self.main_cache_location + suffix):
+                os.remove(self.main_cache_location + suffix)
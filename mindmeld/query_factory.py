@@ -90,6 +90,56 @@ class QueryFactory:
             language = self.language
             locale = self.locale
 
+        query = self._create_query(
+            text, time_zone=time_zone, timestamp=timestamp, locale=locale, language=language
+        )
+        query.system_entity_candidates = self.system_entity_recognizer.get_candidates(
+            query, locale=locale, language=language
+        )
+        return query
+
+    def create_queries(
+        self, texts, time_zone=None, timestamp=None, locale=None, language=None
+    ):
+        """Creates queries with the given texts. The system entity candidates of all the queries
+        are requested from the system entity recognizer as a single batch.
+
+        Args:
+            texts (list of str): Texts to create query objects for
+            time_zone (str, optional): An IANA time zone id to create the queries relative to.
+            timestamp (int, optional): A reference unix timestamp to create the queries relative
+                to, in seconds.
+            locale (str, optional): The locale representing the ISO 639-1 language code and \
+                ISO3166 alpha 2 country code separated by an underscore character.
+            language (str, optional): Language as specified using a 639-1/2 code
+
+        Returns:
+            list of Query: The newly constructed queries, in the same order as the texts
+        """
+        if not language and not locale:
+            language = self.language
+            locale = self.locale
+
+        queries = [
+            self._create_query(
+                text,
+                time_zone=time_zone,
+                timestamp=timestamp,
+                locale=locale,
+                language=language,
+            )
+            for text in texts
+        ]
+        candidates = self.system_entity_recognizer.get_candidates_batch(
+            queries, locale=locale, language=language
+        )
+        for query, query_candidates in zip(queries, candidates):
+            query.system_entity_candidates = query_candidates
+        return queries
+
+    def _create_query(
+        self, text, time_zone=None, timestamp=None, locale=None, language=None
+    ):
         raw_text = text
         char_maps = {}
 
@@ -118,7 +168,7 @@ class QueryFactory:
         char_maps[(TEXT_FORM_PROCESSED, TEXT_FORM_NORMALIZED)] = forward
         char_maps[(TEXT_FORM_NORMALIZED, TEXT_FORM_PROCESSED)] = backward
 
-        query = Query(
+        return Query(
             raw_text,
             processed_text,
             normalized_tokens,
@@ -129,10 +179,6 @@ class QueryFactory:
             timestamp=timestamp,
             stemmed_tokens=stemmed_tokens,
         )
-        query.system_entity_candidates = self.system_entity_recognizer.get_candidates(
-            query, locale=locale, language=language
-        )
-        return query
 
     def normalize(self, text):
         """Normalizes the given text.
@@ -19,9 +19,12 @@ import json
 import logging
 import os
 import re
+import sys
 import time
 from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
 from copy import deepcopy
+from multiprocessing import get_context
 import nltk
 from nltk.sentiment.vader import SentimentIntensityAnalyzer
 
@@ -29,7 +32,8 @@ from . import markup, path
 from .constants import DEFAULT_TRAIN_SET_REGEX
 from .core import Entity
 from .exceptions import MindMeldError
-from .gazetteer import Gazetteer
+from .fingerprints import FingerprintManifest
+from .gazetteer import Gazetteer, get_gazetteer_matcher
 from .models.helpers import (
     CHAR_NGRAM_FREQ_RSC,
     ENABLE_STEMMING,
@@ -49,6 +53,46 @@ logger = logging.getLogger(__name__)
 
 ENABLE_STEMMING_ARGS = "enable_stemming"
 
+# The number of worker processes used to load labeled query files. Queries are loaded serially
+# in the calling process when this is 0.
+DEFAULT_QUERY_LOADING_WORKERS = int(os.environ.get("MM_QUERY_LOADING_WORKERS", 0))
+# The maximum number of uncached queries sent to a worker process in a single task
+QUERY_LOADING_CHUNK_SIZE = 500
+
+# The query factory used by query loading worker processes. It is set in the parent process
+# right before the process pool is created so that forked workers inherit it. Workers which are
+# not forked would not see it, so queries are only loaded in parallel when fork is available.
+_worker_query_factory = None
+
+
+def _get_fork_context():
+    """Returns the fork multiprocessing context, or None if fork is not available on this
+    platform."""
+    try:
+        return get_context("fork")
+    except ValueError:
+        return None
+
+
+def _load_query_chunk(domain, intent, query_texts):
+    """A module function used to load a chunk of labeled queries in a worker process.
+
+    Args:
+        domain (str): The domain of the queries
+        intent (str): The intent of the queries
+        query_texts (list[str]): The marked up query texts to load
+
+    Returns:
+        list[ProcessedQuery]: The loaded queries in the same order as ``query_texts``
+    """
+    return markup.load_queries(
+        query_texts,
+        query_factory=_worker_query_factory,
+        domain=domain,
+        intent=intent,
+        is_gold=True,
+    )
+
 
 class ResourceLoader:
     """ResourceLoader objects are responsible for loading resources necessary for nlp components
@@ -58,9 +102,12 @@ class ResourceLoader:
     assumes all helpers to be instance methods.
     """
 
-    def __init__(self, app_path, query_factory, query_cache=None):
+    def __init__(self, app_path, query_factory, query_cache=None, num_workers=None):
         self.app_path = app_path
         self.query_factory = query_factory
+        self.num_workers = (
+            DEFAULT_QUERY_LOADING_WORKERS if num_workers is None else num_workers
+        )
 
         # Example Layout: {
         #   'entity_type': {
@@ -97,6 +144,7 @@ class ResourceLoader:
         self.file_to_query_info = {}
         self._hasher = Hasher()
         self.query_cache = query_cache or QueryCache(app_path=self.app_path)
+        self.fingerprints = FingerprintManifest(self.app_path, self._hasher)
         self._hash_to_model_path = None
 
     @property
@@ -186,10 +234,10 @@ class ResourceLoader:
         """
         self._update_entity_file_dates(gaz_name)
         entity_data_path = path.get_entity_gaz_path(self.app_path, gaz_name)
-        entity_data_hash = self._hasher.hash_file(entity_data_path)
+        entity_data_hash = self.fingerprints.get_file_digest(entity_data_path)
 
         mapping_path = path.get_entity_map_path(self.app_path, gaz_name)
-        mapping_hash = self._hasher.hash_file(mapping_path)
+        mapping_hash = self.fingerprints.get_file_digest(mapping_path)
 
         return self._hasher.hash_list([entity_data_hash, mapping_hash])
 
@@ -224,8 +272,7 @@ class ResourceLoader:
         gaz_path = path.get_gazetteer_data_path(self.app_path, gaz_name)
         gaz.dump(gaz_path)
 
-        self._entity_files[gaz_name]["gazetteer"]["data"] = gaz.to_dict()
-        self._entity_files[gaz_name]["gazetteer"]["loaded"] = time.time()
+        self._set_gazetteer_data(gaz_name, gaz)
 
     def load_gazetteer(self, gaz_name):
         """
@@ -237,8 +284,7 @@ class ResourceLoader:
         gaz = Gazetteer(gaz_name)
         gaz_path = path.get_gazetteer_data_path(self.app_path, gaz_name)
         gaz.load(gaz_path)
-        self._entity_files[gaz_name]["gazetteer"]["data"] = gaz.to_dict()
-        self._entity_files[gaz_name]["gazetteer"]["loaded"] = time.time()
+        self._set_gazetteer_data(gaz_name, gaz)
 
     def get_entity_map(self, entity_type, force_reload=False):
         """Creates a mapping file for a given entity.
@@ -290,6 +336,13 @@ class ResourceLoader:
                     continue
                 self._hash_to_model_path[hash_val] = classifier_file_path
 
+    def _set_gazetteer_data(self, gaz_name, gaz):
+        gaz_data = gaz.to_dict()
+        # compile the span matcher once here rather than when the gazetteer is first matched
+        get_gazetteer_matcher(gaz_data)
+        self._entity_files[gaz_name]["gazetteer"]["data"] = gaz_data
+        self._entity_files[gaz_name]["gazetteer"]["loaded"] = time.time()
+
     def _gaz_needs_build(self, gaz_name):
         try:
             build_time = self._entity_files[gaz_name]["gazetteer"]["modified"]
@@ -360,7 +413,13 @@ class ResourceLoader:
             file_table["gazetteer"]["modified"] = 0.0
 
     def get_labeled_queries(
-        self, domain=None, intent=None, label_set=None, force_reload=False, raw=False
+        self,
+        domain=None,
+        intent=None,
+        label_set=None,
+        force_reload=False,
+        raw=False,
+        num_workers=None,
     ):
         """Gets labeled queries from the cache, or loads them from disk.
 
@@ -369,24 +428,38 @@ class ResourceLoader:
             intent (str): The intent of queries to load
             force_reload (bool): Will not load queries from the cache when True
             raw (bool): Will return raw query strings instead of ProcessedQuery objects when true
+            num_workers (int, optional): The number of worker processes used to load query
+                files which are out of date. Defaults to the resource loader's ``num_workers``.
 
         Returns:
             dict: ProcessedQuery objects (or strings) loaded from labeled query files, organized by
                 domain and intent.
         """
         label_set = label_set or DEFAULT_TRAIN_SET_REGEX
+        num_workers = self.num_workers if num_workers is None else num_workers
         query_tree = {}
         loaded_key = "loaded_raw" if raw else "loaded"
-        file_iter = self._traverse_labeled_queries_files(domain, intent, label_set)
+        file_iter = list(self._traverse_labeled_queries_files(domain, intent, label_set))
+
+        stale_files = []
         for a_domain, an_intent, filename in file_iter:
             file_info = self.file_to_query_info[filename]
             if force_reload or (
                 not file_info[loaded_key]
                 or file_info[loaded_key] < file_info["modified"]
             ):
-                # file is out of date, load it
-                self.load_query_file(a_domain, an_intent, filename, raw=raw)
+                stale_files.append((a_domain, an_intent, filename))
 
+        if stale_files:
+            if raw or num_workers <= 0:
+                for a_domain, an_intent, filename in stale_files:
+                    # file is out of date, load it
+                    self.load_query_file(a_domain, an_intent, filename, raw=raw)
+            else:
+                self.load_query_files_parallel(stale_files, num_workers)
+
+        for a_domain, an_intent, filename in file_iter:
+            file_info = self.file_to_query_info[filename]
             if a_domain not in query_tree:
                 query_tree[a_domain] = {}
 
@@ -396,6 +469,26 @@ class ResourceLoader:
             queries.extend(file_info["raw_queries" if raw else "queries"])
         return query_tree
 
+    def get_labeled_queries_fingerprint(self, domain=None, intent=None, label_set=None):
+        """Gets a hash of the paths and contents of the labeled query files in a label set. The
+        files are only read when they have changed since they were last fingerprinted.
+
+        Args:
+            domain (str): The domain of the query files
+            intent (str): The intent of the query files
+            label_set (str): The label set of the query files
+
+        Returns:
+            str: The hash of the query files
+        """
+        label_set = label_set or DEFAULT_TRAIN_SET_REGEX
+        return self._hasher.hash_list(
+            "{}###{}".format(filename, self.fingerprints.get_file_digest(filename))
+            for _, _, filename in self._traverse_labeled_queries_files(
+                domain, intent, label_set
+            )
+        )
+
     @staticmethod
     def flatten_query_tree(query_tree):
         """
@@ -498,6 +591,104 @@ class ResourceLoader:
             file_data["queries"] = queries
             file_data["loaded"] = time.time()
 
+    def load_query_files_parallel(self, files, num_workers):
+        """Loads the queries from the specified files using a pool of worker processes.
+
+        Queries found in the query cache are reused, and the remaining queries of all files are
+        split into chunks which are loaded concurrently. The loaded queries are added to the query
+        cache and the queries of each file are kept in the order they appear in the file. The
+        workers are forked so that they inherit the query factory. If fork is not available or the
+        process pool fails, the queries are loaded serially instead.
+
+        Args:
+            files (list[tuple]): A list of (domain, intent, file path) tuples to load
+            num_workers (int): The number of worker processes to use
+        """
+        global _worker_query_factory  # pylint: disable=global-statement
+
+        file_queries = {}
+        # maps (domain, intent, query_text) to the indices of the queries awaiting that result
+        pending = {}
+        for domain, intent, file_path in files:
+            logger.info("Loading queries from file %s", file_path)
+            queries = []
+            for query_text in markup.read_query_file(file_path):
+                if query_text[0] == "-":
+                    continue
+                query = self.query_cache.get_value(domain, intent, query_text)
+                if not query:
+                    pending.setdefault((domain, intent, query_text), []).append(
+                        (file_path, len(queries))
+                    )
+                queries.append(query)
+            file_queries[file_path] = queries
+
+        chunks = []
+        for key in pending:
+            domain, intent, query_text = key
+            if (
+                not chunks
+                or chunks[-1][0] != (domain, intent)
+                or len(chunks[-1][1]) >= QUERY_LOADING_CHUNK_SIZE
+            ):
+                chunks.append(((domain, intent), []))
+            chunks[-1][1].append(query_text)
+
+        results = None
+        mp_context = _get_fork_context()
+        if chunks and mp_context is None:
+            logger.info("Fork is not available, loading queries serially instead.")
+        elif chunks:
+            _worker_query_factory = self.query_factory
+            # the executor only takes a context from Python 3.7, before which it always uses the
+            # default context, which is fork where fork is available
+            pool_kwargs = {"mp_context": mp_context} if sys.version_info >= (3, 7) else {}
+            try:
+                with ProcessPoolExecutor(
+                    max_workers=min(num_workers, len(chunks)), **pool_kwargs
+                ) as pool:
+                    futures = [
+                        pool.submit(_load_query_chunk, domain, intent, texts)
+                        for (domain, intent), texts in chunks
+                    ]
+                    results = [future.result() for future in futures]
+            except Exception:  # pylint: disable=broad-except
+                logger.warning(
+                    "Could not load queries in parallel, loading them serially instead.",
+                    exc_info=True,
+                )
+            finally:
+                _worker_query_factory = None
+
+        if results is None:
+            results = [
+                markup.load_queries(
+                    texts,
+                    query_factory=self.query_factory,
+                    domain=domain,
+                    intent=intent,
+                    is_gold=True,
+                )
+                for (domain, intent), texts in chunks
+            ]
+
+        # results are consumed in submission order so the query cache is filled deterministically
+        for ((domain, intent), texts), loaded in zip(chunks, results):
+            for query_text, query in zip(texts, loaded):
+                self.query_cache.set_value(domain, intent, query_text, query)
+                for file_path, idx in pending[(domain, intent, query_text)]:
+                    file_queries[file_path][idx] = query
+
+        for _, _, file_path in files:
+            queries = file_queries[file_path]
+            try:
+                self._check_query_entities(queries)
+            except MindMeldError as exc:
+                logger.warning(exc.message)
+            file_data = self.file_to_query_info[file_path]
+            file_data["queries"] = queries
+            file_data["loaded"] = time.time()
+
     def _check_query_entities(self, queries):
         entity_types = path.get_entity_types(self.app_path)
         for query in queries:
@@ -695,6 +886,19 @@ class ResourceLoader:
         """
         return self._hasher.hash(string)
 
+    def hash_cached(self, key, hash_func):
+        """Gets a hash from the fingerprint manifest, or computes it and adds it to the manifest.
+
+        Args:
+            key (str): A hash of the fingerprints of the files the hash is derived from, and
+                anything else it depends on
+            hash_func (function): A function which computes the hash
+
+        Returns:
+            str: The hash result
+        """
+        return self.fingerprints.get_hash(key, hash_func)
+
     def hash_list(self, items):
         """Hashes the list of items.
 
@@ -707,13 +911,18 @@ class ResourceLoader:
         return self._hasher.hash_list(items)
 
     @staticmethod
-    def create_resource_loader(app_path, query_factory=None, preprocessor=None):
+    def create_resource_loader(
+        app_path, query_factory=None, preprocessor=None, num_workers=None
+    ):
         """Creates the resource loader for the app at app path.
 
         Args:
             app_path (str): The path to the directory containing the app's data
             query_factory (QueryFactory): The app's query factory
             preprocessor (Preprocessor): The app's preprocessor
+            num_workers (int, optional): The number of worker processes used to load labeled
+                queries. Defaults to the ``MM_QUERY_LOADING_WORKERS`` environment variable, or 0
+                to load queries serially.
 
         Returns:
             ResourceLoader: a resource loader
@@ -722,7 +931,9 @@ class ResourceLoader:
             app_path, preprocessor=preprocessor
         )
         query_cache = QueryCache(app_path)
-        return ResourceLoader(app_path, query_factory, query_cache)
+        return ResourceLoader(
+            app_path, query_factory, query_cache, num_workers=num_workers
+        )
 
     # resource loader map
     FEATURE_RSC_MAP = {
@@ -21,15 +21,100 @@ import sys
 import time
 import uuid
 
-from flask import Flask, Request, g, jsonify, request
+from flask import Flask, Request, g, request
+from flask.json import JSONEncoder
 from flask_cors import CORS
 
 from ._version import current as __version__
 from .components.dialogue import DialogueResponder
 from .exceptions import BadMindMeldRequestError
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
+PARSE_REQUEST_KEYS = [
+    "text",
+    "params",
+    "context",
+    "frame",
+    "history",
+    "verbose",
+    "conversation_id",
+]
+
+_json_encoder = JSONEncoder()
+
+
+def encode_json(data):
+    """Serializes the body of a response. orjson is used if it is installed, since it is much
+    faster than the standard library on large payloads such as long conversation histories.
+
+    Args:
+        data (dict): The body of the response
+
+    Returns:
+        bytes: The JSON encoded body
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(
+                data,
+                default=_json_encoder.default,
+                # dates are passed to the Flask encoder so they are formatted the same either way
+                option=orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME,
+            )
+        except TypeError:
+            # fall back to the standard library for values orjson does not support, such as
+            # integers larger than 64 bits
+            pass
+    return json.dumps(
+        data, default=_json_encoder.default, separators=(",", ":")
+    ).encode("utf8")
+
+
+def get_response_body(response, request_json):
+    """Creates the body of a response to a parse request.
+
+    Args:
+        response (DialogueResponder): The response of the application
+        request_json (dict): The body of the request
+
+    Returns:
+        dict: The body of the response
+    """
+    # add request id to response
+    # use the passed in id if any
+    response.request_id = request_json.get("request_id", str(uuid.uuid4()))
+    body = DialogueResponder.to_json(response)
+    if "conversation_id" in body:
+        # the server keeps the history of the conversation, so only the new turn is returned
+        body["history"] = body["history"][:1]
+    return body
+
+
+def get_app_version():
+    """Gets the version of the app from the ``MM_APP_VERSION`` environment variable, or the file
+    named by the ``MM_APP_VERSION_FILE`` environment variable.
+
+    Returns:
+        str: The app version, or None if it is not set
+    """
+    if os.environ.get("MM_APP_VERSION"):
+        return os.environ.get("MM_APP_VERSION")
+    if os.environ.get("MM_APP_VERSION_FILE"):
+        version_file = os.environ.get("MM_APP_VERSION_FILE")
+        try:
+            with open(version_file, "r") as file:
+                return file.readline().strip()
+        except (OSError, IOError):
+            # failed to set version
+            logger.warning("Failed to open app version file: '%s'", version_file)
+    return None
+
 
 class MindMeldRequest(Request):  # pylint: disable=too-many-ancestors
     """This class represents requests to the MindMeldServer. It extends
@@ -65,17 +150,7 @@ class MindMeldServer:
 
         # Set the version for logging purposes
         self._package_version = __version__
-        self._app_version = None
-        if os.environ.get("MM_APP_VERSION"):
-            self._app_version = os.environ.get("MM_APP_VERSION")
-        elif os.environ.get("MM_APP_VERSION_FILE"):
-            version_file = os.environ.get("MM_APP_VERSION_FILE")
-            try:
-                with open(version_file, "r") as file:
-                    self._app_version = file.readline().strip()
-            except (OSError, IOError):
-                # failed to set version
-                logger.warning("Failed to open app version file: '%s'", version_file)
+        self._app_version = get_app_version()
 
         # pylint: disable=unused-variable
         @server.route("/parse", methods=["POST"])
@@ -87,15 +162,11 @@ class MindMeldServer:
                 raise BadMindMeldRequestError(msg, status_code=415)
 
             safe_request = {}
-            for key in ["text", "params", "context", "frame", "history", "verbose"]:
+            for key in PARSE_REQUEST_KEYS:
                 if key in request_json:
                     safe_request[key] = request_json[key]
             response = self._app_manager.parse(**safe_request)
-            # add request id to response
-            # use the passed in id if any
-            request_id = request_json.get("request_id", str(uuid.uuid4()))
-            response.request_id = request_id
-            return jsonify(DialogueResponder.to_json(response))
+            return self._make_response(get_response_body(response, request_json))
 
         @server.before_request
         def _before_request():
@@ -103,18 +174,9 @@ class MindMeldServer:
 
         @server.after_request
         def _after_request(response):
-            g.response_time = time.time() - g.start_time
+            if not hasattr(g, "response_time"):
+                g.response_time = time.time() - g.start_time
             g.response = response
-
-            # add response time to response
-            try:
-                data = json.loads(response.get_data(as_text=True))
-                data["response_time"] = g.response_time
-                data["version"] = "2.0"
-                response.set_data(json.dumps(data))
-            except json.JSONDecodeError:
-                pass
-
             return response
 
         @server.teardown_request
@@ -127,35 +189,51 @@ class MindMeldServer:
         # handle exceptions
         @server.errorhandler(BadMindMeldRequestError)
         def handle_bad_request(error):
-            response = jsonify(error.to_dict())
-            response.status_code = error.status_code
             logger.error(json.dumps(error.to_dict()))
-            return response
+            return self._make_response(error.to_dict(), error.status_code)
 
         @server.errorhandler(500)
         def handle_server_error(error):
             response_data = {"error": error.message}
-            response = jsonify(response_data)
-            response.status_code = 500
             logger.error(json.dumps(response_data))
-            return response
+            return self._make_response(response_data, 500)
 
         @server.route("/_status", methods=["GET"])
         def status_check():
             body = {"status": "OK", "package_version": self._package_version}
             if self._app_version:
                 body["app_version"] = self._app_version
-            return jsonify(body)
+            return self._make_response(body)
 
         self._server = server
 
+    def _make_response(self, data, status_code=200):
+        """Creates a JSON response. The response time and API version are added to the body
+        before it is serialized, and the body is kept for the request log, so that it is only
+        serialized once.
+
+        Args:
+            data (dict): The body of the response
+            status_code (int, optional): The status code of the response
+
+        Returns:
+            flask.Response: The response
+        """
+        g.response_time = time.time() - g.start_time
+        data["response_time"] = g.response_time
+        data["version"] = "2.0"
+        g.response_data = data
+        return self._server.response_class(
+            encode_json(data), status=status_code, mimetype="application/json"
+        )
+
     def run(self, **kwargs):
         """Starts the flask server."""
         self._server.run(**kwargs)
 
     def _log_request(self, req, response):
         try:
-            response_data = json.loads(response.data)
+            response_data = g.response_data
 
             if req.headers.getlist("X-Forwarded-For"):
                 ip_address = req.headers.getlist("X-Forwarded-For")[0]
@@ -193,4 +271,4 @@ class MindMeldServer:
         if self._app_version:
             log_request_data["source"]["app_version"] = self._app_version
 
-        self._request_logger.info(json.dumps(log_request_data))
+        self._request_logger.info(encode_json(log_request_data).decode("utf8"))
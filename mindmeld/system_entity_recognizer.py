@@ -11,20 +11,27 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 from abc import ABC, abstractmethod
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from copy import deepcopy
 from enum import Enum
 import json
 import logging
 import os
 import sys
+import threading
+import time
 
 import pycountry
 import requests
+from requests.adapters import HTTPAdapter
 
 
 from .components.request import validate_language_code, validate_locale_code
 from .components._config import (
     DEFAULT_DUCKLING_URL,
     is_duckling_configured,
+    get_system_entity_cache_config,
     get_system_entity_url_config,
 )
 from .core import Entity, QueryEntity, Span, _sort_by_lowest_time_grain
@@ -41,6 +48,16 @@ except ValueError as e:
     raise MindMeldError(
         "MM_SYS_ENTITY_REQUEST_TIMEOUT env var has to be a float value."
     ) from e
+SYS_ENTITY_REQUEST_CONCURRENCY = os.environ.get("MM_SYS_ENTITY_REQUEST_CONCURRENCY", 8)
+try:
+    if int(SYS_ENTITY_REQUEST_CONCURRENCY) <= 0:
+        raise MindMeldError(
+            "MM_SYS_ENTITY_REQUEST_CONCURRENCY env var has to be > 0."
+        )
+except ValueError as e:
+    raise MindMeldError(
+        "MM_SYS_ENTITY_REQUEST_CONCURRENCY env var has to be an integer value."
+    ) from e
 
 logger = logging.getLogger(__name__)
 
@@ -49,6 +66,124 @@ class SystemEntityError(Exception):
     pass
 
 
+class SystemEntityResponseCache:
+    """A bounded, thread safe LRU cache of system entity recognizer responses.
+
+    Responses are keyed by the request sentence, dimensions, locale, language and time zone. Time
+    relative dimensions also depend on the reference time of the request, so requests which may
+    return the time dimension are additionally keyed by their reference time rounded down to
+    ``time_bucket`` seconds. Entries expire ``ttl`` seconds after they were added.
+
+    Attributes:
+        max_size (int): The maximum number of cached responses
+        ttl (float): The number of seconds a response stays valid, or None to never expire
+        time_bucket (float): The granularity of reference times, in seconds
+        hits (int): The number of lookups which returned a cached response
+        misses (int): The number of lookups which did not find a valid cached response
+        evictions (int): The number of responses removed to stay within ``max_size``
+        expirations (int): The number of responses removed because they were older than ``ttl``
+    """
+
+    def __init__(self, max_size=10000, ttl=3600, time_bucket=60):
+        if max_size <= 0:
+            raise SystemEntityError("The system entity cache size has to be > 0.")
+        if time_bucket <= 0:
+            raise SystemEntityError("The system entity cache time bucket has to be > 0.")
+        self.max_size = max_size
+        self.ttl = ttl
+        self.time_bucket = time_bucket
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_key(self, data):
+        """Creates the cache key for the form data of a request.
+
+        Args:
+            data (dict): The request data
+
+        Returns:
+            (tuple): The cache key
+        """
+        dims = data.get("dims")
+        reftime_bucket = None
+        if dims is None or DucklingDimension.TIME.value in json.loads(dims):
+            # the reference time is in milliseconds, the current time is used when it is missing
+            reftime = data.get("reftime") or time.time() * 1000
+            reftime_bucket = int(reftime // (self.time_bucket * 1000))
+        return (
+            data["text"],
+            dims,
+            data.get("locale"),
+            data.get("lang"),
+            data.get("tz"),
+            reftime_bucket,
+        )
+
+    def get(self, key):
+        """Gets a copy of the cached response for a key.
+
+        Args:
+            key (tuple): The cache key
+
+        Returns:
+            (tuple): The (response, response_code) tuple, or None if there is no valid entry
+        """
+        with self._lock:
+            try:
+                added, value = self._entries[key]
+            except KeyError:
+                self.misses += 1
+                return None
+            if self.ttl is not None and time.monotonic() - added >= self.ttl:
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        return deepcopy(value)
+
+    def set(self, key, value):
+        """Adds a response to the cache, evicting the least recently used entries if needed.
+
+        Args:
+            key (tuple): The cache key
+            value (tuple): The (response, response_code) tuple
+        """
+        value = deepcopy(value)
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        """Removes all the cached responses."""
+        with self._lock:
+            self._entries.clear()
+
+    @property
+    def stats(self):
+        """dict: The cache counters and current size."""
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
+
+    def __len__(self):
+        return len(self._entries)
+
+
 class DucklingDimension(Enum):
     AMOUNT_OF_MONEY = "amount-of-money"
     DISTANCE = "distance"
@@ -129,7 +264,11 @@ class SystemEntityRecognizer(ABC):
 
         if is_duckling_configured(app_path):
             url = get_system_entity_url_config(app_path=app_path)
-            return DucklingRecognizer.get_instance(url)
+            recognizer = DucklingRecognizer.get_instance(url)
+            cache_config = get_system_entity_cache_config(app_path=app_path)
+            if cache_config:
+                recognizer.enable_cache(**cache_config)
+            return recognizer
         else:
             return NoOpSystemEntityRecognizer.get_instance()
 
@@ -192,6 +331,34 @@ class SystemEntityRecognizer(ABC):
         """
         pass
 
+    def parse_batch(self, sentences, **kwargs):
+        """Calls System Entity Recognizer service API to extract numerical entities from a list
+        of sentences.
+
+        Args:
+            sentences (list of str): The raw sentences.
+
+        Returns:
+            (list of tuple): The (response, response_code) tuple for each sentence, in the same \
+                order as the sentences.
+        """
+        return [self.parse(sentence, **kwargs) for sentence in sentences]
+
+    def get_candidates_batch(self, queries, entity_types=None, **kwargs):
+        """Identifies candidate system entities in each of the given queries.
+
+        Args:
+            queries (list of Query): The queries to examine
+            entity_types (list of str): The entity types to consider
+
+        Returns:
+            list of list of QueryEntity: The system entities found in each query
+        """
+        return [
+            self.get_candidates(query, entity_types=entity_types, **kwargs)
+            for query in queries
+        ]
+
 
 class NoOpSystemEntityRecognizer(SystemEntityRecognizer):
     """
@@ -241,6 +408,10 @@ class DucklingRecognizer(SystemEntityRecognizer):
             raise SystemEntityError("DucklingRecognizer is a singleton")
 
         self.url = url
+        self.max_concurrency = int(SYS_ENTITY_REQUEST_CONCURRENCY)
+        self.cache = None
+        self._session = None
+        self._session_pid = None
         DucklingRecognizer._instance = self
 
     @staticmethod
@@ -260,10 +431,48 @@ class DucklingRecognizer(SystemEntityRecognizer):
             DucklingRecognizer(url=url)
         return DucklingRecognizer._instance
 
+    @property
+    def session(self):
+        """requests.Session: A session with a connection pool to the Duckling service. A new
+        session is created in forked processes so that connections are not shared with the
+        parent."""
+        if self._session is None or self._session_pid != os.getpid():
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.max_concurrency)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            self._session = session
+            self._session_pid = os.getpid()
+        return self._session
+
+    def enable_cache(self, max_size=10000, ttl=3600, time_bucket=60):
+        """Caches Duckling responses so that repeated sentences are not sent to Duckling again.
+
+        Args:
+            max_size (int, optional): The maximum number of cached responses
+            ttl (float, optional): The number of seconds a response stays valid, or None to never
+                expire responses
+            time_bucket (float, optional): The granularity in seconds of the reference times of
+                requests which may return time entities. Time values of cached responses can be
+                off by up to this amount.
+
+        Returns:
+            (SystemEntityResponseCache): The response cache
+        """
+        self.cache = SystemEntityResponseCache(
+            max_size=max_size, ttl=ttl, time_bucket=time_bucket
+        )
+        return self.cache
+
+    def disable_cache(self):
+        """Stops caching Duckling responses."""
+        self.cache = None
+
     def get_response(self, data):
         """
         Send a post request to Duckling, data is a dictionary with field `text`.
-        Return a tuple consisting the JSON response and a response code.
+        Return a tuple consisting the JSON response and a response code. Responses are served from
+        the response cache when it is enabled.
 
         Args:
             data (dict)
@@ -271,9 +480,21 @@ class DucklingRecognizer(SystemEntityRecognizer):
         Returns:
             (dict, int)
         """
+        cache = self.cache
+        if cache is None:
+            return self._get_response(data)
+
+        key = cache.get_key(data)
+        result = cache.get(key)
+        if result is None:
+            result = self._get_response(data)
+            cache.set(key, result)
+        return result
+
+    def _get_response(self, data):
         try:
-            response = requests.request(
-                "POST", self.url, data=data, timeout=float(SYS_ENTITY_REQUEST_TIMEOUT)
+            response = self.session.post(
+                self.url, data=data, timeout=float(SYS_ENTITY_REQUEST_TIMEOUT)
             )
 
             if response.status_code == requests.codes["ok"]:
@@ -342,6 +563,93 @@ class DucklingRecognizer(SystemEntityRecognizer):
             logger.error("Empty query passed to the system entity resolver")
             return [], SUCCESSFUL_HTTP_CODE
 
+        data = self._get_request_data(
+            sentence,
+            dimensions=dimensions,
+            language=language,
+            locale=locale,
+            time_zone=time_zone,
+            timestamp=timestamp,
+        )
+        # Currently we rely on Duckling for parsing numerical data but in the future we can use
+        # other system entity recognizer too
+        return self.get_response(data)
+
+    def parse_batch(
+        self,
+        sentences,
+        dimensions=None,
+        language=None,
+        locale=None,
+        time_zone=None,
+        timestamp=None,
+        max_concurrency=None,
+    ):
+        """Calls System Entity Recognizer service API to extract numerical entities from a list
+        of sentences. The requests are sent concurrently over the pooled session.
+
+        Args:
+            sentences (list of str): The raw sentences.
+            dimensions (None or list of str): The list of types (e.g. volume, \
+                temperature) to restrict the output to. If None, include all types.
+            language (str, optional): Language of the sentences specified using a 639-1/2 code.
+            locale (str, optional): The locale representing the ISO 639-1 language code and \
+                ISO3166 alpha 2 country code separated by an underscore character.
+            time_zone (str, optional): An IANA time zone id such as 'America/Los_Angeles'.
+            timestamp (long, optional): A unix millisecond timestamp used as the reference time.
+            max_concurrency (int, optional): The maximum number of requests in flight. Defaults \
+                to the ``MM_SYS_ENTITY_REQUEST_CONCURRENCY`` environment variable.
+
+        Returns:
+            (list of tuple): The (response, response_code) tuple for each sentence, in the same \
+                order as the sentences.
+        """
+        max_concurrency = max_concurrency or self.max_concurrency
+        results = [None] * len(sentences)
+        pending = []
+        for idx, sentence in enumerate(sentences):
+            if sentence == "":
+                logger.error("Empty query passed to the system entity resolver")
+                results[idx] = [], SUCCESSFUL_HTTP_CODE
+                continue
+            data = self._get_request_data(
+                sentence,
+                dimensions=dimensions,
+                language=language,
+                locale=locale,
+                time_zone=time_zone,
+                timestamp=timestamp,
+            )
+            pending.append((idx, data))
+
+        if len(pending) == 1 or max_concurrency == 1:
+            for idx, data in pending:
+                results[idx] = self.get_response(data)
+        elif pending:
+            with ThreadPoolExecutor(
+                max_workers=min(max_concurrency, len(pending))
+            ) as pool:
+                futures = [
+                    (idx, pool.submit(self.get_response, data)) for idx, data in pending
+                ]
+                for idx, future in futures:
+                    results[idx] = future.result()
+        return results
+
+    @staticmethod
+    def _get_request_data(
+        sentence,
+        dimensions=None,
+        language=None,
+        locale=None,
+        time_zone=None,
+        timestamp=None,
+    ):
+        """Builds the form data of a Duckling request for a sentence.
+
+        Returns:
+            (dict): The request data
+        """
         data = {
             "text": sentence,
             "latent": True,
@@ -398,10 +706,7 @@ class DucklingRecognizer(SystemEntityRecognizer):
                 # Convert a second grain unix timestamp to millisecond
                 timestamp *= 1000
             data["reftime"] = timestamp
-
-        # Currently we rely on Duckling for parsing numerical data but in the future we can use
-        # other system entity recognizer too
-        return self.get_response(data)
+        return data
 
     def resolve_system_entity(self, query, entity_type, span):
         """Resolves a system entity in the provided query at the specified span.
@@ -561,7 +866,62 @@ class DucklingRecognizer(SystemEntityRecognizer):
             time_zone=time_zone,
             timestamp=timestamp,
         )
+        return self._response_to_candidates(
+            query, entity_types, dims, response, response_code
+        )
 
+    def get_candidates_batch(
+        self,
+        queries,
+        entity_types=None,
+        locale=None,
+        language=None,
+        time_zone=None,
+        timestamp=None,
+    ):
+        """Identifies candidate system entities in each of the given queries. Queries which share
+        the same language, time zone and timestamp are sent to Duckling as a single batch.
+
+        Args:
+            queries (list of Query): The queries to examine
+            entity_types (list of str): The entity types to consider
+            locale (str, optional): The locale representing the ISO 639-1 language code and \
+                ISO3166 alpha 2 country code separated by an underscore character.
+            language (str, optional): Language as specified using a 639-1/2 code.
+            time_zone (str, optional): An IANA time zone id such as 'America/Los_Angeles'.
+            timestamp (long, optional): A unix timestamp used as the reference time.
+
+        Returns:
+            list of list of QueryEntity: The system entities found in each query
+        """
+        dims = dimensions_from_entity_types(entity_types)
+        groups = {}
+        for idx, query in enumerate(queries):
+            key = (
+                language or query.language,
+                time_zone or query.time_zone,
+                timestamp or query.timestamp,
+            )
+            groups.setdefault(key, []).append(idx)
+
+        candidates = [None] * len(queries)
+        for (a_language, a_time_zone, a_timestamp), indices in groups.items():
+            responses = self.parse_batch(
+                [queries[idx].text for idx in indices],
+                dimensions=dims,
+                locale=locale,
+                language=a_language,
+                time_zone=a_time_zone,
+                timestamp=a_timestamp,
+            )
+            for idx, (response, response_code) in zip(indices, responses):
+                candidates[idx] = self._response_to_candidates(
+                    queries[idx], entity_types, dims, response, response_code
+                )
+        return candidates
+
+    @staticmethod
+    def _response_to_candidates(query, entity_types, dims, response, response_code):
         if response_code == SUCCESSFUL_HTTP_CODE:
             return [
                 e
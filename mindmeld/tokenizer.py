@@ -24,6 +24,15 @@ from .constants import CURRENCY_SYMBOLS
 
 logger = logging.getLogger(__name__)
 
+# Matches the raw tokens of a text, which are separated by whitespace
+RAW_TOKEN_PATTERN = re.compile(r"\S+", re.UNICODE)
+# The maximum number of normalized raw tokens cached by a tokenizer in fast mode
+TOKEN_CACHE_SIZE = 100000
+# The directions of the edit distance alignment
+DOWN, RIGHT, DIAGONAL = range(3)
+# Text lengths above which the character index maps are computed with the full alignment
+FAST_ALIGNMENT_MAX_LENGTH = 900
+
 
 class Tokenizer:
     """The Tokenizer class encapsulates all the functionality for normalizing and tokenizing a
@@ -31,16 +40,30 @@ class Tokenizer:
 
     _ASCII_CUTOFF = ord("\u0080")
 
-    def __init__(self, app_path=None, exclude_from_norm=None):
+    def __init__(self, app_path=None, exclude_from_norm=None, fast_mode=None):
         """Initializes the tokenizer.
 
         Args:
             exclude_from_norm (optional) - list of chars to exclude from normalization
+            fast_mode (bool, optional): Whether to cache the normalized tokens and compute the
+                character index maps with a linear time alignment when possible. The results
+                are the same as in the default mode. Defaults to the ``fast_mode`` setting of
+                the tokenizer config, which is ``True`` if not set.
         """
 
         self.ascii_folding_table = self.load_ascii_folding_table()
+        self._ascii_translation_table = {
+            char_ord: ascii_char
+            for char_ord, ascii_char in self.ascii_folding_table.items()
+            if char_ord >= self._ASCII_CUTOFF
+        }
         self.exclude_from_norm = exclude_from_norm or []
         self.config = get_tokenizer_config(app_path, self.exclude_from_norm)
+        self.fast_mode = (
+            self.config.get("fast_mode", True) if fast_mode is None else fast_mode
+        )
+        # The normalized tokens of the raw tokens, with and without special characters
+        self._token_cache = {True: {}, False: {}}
         self._custom = False
         self._init_regex()
 
@@ -132,7 +155,7 @@ class Tokenizer:
     # TODO investigate necessity of deepcopy in train-roles
     def __deepcopy__(self, memo):
         # TODO: optimize this
-        return Tokenizer(exclude_from_norm=self.exclude_from_norm)
+        return Tokenizer(exclude_from_norm=self.exclude_from_norm, fast_mode=self.fast_mode)
 
     @staticmethod
     def load_ascii_folding_table():
@@ -251,6 +274,9 @@ class Tokenizer:
             list: A list of normalized tokens
         """
 
+        if self.fast_mode:
+            return self._tokenize_fast(text, keep_special_chars)
+
         raw_tokens = self.tokenize_raw(text)
 
         norm_tokens = []
@@ -289,6 +315,40 @@ class Tokenizer:
             raw_token["norm_token_count"] = norm_token_count
         return norm_tokens
 
+    def _tokenize_fast(self, text, keep_special_chars=True):
+        """Tokenizes the input text like ``tokenize``, normalizing each distinct raw token only
+        once."""
+        token_cache = self._token_cache[keep_special_chars]
+        norm_tokens = []
+        for i, match in enumerate(RAW_TOKEN_PATTERN.finditer(text)):
+            raw_token_text = match.group()
+            norm_token_texts = token_cache.get(raw_token_text)
+            if norm_token_texts is None:
+                norm_token_texts = self._normalize_raw_token(raw_token_text, keep_special_chars)
+                if len(token_cache) >= TOKEN_CACHE_SIZE:
+                    token_cache.clear()
+                token_cache[raw_token_text] = norm_token_texts
+
+            raw_start = match.start()
+            for token in norm_token_texts:
+                norm_tokens.append(
+                    {
+                        "entity": token,
+                        "raw_entity": raw_token_text,
+                        "raw_token_index": i,
+                        "raw_start": raw_start,
+                    }
+                )
+        return norm_tokens
+
+    def _normalize_raw_token(self, raw_token_text, keep_special_chars=True):
+        if keep_special_chars:
+            norm_token_text = self.multiple_replace(raw_token_text, self.keep_special_compiled)
+        else:
+            norm_token_text = self.multiple_replace(raw_token_text, self.compiled)
+        norm_token_text = norm_token_text.translate(self._ascii_translation_table).lower()
+        return tuple(norm_token_text.split())
+
     @staticmethod
     def tokenize_raw(text):
         """
@@ -353,6 +413,12 @@ class Tokenizer:
             mapping = {i: i for i in range(n)}
             return mapping, mapping
 
+        if self.fast_mode and len(text) == m and max(m, n) < FAST_ALIGNMENT_MAX_LENGTH:
+            mapping = self._align_subsequence(text, normalized_text)
+            if mapping is None:
+                mapping = self._align_banded(text, normalized_text)
+            return self._get_raw_to_norm_mapping(mapping, m), mapping
+
         edit_dis = []
         for i in range(0, n + 1):
             edit_dis.append([0] * (m + 1))
@@ -407,6 +473,10 @@ class Tokenizer:
             elif directions[n_idx][m_idx] == "↓":
                 n_idx -= 1
 
+        return self._get_raw_to_norm_mapping(mapping, m), mapping
+
+    @staticmethod
+    def _get_raw_to_norm_mapping(mapping, m):
         # initialize the forward mapping (raw to normalized text)
         raw_to_norm_mapping = {0: 0}
 
@@ -417,7 +487,127 @@ class Tokenizer:
             if i not in raw_to_norm_mapping:
                 raw_to_norm_mapping[i] = raw_to_norm_mapping[i - 1]
 
-        return raw_to_norm_mapping, mapping
+        return raw_to_norm_mapping
+
+    @staticmethod
+    def _align_subsequence(text, normalized_text):
+        """Aligns the normalized text to the folded raw text in linear time when normalization
+        only removed characters.
+
+        When the normalized text is a subsequence of the raw text, the optimal alignments only
+        delete raw characters, and the edit distance backtracking keeps skipping raw characters
+        while the rest of the normalized text still fits before them. So each normalized
+        character is aligned to its leftmost match after the previous one.
+
+        Args:
+            text (str): The folded, lower cased raw text.
+            normalized_text (str): Normalized query text.
+
+        Returns:
+            dict: A mapping of character indexes from normalized text to raw text, or None if \
+                the normalized text is not a subsequence of the raw text.
+        """
+        mapping = {}
+        raw_idx = 0
+        for norm_idx, char in enumerate(normalized_text):
+            raw_idx = text.find(char, raw_idx)
+            if raw_idx < 0:
+                return None
+            mapping[norm_idx] = raw_idx
+            raw_idx += 1
+        return mapping
+
+    @staticmethod
+    def _align_banded(text, normalized_text):
+        """Aligns the normalized text to the folded raw text like the full edit distance
+        alignment, but only computes the cells close to the diagonal.
+
+        The cells of the edit distance table which are more than ``band`` cells away from the
+        diagonal have a distance greater than ``band``. So if the distance of the texts is at
+        most ``band``, the cells on the backtracking path and their neighbours which can be
+        chosen have the same distances and directions as in the full table. The band is doubled
+        until that is the case.
+
+        Args:
+            text (str): The folded, lower cased raw text.
+            normalized_text (str): Normalized query text.
+
+        Returns:
+            dict: A mapping of character indexes from normalized text to raw text.
+        """
+        m = len(text)
+        n = len(normalized_text)
+        unreachable = float("inf")
+        band = abs(m - n) + 4
+        while True:
+            # each row holds the distances and directions of columns lo to hi
+            prev_lo, prev_hi = 0, min(m, band)
+            prev_row = list(range(prev_hi + 1))
+            direction_rows = [(0, [None] * (prev_hi + 1))]
+            for i in range(1, n + 1):
+                lo, hi = max(0, i - band), min(m, i + band)
+                row = [unreachable] * (hi - lo + 1)
+                directions = [None] * (hi - lo + 1)
+                norm_char = normalized_text[i - 1]
+                for j in range(lo, hi + 1):
+                    if j == 0:
+                        row[0] = i
+                        continue
+                    dis = 999
+                    direction = None
+
+                    if prev_lo <= j - 1 <= prev_hi:
+                        diag_dis = prev_row[j - 1 - prev_lo]
+                        if norm_char != text[j - 1]:
+                            diag_dis += 1
+                    else:
+                        diag_dis = unreachable
+
+                    # dis from going down
+                    if j <= prev_hi:
+                        down_dis = prev_row[j - prev_lo] + 1
+                    else:
+                        down_dis = unreachable
+
+                    # dis from going right
+                    right_dis = row[j - 1 - lo] + 1 if j > lo else unreachable
+
+                    if down_dis < dis:
+                        dis = down_dis
+                        direction = DOWN
+                    if right_dis < dis:
+                        dis = right_dis
+                        direction = RIGHT
+                    if diag_dis < dis:
+                        dis = diag_dis
+                        direction = DIAGONAL
+
+                    row[j - lo] = dis
+                    directions[j - lo] = direction
+                prev_lo, prev_hi, prev_row = lo, hi, row
+                direction_rows.append((lo, directions))
+
+            if prev_row[m - prev_lo] <= band or band >= max(m, n):
+                break
+            band *= 2
+
+        mapping = {}
+
+        # backtrack
+        m_idx = m
+        n_idx = n
+        while m_idx > 0 and n_idx > 0:
+            lo, directions = direction_rows[n_idx]
+            direction = directions[m_idx - lo]
+            if direction == DIAGONAL:
+                mapping[n_idx - 1] = m_idx - 1
+                m_idx -= 1
+                n_idx -= 1
+            elif direction == RIGHT:
+                m_idx -= 1
+            else:
+                n_idx -= 1
+        return mapping
 
     def fold_char_to_ascii(self, char):
         """
@@ -448,6 +638,8 @@ class Tokenizer:
         Returns:
             char: a ASCII character
         """
+        if self.fast_mode:
+            return text.translate(self._ascii_translation_table)
         folded_str = ""
         for char in text:
             folded_str += self.fold_char_to_ascii(char)
@@ -95,6 +95,9 @@ setup(
             'sentence-transformers~=0.2.6; python_version>="3.6"',
             "elasticsearch>=7.0",
         ],
+        "asgi": ["uvicorn>=0.11"],
+        "orjson": ["orjson>=3.4"],
+        "http2": ["httpx[http2]>=0.18"],
         "examples": [
             'connexion>=2.7.0; python_version>="3.6"',
         ],
@@ -0,0 +1,120 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+asgi_server
+----------------------------------
+
+Load tests the ASGI server of the kwik_e_mart app in process, by holding many concurrent
+conversations with it. Each conversation sends its turns one after another, passing the history,
+frame and params of each response to the next request like a client would. Reports the
+throughput, the latency percentiles and the number of requests rejected by backpressure.
+
+Usage:
+    python -m tests.benchmarks.asgi_server [--conversations N] [--turns N] [--async-app]
+        [--max-concurrency N] [--max-queue N]
+"""
+import argparse
+import asyncio
+import json
+import time
+
+from mindmeld.asgi import AsyncMindMeldServer
+
+TURNS = [
+    "hello",
+    "where is the store on elm street",
+    "when does it open",
+    "is the one on 12th ave open tomorrow",
+    "goodbye",
+]
+
+
+async def post(server, body):
+    messages = [
+        {"type": "http.request", "body": json.dumps(body).encode(), "more_body": False}
+    ]
+    sent = []
+
+    async def receive():
+        return messages.pop(0)
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {
+        "type": "http",
+        "method": "POST",
+        "path": "/parse",
+        "headers": [(b"content-type", b"application/json")],
+    }
+    await server(scope, receive, send)
+    return sent[0]["status"], json.loads(sent[1]["body"].decode("utf8"))
+
+
+async def converse(server, num_turns, latencies, statuses):
+    state = {}
+    for turn in range(num_turns):
+        body = dict(state, text=TURNS[turn % len(TURNS)])
+        start = time.perf_counter()
+        status, response = await post(server, body)
+        latencies.append(time.perf_counter() - start)
+        statuses.append(status)
+        if status == 200:
+            state = {key: response[key] for key in ("history", "frame", "params")}
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--conversations", type=int, default=200)
+    parser.add_argument("--turns", type=int, default=5)
+    parser.add_argument("--async-app", action="store_true")
+    parser.add_argument("--max-concurrency", type=int, default=None)
+    parser.add_argument("--max-queue", type=int, default=None)
+    args = parser.parse_args()
+
+    if args.async_app:
+        from ..kwik_e_mart.app_async import app
+    else:
+        from ..kwik_e_mart import app
+
+    app.lazy_init()
+    server = AsyncMindMeldServer(
+        app.app_manager, max_concurrency=args.max_concurrency, max_queue=args.max_queue
+    )
+    loop = asyncio.get_event_loop()
+    loop.run_until_complete(server.load())
+
+    latencies = []
+    statuses = []
+    start = time.perf_counter()
+    loop.run_until_complete(
+        asyncio.gather(
+            *(
+                converse(server, args.turns, latencies, statuses)
+                for _ in range(args.conversations)
+            )
+        )
+    )
+    elapsed = time.perf_counter() - start
+
+    print(
+        "{} conversations  {} requests  {:8.1f} requests/s  p50: {:7.1f} ms  "
+        "p99: {:7.1f} ms  rejected: {}".format(
+            args.conversations,
+            len(statuses),
+            len(statuses) / elapsed,
+            percentile(latencies, 0.5) * 1000,
+            percentile(latencies, 0.99) * 1000,
+            statuses.count(503),
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
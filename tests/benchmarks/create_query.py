@@ -0,0 +1,75 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+create_query
+----------------------------------
+
+Benchmarks query creation on the training queries of the test apps, comparing the tokenizer's
+fast mode against its default implementation.
+
+Usage:
+    python -m tests.benchmarks.create_query [--repeat N]
+"""
+import argparse
+import glob
+import os
+import re
+import timeit
+
+from mindmeld.query_factory import QueryFactory
+from mindmeld.system_entity_recognizer import NoOpSystemEntityRecognizer
+from mindmeld.tokenizer import Tokenizer
+
+TESTS_PATH = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP_PATH = os.path.join(TESTS_PATH, "kwik_e_mart")
+
+
+def load_query_texts():
+    texts = []
+    pattern = os.path.join(TESTS_PATH, "**", "domains", "**", "*.txt")
+    for path in sorted(glob.glob(pattern, recursive=True)):
+        with open(path, encoding="utf-8") as query_file:
+            texts.extend(
+                re.sub(r"\|[\w\-]+(?=\}|\])|[\{\}\[\]]", "", line.strip())
+                for line in query_file
+                if line.strip()
+            )
+    return texts
+
+
+def time_per_query(query_factory, texts, repeat):
+    total = min(
+        timeit.repeat(
+            lambda: [query_factory.create_query(text) for text in texts], number=1, repeat=repeat
+        )
+    )
+    return total / len(texts) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    texts = load_query_texts()
+    timings = {}
+    for fast_mode in (False, True):
+        # system entities are not needed to compare the tokenizer overhead
+        query_factory = QueryFactory.create_query_factory(
+            APP_PATH,
+            tokenizer=Tokenizer(app_path=APP_PATH, fast_mode=fast_mode),
+            system_entity_recognizer=NoOpSystemEntityRecognizer.get_instance(),
+        )
+        timings[fast_mode] = time_per_query(query_factory, texts, args.repeat)
+
+    print(
+        "{} queries  default: {:8.1f} us/query  fast mode: {:8.1f} us/query  "
+        "speedup: {:.2f}x".format(
+            len(texts), timings[False], timings[True], timings[False] / timings[True]
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
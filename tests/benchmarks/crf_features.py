@@ -0,0 +1,113 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+crf_features
+----------------------------------
+
+Benchmarks the conversion of the token features of the kwik_e_mart training queries into CRF
+suite attributes, comparing formatting the binned features of every token against the cached
+attribute encoding, and checks that both give the same attributes.
+
+Usage:
+    python -m tests.benchmarks.crf_features [--repeat N]
+"""
+import argparse
+import glob
+import os
+import timeit
+
+from mindmeld import markup
+from mindmeld.models import ENTITIES_LABEL_TYPE, QUERY_EXAMPLE_TYPE, ModelConfig
+from mindmeld.models.tagger_models import TaggerModel
+from mindmeld.query_factory import QueryFactory
+from mindmeld.resource_loader import ResourceLoader
+from mindmeld.system_entity_recognizer import NoOpSystemEntityRecognizer
+
+APP_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "kwik_e_mart"
+)
+
+CRF_MODEL_CONFIG = {
+    "model_type": "tagger",
+    "example_type": QUERY_EXAMPLE_TYPE,
+    "label_type": ENTITIES_LABEL_TYPE,
+    "model_settings": {"classifier_type": "crf", "tag_scheme": "IOB"},
+    "params": {"C": 10},
+    "features": {
+        "bag-of-words-seq": {
+            "ngram_lengths_to_start_positions": {
+                1: [-2, -1, 0, 1, 2],
+                2: [-2, -1, 0, 1],
+            }
+        },
+        "in-gaz-span-seq": {},
+        "sys-candidates-seq": {"start_positions": [-1, 0, 1]},
+    },
+}
+
+
+def load_queries(query_factory):
+    queries = []
+    for path in sorted(glob.glob(os.path.join(APP_PATH, "domains", "*", "*", "train.txt"))):
+        with open(path, encoding="utf-8") as train_file:
+            # system entity annotations can not be resolved without a system entity recognizer
+            lines = [line.strip() for line in train_file if line.strip() and "|sys_" not in line]
+        queries.extend(markup.load_queries(lines, query_factory))
+    return queries
+
+
+def format_transformed(binner, X):
+    new_X = []
+    for feat_seq in binner.transform(X):
+        feat_list = []
+        for feature in feat_seq:
+            temp_list = []
+            for feat_type in sorted(feature.keys()):
+                temp_list.append("{}={}".format(feat_type, str(feature[feat_type])))
+            feat_list.append(temp_list)
+        new_X.append(feat_list)
+    return new_X
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    # system entities are not needed to compare the feature encoding overhead
+    query_factory = QueryFactory.create_query_factory(
+        APP_PATH, system_entity_recognizer=NoOpSystemEntityRecognizer.get_instance()
+    )
+    resource_loader = ResourceLoader(APP_PATH, query_factory)
+    processed_queries = load_queries(query_factory)
+    queries = [q.query for q in processed_queries]
+
+    model = TaggerModel(ModelConfig(**CRF_MODEL_CONFIG))
+    model.initialize_resources(resource_loader, queries, [q.entities for q in processed_queries])
+    crf = model._clf
+    feats = [crf.extract_example_features(q, model.config, model._resources) for q in queries]
+    binner = crf._feat_binner
+    binner.fit(feats)
+
+    assert format_transformed(binner, feats) == binner.encode(feats)
+
+    num_tokens = sum(len(query_feats) for query_feats in feats)
+    before = min(
+        timeit.repeat(lambda: format_transformed(binner, feats), number=1, repeat=args.repeat)
+    )
+    after = min(timeit.repeat(lambda: binner.encode(feats), number=1, repeat=args.repeat))
+    print(
+        "{} queries, {} tokens  formatted: {:8.2f} us/token  encoded: {:8.2f} us/token  "
+        "speedup: {:.2f}x".format(
+            len(queries),
+            num_tokens,
+            before / num_tokens * 1e6,
+            after / num_tokens * 1e6,
+            before / after,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
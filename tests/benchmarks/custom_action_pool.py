@@ -0,0 +1,131 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+custom_action_pool
+----------------------------------
+
+Benchmarks the per-call overhead of invoking custom actions against a local stub custom action
+server. Compares opening a new connection for every call, as ``requests.post`` and a new
+``aiohttp.ClientSession`` do, against the persistent connections of the custom action client
+pool, and a sequence of actions invoked one after another against the same sequence invoked in
+parallel.
+
+Usage:
+    python -m tests.benchmarks.custom_action_pool [--calls N] [--delay SECONDS]
+"""
+import argparse
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import aiohttp
+import requests
+
+from mindmeld.components.custom_action import (
+    CustomActionClientPool,
+    CustomActionSequence,
+)
+from mindmeld.components.dialogue import DialogueResponder
+from mindmeld.components.request import Request
+
+
+class StubActionHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    delay = 0
+
+    def do_POST(self):  # pylint: disable=invalid-name
+        action = json.loads(self.rfile.read(int(self.headers["Content-Length"])))["action"]
+        if self.delay:
+            time.sleep(self.delay)
+        body = json.dumps({"directives": [action], "frame": {}}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):  # pylint: disable=arguments-differ
+        pass
+
+
+def start_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubActionHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, "http://127.0.0.1:{}/action".format(server.server_address[1])
+
+
+def per_call(func, calls):
+    start = time.perf_counter()
+    for _ in range(calls):
+        func()
+    return (time.perf_counter() - start) / calls
+
+
+async def per_call_async(func, calls):
+    start = time.perf_counter()
+    for _ in range(calls):
+        await func()
+    return (time.perf_counter() - start) / calls
+
+
+async def post_new_session(url, json_data):
+    async with aiohttp.ClientSession() as session:
+        async with session.post(url, json=json_data) as response:
+            return response.status, await response.json()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--calls", type=int, default=500)
+    parser.add_argument("--actions", type=int, default=4)
+    parser.add_argument("--delay", type=float, default=0.02)
+    args = parser.parse_args()
+
+    server, url = start_server()
+    pool = CustomActionClientPool()
+    json_data = {"action": "stub", "request": {}, "responder": {}}
+    loop = asyncio.get_event_loop()
+
+    timings = {
+        "requests.post": per_call(lambda: requests.post(url, json=json_data), args.calls),
+        "pool.post": per_call(lambda: pool.post(url, json_data), args.calls),
+        "new aiohttp session": loop.run_until_complete(
+            per_call_async(lambda: post_new_session(url, json_data), args.calls)
+        ),
+        "pool.post_async": loop.run_until_complete(
+            per_call_async(lambda: pool.post_async(url, json_data), args.calls)
+        ),
+    }
+    print("{} calls to a local stub server".format(args.calls))
+    for name, seconds in timings.items():
+        print("{:20s} {:8.3f} ms/call".format(name, seconds * 1000))
+
+    StubActionHandler.delay = args.delay
+    actions = ["action_{}".format(index) for index in range(args.actions)]
+    request = Request(text="hello", domain="stub", intent="stub")
+    for parallel in (False, True):
+        sequence = CustomActionSequence(actions, {"url": url}, parallel=parallel)
+        seconds = per_call(
+            lambda: sequence.invoke(request, DialogueResponder(frame={})),
+            max(1, args.calls // 50),
+        )
+        print(
+            "{} actions taking {:.0f} ms, {:10s} {:8.1f} ms/sequence".format(
+                args.actions,
+                args.delay * 1000,
+                "parallel" if parallel else "sequential",
+                seconds * 1000,
+            )
+        )
+
+    loop.run_until_complete(pool.close_async())
+    pool.close()
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+feature_extraction
+----------------------------------
+
+Benchmarks per-query feature extraction for the text and tagger models, comparing the feature
+extractors compiled once per model config against compiling them again for every query.
+
+Usage:
+    python -m tests.benchmarks.feature_extraction [--repeat N]
+"""
+import argparse
+import os
+import timeit
+
+from mindmeld import markup
+from mindmeld.models import (
+    CLASS_LABEL_TYPE,
+    ENTITIES_LABEL_TYPE,
+    QUERY_EXAMPLE_TYPE,
+    ModelConfig,
+)
+from mindmeld.models.helpers import compile_feature_extractors
+from mindmeld.models.tagger_models import TaggerModel
+from mindmeld.models.taggers.taggers import extract_sequence_features
+from mindmeld.models.text_models import TextModel
+from mindmeld.query_factory import QueryFactory
+from mindmeld.resource_loader import ResourceLoader
+from mindmeld.system_entity_recognizer import NoOpSystemEntityRecognizer
+
+APP_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "kwik_e_mart"
+)
+TRAIN_FILE = os.path.join(
+    APP_PATH, "domains", "store_info", "get_store_hours", "train.txt"
+)
+
+TEXT_MODEL_CONFIG = {
+    "model_type": "text",
+    "example_type": QUERY_EXAMPLE_TYPE,
+    "label_type": CLASS_LABEL_TYPE,
+    "model_settings": {"classifier_type": "logreg"},
+    "params": {"C": 10},
+    "features": {
+        "bag-of-words": {"lengths": [1, 2]},
+        "edge-ngrams": {"lengths": [1, 2]},
+        "in-gaz": {},
+        "exact": {"scaling": 10},
+        "gaz-freq": {},
+        "freq": {"bins": 5},
+        "enable-stemming": True,
+    },
+}
+
+TAGGER_MODEL_CONFIG = {
+    "model_type": "tagger",
+    "example_type": QUERY_EXAMPLE_TYPE,
+    "label_type": ENTITIES_LABEL_TYPE,
+    "model_settings": {"classifier_type": "memm", "tag_scheme": "IOB"},
+    "params": {"C": 10},
+    "features": {
+        "bag-of-words-seq": {
+            "ngram_lengths_to_start_positions": {
+                1: [-2, -1, 0, 1, 2],
+                2: [-2, -1, 0, 1],
+            }
+        },
+        "in-gaz-span-seq": {},
+        "sys-candidates-seq": {"start_positions": [-1, 0, 1]},
+        "enable-stemming": True,
+    },
+}
+
+
+def load_queries(query_factory):
+    with open(TRAIN_FILE, encoding="utf-8") as train_file:
+        # system entity annotations can not be resolved without a system entity recognizer
+        lines = [
+            line.strip()
+            for line in train_file
+            if line.strip() and "|sys_" not in line
+        ]
+    return [
+        markup.load_query(
+            line, query_factory, domain="store_info", intent="get_store_hours"
+        )
+        for line in lines
+    ]
+
+
+def time_per_query(func, queries, repeat):
+    total = min(
+        timeit.repeat(lambda: [func(query) for query in queries], number=1, repeat=repeat)
+    )
+    return total / len(queries) * 1e6
+
+
+def report(name, before, after):
+    print(
+        "{:<12} compiled per query: {:8.1f} us  compiled once: {:8.1f} us  "
+        "speedup: {:.2f}x".format(name, before, after, before / after)
+    )
+
+
+def benchmark_text_model(resource_loader, processed_queries, repeat):
+    model = TextModel(ModelConfig(**TEXT_MODEL_CONFIG))
+    queries = [q.query for q in processed_queries]
+    model.initialize_resources(resource_loader, queries, [q.intent for q in processed_queries])
+    config = model.config
+
+    def extract_uncompiled(query):
+        feat_set = {}
+        for extractor in compile_feature_extractors(config.example_type, config.features):
+            feat_set.update(extractor(query, model._resources))
+        return feat_set
+
+    before = time_per_query(extract_uncompiled, queries, repeat)
+    after = time_per_query(model._extract_features, queries, repeat)
+    report("TextModel", before, after)
+
+
+def benchmark_tagger_model(resource_loader, processed_queries, repeat):
+    model = TaggerModel(ModelConfig(**TAGGER_MODEL_CONFIG))
+    queries = [q.query for q in processed_queries]
+    model.initialize_resources(resource_loader, queries, [q.entities for q in processed_queries])
+    config = model.config
+
+    def extract_uncompiled(query):
+        return extract_sequence_features(
+            query, config.example_type, config.features, model._resources
+        )
+
+    def extract_compiled(query):
+        return model._clf.extract_example_features(query, config, model._resources)
+
+    before = time_per_query(extract_uncompiled, queries, repeat)
+    after = time_per_query(extract_compiled, queries, repeat)
+    report("TaggerModel", before, after)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    # system entities are not needed to compare the feature extraction overhead
+    query_factory = QueryFactory.create_query_factory(
+        APP_PATH, system_entity_recognizer=NoOpSystemEntityRecognizer.get_instance()
+    )
+    resource_loader = ResourceLoader(APP_PATH, query_factory)
+    processed_queries = load_queries(query_factory)
+
+    benchmark_text_model(resource_loader, processed_queries, args.repeat)
+    benchmark_tagger_model(resource_loader, processed_queries, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
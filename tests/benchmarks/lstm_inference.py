@@ -0,0 +1,113 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+lstm_inference
+----------------------------------
+
+Benchmarks inference of the LSTM entity recognizer trained on the kwik_e_mart app. It reports
+the p50 and p99 latency of predicting one query at a time, and the throughput of predicting all
+the queries at once, with and without batching the queries by sequence length.
+
+Usage:
+    python -m tests.benchmarks.lstm_inference [--repeat N]
+"""
+import argparse
+import glob
+import os
+import time
+import timeit
+
+import numpy as np
+
+from mindmeld import markup
+from mindmeld.models import ENTITIES_LABEL_TYPE, QUERY_EXAMPLE_TYPE, ModelConfig
+from mindmeld.models.tagger_models import TaggerModel
+from mindmeld.query_factory import QueryFactory
+from mindmeld.resource_loader import ResourceLoader
+from mindmeld.system_entity_recognizer import NoOpSystemEntityRecognizer
+
+APP_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "kwik_e_mart"
+)
+
+LSTM_MODEL_CONFIG = {
+    "model_type": "tagger",
+    "example_type": QUERY_EXAMPLE_TYPE,
+    "label_type": ENTITIES_LABEL_TYPE,
+    "model_settings": {"classifier_type": "lstm", "tag_scheme": "IOB"},
+    "params": {
+        "number_of_epochs": 3,
+        "token_embedding_dimension": 50,
+        "gaz_encoding_dimension": 50,
+        "token_lstm_hidden_state_dimension": 200,
+    },
+    "features": {"in-gaz-span-seq": {}},
+}
+
+
+def load_queries(query_factory):
+    queries = []
+    for path in sorted(glob.glob(os.path.join(APP_PATH, "domains", "*", "*", "train.txt"))):
+        with open(path, encoding="utf-8") as train_file:
+            # system entity annotations can not be resolved without a system entity recognizer
+            lines = [line.strip() for line in train_file if line.strip() and "|sys_" not in line]
+        queries.extend(markup.load_queries(lines, query_factory))
+    return queries
+
+
+def single_query_latencies(model, queries):
+    latencies = []
+    for query in queries:
+        start = time.perf_counter()
+        model.predict([query])
+        latencies.append(time.perf_counter() - start)
+    return np.array(latencies) * 1e3
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    # system entities are not needed to measure the network inference
+    query_factory = QueryFactory.create_query_factory(
+        APP_PATH, system_entity_recognizer=NoOpSystemEntityRecognizer.get_instance()
+    )
+    resource_loader = ResourceLoader(APP_PATH, query_factory)
+    processed_queries = load_queries(query_factory)
+    queries = [q.query for q in processed_queries]
+    labels = [q.entities for q in processed_queries]
+
+    model = TaggerModel(ModelConfig(**LSTM_MODEL_CONFIG))
+    model.initialize_resources(resource_loader, queries, labels)
+    model.fit(queries, labels)
+    lstm = model._clf
+
+    latencies = single_query_latencies(model, queries)
+    print(
+        "single query  p50: {:7.2f} ms  p99: {:7.2f} ms".format(
+            np.percentile(latencies, 50), np.percentile(latencies, 99)
+        )
+    )
+
+    predictions = {}
+    for name, batch_size, bucket_size in (
+        ("one batch", len(queries), lstm.padding_length),
+        ("length buckets", 256, 4),
+    ):
+        lstm.inference_batch_size = batch_size
+        lstm.inference_length_bucket_size = bucket_size
+        predictions[name] = model.predict(queries)
+        total = min(
+            timeit.repeat(lambda: model.predict(queries), number=1, repeat=args.repeat)
+        )
+        print(
+            "{:<14} {} queries: {:8.1f} queries/s".format(name, len(queries), len(queries) / total)
+        )
+
+    assert predictions["one batch"] == predictions["length buckets"]
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+query_memory
+----------------------------------
+
+Benchmarks the memory used by the training queries of the test apps, reporting the bytes each
+processed query keeps alive in memory and the size of its pickle in the query cache.
+
+Usage:
+    python -m tests.benchmarks.query_memory
+"""
+import argparse
+import gc
+import glob
+import os
+import pickle
+import tracemalloc
+
+from mindmeld import markup
+from mindmeld.query_factory import QueryFactory
+from mindmeld.system_entity_recognizer import NoOpSystemEntityRecognizer
+
+TESTS_PATH = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP_PATH = os.path.join(TESTS_PATH, "kwik_e_mart")
+
+
+def load_markup():
+    lines = []
+    pattern = os.path.join(TESTS_PATH, "**", "domains", "**", "*.txt")
+    for path in sorted(glob.glob(pattern, recursive=True)):
+        with open(path, encoding="utf-8") as query_file:
+            lines.extend(line.strip() for line in query_file if line.strip())
+    return lines
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.parse_args()
+
+    # system entities are not needed to measure the query representation
+    query_factory = QueryFactory.create_query_factory(
+        APP_PATH, system_entity_recognizer=NoOpSystemEntityRecognizer.get_instance()
+    )
+    lines = load_markup()
+    # create the queries once so the caches of the tokenizer and the query factory are warm
+    markup.load_queries(lines, query_factory=query_factory)
+
+    gc.collect()
+    tracemalloc.start()
+    baseline, _ = tracemalloc.get_traced_memory()
+    queries = markup.load_queries(lines, query_factory=query_factory)
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    pickled = sum(len(pickle.dumps(q, pickle.HIGHEST_PROTOCOL)) for q in queries)
+    print(
+        "{} queries  in memory: {:8.1f} bytes/query  pickled: {:8.1f} bytes/query".format(
+            len(queries), (current - baseline) / len(queries), pickled / len(queries)
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+response_serialization
+----------------------------------
+
+Benchmarks the serialization of /parse responses with long conversation histories. Compares the
+previous pipeline, which serialized the body, parsed it back to add the response time and API
+version, serialized it again and parsed it once more for the request log, against serializing the
+final body once with ``mindmeld.server.encode_json``.
+
+Usage:
+    python -m tests.benchmarks.response_serialization [--history N] [--repeat N]
+"""
+import argparse
+import json
+import timeit
+
+from mindmeld.server import encode_json, orjson
+
+
+def make_turn(index):
+    return {
+        "request": {
+            "text": "is the store on elm street open at {} pm".format(index % 12),
+            "domain": "store_info",
+            "intent": "get_store_hours",
+            "entities": [
+                {
+                    "text": "elm street",
+                    "type": "store_name",
+                    "role": None,
+                    "value": [{"cname": "23 Elm Street", "score": 40.3, "id": "1"}],
+                    "span": {"start": 16, "end": 25},
+                }
+            ],
+            "context": {"device": "web"},
+            "confidences": {},
+            "nbest_transcripts_text": [],
+            "nbest_transcripts_entities": [],
+            "nbest_aligned_entities": [],
+            "frame": {"store": "23 Elm Street"},
+            "params": {"time_zone": "America/Los_Angeles"},
+            "history": [],
+        },
+        "dialogue_state": "send_store_hours",
+        "directives": [
+            {
+                "name": "reply",
+                "type": "view",
+                "payload": {
+                    "text": "The 23 Elm Street Kwik-E-Mart is open from 7:00 to 19:00."
+                },
+            },
+            {"name": "listen", "type": "action"},
+        ],
+        "frame": {"store": "23 Elm Street"},
+        "params": {"allowed_intents": [], "target_dialogue_state": None},
+        "slots": {"store_name": "23 Elm Street", "open_time": "7:00"},
+    }
+
+
+def make_response(history_len):
+    response = make_turn(history_len)
+    response["history"] = [make_turn(index) for index in range(history_len)]
+    response["request_id"] = "c0ffee"
+    return response
+
+
+def previous_pipeline(response):
+    # jsonify, then _after_request, then _log_request
+    data = json.loads(json.dumps(response))
+    data["response_time"] = 0.1
+    data["version"] = "2.0"
+    body = json.dumps(data)
+    json.loads(body)
+    return body
+
+
+def single_pass(response):
+    data = dict(response)
+    data["response_time"] = 0.1
+    data["version"] = "2.0"
+    return encode_json(data)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--history", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--number", type=int, default=50)
+    args = parser.parse_args()
+
+    response = make_response(args.history)
+    if json.loads(previous_pipeline(response)) != json.loads(single_pass(response)):
+        raise AssertionError("single pass serialization differs from the previous pipeline")
+
+    timings = {}
+    for name, func in [("previous", previous_pipeline), ("single pass", single_pass)]:
+        timings[name] = (
+            min(timeit.repeat(lambda: func(response), number=args.number, repeat=args.repeat))
+            / args.number
+        )
+    print(
+        "history: {} turns  body: {} kB  encoder: {}".format(
+            args.history,
+            len(single_pass(response)) // 1024,
+            "orjson" if orjson is not None else "json",
+        )
+    )
+    for name, seconds in timings.items():
+        print("{:12s} {:8.3f} ms/response".format(name, seconds * 1000))
+    print("speedup: {:.2f}x".format(timings["previous"] / timings["single pass"]))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+startup
+----------------------------------
+
+Benchmarks the time it takes to import MindMeld and to load the natural language processor of
+the kwik_e_mart app, and reports which heavy optional dependencies were imported. Each
+measurement runs in a fresh interpreter so no module is already imported.
+
+Usage:
+    python -m tests.benchmarks.startup [--repeat N]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+APP_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "kwik_e_mart"
+)
+
+HEAVY_MODULES = ["tensorflow", "torch", "sentence_transformers", "spacy", "elasticsearch"]
+
+STEPS = {
+    "import mindmeld": "import mindmeld",
+    "import nlp": "from mindmeld.components import NaturalLanguageProcessor",
+    "load nlp": (
+        "from mindmeld.components import NaturalLanguageProcessor\n"
+        "NaturalLanguageProcessor({!r}).load()".format(APP_PATH)
+    ),
+}
+
+SCRIPT = """
+import json, resource, sys, time
+start = time.perf_counter()
+{code}
+elapsed = time.perf_counter() - start
+print(json.dumps({{
+    "seconds": elapsed,
+    "max_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    "loaded": [name for name in {heavy!r} if name in sys.modules],
+}}))
+"""
+
+
+def measure(code):
+    script = SCRIPT.format(code=code, heavy=HEAVY_MODULES)
+    output = subprocess.check_output([sys.executable, "-c", script])
+    return json.loads(output.decode("utf-8").strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    for name, code in STEPS.items():
+        runs = [measure(code) for _ in range(args.repeat)]
+        best = min(runs, key=lambda run: run["seconds"])
+        print(
+            "{:16} {:8.3f} s  max rss: {:8.1f} MB  heavy modules: {}".format(
+                name, best["seconds"], best["max_rss_mb"], ", ".join(best["loaded"]) or "none"
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -7,15 +7,23 @@ test_custom_action
 
 Tests for custom actions.
 """
+import aiohttp
 import pytest
+import requests
 from unittest.mock import Mock, patch
 
 from mindmeld import Application
 from mindmeld.components import (
     CustomAction,
+    CustomActionSequence,
     invoke_custom_action,
     invoke_custom_action_async,
 )
+from mindmeld.components.custom_action import (
+    CustomActionClientPool,
+    CustomActionException,
+    get_ssl_context,
+)
 from mindmeld.components.dialogue import DialogueResponder
 from mindmeld.components.request import Request
 
@@ -32,7 +40,7 @@ def test_custom_action():
     action_config = {"url": "http://localhost:8080/v2/action"}
     action = CustomAction(name="action_call_people", config=action_config)
 
-    with patch("requests.post") as mock_object:
+    with patch("requests.Session.post") as mock_object:
         mock_object.return_value = Mock()
         mock_object.return_value.status_code = 200
         mock_object.return_value.json.return_value = {}
@@ -53,7 +61,7 @@ def test_custom_action_merge():
     action_config = {"url": "http://localhost:8080/v2/action"}
     action = CustomAction(name="action_call_people", config=action_config)
 
-    with patch("requests.post") as mock_object:
+    with patch("requests.Session.post") as mock_object:
         mock_object.return_value = Mock()
         mock_object.return_value.status_code = 200
         mock_object.return_value.json.return_value = {
@@ -108,7 +116,7 @@ def test_custom_action_no_merge():
     action_config = {"url": "http://localhost:8080/v2/action"}
     action = CustomAction(name="action_call_people", config=action_config, merge=False)
 
-    with patch("requests.post") as mock_object:
+    with patch("requests.Session.post") as mock_object:
         mock_object.return_value = Mock()
         mock_object.return_value.status_code = 200
         mock_object.return_value.json.return_value = {
@@ -158,7 +166,7 @@ def test_invoke_custom_action():
     """Test invoke_custom_action to ensure that the parameters of the JSON body are correct"""
     action_config = {"url": "http://localhost:8080/v2/action"}
 
-    with patch("requests.post") as mock_object:
+    with patch("requests.Session.post") as mock_object:
         mock_object.return_value = Mock()
         mock_object.return_value.status_code = 200
         mock_object.return_value.json.return_value = {}
@@ -231,7 +239,7 @@ def test_custom_action_handler(home_assistant_nlp):
     app.custom_action(intent="set_thermostat", action="set-thermostat")
     app.custom_action(default=True, action="times-and-dates")
 
-    with patch("requests.post") as mock_object:
+    with patch("requests.Session.post") as mock_object:
         mock_object.return_value = Mock()
         mock_object.return_value.status_code = 200
         mock_object.return_value.json.return_value = {
@@ -262,7 +270,7 @@ def test_custom_action_sequence(home_assistant_nlp):
         intent="set_thermostat", actions=["set-thermostat", "clear-thermostat"]
     )
 
-    with patch("requests.post") as mock_object:
+    with patch("requests.Session.post") as mock_object:
         mock_object.return_value = Mock()
         mock_object.return_value.status_code = 200
         mock_object.return_value.json.return_value = {"directives": ["some-directive"]}
@@ -291,3 +299,103 @@ async def test_custom_action_handler_async(home_assistant_nlp):
         # invoke set thermostat intent
         res = await app.app_manager.parse("turn it to 70 degrees")
         assert res.directives == ["set-thermostat-action"]
+
+
+def test_custom_action_client_pool_reuses_session():
+    """Test that a thread reuses its session for all custom actions"""
+    pool = CustomActionClientPool(pool_size=4)
+    with patch("requests.Session.post") as mock_object:
+        mock_object.return_value = Mock()
+        mock_object.return_value.status_code = 500
+        assert pool.post("http://localhost:8080/a", {}) == (500, {})
+        session = pool._get_client(("requests",))
+        assert pool.post("http://localhost:8080/b", {}) == (500, {})
+        assert pool._get_client(("requests",)) is session
+        assert session.get_adapter("http://localhost:8080/")._pool_maxsize == 4
+    pool.close()
+    assert pool._get_client(("requests",)) is None
+
+
+def test_custom_action_sequence_parallel():
+    """Test that the responses of a parallel sequence are merged in order"""
+    sequence = CustomActionSequence(
+        ["first", "second"], {"url": "some-url"}, parallel=True
+    )
+
+    def post(url, json):
+        del url
+        return Mock(
+            status_code=200,
+            json=Mock(return_value={"directives": [json["action"]], "frame": {}}),
+        )
+
+    with patch("requests.Session.post", side_effect=post) as mock_object:
+        request = Request(text="sing a song", domain="some domain", intent="some intent")
+        responder = DialogueResponder()
+        assert sequence.invoke(request, responder)
+        assert responder.directives == ["first", "second"]
+        assert mock_object.call_count == 2
+        # the actions are independent, so both were sent the initial responder
+        for call in mock_object.call_args_list:
+            assert call[1]["json"]["responder"]["directives"] == []
+
+    with pytest.raises(CustomActionException):
+        CustomActionSequence(["first", "second"], {"url": "some-url"}, merge=False, parallel=True)
+
+
+def test_custom_action_sequence_parallel_connection_error():
+    """Test that a parallel sequence merges the responses before an unreachable action"""
+    sequence = CustomActionSequence(
+        ["first", "second", "third"], {"url": "some-url"}, parallel=True
+    )
+
+    def post(url, json):
+        del url
+        if json["action"] == "second":
+            raise requests.exceptions.ConnectionError("refused")
+        return Mock(
+            status_code=200,
+            json=Mock(return_value={"directives": [json["action"]], "frame": {}}),
+        )
+
+    with patch("requests.Session.post", side_effect=post):
+        request = Request(text="sing a song", domain="some domain", intent="some intent")
+        responder = DialogueResponder()
+        assert not sequence.invoke(request, responder)
+        assert responder.directives == ["first"]
+
+
+@pytest.mark.asyncio
+async def test_custom_action_sequence_parallel_async_connection_error():
+    """Test that a client error of a parallel sequence does not escape from it"""
+    sequence = CustomActionSequence(
+        ["first", "second"], {"url": "some-url"}, parallel=True
+    )
+
+    async def post_async(self, json_data):
+        if json_data["action"] == "second":
+            raise aiohttp.ClientConnectionError("refused")
+        return 200, {"directives": [json_data["action"]], "frame": {}}
+
+    with patch("mindmeld.components.CustomAction.post_async", post_async):
+        request = Request(text="sing a song", domain="some domain", intent="some intent")
+        responder = DialogueResponder()
+        assert not await sequence.invoke_async(request, responder)
+        assert responder.directives == ["first"]
+
+
+def test_ssl_context_is_reloaded_when_files_change(tmpdir):
+    """Test that SSL contexts are cached until their certificate files change"""
+    cert = tmpdir.join("cert.pem")
+    cert.write("")
+    with patch("ssl.create_default_context") as create_default_context:
+        context = get_ssl_context(str(cert))
+        assert get_ssl_context(str(cert)) is context
+        assert create_default_context.call_count == 1
+
+        cert.setmtime(cert.mtime() + 10)
+        get_ssl_context(str(cert))
+        assert create_default_context.call_count == 2
+
+        # a client certificate without a private key is not loaded into the context
+        assert get_ssl_context(public_key=str(cert)) is None
@@ -10,6 +10,9 @@ Tests for dialogue module.
 These tests apply regardless of async/await support.
 """
 # pylint: disable=locally-disabled,redefined-outer-name
+from itertools import combinations
+from random import Random
+
 import pytest
 
 from mindmeld.components import Conversation, DialogueManager, DialogueResponder
@@ -281,6 +284,52 @@ class TestDialogueManager:
         result = dm.apply_handler(request, response)
         assert result.dialogue_state == "middleware_test"
 
+    def test_middleware_added_after_dispatch(self, dm):
+        """Middleware added after a handler was dispatched is applied to it"""
+
+        def _middle(request, responder, handler):
+            responder.flag = True
+            handler(request, responder)
+
+        request = create_request("domain", "intent")
+        dm.apply_handler(request, create_responder(request))
+        dm.add_middleware(_middle)
+
+        result = dm.apply_handler(request, create_responder(request))
+        assert result.flag
+
+    def test_rule_index_matches_linear_scan(self):
+        """The indexed dispatch finds the same dialogue state as applying each rule in order"""
+        random = Random(0)
+        values = [None, "a", "b", "c"]
+        entity_types = ["x", "y", "z"]
+
+        dm = DialogueManager()
+        for index in range(300):
+            kwargs = {}
+            domain, intent = random.choice(values), random.choice(values)
+            if domain:
+                kwargs["domain"] = domain
+            if intent:
+                kwargs["intent"] = intent
+            if random.random() < 0.5:
+                kwargs["has_entities"] = random.sample(
+                    entity_types, random.randint(0, len(entity_types))
+                )
+            dm.add_dialogue_rule("state_{}".format(index), lambda x, y: None, **kwargs)
+
+        for domain in values:
+            for intent in values:
+                for num_entities in range(len(entity_types) + 1):
+                    for types in combinations(entity_types, num_entities):
+                        request = create_request(
+                            domain, intent, [{"type": t} for t in types]
+                        )
+                        expected = next(
+                            (r.dialogue_state for r in dm.rules if r.apply(request)), None
+                        )
+                        assert dm._get_dialogue_state(request) == expected
+
 
 def test_convo_params_are_cleared(kwik_e_mart_nlp, kwik_e_mart_app_path):
     """Tests that the params are cleared in one trip from app to mm."""
@@ -8,11 +8,13 @@ test_nlp
 Tests for NaturalLanguageProcessor module.
 """
 import math
+from unittest.mock import patch
 
 # pylint: disable=locally-disabled,redefined-outer-name
 import pytest
 
 from mindmeld.components import NaturalLanguageProcessor
+from mindmeld.components.nlp import IntentProcessor, Processor
 from mindmeld.exceptions import AllowedNlpClassesKeyError, ProcessorError
 from mindmeld.query_factory import QueryFactory
 from mindmeld.components.domain_classifier import DomainClassifier
@@ -39,6 +41,69 @@ def test_build(empty_nlp):
     nlp.build()
 
 
+def test_parallel_build(kwik_e_mart_app_path, kwik_e_mart_nlp):
+    """Tests that building a processor in worker processes fits the same models as a serial
+    build"""
+    nlp = NaturalLanguageProcessor(app_path=kwik_e_mart_app_path)
+    nlp.build(num_workers=2)
+
+    assert nlp.ready
+    assert nlp.domain_classifier.hash == kwik_e_mart_nlp.domain_classifier.hash
+    for domain, domain_processor in nlp.domains.items():
+        serial_domain = kwik_e_mart_nlp.domains[domain]
+        assert domain_processor.intent_classifier.hash == (
+            serial_domain.intent_classifier.hash
+        )
+        for intent, intent_processor in domain_processor.intents.items():
+            serial_intent = serial_domain.intents[intent]
+            assert intent_processor.ready
+            assert intent_processor.entity_recognizer.hash == (
+                serial_intent.entity_recognizer.hash
+            )
+            assert set(intent_processor.entities) == set(serial_intent.entities)
+
+    for text in ["Hello", "Where is the store on Elm Street?"]:
+        assert nlp.process(text) == kwik_e_mart_nlp.process(text)
+
+
+def test_parallel_build_raises_fit_errors(empty_nlp):
+    """Tests that an error raised while fitting a model in a worker process is raised without
+    fitting the models again serially"""
+    with patch.object(
+        IntentProcessor, "_fit", side_effect=ValueError("fit failed")
+    ) as fit:
+        with pytest.raises(ValueError, match="fit failed"):
+            empty_nlp.build(num_workers=2)
+    # the mock is only called in the worker processes
+    fit.assert_not_called()
+
+
+class BuildOnlyProcessor(Processor):
+    """A processor which only implements _build(), as processors did before models could be
+    fit in worker processes"""
+
+    def _build(self, incremental=False, label_set=None):
+        self.build_label_set = label_set
+
+    def _dump(self):
+        pass
+
+    def _load(self, incremental_timestamp=None):
+        pass
+
+    def _evaluate(self, print_stats, label_set="test"):
+        pass
+
+
+def test_parallel_build_of_build_only_processor(kwik_e_mart_app_path):
+    """Tests that a processor which only implements _build() is built by a parallel build"""
+    processor = BuildOnlyProcessor(kwik_e_mart_app_path)
+    processor.build(label_set="train", num_workers=2)
+
+    assert processor.build_label_set == "train"
+    assert processor.ready
+
+
 def test_dump(kwik_e_mart_nlp):
     """Test dump method of nlp"""
     kwik_e_mart_nlp.dump()
@@ -297,6 +362,46 @@ def test_nlp_hierarchy_using_dynamic_gazetteer(
         assert expected_entity in [entity["text"] for entity in response["entities"]]
 
 
+test_data_batch = [
+    "Hello",
+    "When is main street open tomorrow",
+    "is the 45 Fifth store open?",
+    "find me the nearest kwik-e-mart",
+    "goodbye",
+    "what mythical scottish town appears for one day every 100 years",
+]
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {},
+        {"verbose": True},
+        {"allowed_intents": ["store_info.get_store_hours", "store_info.find_nearest_store"]},
+        {"allowed_intents": ["store_info.*"], "verbose": True},
+        {"dynamic_resource": {"gazetteers": {"store_name": {"main street": 10.0}}}},
+    ],
+)
+def test_process_batch(kwik_e_mart_nlp, kwargs):
+    """Tests that processing a batch of queries matches processing each query"""
+    expected = [kwik_e_mart_nlp.process(query, **kwargs) for query in test_data_batch]
+    assert kwik_e_mart_nlp.process_batch(test_data_batch, **kwargs) == expected
+
+
+def test_process_batch_training_queries(kwik_e_mart_nlp):
+    """Tests that processing the training queries of every intent in a single batch matches
+    processing each query"""
+    query_tree = kwik_e_mart_nlp.resource_loader.get_labeled_queries()
+    texts = [
+        query.query.text
+        for intents in query_tree.values()
+        for queries in intents.values()
+        for query in queries
+    ]
+    expected = [kwik_e_mart_nlp.process(text) for text in texts]
+    assert kwik_e_mart_nlp.process_batch(texts) == expected
+
+
 test_data_3 = [
     "what mythical scottish town appears for one day every 100 years",
     "lets run 818m",
@@ -578,11 +683,12 @@ def test_process_empty_nbest_unspecified_intent(kwik_e_mart_nlp, queries):
 
 def test_parallel_processing(kwik_e_mart_nlp):
     nlp = kwik_e_mart_nlp
-    import mindmeld.components.nlp as nlp_module
+    from mindmeld.components._worker_pool import PROCESS_MODE, get_worker_pool
     import os
     import time
 
-    if nlp_module.executor:
+    pool = get_worker_pool(PROCESS_MODE)
+    if pool.enabled:
         input_list = ["A", "B", "C"]
         parent = os.getpid()
 
@@ -595,19 +701,21 @@ def test_parallel_processing(kwik_e_mart_nlp):
                 item = item + "-child"
             return item
 
-        prev_executor = nlp_module.executor
+        pool.start(wait=True)
+        restarts = pool.metrics.get("restarts", 0)
         nlp._test_function = test_function.__get__(nlp)
         processed = nlp._process_list(input_list, "_test_function")
-        # verify the process pool was restarted
+        # verify the stale workers were retired
         # (the function doesn't exist yet in the subprocesses)
-        assert nlp_module.executor != prev_executor
+        assert pool.metrics["restarts"] == restarts + 1
         # verify the list was processed by main process
         assert processed == ("a-parent", "b-parent", "c-parent")
 
-        prev_executor = nlp_module.executor
+        # start workers which are forked with the new function
+        pool.start(wait=True)
         processed = nlp._process_list(input_list, "_test_function")
-        # verify the process pool was not restarted
-        assert prev_executor == nlp_module.executor
+        # verify the workers were not restarted again
+        assert pool.metrics["restarts"] == restarts + 1
         # verify the list was processed by subprocesses
         assert processed == ("a-child", "b-child", "c-child")
 
@@ -618,20 +726,30 @@ def test_parallel_processing(kwik_e_mart_nlp):
                 item = item + "-parent"
             else:
                 # sleep enough to trigger a timeout in the child process
-                time.sleep(nlp_module.SUBPROCESS_WAIT_TIME + 0.1)
+                time.sleep(pool.timeout + 0.1)
                 item = item + "-child"
             return item
 
         nlp._test_function = slow_function.__get__(nlp)
-        nlp_module.restart_subprocesses()
-        prev_executor = nlp_module.executor
+        pool.start(wait=True)
+        timeouts = pool.metrics.get("fallbacks_timeout", 0)
         processed = nlp._process_list(input_list, "_test_function")
-        # verify the process pool was restarted due to timeout
-        assert prev_executor != nlp_module.executor
+        # verify the timeout was recorded without restarting the workers
+        assert pool.metrics["fallbacks_timeout"] == timeouts + 1
+        assert pool.metrics["restarts"] == restarts + 1
         # verify the list was processed by main process
         assert processed == ("a-parent", "b-parent", "c-parent")
 
 
+def test_build_hands_off_models(kwik_e_mart_nlp):
+    from mindmeld.components._worker_pool import PROCESS_MODE, get_worker_pool
+
+    pool = get_worker_pool(PROCESS_MODE)
+    version = pool.version
+    kwik_e_mart_nlp.domains.store_info.intents.exit.load()
+    assert pool.version > version
+
+
 def test_custom_data(kwik_e_mart_nlp):
     store_info_processor = kwik_e_mart_nlp.domains.store_info
 
@@ -9,6 +9,7 @@ Tests for parser module.
 """
 # pylint: disable=locally-disabled,redefined-outer-name
 import pytest
+from mock import patch
 
 from mindmeld import markup
 from mindmeld.components.parser import Parser
@@ -263,3 +264,36 @@ def test_parser_timeout():
 
     with pytest.raises(ParserTimeout):
         parser.parse_entities(query.query, query.entities, handle_timeout=False)
+
+
+def test_parser_shares_compiled_grammar():
+    """Tests that parsers with the same config share their compiled grammar"""
+    config = {"head": ["dependent"]}
+    parser = Parser(config=config)
+    other_parser = Parser(config={"head": ["dependent"]})
+    different_parser = Parser(config={"head": ["other"]})
+
+    assert parser._compiled_grammar is other_parser._compiled_grammar
+    assert parser._compiled_grammar is not different_parser._compiled_grammar
+
+
+def test_parser_caches_sentential_forms():
+    """Tests that the parses of a sentential form are reused for queries with the same entity
+    types, but ranked by the distances in each query"""
+    parser = Parser(config={"head": ["dependent"]})
+    compiled_grammar = parser._compiled_grammar
+
+    query = markup.load_query("{Hello|head} {there|dependent} my {friend|head}")
+    entities = parser.parse_entities(query.query, query.entities)
+    assert entities[0].children == (entities[1],)
+    assert entities[2].children is None
+
+    with patch.object(
+        compiled_grammar, "_parse", side_effect=AssertionError("parsed again")
+    ):
+        query = markup.load_query("{Hello|head} my {friend|dependent} {there|head}")
+        entities = parser.parse_entities(query.query, query.entities)
+
+    assert entities[0].children is None
+    assert entities[1].parent == entities[2]
+    assert entities[2].children == (entities[1],)
@@ -7,13 +7,20 @@ test_question_answerer
 
 Tests for `question_answerer` module.
 """
+import json
 import os
 
 # pylint: disable=locally-disabled,redefined-outer-name
 import pytest
 
 from mindmeld.components._elasticsearch_helpers import create_es_client
-from mindmeld.components.question_answerer import QuestionAnswerer
+from mindmeld.components.question_answerer import (
+    QuestionAnswerer,
+    _embed_documents,
+    _LoadCheckpoint,
+    _prefetch,
+    _read_documents,
+)
 
 ENTITY_TYPE = "store_name"
 STORE_DATA_FILE_PATH = os.path.dirname(__file__) + "/../kwik_e_mart/data/stores.json"
@@ -319,3 +326,71 @@ def test_embedder_search_glove(food_ordering_with_glove):
         name="pasta with tomato sauce",
     )
     assert len(res) > 0
+
+
+class _FakeEncoding(list):
+    def tolist(self):
+        return list(self)
+
+
+class _FakeEmbedder:
+    def __init__(self):
+        self.batches = []
+
+    def get_encodings(self, text_list):
+        self.batches.append(list(text_list))
+        return [_FakeEncoding([len(text)]) for text in text_list]
+
+
+def test_embed_documents_in_batches():
+    """Tests that the fields of several documents are encoded together"""
+    docs = [{"id": str(idx), "name": "n" * idx, "price": idx} for idx in range(1, 6)]
+    embedder = _FakeEmbedder()
+
+    embedded = list(_embed_documents(iter(docs), embedder, ["name"], batch_size=2))
+
+    assert [len(batch) for batch in embedder.batches] == [2, 2, 1]
+    assert [doc["name_embedding"] for doc in embedded] == [[1], [2], [3], [4], [5]]
+    assert "price_embedding" not in embedded[0]
+
+
+def test_read_documents_resumes_from_checkpoint(tmpdir):
+    """Tests that reading a jsonl data file resumes after the documents which were loaded"""
+    data_file = str(tmpdir.join("docs.jsonl"))
+    with open(data_file, "w") as data_fp:
+        for idx in range(5):
+            data_fp.write(json.dumps({"id": idx}) + "\n")
+    checkpoint_path = str(tmpdir.join("checkpoint.json"))
+
+    checkpoint = _LoadCheckpoint(checkpoint_path, data_file)
+    assert not checkpoint.load()
+    _, docs = _read_documents(data_file, checkpoint)
+    for _ in range(3):
+        next(docs)
+        checkpoint.loaded()
+    checkpoint.save()
+
+    checkpoint = _LoadCheckpoint(checkpoint_path, data_file)
+    assert checkpoint.load()
+    assert checkpoint.documents == 3
+    _, docs = _read_documents(data_file, checkpoint)
+    assert [doc["id"] for doc in docs] == [3, 4]
+
+    # the checkpoint is ignored once the data file changes
+    with open(data_file, "a") as data_fp:
+        data_fp.write(json.dumps({"id": 5}) + "\n")
+    assert not _LoadCheckpoint(checkpoint_path, data_file).load()
+
+
+def test_prefetch():
+    """Tests that prefetching an iterable returns its items, and raises its errors"""
+    assert list(_prefetch(iter(range(100)), max_items=3)) == list(range(100))
+
+    def _fail():
+        yield 1
+        raise ValueError("failed")
+
+    items = _prefetch(_fail(), max_items=3)
+    assert next(items) == 1
+    with pytest.raises(ValueError):
+        next(items)
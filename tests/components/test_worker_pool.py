@@ -0,0 +1,163 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+test_worker_pool
+----------------------------------
+
+Tests for the worker pools of the natural language processor.
+"""
+# pylint: disable=locally-disabled,redefined-outer-name
+import os
+import time
+
+import pytest
+
+from mindmeld.components._worker_pool import (
+    PROCESS_MODE,
+    THREAD_MODE,
+    StaleWorkerError,
+    WorkerPool,
+)
+
+
+def add(item, value):
+    return item + value
+
+
+def get_pid(item):
+    return os.getpid()
+
+
+def sleep(item, seconds):
+    time.sleep(seconds)
+    return item
+
+
+def fail(item):
+    raise ValueError(item)
+
+
+def stale(item):
+    raise StaleWorkerError()
+
+
+@pytest.fixture(params=[PROCESS_MODE, THREAD_MODE])
+def pool(request):
+    pool = WorkerPool(request.param, num_workers=2, timeout=2.0)
+    yield pool
+    pool.shutdown()
+
+
+def wait_for_health_check(pool):
+    thread = pool._health_check_thread
+    if thread is not None:
+        thread.join()
+
+
+def test_map(pool):
+    pool.start(wait=True)
+    assert pool.map(add, [1, 2, 3], 10) == (11, 12, 13)
+    assert pool.metrics["parallel"] == 1
+    assert pool.metrics["starts"] == 1
+
+
+def test_map_in_process_workers():
+    pool = WorkerPool(PROCESS_MODE, num_workers=2)
+    pool.start(wait=True)
+    assert os.getpid() not in pool.map(get_pid, [1, 2, 3])
+    pool.shutdown()
+
+
+def test_workers_are_health_checked_in_background(pool):
+    # the first list is processed in series while the new workers are checked
+    assert pool.map(add, [1, 2, 3], 10) is None
+    assert pool.metrics["fallbacks_unhealthy"] == 1
+    wait_for_health_check(pool)
+    assert pool.map(add, [1, 2, 3], 10) == (11, 12, 13)
+    assert pool.metrics["starts"] == 1
+
+
+def test_disabled_pool():
+    pool = WorkerPool(PROCESS_MODE, num_workers=0)
+    assert pool.map(add, [1, 2, 3], 10) is None
+    assert pool.metrics == {}
+
+
+def test_single_item_is_not_dispatched(pool):
+    assert pool.map(add, [1], 10) is None
+    assert "starts" not in pool.metrics
+
+
+def test_timeout_does_not_restart_workers():
+    pool = WorkerPool(PROCESS_MODE, num_workers=2, timeout=0.1)
+    pool.start(wait=True)
+    assert pool.map(sleep, [1, 2], 0.5) is None
+    assert pool.metrics["fallbacks_timeout"] == 1
+
+    # the busy workers are checked in the background rather than restarted
+    pool.timeout = 2.0
+    assert pool.map(add, [1, 2], 1) is None
+    wait_for_health_check(pool)
+    assert pool.map(add, [1, 2], 1) == (2, 3)
+    assert pool.metrics["starts"] == 1
+    assert "restarts" not in pool.metrics
+    assert pool.metrics["health_checks"] == 2
+    pool.shutdown()
+
+
+def test_thread_timeout_awaits_running_items():
+    pool = WorkerPool(THREAD_MODE, num_workers=1, timeout=0.1)
+    pool.start(wait=True)
+    calls = []
+
+    def record(item):
+        calls.append(item)
+        time.sleep(0.3)
+        return item
+
+    # the running item is awaited and the others are processed in the calling thread, so no
+    # item is processed twice
+    assert pool.map(record, [1, 2, 3]) == (1, 2, 3)
+    assert sorted(calls) == [1, 2, 3]
+    assert pool.metrics["fallbacks_timeout"] == 1
+    pool.shutdown()
+
+
+def test_task_error_falls_back(pool):
+    pool.start(wait=True)
+    assert pool.map(fail, [1, 2]) is None
+    assert pool.metrics["fallbacks_error"] == 1
+    assert pool.map(add, [1, 2], 1) == (2, 3)
+    assert "restarts" not in pool.metrics
+
+
+def test_stale_workers_are_restarted(pool):
+    pool.start(wait=True)
+    assert pool.map(stale, [1, 2]) is None
+    assert pool.metrics["fallbacks_stale"] == 1
+    assert pool.metrics["restarts"] == 1
+    assert pool.map(add, [1, 2], 1) is None
+    wait_for_health_check(pool)
+    assert pool.map(add, [1, 2], 1) == (2, 3)
+    assert pool.metrics["starts"] == 2
+
+
+def test_handoff():
+    pool = WorkerPool(PROCESS_MODE, num_workers=2)
+    pool.start(wait=True)
+    pids = set(pool.map(get_pid, [1, 2, 3, 4]))
+    version = pool.version
+
+    pool.handoff(preload=True)
+    assert pool.version == version + 1
+    assert pool.metrics["starts"] == 2
+    # the workers forked with the previous version are not used
+    assert not pids & set(pool.map(get_pid, [1, 2, 3, 4]))
+    assert pool.check_health()
+    pool.shutdown()
+
+
+def test_invalid_mode():
+    with pytest.raises(ValueError):
+        WorkerPool("fiber")
@@ -0,0 +1,81 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+test_crf
+----------------------------------
+
+Tests for the `crf` tagger module.
+"""
+# pylint: disable=locally-disabled,redefined-outer-name
+import pickle
+from unittest.mock import patch
+
+import pytest
+
+from mindmeld.models.taggers.crf import FeatureBinner
+
+TRAIN_FEATURES = [
+    [
+        {"bag_of_words|length:1|word_pos:0": 1, "in_gaz|type:store_name": 1, "freq": 3},
+        {"bag_of_words|length:1|word_pos:0": 1, "freq": 7, "sys_candidate": "sys_time"},
+    ],
+    [
+        {"bag_of_words|length:1|word_pos:0": 1, "freq": 12.5, "in-gaz|type:store_name": 0},
+        {"freq": "1e1", "sys_candidate": "sys_number", "pos": "NN"},
+    ],
+]
+
+TEST_FEATURES = [
+    [
+        {"freq": 100, "unseen": 2, "bag_of_words|length:1|word_pos:0": True},
+        {"freq": -4, "pos": "VB", "sys_candidate": "sys_time"},
+        {},
+    ]
+]
+
+
+@pytest.fixture
+def feature_binner():
+    binner = FeatureBinner()
+    binner.fit(TRAIN_FEATURES)
+    return binner
+
+
+def _format_transformed(binner, X):
+    return [
+        [
+            ["{}={}".format(name, str(word[name])) for name in sorted(word.keys())]
+            for word in sentence
+        ]
+        for sentence in binner.transform(X)
+    ]
+
+
+@pytest.mark.parametrize("features", [TRAIN_FEATURES, TEST_FEATURES])
+def test_encode_matches_transform(feature_binner, features):
+    """Tests that encoded attributes match the formatted output of transform"""
+    expected = _format_transformed(feature_binner, features)
+
+    assert feature_binner.encode(features) == expected
+    # the second encoding is served from the cache of encoded feature values
+    assert feature_binner.encode(features) == expected
+
+
+def test_encode_after_pickle(feature_binner):
+    """Tests that a pickled binner encodes features the same way without its cache"""
+    expected = _format_transformed(feature_binner, TEST_FEATURES)
+    assert feature_binner.encode(TEST_FEATURES) == expected
+    binner = pickle.loads(pickle.dumps(feature_binner))
+
+    assert binner._attributes == {}
+    assert _format_transformed(binner, TEST_FEATURES) == expected
+    assert binner.encode(TEST_FEATURES) == expected
+
+
+def test_encode_with_full_cache(feature_binner):
+    """Tests that features are encoded the same way when the cache is cleared as it fills up"""
+    expected = _format_transformed(feature_binner, TRAIN_FEATURES)
+    with patch("mindmeld.models.taggers.crf.MAX_CACHED_ATTRIBUTES", 2):
+        assert feature_binner.encode(TRAIN_FEATURES) == expected
+        assert len(feature_binner._attributes) <= 2
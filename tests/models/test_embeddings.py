@@ -1,8 +1,13 @@
 import os
+import pickle
+import zipfile
+
+import numpy as np
 import pytest
 from numpy import ndarray
 
-from mindmeld.models.taggers.embeddings import GloVeEmbeddingsContainer
+from mindmeld.models.taggers import embeddings
+from mindmeld.models.taggers.embeddings import GloVeEmbeddingsContainer, WordSequenceEmbedding
 from mindmeld.models.embedder_models import BertEmbedder, GloveEmbedder
 
 APP_NAME = "kwik_e_mart"
@@ -47,3 +52,102 @@ def test_glove_embedder():
     encoded_vec = embedder.encode(["test string"])[0]
     assert len(encoded_vec) == 300
     assert type(encoded_vec) == ndarray
+
+
+@pytest.fixture
+def embeddings_folder(tmpdir, monkeypatch):
+    """Redirects the embeddings folders to a temporary folder"""
+    folder = str(tmpdir.mkdir("embeddings"))
+    monkeypatch.setattr(
+        embeddings, "BINARY_EMBEDDINGS_FOLDER_PATH", os.path.join(folder, "binary")
+    )
+    monkeypatch.setattr(embeddings, "EMBEDDINGS_FILE_PATH", os.path.join(folder, "glove.zip"))
+    monkeypatch.setattr(
+        embeddings,
+        "PREVIOUSLY_USED_WORD_EMBEDDINGS_FILE_PATH",
+        os.path.join(folder, "previously_used_word_embeddings.pkl"),
+    )
+    return folder
+
+
+GLOVE_WORDS = ["the", "store", "open", "street", "the"]
+
+
+def write_glove_file(path, dimension=50):
+    vectors = np.round(np.random.uniform(-1, 1, size=(len(GLOVE_WORDS), dimension)), 6)
+    with open(path, "w") as glove_file:
+        for word, vector in zip(GLOVE_WORDS, vectors):
+            glove_file.write(" ".join([word] + ["{:.6f}".format(v) for v in vector]) + "\n")
+    # the last occurrence of a word is used
+    return {
+        word: vector.astype(np.float32) for word, vector in zip(GLOVE_WORDS, vectors)
+    }
+
+
+def test_binary_embeddings_are_reused(embeddings_folder, monkeypatch):
+    """Tests the embeddings are converted to the binary format once and then memory mapped"""
+    glove_path = os.path.join(embeddings_folder, "glove.txt")
+    expected = write_glove_file(glove_path, dimension=25)
+
+    container = GloVeEmbeddingsContainer(50, glove_path)
+    assert container.token_dimension == 25
+    mapping = container.get_pretrained_word_to_embeddings_dict()
+    assert set(mapping) == set(expected)
+    for word, vector in expected.items():
+        assert np.allclose(mapping[word], vector)
+
+    def fail(*args, **kwargs):
+        raise AssertionError("The embeddings should not be parsed again")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(GloVeEmbeddingsContainer, "_extract_and_map", fail)
+        container = GloVeEmbeddingsContainer(50, glove_path)
+    assert isinstance(container.embeddings, np.memmap)
+    assert np.allclose(
+        container.get_pretrained_word_to_embeddings_dict()["store"], expected["store"]
+    )
+
+    # the embeddings are converted again when the text file changes
+    expected = write_glove_file(glove_path, dimension=25)
+    os.utime(glove_path, (0, 0))
+    container = GloVeEmbeddingsContainer(50, glove_path)
+    assert np.allclose(
+        container.get_pretrained_word_to_embeddings_dict()["store"], expected["store"]
+    )
+
+
+def test_binary_embeddings_from_zip(embeddings_folder):
+    """Tests the embeddings in the default zip file are mapped by their decoded words"""
+    glove_path = os.path.join(embeddings_folder, "glove.6B.50d.txt")
+    expected = write_glove_file(glove_path)
+    with zipfile.ZipFile(embeddings.EMBEDDINGS_FILE_PATH, "w") as zip_file:
+        zip_file.write(glove_path, "glove.6B.50d.txt")
+
+    mapping = GloVeEmbeddingsContainer(50).get_pretrained_word_to_embeddings_dict()
+    assert np.allclose(mapping["street"], expected["street"])
+    assert np.allclose(mapping[b"street"], expected["street"])
+
+
+def test_word_sequence_embedding(embeddings_folder):
+    """Tests the encoding of pretrained and out of vocabulary tokens"""
+    glove_path = os.path.join(embeddings_folder, "glove.txt")
+    expected = write_glove_file(glove_path)
+
+    encoder = WordSequenceEmbedding(4, 50, glove_path)
+    encoded = encoder.encode_sequence_of_tokens(["the", "kwik", "store", "open", "street"])
+    assert encoded.shape == (4, 50)
+    assert np.allclose(encoded[0], expected["the"])
+    assert np.allclose(encoded[2], expected["store"])
+    assert np.allclose(encoded[3], expected["open"])
+    # out of vocabulary tokens keep their random embedding
+    assert np.allclose(encoder.encode_sequence_of_tokens(["kwik"])[0], encoded[1])
+    assert not encoder.encode_sequence_of_tokens([]).any()
+
+    encoder.save_embeddings()
+    with open(embeddings.PREVIOUSLY_USED_WORD_EMBEDDINGS_FILE_PATH, "rb") as pkl_file:
+        assert list(pickle.load(pkl_file)) == ["kwik"]
+
+    encoder = WordSequenceEmbedding(2, 50, glove_path, use_padding=False)
+    encoded_again = encoder.encode_sequence_of_tokens(["the", "kwik", "store"])
+    assert encoded_again.shape == (3, 50)
+    assert np.allclose(encoded_again[1], encoded[1])
@@ -0,0 +1,115 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+test_lstm
+----------------------------------
+
+Tests for the batched inference of the `lstm` tagger module.
+"""
+# pylint: disable=locally-disabled,redefined-outer-name
+import numpy as np
+import pytest
+
+PADDING_LENGTH = 10
+OUTPUT_DIMENSION = 3
+SEQUENCE_LENGTHS = [5, 1, 2, 9, 1, 6, 10, 3]
+
+
+class FakeSession:
+    """A session which computes the output of each query from its own inputs only, as the
+    network does, and records the sequence lengths of each batch it is run with."""
+
+    def __init__(self):
+        self.batches = []
+
+    def run(self, fetches, feed_dict):
+        examples = np.asarray(feed_dict["query_input"])
+        seq_lengths = np.asarray(feed_dict["sequence_lengths"])
+        gaz = np.asarray(feed_dict["gaz_input"])
+        self.batches.append(list(seq_lengths))
+        output = examples + gaz + seq_lengths[:, None, None]
+        output = output.reshape(-1, OUTPUT_DIMENSION)
+        return [output] if isinstance(fetches, list) else output
+
+
+@pytest.fixture
+def lstm_model():
+    from mindmeld.models.taggers.lstm import LstmModel
+
+    model = LstmModel(
+        padding_length=PADDING_LENGTH, inference_batch_size=2, inference_length_bucket_size=4
+    )
+    model.output_dimension = OUTPUT_DIMENSION
+    model.sequence_lengths = SEQUENCE_LENGTHS
+    model.session = FakeSession()
+    model._feature_buffers = {}
+    for name in ["query_input", "sequence_lengths", "gaz_input", "char_input", "label"]:
+        setattr(model, name + "_tf", name)
+    for name in ["dense_keep_prob", "lstm_input_keep_prob", "lstm_output_keep_prob"]:
+        setattr(model, name + "_tf", name)
+    model.batch_sequence_lengths_tf = "sequence_lengths"
+    model.batch_sequence_mask_tf = "sequence_mask"
+    model.lstm_output_softmax_tf = "softmax"
+
+    rng = np.random.RandomState(0)
+    shape = (len(SEQUENCE_LENGTHS), PADDING_LENGTH, OUTPUT_DIMENSION)
+    model.gaz_features_arr = rng.rand(*shape).astype(np.float32)
+    model.char_features_arr = []
+    return model, rng.rand(*shape).astype(np.float32)
+
+
+@pytest.mark.extras
+@pytest.mark.tensorflow
+def test_inference_batches(lstm_model):
+    model, _ = lstm_model
+    batches = model._get_inference_batches(np.array(SEQUENCE_LENGTHS))
+
+    indices = np.concatenate(batches)
+    assert sorted(indices) == list(range(len(SEQUENCE_LENGTHS)))
+    for batch in batches:
+        assert len(batch) <= model.inference_batch_size
+        buckets = {(SEQUENCE_LENGTHS[index] - 1) // 4 for index in batch}
+        assert len(buckets) == 1
+    # queries of the same bucket keep their order
+    assert [list(batch) for batch in batches] == [[1, 2], [4, 7], [0, 5], [3, 6]]
+
+
+@pytest.mark.extras
+@pytest.mark.tensorflow
+def test_batched_inference_matches_single_batch(lstm_model):
+    model, X = lstm_model
+    batched = model._run_inference(X)
+    assert len(model.session.batches) == 4
+    assert all(max(lengths) - min(lengths) < 4 for lengths in model.session.batches)
+
+    model.session = FakeSession()
+    model.inference_batch_size = len(SEQUENCE_LENGTHS)
+    model.inference_length_bucket_size = PADDING_LENGTH
+    unbatched = model._run_inference(X)
+    assert model.session.batches == [SEQUENCE_LENGTHS]
+
+    # the output of each query is restored to its position in the input
+    assert batched.shape == unbatched.shape
+    np.testing.assert_allclose(batched, unbatched)
+
+
+@pytest.mark.extras
+@pytest.mark.tensorflow
+def test_feature_buffer_is_reused(lstm_model):
+    model, _ = lstm_model
+    buffer = model._get_feature_buffer("gaz", (3, PADDING_LENGTH, 4))
+    assert buffer.shape == (3, PADDING_LENGTH, 4)
+
+    # a smaller set of queries is a view of the same buffer
+    smaller = model._get_feature_buffer("gaz", (1, PADDING_LENGTH, 4))
+    assert smaller.shape == (1, PADDING_LENGTH, 4)
+    assert np.shares_memory(buffer, smaller)
+
+    # the buffer is replaced when the queries do not fit or the features change shape
+    larger = model._get_feature_buffer("gaz", (5, PADDING_LENGTH, 4))
+    assert larger.shape == (5, PADDING_LENGTH, 4)
+    assert not np.shares_memory(buffer, larger)
+    reshaped = model._get_feature_buffer("gaz", (1, PADDING_LENGTH, 6))
+    assert reshaped.shape == (1, PADDING_LENGTH, 6)
+    assert not np.shares_memory(larger, reshaped)
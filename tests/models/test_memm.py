@@ -0,0 +1,138 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+test_memm
+----------------------------------
+
+Tests for the `memm` tagger module.
+"""
+# pylint: disable=locally-disabled,redefined-outer-name
+import os
+
+import pytest
+
+from mindmeld import markup
+from mindmeld.models import ENTITIES_LABEL_TYPE, QUERY_EXAMPLE_TYPE, ModelConfig
+from mindmeld.models.tagger_models import TaggerModel
+from mindmeld.models.taggers.taggers import START_TAG
+from mindmeld.query_factory import QueryFactory
+from mindmeld.resource_loader import ResourceLoader
+from mindmeld.tokenizer import Tokenizer
+
+APP_NAME = "kwik_e_mart"
+APP_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), APP_NAME
+)
+
+TRAIN_QUERIES = [
+    "When does the {Elm Street|store_name} store close?",
+    "At what time does the {Elm Street|store_name} store close?",
+    "When does the {Central Plaza|store_name} store close?",
+    "Is the {Central Plaza|store_name} Kwik-E-Mart open now?",
+    "What are the hours for the Kwik-E-Mart on {Main Street|store_name}?",
+    "is the {Main Street|store_name} store open",
+    "when does {Pine Street|store_name} open",
+    "what are your hours",
+    "when do you close",
+    "is the store open today",
+]
+
+TEST_QUERIES = [
+    "When does the Elm Street store open?",
+    "is the Central Plaza store closed",
+    "what time do you open",
+    "Main Street",
+    "",
+]
+
+
+@pytest.fixture
+def resource_loader():
+    """A resource loader"""
+    return ResourceLoader(APP_PATH, QueryFactory(Tokenizer()))
+
+
+@pytest.fixture(params=["greedy", "viterbi"])
+def memm_model(request, resource_loader):
+    """A MEMM tagger model trained on the store names"""
+    config = ModelConfig(
+        **{
+            "model_type": "tagger",
+            "example_type": QUERY_EXAMPLE_TYPE,
+            "label_type": ENTITIES_LABEL_TYPE,
+            "model_settings": {
+                "classifier_type": "memm",
+                "tag_scheme": "IOB",
+                "feature_scaler": "max-abs",
+                "decoder": request.param,
+            },
+            "params": {"C": 100},
+            "features": {
+                "bag-of-words-seq": {
+                    "ngram_lengths_to_start_positions": {
+                        1: [-2, -1, 0, 1, 2],
+                        2: [-2, -1, 0, 1],
+                    }
+                },
+                "in-gaz-span-seq": {},
+            },
+        }
+    )
+    processed_queries = [markup.load_query(text) for text in TRAIN_QUERIES]
+    examples = [q.query for q in processed_queries]
+    labels = [q.entities for q in processed_queries]
+    model = TaggerModel(config)
+    model.initialize_resources(resource_loader, examples, labels)
+    model.fit(examples, labels)
+    return model
+
+
+def _predict_token_by_token(model, example):
+    """Predicts the tags of an example one token at a time, as the MEMM is defined"""
+    clf = model._clf
+    tags = []
+    prev_tag = START_TAG
+    for features in clf.extract_example_features(example, model.config, model._resources):
+        features["prev_tag"] = prev_tag
+        X, _ = clf._preprocess_data([features])
+        prev_tag = clf.class_encoder.inverse_transform(clf.predict(X))[0]
+        tags.append(prev_tag)
+    return tags
+
+
+def test_batched_prediction_matches_single_predictions(memm_model):
+    examples = [markup.load_query(text).query for text in TEST_QUERIES]
+    clf = memm_model._clf
+    batch_tags = clf.extract_and_predict(examples, memm_model.config, memm_model._resources)
+
+    assert len(batch_tags) == len(examples)
+    for example, tags in zip(examples, batch_tags):
+        assert len(tags) == len(example.normalized_tokens)
+        assert list(tags) == list(
+            clf.extract_and_predict([example], memm_model.config, memm_model._resources)[0]
+        )
+
+
+def test_greedy_prediction_matches_token_by_token(memm_model):
+    if memm_model._clf._decoder != "greedy":
+        pytest.skip("only the greedy decoder predicts one token at a time")
+    examples = [markup.load_query(text).query for text in TEST_QUERIES]
+    batch_tags = memm_model._clf.extract_and_predict(
+        examples, memm_model.config, memm_model._resources
+    )
+    for example, tags in zip(examples, batch_tags):
+        assert list(tags) == _predict_token_by_token(memm_model, example)
+
+
+def test_predict_proba(memm_model):
+    examples = [markup.load_query(text).query for text in TEST_QUERIES]
+    tags_probas = memm_model._clf.predict_proba(
+        examples, memm_model.config, memm_model._resources
+    )
+    predicted_tags = memm_model._clf.extract_and_predict(
+        examples, memm_model.config, memm_model._resources
+    )
+    for example_tags_probas, tags in zip(tags_probas, predicted_tags):
+        assert [tag for tag, _ in example_tags_probas] == list(tags)
+        assert all(0 < proba <= 1 for _, proba in example_tags_probas)
@@ -9,6 +9,7 @@ Tests for `standard_models` module.
 """
 # pylint: disable=locally-disabled,redefined-outer-name
 import os
+import pickle
 
 import pytest
 
@@ -184,3 +185,35 @@ class TestTextModel:
             markup.load_query("hi there").query
         )
         assert extracted_features == expected_features
+
+    def test_feature_extractors_compiled_once(self, resource_loader):
+        """Tests the feature extractors are compiled once and again after loading"""
+        config = ModelConfig(
+            **{
+                "model_type": "text",
+                "example_type": QUERY_EXAMPLE_TYPE,
+                "label_type": CLASS_LABEL_TYPE,
+                "model_settings": {"classifier_type": "logreg"},
+                "params": {"fit_intercept": True, "C": 100},
+                "features": {
+                    "bag-of-words": {"lengths": [1]},
+                    "length": {},
+                },
+            }
+        )
+        model = TextModel(config)
+        examples = [q.query for q in self.labeled_data]
+        labels = [q.intent for q in self.labeled_data]
+        model.initialize_resources(resource_loader, examples, labels)
+        model.fit(examples, labels)
+
+        feature_extractors = model.config.get_feature_extractors()
+        assert len(feature_extractors) == 2
+        assert model.config.get_feature_extractors() is feature_extractors
+
+        query = markup.load_query("hi there").query
+        loaded_model = pickle.loads(pickle.dumps(model))
+        assert loaded_model.config.to_dict() == model.config.to_dict()
+        assert loaded_model.view_extracted_features(
+            query
+        ) == model.view_extracted_features(query)
@@ -14,6 +14,7 @@ import pytest
 
 from mindmeld.app_manager import ApplicationManager, freeze_params
 from mindmeld.components.request import FrozenParams, Params
+from mindmeld.exceptions import BadMindMeldRequestError
 
 
 @pytest.fixture
@@ -43,3 +44,28 @@ def test_parse(app_manager):
     fields = {"params", "request", "dialogue_state", "directives", "history"}
     for field in fields:
         assert field in vars(response).keys()
+
+
+def test_parse_with_conversation_id(app_manager):
+    conversation_id = app_manager.parse("hello", conversation_id="new").conversation_id
+    assert conversation_id != "new"
+    response = app_manager.parse(
+        "where is the store on elm street", conversation_id=conversation_id
+    )
+    assert response.conversation_id == conversation_id
+    assert len(response.history) == 2
+    assert response.history[0]["request"]["text"] == "where is the store on elm street"
+    assert response.history[1]["request"]["text"] == "hello"
+    assert "history" not in response.history[0]["request"]
+    assert app_manager.history_store.get(conversation_id) == response.history
+
+    response = app_manager.parse("hello", conversation_id="new")
+    assert response.conversation_id != conversation_id
+    assert len(response.history) == 1
+
+
+def test_parse_with_unknown_conversation_id(app_manager):
+    with pytest.raises(BadMindMeldRequestError) as exc_info:
+        app_manager.parse("hello", conversation_id="1")
+    assert exc_info.value.status_code == 404
+    assert "1" not in app_manager.history_store
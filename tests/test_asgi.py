@@ -0,0 +1,144 @@
+import asyncio
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from mindmeld.app_manager import ApplicationManager
+from mindmeld.asgi import AsyncMindMeldServer
+
+
+async def request(server, method, path, body=None, content_type="application/json"):
+    """Sends a request to an ASGI application and returns its status and JSON body"""
+    headers = []
+    if content_type:
+        headers.append((b"content-type", content_type.encode()))
+    scope = {"type": "http", "method": method, "path": path, "headers": headers}
+    messages = [{"type": "http.request", "body": body or b"", "more_body": False}]
+    sent = []
+
+    async def receive():
+        return messages.pop(0)
+
+    async def send(message):
+        sent.append(message)
+
+    await server(scope, receive, send)
+    status = sent[0]["status"]
+    return status, json.loads(sent[1]["body"].decode("utf8"))
+
+
+@pytest.fixture
+def app_manager(kwik_e_mart_app_path, kwik_e_mart_nlp):
+    return ApplicationManager(kwik_e_mart_app_path, nlp=kwik_e_mart_nlp)
+
+
+@pytest.fixture
+def server(app_manager):
+    return AsyncMindMeldServer(app_manager)
+
+
+@pytest.mark.asyncio
+async def test_parse_endpoint(server):
+    test_request = {"text": "where is the restaurant on 12th ave", "request_id": "1"}
+    status, data = await request(
+        server, "POST", "/parse", json.dumps(test_request).encode()
+    )
+    assert status == 200
+    assert data["request"]["entities"][0]["value"][0]["cname"] == "12th Avenue"
+    assert data["request_id"] == "1"
+    assert set(data.keys()) == {
+        "version",
+        "history",
+        "params",
+        "frame",
+        "dialogue_state",
+        "request_id",
+        "response_time",
+        "request",
+        "directives",
+        "slots",
+    }
+
+
+@pytest.mark.asyncio
+async def test_parse_endpoint_async_app(async_kwik_e_mart_app):
+    server = AsyncMindMeldServer(async_kwik_e_mart_app.app_manager)
+    test_request = {"text": "where is the restaurant on 12th ave"}
+    status, data = await request(
+        server, "POST", "/parse", json.dumps(test_request).encode()
+    )
+    assert status == 200
+    assert data["request"]["entities"][0]["value"][0]["cname"] == "12th Avenue"
+
+
+@pytest.mark.asyncio
+async def test_parse_endpoint_fail(server):
+    status, _ = await request(server, "POST", "/parse", content_type=None)
+    assert status == 415
+
+    status, data = await request(server, "POST", "/parse", b"{")
+    assert status == 400
+    assert data["error"].startswith("Malformed request body")
+
+    status, _ = await request(server, "GET", "/parse")
+    assert status == 405
+
+    status, _ = await request(server, "GET", "/unknown")
+    assert status == 404
+
+
+@pytest.mark.asyncio
+async def test_status_endpoint(server):
+    status, data = await request(server, "GET", "/_status")
+    assert status == 200
+    assert set(data.keys()) == {
+        "package_version",
+        "status",
+        "response_time",
+        "version",
+    }
+
+
+class SlowAppManager:
+    """An application manager whose requests block until they are released"""
+
+    async_mode = True
+
+    def __init__(self):
+        self.release = asyncio.Event()
+        self.num_running = 0
+
+    async def parse(self, **kwargs):
+        self.num_running += 1
+        await self.release.wait()
+        return SimpleNamespace()
+
+
+@pytest.mark.asyncio
+async def test_backpressure(monkeypatch):
+    app_manager = SlowAppManager()
+    server = AsyncMindMeldServer(app_manager, max_concurrency=2, max_queue=1)
+    monkeypatch.setattr(
+        "mindmeld.server.DialogueResponder.to_json", lambda response: {}
+    )
+    body = json.dumps({"text": "hello"}).encode()
+
+    requests = [
+        asyncio.ensure_future(request(server, "POST", "/parse", body))
+        for _ in range(3)
+    ]
+    await asyncio.sleep(0.01)
+    # two requests are running and one is waiting, so the next one is rejected
+    assert app_manager.num_running == 2
+    status, _ = await request(server, "POST", "/parse", body)
+    assert status == 503
+
+    # status checks are not throttled
+    status, _ = await request(server, "GET", "/_status")
+    assert status == 200
+
+    app_manager.release.set()
+    statuses = [status for status, _ in await asyncio.gather(*requests)]
+    assert statuses == [200, 200, 200]
+    assert app_manager.num_running == 3
@@ -8,6 +8,9 @@ test_core
 Tests for `core` module.
 """
 # pylint: disable=locally-disabled,redefined-outer-name
+import pickle
+from array import array
+
 import pytest
 
 from mindmeld.stemmers import (
@@ -22,6 +25,7 @@ from mindmeld.core import (
     TEXT_FORM_RAW,
     Entity,
     NestedEntity,
+    ProcessedQuery,
     QueryEntity,
     Span,
     _sort_by_lowest_time_grain,
@@ -254,6 +258,49 @@ def test_entity_equality():
     assert entity_a == entity_b
 
 
+def test_entity_is_system_entity():
+    """Tests that is_system_entity is a static method on the class and a flag on entities"""
+    assert Entity.is_system_entity("sys_time")
+    assert not Entity.is_system_entity("store_name")
+    assert Entity("5 pm", "sys_time").is_system_entity is True
+    assert Entity("springfield", "store_name").is_system_entity is False
+
+
+def test_query_compact_representation(query_factory):
+    """Tests that queries and their entities use slots, interned tokens and array char maps"""
+    query_a = query_factory.create_query("Hello. There.")
+    query_b = query_factory.create_query("hello there")
+    entity = QueryEntity.from_query(query_a, Span(0, 4), entity_type="greeting")
+
+    for obj in (query_a, ProcessedQuery(query_a), entity, entity.entity):
+        assert not hasattr(obj, "__dict__")
+    assert query_a.normalized_tokens == ("hello", "there")
+    assert all(a is b for a, b in zip(query_a.normalized_tokens, query_b.normalized_tokens))
+    assert any(isinstance(m, array) for m in query_a._char_maps.values())
+
+
+def test_query_pickle(query_factory):
+    """Tests that queries are unchanged by a round trip through pickle"""
+    query = query_factory.create_query("Test: One. 2. 3.")
+    processed_query = ProcessedQuery(
+        query,
+        domain="domain",
+        intent="intent",
+        entities=[QueryEntity.from_query(query, Span(6, 8), entity_type="number")],
+    )
+
+    assert pickle.loads(pickle.dumps(processed_query)) == processed_query
+
+
+def test_transform_invalid_index(query_factory):
+    """Tests that transforming an index outside the text raises an error"""
+    query = query_factory.create_query("Test: One. 2. 3.")
+
+    for index in (-1, 100):
+        with pytest.raises(ValueError):
+            query.transform_index(index, TEXT_FORM_NORMALIZED, TEXT_FORM_RAW)
+
+
 def test_entity_string():
     """Tests string representation of entities"""
     entity = NestedEntity(
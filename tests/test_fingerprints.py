@@ -0,0 +1,132 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+test_fingerprints
+----------------------------------
+
+Tests for `fingerprints` module.
+"""
+# pylint: disable=locally-disabled,redefined-outer-name
+import hashlib
+import os
+
+import pytest
+
+from mindmeld.fingerprints import FingerprintManifest
+from mindmeld.resource_loader import Hasher
+
+
+class CountingHasher(Hasher):
+    """A hasher which counts the files it hashes"""
+
+    def __init__(self):
+        super().__init__()
+        self.hashed_files = []
+
+    def hash_file(self, filename):
+        self.hashed_files.append(filename)
+        return super().hash_file(filename)
+
+
+def _write(file_path, content, age=60):
+    with open(file_path, "w") as text_file:
+        text_file.write(content)
+    mtime = os.path.getmtime(file_path) - age
+    os.utime(file_path, (mtime, mtime))
+
+
+def _sha1(content):
+    return hashlib.sha1(content.encode("utf-8")).hexdigest()
+
+
+@pytest.fixture
+def app_path(tmpdir):
+    return str(tmpdir.mkdir("app"))
+
+
+def test_file_digest_is_reused(app_path):
+    """Tests that unchanged files are only hashed once, including across manifests"""
+    file_path = os.path.join(app_path, "train.txt")
+    _write(file_path, "hello")
+
+    hasher = CountingHasher()
+    manifest = FingerprintManifest(app_path, hasher)
+    assert manifest.get_file_digest(file_path) == _sha1("hello")
+    assert manifest.get_file_digest(file_path) == _sha1("hello")
+    assert hasher.hashed_files == [file_path]
+    manifest.dump()
+
+    hasher = CountingHasher()
+    manifest = FingerprintManifest(app_path, hasher)
+    assert manifest.get_file_digest(file_path) == _sha1("hello")
+    assert hasher.hashed_files == []
+
+
+def test_changed_file_is_rehashed(app_path):
+    """Tests that a file is hashed again when its size or modification time changes"""
+    file_path = os.path.join(app_path, "train.txt")
+    _write(file_path, "hello", age=120)
+
+    manifest = FingerprintManifest(app_path, Hasher())
+    assert manifest.get_file_digest(file_path) == _sha1("hello")
+
+    _write(file_path, "hello world")
+    assert manifest.get_file_digest(file_path) == _sha1("hello world")
+
+    _write(file_path, "jello world")
+    assert manifest.get_file_digest(file_path) == _sha1("jello world")
+
+
+def test_recent_file_is_not_fingerprinted(app_path):
+    """Tests that a file modified just now is hashed every time"""
+    file_path = os.path.join(app_path, "train.txt")
+    _write(file_path, "hello", age=0)
+
+    hasher = CountingHasher()
+    manifest = FingerprintManifest(app_path, hasher)
+    manifest.get_file_digest(file_path)
+    manifest.get_file_digest(file_path)
+    assert hasher.hashed_files == [file_path, file_path]
+
+
+def test_missing_file_digest(app_path):
+    """Tests that the digest of a missing file is the digest of an empty file"""
+    manifest = FingerprintManifest(app_path, Hasher())
+    assert manifest.get_file_digest(os.path.join(app_path, "missing.txt")) == _sha1("")
+
+
+def test_derived_hash(app_path):
+    """Tests that derived hashes are computed once, and persisted"""
+    calls = []
+
+    def hash_func():
+        calls.append(1)
+        return "derived"
+
+    manifest = FingerprintManifest(app_path, Hasher())
+    assert manifest.get_hash("key", hash_func) == "derived"
+    assert manifest.get_hash("key", hash_func) == "derived"
+    assert len(calls) == 1
+    manifest.dump()
+
+    manifest = FingerprintManifest(app_path, Hasher())
+    assert manifest.get_hash("key", hash_func) == "derived"
+    assert len(calls) == 1
+
+
+def test_update(app_path):
+    """Tests that the entries added to one manifest can be added to another"""
+    file_path = os.path.join(app_path, "train.txt")
+    _write(file_path, "hello")
+
+    worker_manifest = FingerprintManifest(app_path, Hasher())
+    worker_manifest.get_file_digest(file_path)
+    worker_manifest.get_hash("key", lambda: "derived")
+
+    hasher = CountingHasher()
+    manifest = FingerprintManifest(app_path, hasher)
+    manifest.update(worker_manifest.get_updates())
+    assert manifest.get_file_digest(file_path) == _sha1("hello")
+    assert manifest.get_hash("key", lambda: "other") == "derived"
+    assert hasher.hashed_files == []
@@ -0,0 +1,107 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+test_gazetteer
+----------------------------------
+
+Tests for `gazetteer` module.
+"""
+# pylint: disable=locally-disabled,redefined-outer-name
+import pytest
+
+from mindmeld.gazetteer import (
+    Gazetteer,
+    GazetteerMatcher,
+    GazetteerOverlay,
+    get_gazetteer_matcher,
+)
+from mindmeld.models.helpers import GAZETTEER_RSC, ingest_dynamic_gazetteer
+
+
+BASE_ENTITIES = [("elm street", 0.8), ("main street", 0.5)]
+DYNAMIC_ENTITIES = [("pine street", 0.9), ("elm street", 1.0)]
+
+
+def _build_gazetteer(entities):
+    gaz = Gazetteer("store_name")
+    for entity, popularity in entities:
+        gaz._update_entity(entity, popularity)  # pylint: disable=protected-access
+    return gaz
+
+
+@pytest.fixture
+def gazetteer():
+    """A serialized gazetteer of store names"""
+    return _build_gazetteer(BASE_ENTITIES).to_dict()
+
+
+def test_overlay_matches_merged_gazetteer(gazetteer):
+    merged = _build_gazetteer(BASE_ENTITIES + DYNAMIC_ENTITIES)
+    overlay = GazetteerOverlay(gazetteer)
+    for entity, popularity in DYNAMIC_ENTITIES:
+        overlay.update_entity(entity, popularity)
+
+    overlay_dict = overlay.to_dict()
+    assert overlay_dict["total_entities"] == merged.entity_count
+    assert dict(overlay_dict["pop_dict"]) == dict(merged.pop_dict)
+    assert dict(overlay_dict["index"]) == dict(merged.index)
+    assert list(overlay_dict["entities"]) == merged.entities
+
+
+def test_overlay_does_not_modify_base(gazetteer):
+    overlay = GazetteerOverlay(gazetteer)
+    overlay.update_entity("pine street", 0.9)
+
+    assert overlay.pop_dict["unknown"] == 0
+    assert overlay.index["unknown"] == set()
+    assert "pine street" not in gazetteer["pop_dict"]
+    assert "unknown" not in gazetteer["pop_dict"]
+    assert gazetteer["index"]["street"] == {0, 1}
+    assert gazetteer["total_entities"] == 2
+
+
+def test_dynamic_gazetteer_overlay_is_shared(gazetteer, tokenizer):
+    resource = {GAZETTEER_RSC: {"store_name": gazetteer}}
+    dynamic_resource = {GAZETTEER_RSC: {"store_name": {"Pine Street": 0.9}}}
+
+    first = ingest_dynamic_gazetteer(resource, dynamic_resource, tokenizer)
+    second = ingest_dynamic_gazetteer(resource, dict(dynamic_resource), tokenizer)
+
+    assert first[GAZETTEER_RSC]["store_name"]["pop_dict"]["pine street"] == 0.9
+    assert first[GAZETTEER_RSC]["store_name"] is second[GAZETTEER_RSC]["store_name"]
+
+
+def _brute_force_spans(tokens, entities):
+    return [
+        (start, end)
+        for start in range(len(tokens))
+        for end in range(start + 1, len(tokens) + 1)
+        if " ".join(tokens[start:end]) in entities
+    ]
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "",
+        "elm",
+        "is the elm street store open",
+        "elm street main street elm street",
+        "main main street street",
+    ],
+)
+def test_matcher_finds_all_spans(text):
+    entities = {"elm", "elm street", "main street", "street", "elm street main"}
+    tokens = text.split()
+    matcher = GazetteerMatcher(entities)
+    assert matcher.find_spans(tokens) == _brute_force_spans(tokens, entities)
+
+
+def test_overlay_matcher_finds_base_and_dynamic_spans(gazetteer):
+    overlay = GazetteerOverlay(gazetteer)
+    overlay.update_entity("pine street", 0.9)
+    tokens = "from pine street to elm street".split()
+
+    assert get_gazetteer_matcher(overlay.to_dict()).find_spans(tokens) == [(1, 3), (4, 6)]
+    assert get_gazetteer_matcher(gazetteer).find_spans(tokens) == [(4, 6)]
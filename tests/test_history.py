@@ -0,0 +1,100 @@
+import datetime
+import json
+import threading
+
+import pytest
+
+from mindmeld.history import HistoryStore, SQLiteHistoryBackend
+
+
+@pytest.fixture
+def backend(tmpdir):
+    backend = SQLiteHistoryBackend(str(tmpdir.join("history.db")))
+    yield backend
+    backend.close()
+
+
+def test_history_store_appends_turns():
+    store = HistoryStore()
+    assert store.get("1") == ()
+    assert store.append("1", ({"text": "a"},), 2) == ({"text": "a"},)
+    assert store.append("1", ({"text": "c"}, {"text": "b"}), 2) == (
+        {"text": "c"},
+        {"text": "b"},
+    )
+    assert store.get("1") == ({"text": "c"}, {"text": "b"})
+    assert store.get("2") == ()
+
+
+def test_history_store_evicts_least_recent_conversation():
+    store = HistoryStore(cache_size=2)
+    store.append("1", ({"text": "a"},), 10)
+    store.append("2", ({"text": "b"},), 10)
+    store.get("1")
+    store.append("3", ({"text": "c"},), 10)
+    assert store.get("1") == ({"text": "a"},)
+    assert store.get("2") == ()
+
+
+def test_sqlite_backend_stores_deltas(backend):
+    backend.append("1", ({"text": "b"}, {"text": "a"}), 3)
+    backend.append("1", ({"text": "d"}, {"text": "c"}), 3)
+    backend.append("2", ({"text": "x"},), 3)
+    assert backend.load("1") == ({"text": "d"}, {"text": "c"}, {"text": "b"})
+    assert backend.load("2") == ({"text": "x"},)
+    assert backend.load("3") is None
+
+    backend.delete("1")
+    assert backend.load("1") is None
+
+
+def test_sqlite_backend_encodes_turns_as_the_server_does(backend):
+    from mindmeld.server import encode_json
+
+    turn = {"text": "a", "date": datetime.date(2026, 10, 16)}
+    backend.append("1", (turn,), 3)
+    assert backend.load("1") == (json.loads(encode_json(turn)),)
+
+
+def test_history_store_loads_evicted_conversation_from_backend(backend):
+    store = HistoryStore(backend=backend, cache_size=1)
+    store.append("1", ({"text": "a"},), 10)
+    store.append("2", ({"text": "b"},), 10)
+    assert store.append("1", ({"text": "c"},), 10) == ({"text": "c"}, {"text": "a"})
+
+    # a new store, as after a restart
+    store = HistoryStore(backend=backend)
+    assert store.get("1") == ({"text": "c"}, {"text": "a"})
+    store.delete("1")
+    assert store.get("1") == ()
+
+
+def test_history_store_creates_conversations():
+    store = HistoryStore()
+    conversation_id = store.create()
+    assert conversation_id in store
+    assert store.get(conversation_id) == ()
+    assert store.create() != conversation_id
+    # looking up an unknown conversation does not create it
+    assert store.get("1") == ()
+    assert "1" not in store
+
+
+def test_history_store_keeps_concurrent_turns(backend):
+    store = HistoryStore(backend=backend)
+    conversation_id = store.create()
+
+    def append_turns(index):
+        for turn in range(20):
+            store.append(conversation_id, ({"text": "{}-{}".format(index, turn)},), 100)
+
+    threads = [threading.Thread(target=append_turns, args=(index,)) for index in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    history = store.get(conversation_id)
+    assert len(history) == 80
+    # the history in memory is the same as the history in the backend
+    assert history == backend.load(conversation_id)
@@ -0,0 +1,56 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+test_lazy
+----------------------------------
+
+Tests for `_lazy` module.
+"""
+import subprocess
+import sys
+import types
+
+import pytest
+
+from mindmeld._lazy import LazyModule, lazy_import
+
+HEAVY_MODULES = ["tensorflow", "torch", "sentence_transformers", "spacy", "elasticsearch"]
+
+
+def test_lazy_import_defers_import():
+    module = lazy_import("mindmeld.tests_lazy_missing_module")
+    assert isinstance(module, LazyModule)
+    with pytest.raises(ImportError):
+        module.attribute  # pylint: disable=pointless-statement
+
+
+def test_lazy_import_returns_imported_module():
+    assert lazy_import("json") is sys.modules["json"]
+
+
+def test_lazy_module_resolves_attributes():
+    module = LazyModule("string")
+    assert module.ascii_lowercase == "abcdefghijklmnopqrstuvwxyz"
+    assert isinstance(module, types.ModuleType)
+
+
+@pytest.mark.parametrize(
+    "code",
+    ["import mindmeld", "from mindmeld.components import NaturalLanguageProcessor"],
+)
+def test_import_does_not_load_heavy_modules(code):
+    script = "import sys\n{}\nprint(','.join(m for m in {!r} if m in sys.modules))".format(
+        code, HEAVY_MODULES
+    )
+    output = subprocess.check_output([sys.executable, "-c", script])
+    assert output.decode("utf-8").strip() == ""
+
+
+def test_lazy_exports():
+    import mindmeld  # noqa: F401 pylint: disable=import-outside-toplevel
+    from mindmeld import components  # pylint: disable=import-outside-toplevel
+
+    assert "NaturalLanguageProcessor" in dir(components)
+    with pytest.raises(AttributeError):
+        components.NotAComponent  # pylint: disable=pointless-statement
@@ -1020,3 +1020,13 @@ def test_bootstrap_query_no_entity(query_factory):
         "role_conf": 1.0,
     }
     assert bootstrap_data == expected_data
+
+
+@pytest.mark.load
+def test_load_queries(query_factory):
+    """Tests that loading a batch of queries matches loading the queries one by one"""
+    processed_queries = markup.load_queries(MARKED_UP_STRS, query_factory)
+
+    assert len(processed_queries) == len(MARKED_UP_STRS)
+    for markup_text, processed_query in zip(MARKED_UP_STRS, processed_queries):
+        assert processed_query.entities == markup.load_query(markup_text, query_factory).entities
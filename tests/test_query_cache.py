@@ -9,23 +9,37 @@ Tests the generated query cache has to correct key value types.
 
 """
 # pylint: disable=locally-disabled,redefined-outer-name
-import os
-
-from sklearn.externals import joblib
-
 from mindmeld.core import ProcessedQuery
-
-QUERY_CACHE_RELATIVE_PATH = ".generated/query_cache.pkl"
+from mindmeld.query_cache import QueryCache
 
 
 def test_query_cache_has_the_correct_format(kwik_e_mart_app_path):
-    query_cache_location = os.path.join(kwik_e_mart_app_path, QUERY_CACHE_RELATIVE_PATH)
-    versioned_data = joblib.load(query_cache_location)
-    if "cached_queries" in versioned_data:
-        query_cache = versioned_data["cached_queries"]
-    else:
-        query_cache = versioned_data
-    assert ("store_info", "help", "User manual") in query_cache
-    assert query_cache[("store_info", "help", "User manual")].domain == "store_info"
-    assert query_cache[("store_info", "help", "User manual")].intent == "help"
-    assert type(query_cache[("store_info", "help", "User manual")]) == ProcessedQuery
+    query_cache = QueryCache(kwik_e_mart_app_path)
+    processed_query = query_cache.get_value("store_info", "help", "User manual")
+    assert processed_query.domain == "store_info"
+    assert processed_query.intent == "help"
+    assert isinstance(processed_query, ProcessedQuery)
+    assert ("store_info", "help", "User manual") in query_cache.cached_queries
+
+
+def test_query_cache_appends_queries(tmpdir):
+    query_cache = QueryCache(str(tmpdir))
+    query_cache.set_value("domain", "intent", "first", "first query")
+    query_cache.dump()
+    query_cache.set_value("domain", "intent", "second", "second query")
+    query_cache.dump()
+
+    query_cache = QueryCache(str(tmpdir))
+    assert query_cache.get_value("domain", "intent", "first") == "first query"
+    assert query_cache.get_value("domain", "intent", "second") == "second query"
+    assert query_cache.get_value("domain", "intent", "third") is None
+
+
+def test_query_cache_compact(tmpdir):
+    query_cache = QueryCache(str(tmpdir))
+    query_cache.set_value("domain", "intent", "first", "first query")
+    query_cache.set_value("domain", "intent", "second", "second query")
+    query_cache.compact(keys=[("domain", "intent", "second")])
+
+    query_cache = QueryCache(str(tmpdir))
+    assert query_cache.cached_queries == {("domain", "intent", "second"): "second query"}
@@ -43,6 +43,15 @@ def test_history(sample_request):
     assert_tuple_of_immutable_maps(sample_request.history)
 
 
+def test_history_is_converted_lazily():
+    request = Request(history=[{"key": "value"}, {"key": "other value"}])
+    assert request.history._maps == [None, None]
+    assert request.history[1] == Map({"key": "other value"})
+    assert request.history._maps[0] is None
+    assert request.history == ({"key": "value"}, {"key": "other value"})
+    assert request.history.to_json() == ({"key": "value"}, {"key": "other value"})
+
+
 def test_text(sample_request):
     with pytest.raises(FrozenInstanceError):
         sample_request.text = "some_text"
@@ -0,0 +1,76 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+test_resource_loader
+----------------------------------
+
+Tests for `resource_loader` module.
+"""
+# pylint: disable=locally-disabled,redefined-outer-name
+from unittest.mock import patch
+
+import pytest
+
+from mindmeld.query_cache import QueryCache
+from mindmeld.resource_loader import ResourceLoader
+
+from .conftest import APP_PATH
+
+
+@pytest.fixture
+def empty_query_cache(tmpdir):
+    """A query cache which does not contain any queries"""
+    return QueryCache(str(tmpdir.mkdir("parallel")))
+
+
+@pytest.mark.load
+def test_parallel_labeled_queries_match_serial(query_factory, empty_query_cache, tmpdir):
+    """Tests that loading labeled queries in parallel returns the serially loaded queries"""
+    serial_loader = ResourceLoader(
+        APP_PATH,
+        query_factory,
+        query_cache=QueryCache(str(tmpdir.mkdir("serial"))),
+        num_workers=0,
+    )
+    serial_tree = serial_loader.get_labeled_queries()
+
+    parallel_loader = ResourceLoader(
+        APP_PATH, query_factory, query_cache=empty_query_cache, num_workers=2
+    )
+    parallel_tree = parallel_loader.get_labeled_queries()
+
+    assert parallel_tree == serial_tree
+
+
+@pytest.mark.load
+def test_parallel_labeled_queries_fill_query_cache(query_factory, empty_query_cache):
+    """Tests that queries loaded in parallel are added to the query cache"""
+    loader = ResourceLoader(
+        APP_PATH, query_factory, query_cache=empty_query_cache, num_workers=2
+    )
+    query_tree = loader.get_labeled_queries(domain="store_info", intent="help")
+    raw_tree = loader.get_labeled_queries(domain="store_info", intent="help", raw=True)
+
+    queries = query_tree["store_info"]["help"]
+    raw_queries = [q for q in raw_tree["store_info"]["help"] if q[0] != "-"]
+    assert len(queries) == len(raw_queries)
+    for query, query_text in zip(queries, raw_queries):
+        assert empty_query_cache.get_value("store_info", "help", query_text) == query
+
+
+@pytest.mark.load
+def test_labeled_queries_load_serially_without_fork(query_factory, empty_query_cache):
+    """Tests that queries are loaded serially with the loader's query factory when worker
+    processes cannot be forked"""
+    loader = ResourceLoader(
+        APP_PATH, query_factory, query_cache=empty_query_cache, num_workers=2
+    )
+    with patch("mindmeld.resource_loader._get_fork_context", return_value=None), patch(
+        "mindmeld.resource_loader.ProcessPoolExecutor"
+    ) as executor:
+        query_tree = loader.get_labeled_queries(domain="store_info", intent="help")
+    executor.assert_not_called()
+    assert query_tree["store_info"]["help"]
+    for query in query_tree["store_info"]["help"]:
+        assert query.query.language == query_factory.language
@@ -10,7 +10,11 @@ Tests for `system_entity_recognizer` module
 import pytest
 import requests
 
-from mindmeld.system_entity_recognizer import SystemEntityRecognizer, DucklingRecognizer
+from mindmeld.system_entity_recognizer import (
+    DucklingRecognizer,
+    SystemEntityRecognizer,
+    SystemEntityResponseCache,
+)
 
 
 NOW_TIMESTAMP = 1544706000000
@@ -325,3 +329,70 @@ def test_get_candidates_for_text_locale(text, locale, expected_entity):
         text, locale=locale
     )
     assert candidates[0]["body"] == expected_entity
+
+
+def test_parse_batch_matches_parse():
+    recognizer = DucklingRecognizer.get_instance()
+    sentences = [
+        "is this room open for an hour",
+        "",
+        "book ticket tomorrow",
+        "this query has no entities",
+    ]
+    responses = recognizer.parse_batch(sentences, timestamp=NOW_TIMESTAMP)
+    assert responses == [
+        recognizer.parse(sentence, timestamp=NOW_TIMESTAMP) for sentence in sentences
+    ]
+
+
+def test_get_candidates_batch_matches_get_candidates(query_factory):
+    recognizer = DucklingRecognizer.get_instance()
+    queries = [
+        query_factory.create_query(text, timestamp=NOW_TIMESTAMP)
+        for text in ["is this room open for an hour", "book ticket tomorrow"]
+    ]
+    assert recognizer.get_candidates_batch(queries) == [
+        recognizer.get_candidates(query) for query in queries
+    ]
+
+
+def test_response_cache_evicts_least_recently_used():
+    cache = SystemEntityResponseCache(max_size=2, ttl=None)
+    data = [{"text": text, "dims": '["number"]'} for text in ["one", "two", "three"]]
+    keys = [cache.get_key(item) for item in data]
+
+    cache.set(keys[0], ([{"body": "one"}], 200))
+    cache.set(keys[1], ([{"body": "two"}], 200))
+    assert cache.get(keys[0]) == ([{"body": "one"}], 200)
+    cache.set(keys[2], ([{"body": "three"}], 200))
+
+    assert cache.get(keys[1]) is None
+    assert cache.get(keys[2]) == ([{"body": "three"}], 200)
+    assert cache.stats == {
+        "size": 2,
+        "max_size": 2,
+        "hits": 2,
+        "misses": 1,
+        "evictions": 1,
+        "expirations": 0,
+    }
+
+
+def test_response_cache_buckets_reference_time_of_time_dimension():
+    cache = SystemEntityResponseCache(time_bucket=60)
+    number_key = cache.get_key({"text": "5", "dims": '["number"]', "reftime": 0})
+    assert number_key == cache.get_key(
+        {"text": "5", "dims": '["number"]', "reftime": 3600000}
+    )
+
+    time_key = cache.get_key({"text": "tomorrow", "reftime": NOW_TIMESTAMP})
+    assert time_key == cache.get_key({"text": "tomorrow", "reftime": NOW_TIMESTAMP + 1000})
+    assert time_key != cache.get_key({"text": "tomorrow", "reftime": NOW_TIMESTAMP + 60000})
+
+
+def test_response_cache_expires_entries():
+    cache = SystemEntityResponseCache(ttl=0)
+    key = cache.get_key({"text": "5", "dims": '["number"]'})
+    cache.set(key, ([], 200))
+    assert cache.get(key) is None
+    assert cache.expirations == 1
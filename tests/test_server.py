@@ -1,9 +1,10 @@
 import json
 
 import pytest
+from flask import g
 
 from mindmeld.app_manager import ApplicationManager
-from mindmeld.server import MindMeldServer
+from mindmeld.server import MindMeldServer, encode_json
 
 
 @pytest.fixture
@@ -60,3 +61,29 @@ def test_status_endpoint(client):
         "response_time",
         "version",
     }
+
+
+def test_request_log_uses_response_body(app_manager):
+    server = MindMeldServer(app_manager)
+    logged = []
+    server._log_request = lambda req, response: logged.append(g.response_data)
+    server._server.before_request(lambda: setattr(g, "log_this_request", True))
+    response = server._server.test_client().post(
+        "/parse",
+        data=json.dumps({"text": "hello"}),
+        content_type="application/json",
+    )
+    assert logged == [json.loads(response.data.decode("utf8"))]
+
+
+def test_encode_json():
+    data = {
+        "history": ({"text": "hello", "entities": ()},),
+        "frame": {1: "one"},
+        "text": "caf\u00e9",
+    }
+    assert json.loads(encode_json(data).decode("utf8")) == {
+        "history": [{"text": "hello", "entities": []}],
+        "frame": {"1": "one"},
+        "text": "caf\u00e9",
+    }
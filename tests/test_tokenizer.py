@@ -8,13 +8,31 @@ test_markup
 Tests for `markup` module.
 """
 # pylint: disable=I0011,W0621
+import glob
 import os
+import re
+
 import pytest
 
 from mindmeld.tokenizer import Tokenizer
 
 APP_NAME = "food_ordering"
 APP_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), APP_NAME)
+TESTS_PATH = os.path.dirname(os.path.abspath(__file__))
+
+
+def load_corpus():
+    """Loads the text of every training query of the test apps, without markup"""
+    texts = []
+    pattern = os.path.join(TESTS_PATH, "**", "domains", "**", "*.txt")
+    for path in sorted(glob.glob(pattern, recursive=True)):
+        with open(path, encoding="utf-8") as query_file:
+            texts.extend(
+                re.sub(r"\|[\w\-]+(?=\}|\])|[\{\}\[\]]", "", line.strip())
+                for line in query_file
+                if line.strip()
+            )
+    return texts
 
 
 @pytest.fixture
@@ -241,3 +259,47 @@ def test_custom_tokenizer_extra_special_chars(tokenizer, custom_tokenizer):
     # as part of the tokens.
     assert normalized == "join o'reilly 's pmr"
     assert custom_normalized == 'join o reilly s pmr.'
+
+
+@pytest.mark.parametrize("app_path", [None, APP_PATH])
+def test_fast_mode_parity(app_path):
+    fast_tokenizer = Tokenizer(app_path=app_path, fast_mode=True)
+    tokenizer = Tokenizer(app_path=app_path, fast_mode=False)
+    texts = load_corpus() + [
+        "",
+        "  ",
+        "İstanbul",
+        "ﬁve ½ pizzas",
+        "Héllo   wörld -- it's 5:30pm!!",
+        "mom's & dad's  \u00e9clairs, s'il vous plaît",
+    ]
+    assert len(texts) > 1000
+
+    for text in texts:
+        for keep_special_chars in (True, False):
+            assert fast_tokenizer.tokenize(text, keep_special_chars) == tokenizer.tokenize(
+                text, keep_special_chars
+            )
+        normalized_text = tokenizer.normalize(text)
+        assert fast_tokenizer.normalize(text) == normalized_text
+        assert fast_tokenizer.get_char_index_map(
+            text, normalized_text
+        ) == tokenizer.get_char_index_map(text, normalized_text)
+
+
+@pytest.mark.parametrize(
+    "raw_text,normalized_text",
+    [
+        ("abc", "bca"),
+        ("a b c", "abc d"),
+        ("the cat sat", "that cats"),
+        ("aaaa", "a"),
+        ("a", "aaaa"),
+    ],
+)
+def test_fast_mode_alignment(raw_text, normalized_text):
+    fast_tokenizer = Tokenizer(fast_mode=True)
+    tokenizer = Tokenizer(fast_mode=False)
+    assert fast_tokenizer.get_char_index_map(
+        raw_text, normalized_text
+    ) == tokenizer.get_char_index_map(raw_text, normalized_text)